@@ -1,5 +1,6 @@
 # Standard library imports
 import sys
+import multiprocessing
 
 # Third-party imports
 from PyQt5 import QtWidgets
@@ -10,6 +11,7 @@ from views.start import Start
 from views.simulator import Simulator
 from views.create_project import CreateProject
 import tests.plant_tester.plant_tester as Tester
+import tests.simulation_tester.simulation_tester as SimulationTester
 
 MAX_WIDTH_START = 370
 MAX_HEIGHT_START = 441
@@ -160,6 +162,10 @@ def main():
     elif mode == 2:
         tester = Tester.PlantTester()
         tester.run_all_tests(verbosity=2)
+        simulation_tester = SimulationTester.SimulationTester()
+        simulation_tester.run_all_tests(verbosity=2)
 
 if __name__ == "__main__":
+    # Required by the analysis process pools in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,38 @@
+# Standard library imports
+import argparse
+import asyncio
+import json
+import multiprocessing
+
+# Local application imports
+from simulation_components.simulation_service import run_service, export_project, DEFAULT_HOST, DEFAULT_PORT
+from simulation_components.data_export import EXPORT_FORMATS
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless simulation service: POST a project as JSON to "
+                                                 "/step, /reference, /margins, /bode or /export; GET /metrics for latencies.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Interface to listen on (local only by default)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (all cores by default)")
+    parser.add_argument("--export", metavar="PROJECT_JSON", default=None,
+                        help="Export the data of a project file in JSON form and exit instead of serving")
+    parser.add_argument("--output", default="export", help="Path of the exported files (with --export)")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="CSV", help="Export format (with --export)")
+    args = parser.parse_args()
+
+    if args.export:
+        with open(args.export, "r", encoding="utf-8") as f:
+            project = json.load(f)
+        result = export_project(project, args.output, args.format)
+        print(result if isinstance(result, str) else "\n".join(result))
+        return
+
+    try:
+        asyncio.run(run_service(args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    # Required by the service process pool in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,294 @@
+#Scientific imports
+import numpy as np
+from scipy.linalg import expm
+
+# Local application imports
+from .divergence import DIVERGENCE_BOUND, is_asymptotically_stable
+
+
+def stack_coefficients(coefficients, batch):
+    """
+    Stack a list of scalar / array coefficients into a (batch, order + 1) array
+    Args:
+        coefficients (list): Coefficients, highest power first, each a float or an array of shape (batch,)
+        batch (int): Number of systems in the batch
+    Returns:
+        np.ndarray: Coefficient matrix with one row per system
+    """
+    return np.stack([np.broadcast_to(np.asarray(c, dtype=float), (batch,)) for c in coefficients], axis=1)
+
+
+def _polymul(a, b):
+    """
+    Multiply two batches of polynomials row by row
+    Args:
+        a (np.ndarray): Coefficients of shape (batch, na), highest power first
+        b (np.ndarray): Coefficients of shape (batch, nb) or (1, nb)
+    Returns:
+        np.ndarray: Product coefficients of shape (batch, na + nb - 1)
+    """
+    batch = max(a.shape[0], b.shape[0])
+    result = np.zeros((batch, a.shape[1] + b.shape[1] - 1))
+    for i in range(b.shape[1]):
+        result[:, i:i + a.shape[1]] += a * b[:, i:i + 1]
+    return result
+
+
+def _polyadd(a, b):
+    """
+    Add two batches of polynomials, aligning them on the lowest power
+    Args:
+        a (np.ndarray): Coefficients of shape (batch, na)
+        b (np.ndarray): Coefficients of shape (batch, nb)
+    Returns:
+        np.ndarray: Sum coefficients of shape (batch, max(na, nb))
+    """
+    size = max(a.shape[1], b.shape[1])
+    result = np.zeros((max(a.shape[0], b.shape[0]), size))
+    result[:, size - a.shape[1]:] += a
+    result[:, size - b.shape[1]:] += b
+    return result
+
+
+def closed_loop_coefficients(plant_num, plant_den, kp, ki, kd, sensor_num, sensor_den):
+    """
+    Closed-loop polynomials of C*P / (1 + C*P*S) for a batch of plants and PID gains,
+    with C = (kd*s^2 + kp*s + ki) / s
+    Args:
+        plant_num (np.ndarray): Plant numerators of shape (batch, n)
+        plant_den (np.ndarray): Plant denominators of shape (batch, m)
+        kp, ki, kd (float or np.ndarray): PID gains, scalars or arrays of shape (batch,)
+        sensor_num (array-like): Sensor numerator coefficients
+        sensor_den (array-like): Sensor denominator coefficients
+    Returns:
+        tuple: (numerators, denominators) arrays with one row per closed loop
+    """
+    batch = max(plant_num.shape[0], plant_den.shape[0], np.size(kp), np.size(ki), np.size(kd))
+    pid_num = stack_coefficients([kd, kp, ki], batch)
+    pid_den = np.array([[1.0, 0.0]])
+    sensor_num = np.atleast_2d(np.asarray(sensor_num, dtype=float))
+    sensor_den = np.atleast_2d(np.asarray(sensor_den, dtype=float))
+
+    forward = _polymul(pid_num, plant_num)
+    numerators = _polymul(forward, sensor_den)
+    denominators = _polyadd(_polymul(_polymul(np.broadcast_to(pid_den, (batch, 2)), plant_den), sensor_den),
+                            _polymul(forward, sensor_num))
+    return numerators, denominators
+
+
+def cancel_common_integrators(numerators, denominators):
+    """
+    Divide out the factors s shared exactly by the numerator and denominator of every closed loop.
+    With Ki = 0 the integrator of C = (kd*s^2 + kp*s + ki) / s cancels with its numerator, and both
+    constant coefficients of the closed loop are exactly zero.
+    Args:
+        numerators (np.ndarray): Numerators of shape (batch, n)
+        denominators (np.ndarray): Denominators of shape (batch, m)
+    Returns:
+        tuple: (denominators, cancelled) with the reduced denominators shifted right (leading zeros,
+               same shape) and the number of factors s removed from every row
+    """
+    batch, width = denominators.shape
+    cancelled = np.zeros(batch, dtype=int)
+    common = np.ones(batch, dtype=bool)
+    for j in range(1, min(numerators.shape[1], width)):
+        common &= (numerators[:, -j] == 0) & (denominators[:, -j] == 0)
+        if not common.any():
+            break
+        cancelled += common
+    if not cancelled.any():
+        return denominators, cancelled
+
+    reduced = np.zeros_like(denominators)
+    for count in np.unique(cancelled):
+        rows = cancelled == count
+        reduced[rows, count:] = denominators[rows, :width - count]
+    return reduced, cancelled
+
+
+def closed_loop_stable(numerators, denominators):
+    """
+    Stability of a batch of closed loops from the poles left once the exact integrator cancellations
+    are divided out, with the same predicate as a single loop (marginal poles count as unstable)
+    Args:
+        numerators (np.ndarray): Numerators of shape (batch, n)
+        denominators (np.ndarray): Denominators of shape (batch, m) with a non-zero leading coefficient
+    Returns:
+        np.ndarray: Boolean mask of the stable closed loops
+    """
+    reduced, cancelled = cancel_common_integrators(numerators, denominators)
+    batch, width = denominators.shape
+    stable = np.ones(batch, dtype=bool)
+    for count in np.unique(cancelled):
+        rows = np.flatnonzero(cancelled == count)
+        order = width - 1 - count
+        if not order:
+            continue
+        a = reduced[rows, count:] / reduced[rows, count:count + 1]
+        companion = np.zeros((len(rows), order, order))
+        companion[:, np.arange(order - 1), np.arange(1, order)] = 1.0
+        companion[:, -1, :] = -a[:, :0:-1]
+        stable[rows] = is_asymptotically_stable(np.linalg.eigvals(companion), axis=1)
+    return stable
+
+
+def _trim_leading_zeros(numerators, denominators):
+    """
+    Drop the leading denominator columns that vanish for every system and align the numerators
+    Args:
+        numerators (np.ndarray): Numerators of shape (batch, n)
+        denominators (np.ndarray): Denominators of shape (batch, m)
+    Returns:
+        tuple: (numerators, denominators) with matching widths, or None if a system is improper
+    """
+    scale = np.max(np.abs(denominators), axis=1, keepdims=True)
+    scale[scale == 0] = 1.0
+    significant = np.abs(denominators) > 1e-12 * scale
+    first = int(np.argmax(significant.any(axis=0)))
+    denominators = denominators[:, first:]
+
+    width = denominators.shape[1]
+    if numerators.shape[1] > width:
+        if np.any(numerators[:, :numerators.shape[1] - width] != 0):
+            return None
+        numerators = numerators[:, numerators.shape[1] - width:]
+    elif numerators.shape[1] < width:
+        numerators = np.pad(numerators, ((0, 0), (width - numerators.shape[1], 0)))
+    return numerators, denominators
+
+
+def discretize_batch(numerators, denominators, sample_time):
+    """
+    Zero-order hold discretization of a batch of SISO systems of the same order
+    Args:
+        numerators (np.ndarray): Numerators of shape (batch, order + 1), highest power first
+        denominators (np.ndarray): Denominators of shape (batch, order + 1), highest power first
+        sample_time (float): Sample time in seconds
+    Returns:
+        tuple: (Ad, Bd, C, D, valid, stable) with Ad of shape (batch, order, order),
+               Bd and C of shape (batch, order) and D, valid, stable of shape (batch,)
+    """
+    batch, width = denominators.shape
+    order = width - 1
+    leading = denominators[:, 0]
+    valid = np.isfinite(denominators).all(axis=1) & np.isfinite(numerators).all(axis=1) & (leading != 0)
+    leading = np.where(valid, leading, 1.0)
+
+    a = np.where(valid[:, None], denominators / leading[:, None], 0.0)
+    b = np.where(valid[:, None], numerators / leading[:, None], 0.0)
+    a[~valid, 0] = 1.0
+
+    # Controllable canonical realization
+    A = np.zeros((batch, order, order))
+    if order:
+        A[:, np.arange(order - 1), np.arange(1, order)] = 1.0
+        A[:, -1, :] = -a[:, :0:-1]
+    C = b[:, :0:-1] - a[:, :0:-1] * b[:, :1]
+    D = b[:, 0]
+
+    if order:
+        augmented = np.zeros((batch, order + 1, order + 1))
+        augmented[:, :order, :order] = A * sample_time
+        augmented[:, order - 1, order] = sample_time
+        exponential = expm(augmented)
+        Ad = exponential[:, :order, :order]
+        Bd = exponential[:, :order, order]
+        stable = closed_loop_stable(b, a)
+    else:
+        Ad = A
+        Bd = np.zeros((batch, 0))
+        stable = np.ones(batch, dtype=bool)
+
+    return Ad, Bd, C, D, valid, stable & valid
+
+
+def simulate_step_batch(numerators, denominators, t, step_index, divergence_bound=DIVERGENCE_BOUND):
+    """
+    Exact sampled unit-step responses of a batch of closed loops.
+    Unstable closed loops are dropped from the propagation once they exceed the divergence bound,
+    so batches that wander into unstable regions get cheaper as they go.
+    Args:
+        numerators (np.ndarray): Closed-loop numerators of shape (batch, n)
+        denominators (np.ndarray): Closed-loop denominators of shape (batch, m)
+        t (np.ndarray): Uniform time grid
+        step_index (int): First sample where the step is applied
+        divergence_bound (float): Magnitude beyond which an unstable response is cut off
+    Returns:
+        tuple: (responses, stable) with responses of shape (batch, samples), NaN for invalid systems
+               and after the divergence of unstable ones
+        error message (str) if the closed loop is improper
+    """
+    trimmed = _trim_leading_zeros(numerators, denominators)
+    if trimmed is None:
+        return "Error: The closed loop is improper and cannot be simulated."
+    numerators, denominators = trimmed
+
+    sample_time = t[1] - t[0]
+    Ad, Bd, C, D, valid, stable = discretize_batch(numerators, denominators, sample_time)
+
+    batch = numerators.shape[0]
+    responses = np.zeros((batch, len(t)))
+    responses[~valid] = np.nan
+
+    # Only the valid systems are propagated, the unstable ones until they diverge
+    active = np.flatnonzero(valid)
+    Ad, Bd, C, D = Ad[active], Bd[active], C[active], D[active]
+    watched = ~stable[active]
+    x = np.zeros_like(Bd)
+    with np.errstate(over='ignore', invalid='ignore'):
+        for k in range(step_index, len(t)):
+            y = np.einsum('bi,bi->b', C, x) + D
+            responses[active, k] = y
+            diverged = watched & ~(np.abs(y) <= divergence_bound)
+            if diverged.any():
+                responses[active[diverged], k + 1:] = np.nan
+                keep = ~diverged
+                active, watched, x = active[keep], watched[keep], x[keep]
+                Ad, Bd, C, D = Ad[keep], Bd[keep], C[keep], D[keep]
+                if not active.size:
+                    break
+            x = np.einsum('bij,bj->bi', Ad, x) + Bd
+    return responses, stable
+
+
+def closed_loop_step_batch(numerators, denominators, input_parameters):
+    """
+    Step responses of a batch of closed loops given by their coefficients (process pool worker)
+    Args:
+        numerators (np.ndarray): Closed-loop numerators of shape (batch, n)
+        denominators (np.ndarray): Closed-loop denominators of shape (batch, m)
+        input_parameters (dict): Step and time grid parameters of the Input
+    Returns:
+        tuple: (t, responses, stable), or an error message (str)
+    """
+    total_time = input_parameters["total_time"]
+    sample_time = input_parameters["sample_time"]
+    initial_value = input_parameters["initial_value"]
+    final_value = input_parameters["final_value"]
+
+    num_points = int(total_time / sample_time) + 1
+    t = np.linspace(0, total_time, num_points)
+    step_index = int(np.argmax(t >= input_parameters["step_time"])) if input_parameters["step_time"] <= total_time else num_points
+
+    result = simulate_step_batch(numerators, denominators, t, step_index)
+    if isinstance(result, str):
+        return result
+    responses, stable = result
+    return t, initial_value + (final_value - initial_value) * responses, stable
+
+
+def step_response_batch(plant_num, plant_den, pid_parameters, sensor_coefficients, input_parameters):
+    """
+    Step responses of the closed loop for a batch of plants (process pool worker)
+    Args:
+        plant_num (np.ndarray): Plant numerators of shape (batch, n)
+        plant_den (np.ndarray): Plant denominators of shape (batch, m)
+        pid_parameters (dict): 'kp', 'ki', 'kd' gains, floats or arrays of shape (batch,)
+        sensor_coefficients (tuple): (numerator, denominator) of the sensor
+        input_parameters (dict): Step and time grid parameters of the Input
+    Returns:
+        tuple: (t, responses, stable), or an error message (str)
+    """
+    numerators, denominators = closed_loop_coefficients(plant_num, plant_den, pid_parameters["kp"], pid_parameters["ki"],
+                                                        pid_parameters["kd"], *sensor_coefficients)
+    return closed_loop_step_batch(numerators, denominators, input_parameters)
@@ -0,0 +1,255 @@
+# Standard library imports
+import os
+import zipfile
+
+#Scientific imports
+import numpy as np
+
+# Local application imports
+from .instrumentation import traced
+
+# Export formats and the extension of their files
+EXPORT_FORMATS = {"CSV": ".csv", "NPZ": ".npz", "Parquet": ".parquet"}
+
+# Tables that can be exported and their content
+EXPORT_TABLES = {
+    "time_response": "Time response: t, (reference,) response",
+    "bode": "Closed-loop Bode diagram: omega, magnitude_db, phase_deg",
+    "nyquist": "Nyquist contour of the loop C·P·S (upper half): s_real, s_imag, real, imag, segment",
+    "root_locus": "Root locus branches: gain, branch, real, imag",
+    "poles": "Closed-loop poles: real, imag",
+    "zeros": "Closed-loop zeros: real, imag",
+}
+
+# Rows written at a time: large tables never go through a single text or byte buffer
+CHUNK_ROWS = 65536
+
+# Significant digits of the CSV values
+CSV_FORMAT = "%.10g"
+
+
+class ExportTable:
+    """
+    Named columns of equal length, written in chunks of rows.
+    """
+
+    def __init__(self, name, columns):
+        """
+        Initialize the table
+        Args:
+            name (str): Table name (key of EXPORT_TABLES)
+            columns (dict): Column name -> 1-D numpy array, all of the same length
+        Returns:
+            None
+        """
+        self.name = name
+        self.columns = {column: np.asarray(values).reshape(-1) for column, values in columns.items()}
+        lengths = {len(values) for values in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns of table '{name}' have different lengths.")
+        self.length = lengths.pop() if lengths else 0
+
+    def get_column_names(self):
+        """
+        Return the column names in order
+        Args:
+            None
+        Returns:
+            list: Column names
+        """
+        return list(self.columns)
+
+    def iter_chunks(self, chunk_rows=CHUNK_ROWS):
+        """
+        Iterate over the rows in chunks, as views of the columns (no copy)
+        Args:
+            chunk_rows (int): Rows per chunk
+        Returns:
+            Generator of dicts column name -> array slice
+        """
+        for start in range(0, self.length, chunk_rows):
+            yield {column: values[start:start + chunk_rows] for column, values in self.columns.items()}
+
+
+def complex_columns(values):
+    """
+    Split complex values into real and imaginary columns
+    Args:
+        values (np.ndarray): Complex values
+    Returns:
+        dict: 'real' and 'imag' arrays
+    """
+    values = np.asarray(values, dtype=complex).reshape(-1)
+    return {"real": values.real, "imag": values.imag}
+
+
+@traced("data_export.collect_tables")
+def collect_tables(output, names=None):
+    """
+    Compute the exported tables of an Output
+    Args:
+        output (Output): Output of the loop to export
+        names (list or None): Keys of EXPORT_TABLES, every table if None
+    Returns:
+        list: ExportTable objects
+        error message (str) if a table cannot be computed
+    """
+    names = list(EXPORT_TABLES) if names is None else names
+    tables = []
+    for name in names:
+        if name not in EXPORT_TABLES:
+            return f"Error: Unknown export table '{name}'."
+
+        if name == "time_response":
+            if output.get_input_params().get_signal_type() == "Step":
+                data = output.get_step_response_data()
+                columns = None if data is None else {"t": data[0], "response": data[1]}
+            else:
+                data = output.get_reference_response_data()
+                columns = None if data is None else {"t": data[0], "reference": data[1], "response": data[2]}
+        elif name == "bode":
+            data = output.get_bode_data()
+            columns = None if data is None else {"omega": data[0], "magnitude_db": data[1], "phase_deg": data[2]}
+        elif name == "nyquist":
+            data = output.get_nyquist_data()
+            if data is None:
+                columns = None
+            else:
+                s, response, segments = data
+                columns = {"s_real": np.real(s), "s_imag": np.imag(s), **complex_columns(response), "segment": segments}
+        elif name == "root_locus":
+            data = output.get_root_locus_data()
+            if data is None:
+                columns = None
+            else:
+                # Long format: one row per gain and branch
+                gains, loci = data
+                branches = loci.shape[1]
+                columns = {"gain": np.repeat(gains, branches), "branch": np.tile(np.arange(branches), len(gains)),
+                           **complex_columns(loci)}
+        else:
+            data = output.get_pole_zero_data()
+            columns = None if data is None else complex_columns(data[0] if name == "poles" else data[1])
+
+        if columns is None:
+            return f"Error: The {name.replace('_', ' ')} data cannot be computed."
+        tables.append(ExportTable(name, columns))
+    return tables
+
+
+def write_csv(file_path, table, chunk_rows=CHUNK_ROWS):
+    """
+    Write a table as CSV with a header row, chunk by chunk
+    Args:
+        file_path (str): Path of the CSV file
+        table (ExportTable): Table to write
+        chunk_rows (int): Rows per chunk
+    Returns:
+        None
+    """
+    with open(file_path, "w", encoding="utf-8", newline="") as f:
+        f.write(",".join(table.get_column_names()) + "\n")
+        for chunk in table.iter_chunks(chunk_rows):
+            np.savetxt(f, np.column_stack(list(chunk.values())), fmt=CSV_FORMAT, delimiter=",")
+
+
+def write_npz(file_path, tables, chunk_rows=CHUNK_ROWS):
+    """
+    Write tables as a compressed NPZ archive with one '<table>/<column>' array per column.
+    Every column is streamed into its archive member, without a full in-memory copy of the file.
+    Args:
+        file_path (str): Path of the NPZ file
+        tables (list): ExportTable objects
+        chunk_rows (int): Rows per chunk
+    Returns:
+        None
+    """
+    with zipfile.ZipFile(file_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for table in tables:
+            for column, values in table.columns.items():
+                header = {"descr": np.lib.format.dtype_to_descr(values.dtype), "fortran_order": False, "shape": (table.length,)}
+                with archive.open(f"{table.name}/{column}.npy", "w", force_zip64=True) as member:
+                    np.lib.format.write_array_header_1_0(member, header)
+                    for start in range(0, table.length, chunk_rows):
+                        member.write(np.ascontiguousarray(values[start:start + chunk_rows]).tobytes())
+
+
+def write_parquet(file_path, table, chunk_rows=CHUNK_ROWS):
+    """
+    Write a table as a Parquet file with one row group per chunk
+    Args:
+        file_path (str): Path of the Parquet file
+        table (ExportTable): Table to write
+        chunk_rows (int): Rows per chunk
+    Returns:
+        error_log (str): Error message if pyarrow is not installed, None otherwise
+    """
+    # Optional dependency: only Parquet export needs it
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return "Error: Parquet export needs the pyarrow package (pip install pyarrow)."
+
+    schema = pa.schema([(column, pa.from_numpy_dtype(values.dtype)) for column, values in table.columns.items()])
+    with pq.ParquetWriter(file_path, schema, compression="zstd") as writer:
+        for chunk in table.iter_chunks(chunk_rows):
+            writer.write_table(pa.Table.from_pydict({column: pa.array(values) for column, values in chunk.items()}, schema=schema))
+
+
+def get_export_paths(base_path, file_format, names):
+    """
+    Return the files an export writes
+    Args:
+        base_path (str): Path without extension; CSV and Parquet add '_<table>' per table
+        file_format (str): Key of EXPORT_FORMATS
+        names (list): Table names
+    Returns:
+        list: File paths
+    """
+    extension = EXPORT_FORMATS[file_format]
+    if file_format == "NPZ":
+        return [base_path + extension]
+    return [f"{base_path}_{name}{extension}" for name in names]
+
+
+@traced("data_export.export_output")
+def export_output(output, base_path, file_format="CSV", names=None, chunk_rows=CHUNK_ROWS):
+    """
+    Export the numerical results of an Output
+    Args:
+        output (Output): Output of the loop to export
+        base_path (str): Path of the exported files, with or without the extension of the format
+        file_format (str): Key of EXPORT_FORMATS
+        names (list or None): Keys of EXPORT_TABLES, every table if None
+        chunk_rows (int): Rows written at a time
+    Returns:
+        list: Paths of the written files
+        error message (str) if the export fails
+    """
+    if file_format not in EXPORT_FORMATS:
+        return f"Error: Unknown export format '{file_format}'."
+    if chunk_rows < 1:
+        return "Error: Chunk size must be at least one row."
+    root, extension = os.path.splitext(base_path)
+    if extension.lower() == EXPORT_FORMATS[file_format]:
+        base_path = root
+
+    tables = collect_tables(output, names)
+    if isinstance(tables, str):
+        return tables
+    paths = get_export_paths(base_path, file_format, [table.name for table in tables])
+
+    try:
+        if file_format == "NPZ":
+            write_npz(paths[0], tables, chunk_rows)
+        for table, path in zip(tables, paths):
+            if file_format == "CSV":
+                write_csv(path, table, chunk_rows)
+            elif file_format == "Parquet":
+                error_log = write_parquet(path, table, chunk_rows)
+                if error_log:
+                    return error_log
+    except OSError as e:
+        return f"Error: Could not write the export file: {e}"
+    return paths
@@ -0,0 +1,228 @@
+# Standard library imports
+from functools import wraps
+
+
+class _Node:
+    """
+    Memoized value of the graph with the revisions of the nodes it read when it was computed.
+    """
+    __slots__ = ("name", "compute", "source", "value", "fingerprint", "revision", "inputs")
+
+    def __init__(self, name, compute, source):
+        """
+        Initialize the node, not computed yet
+        Args:
+            name (str): Node name
+            compute (callable): Fingerprint of a source, value of a derived node
+            source (bool): True for a source node
+        Returns:
+            None
+        """
+        self.name = name
+        self.compute = compute
+        self.source = source
+        self.value = None
+        self.fingerprint = None
+        self.revision = 0
+        self.inputs = None
+
+
+class DependencyGraph:
+    """
+    Lazy graph of memoized results, pulled from its leaves.
+
+    Source nodes fingerprint mutable objects (PID gains, component coefficients, settings)
+    every time they are read, and change revision only when the fingerprint does. A derived
+    node records the nodes it reads while it is computed and is recomputed only when one of
+    them changed revision since, so an edit recomputes exactly the nodes downstream of the
+    edited object. Every recomputation is logged for introspection.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty graph
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.nodes = {}
+        self.stack = []
+        self.computing = set()
+        self.recomputed = []
+
+    def add_source(self, name, fingerprint):
+        """
+        Register a source node
+        Args:
+            name (str): Node name
+            fingerprint (callable): Value describing the state of the source, compared through its repr
+        Returns:
+            None
+        """
+        self.nodes[name] = _Node(name, fingerprint, True)
+
+    def add_node(self, name, compute):
+        """
+        Register a derived node, its inputs are the nodes read by compute
+        Args:
+            name (str): Node name
+            compute (callable): Computes the value of the node without arguments
+        Returns:
+            None
+        """
+        self.nodes[name] = _Node(name, compute, False)
+
+    def has_node(self, name):
+        """
+        Check whether a node is registered
+        Args:
+            name (str): Node name
+        Returns:
+            bool: True if the node exists
+        """
+        return name in self.nodes
+
+    def get(self, name):
+        """
+        Return the value of a node, recomputing it first if one of its inputs changed
+        Args:
+            name (str): Node name
+        Returns:
+            Value of the node (the fingerprint for a source)
+        """
+        node = self.nodes[name]
+        if self.stack:
+            self.stack[-1][name] = None
+        if node.source:
+            self._refresh_source(node)
+        elif self._is_stale(node):
+            self._recompute(node)
+        if self.stack:
+            self.stack[-1][name] = node.revision
+        return node.value
+
+    def _refresh_source(self, node):
+        """
+        Read the fingerprint of a source and move to a new revision if it changed
+        Args:
+            node (_Node): Source node
+        Returns:
+            None
+        """
+        value = node.compute()
+        fingerprint = repr(value)
+        if node.fingerprint is None or fingerprint != node.fingerprint:
+            node.value = value
+            node.fingerprint = fingerprint
+            node.revision += 1
+            self.recomputed.append(node.name)
+
+    def _is_stale(self, node):
+        """
+        Check the inputs of a derived node in the order they were read, stopping at the first change
+        Args:
+            node (_Node): Derived node
+        Returns:
+            bool: True if the node was never computed or one of its inputs has a new revision
+        """
+        if node.inputs is None:
+            return True
+        for name, revision in node.inputs.items():
+            dependency = self.nodes[name]
+            if dependency.source:
+                self._refresh_source(dependency)
+            elif self._is_stale(dependency):
+                self._recompute(dependency)
+            if dependency.revision != revision:
+                return True
+        return False
+
+    def _recompute(self, node):
+        """
+        Compute a derived node, recording the nodes it reads as its inputs
+        Args:
+            node (_Node): Derived node
+        Returns:
+            None
+        """
+        if node.name in self.computing:
+            raise RuntimeError(f"Cyclic dependency on node '{node.name}'.")
+        self.computing.add(node.name)
+        self.stack.append({})
+        try:
+            value = node.compute()
+        finally:
+            inputs = self.stack.pop()
+            self.computing.discard(node.name)
+        node.value = value
+        node.inputs = inputs
+        node.revision += 1
+        self.recomputed.append(node.name)
+
+    def get_inputs(self, name):
+        """
+        Return the nodes read by a derived node at its last computation
+        Args:
+            name (str): Node name
+        Returns:
+            list: Input node names in the order they were read (empty for sources and nodes not computed yet)
+        """
+        inputs = self.nodes[name].inputs
+        return list(inputs) if inputs else []
+
+    def get_revisions(self):
+        """
+        Return how many times every node has been computed (sources: how many fingerprints they went through)
+        Args:
+            None
+        Returns:
+            dict: Revision of every node (0 if it was never computed)
+        """
+        return {name: node.revision for name, node in self.nodes.items()}
+
+    def pop_recomputed(self):
+        """
+        Return the nodes recomputed since the last call, and start a new log
+        Args:
+            None
+        Returns:
+            list: Node names in the order they were recomputed (sources when their fingerprint changed)
+        """
+        recomputed, self.recomputed = self.recomputed, []
+        return recomputed
+
+    def invalidate(self):
+        """
+        Forget every value, the next reads recompute everything
+        Args:
+            None
+        Returns:
+            None
+        """
+        for node in self.nodes.values():
+            node.inputs = None
+            node.fingerprint = None
+
+
+def memoized(name, sources=()):
+    """
+    Decorator making a method without arguments a derived node of the graph of its instance (self.graph)
+    Args:
+        name (str): Node name
+        sources (tuple): Source nodes the method reads directly from the components
+    Returns:
+        callable: Decorator
+    """
+    def decorator(function):
+        @wraps(function)
+        def wrapper(self):
+            if not self.graph.has_node(name):
+                def compute():
+                    for source in sources:
+                        self.graph.get(source)
+                    return function(self)
+                self.graph.add_node(name, compute)
+            return self.graph.get(name)
+        return wrapper
+    return decorator
@@ -0,0 +1,96 @@
+#Scientific imports
+import numpy as np
+
+# Local application imports
+from .loop_simulator import discretize
+
+# Simulations stop once the response exceeds this many times the step amplitude
+DIVERGENCE_BOUND = 1e6
+
+# Closed loops whose slowest pole has a real part above this value are flagged unstable
+STABILITY_TOLERANCE = 1e-9
+
+# Samples propagated at once between two divergence checks
+CHUNK_SAMPLES = 256
+
+# Largest growth of the state over one chunk (natural log), keeps the chunk matrices finite
+MAX_CHUNK_GROWTH = 200.0
+
+
+def is_asymptotically_stable(poles, axis=None):
+    """
+    Check that every pole lies in the open left half-plane
+    Args:
+        poles (np.ndarray): Complex poles of the closed loop
+        axis (int or None): Axis holding the poles of one loop, for a batch of closed loops
+    Returns:
+        bool: True if the response cannot diverge (marginal poles count as unstable)
+        np.ndarray: Boolean mask of the stable loops if axis is given
+    """
+    poles = np.asarray(poles, dtype=complex)
+    stable = np.all(np.isfinite(poles), axis=axis) & np.all(poles.real < -STABILITY_TOLERANCE, axis=axis)
+    return bool(stable) if axis is None else stable
+
+
+def first_divergent_index(values, bound):
+    """
+    Index of the first sample whose magnitude exceeds the bound or is not finite
+    Args:
+        values (np.ndarray): Samples
+        bound (float): Largest accepted magnitude
+    Returns:
+        int: Index of the first divergent sample, or None if there is none
+    """
+    exceeded = np.flatnonzero(~(np.abs(values) <= bound))
+    return int(exceeded[0]) if exceeded.size else None
+
+
+def step_response_until_divergence(system, t, bound=DIVERGENCE_BOUND):
+    """
+    Unit step response of a continuous system, stopped once it exceeds the bound.
+    The system is discretized with a zero-order hold (exact for a step) and propagated a chunk
+    of samples at a time: the free and forced responses over a chunk are precomputed, so every
+    chunk costs one matrix product and the divergence is checked between chunks.
+    Args:
+        system (ctrl.StateSpace or ctrl.TransferFunction): Continuous closed loop
+        t (np.ndarray): Uniform time grid starting at 0, with at least two samples
+        bound (float): Largest accepted magnitude of the response
+    Returns:
+        tuple: (response, diverged), the response ends at the first sample beyond the bound if diverged
+    """
+    samples = len(t)
+    A, B, C, D = discretize(system, t[1] - t[0])
+    order = len(A)
+
+    # Shorter chunks for fast-growing modes, so that A^chunk does not overflow
+    chunk = min(CHUNK_SAMPLES, samples)
+    if order:
+        growth = np.log(max(np.max(np.abs(np.linalg.eigvals(A))), 1.0))
+        if growth > 0:
+            chunk = int(min(chunk, max(1, MAX_CHUNK_GROWTH / growth)))
+
+    # Output rows C A^k of the free response and step response from rest over one chunk
+    free = np.empty((chunk, order))
+    forced = np.empty(chunk)
+    row = C.copy()
+    state = np.zeros(order)
+    for k in range(chunk):
+        free[k] = row
+        forced[k] = C @ state + D
+        row = row @ A
+        state = A @ state + B
+    transition = np.linalg.matrix_power(A, chunk) if order else A
+    step_state = state
+
+    response = np.empty(samples)
+    x = np.zeros(order)
+    with np.errstate(over='ignore', invalid='ignore'):
+        for start in range(0, samples, chunk):
+            stop = min(start + chunk, samples)
+            y = free[:stop - start] @ x + forced[:stop - start]
+            response[start:stop] = y
+            index = first_divergent_index(y, bound)
+            if index is not None:
+                return response[:start + index + 1], True
+            x = transition @ x + step_state
+    return response, False
@@ -0,0 +1,156 @@
+#Scientific imports
+import numpy as np
+
+
+class FrequencyResponseCache:
+    """
+    Plant and sensor frequency responses on a fixed grid, for loop shaping.
+
+    P(jω) and S(jω), delays included, are evaluated once per component and kept until
+    that component changes. A new set of PID gains only costs the elementwise product
+    with C(jω) = Kp + Ki/(jω) + Kd·jω, so open- and closed-loop Bode data follow every
+    gain change without touching the plant or the sensor again. Gains may be arrays to
+    evaluate a whole sweep at once.
+    """
+
+    def __init__(self, plant_object, sensor_object, omega, use_reduced_models=False):
+        """
+        Initialize the cache with the loop components and the frequency grid
+        Args:
+            plant_object (Plant): Plant model (with optional delay)
+            sensor_object (Sensor): Sensor model (with optional delay)
+            omega (np.ndarray): Frequencies in rad/s
+            use_reduced_models (bool): Use the reduced plant and sensor models when their reduction is enabled
+        Returns:
+            None
+        """
+        self.plant_object = plant_object
+        self.sensor_object = sensor_object
+        self.omega = np.asarray(omega, dtype=float)
+        self.s_values = 1j * self.omega
+        self.use_reduced_models = use_reduced_models
+        self.component_keys = {}
+        self.component_responses = {}
+
+    def _get_component_key(self, component):
+        """
+        Snapshot of every parameter the frequency response of a component depends on
+        Args:
+            component: Plant or Sensor object
+        Returns:
+            str: Key identifying the current component
+        """
+        tolerance = component.get_reduction_tolerance() if self.use_reduced_models else None
+        return repr((component.get_coefficients(), component.get_delay(), tolerance))
+
+    def _get_component_response(self, name, component):
+        """
+        Return the cached response of a component on the grid, re-evaluated only if the component changed
+        Args:
+            name (str): 'plant' or 'sensor'
+            component: Plant or Sensor object
+        Returns:
+            np.ndarray: Complex response including the delay factor
+        Raises:
+            ValueError: If the component is invalid
+        """
+        key = self._get_component_key(component)
+        if self.component_keys.get(name) != key:
+            system = component.get_reduced_state_space() if self.use_reduced_models else component.get_state_space()
+            if isinstance(system, str):
+                raise ValueError(system)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                response = np.asarray(system(self.s_values)).reshape(self.omega.shape)
+            self.component_responses[name] = response * np.exp(-self.s_values * component.get_delay())
+            self.component_keys[name] = key
+        return self.component_responses[name]
+
+    def get_frequency_grid(self):
+        """
+        Return the frequency grid
+        Args:
+            None
+        Returns:
+            np.ndarray: Frequencies in rad/s
+        """
+        return self.omega
+
+    def get_plant_response(self):
+        """
+        Return the plant response P(jω) on the grid, delay included
+        Args:
+            None
+        Returns:
+            np.ndarray: Complex plant response
+        """
+        return self._get_component_response("plant", self.plant_object)
+
+    def get_sensor_response(self):
+        """
+        Return the sensor response S(jω) on the grid, delay included
+        Args:
+            None
+        Returns:
+            np.ndarray: Complex sensor response
+        """
+        return self._get_component_response("sensor", self.sensor_object)
+
+    def get_pid_response(self, kp, ki, kd):
+        """
+        Evaluate C(jω) = Kp + Ki/(jω) + Kd·jω on the grid
+        Args:
+            kp (float or np.ndarray): Proportional gain(s)
+            ki (float or np.ndarray): Integral gain(s)
+            kd (float or np.ndarray): Derivative gain(s)
+        Returns:
+            np.ndarray: Complex PID response, shape (points,) or (gains, points) for arrays of gains
+        """
+        kp, ki, kd = (np.asarray(gain, dtype=float)[..., None] for gain in (kp, ki, kd))
+        return kp + ki / self.s_values + kd * self.s_values
+
+    def get_open_loop_response(self, kp, ki, kd):
+        """
+        Evaluate the loop L(jω) = C(jω) P(jω) S(jω) on the grid
+        Args:
+            kp (float or np.ndarray): Proportional gain(s)
+            ki (float or np.ndarray): Integral gain(s)
+            kd (float or np.ndarray): Derivative gain(s)
+        Returns:
+            np.ndarray: Complex loop response, shape (points,) or (gains, points)
+        """
+        return self.get_pid_response(kp, ki, kd) * self.get_plant_response() * self.get_sensor_response()
+
+    def get_closed_loop_response(self, kp, ki, kd):
+        """
+        Evaluate the closed loop C P / (1 + C P S) on the grid
+        Args:
+            kp (float or np.ndarray): Proportional gain(s)
+            ki (float or np.ndarray): Integral gain(s)
+            kd (float or np.ndarray): Derivative gain(s)
+        Returns:
+            np.ndarray: Complex closed-loop response, shape (points,) or (gains, points)
+        """
+        forward = self.get_pid_response(kp, ki, kd) * self.get_plant_response()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return forward / (1 + forward * self.get_sensor_response())
+
+    def get_bode_data(self, kp, ki, kd):
+        """
+        Magnitude and phase of the open and closed loops for a set of gains
+        Args:
+            kp (float or np.ndarray): Proportional gain(s)
+            ki (float or np.ndarray): Integral gain(s)
+            kd (float or np.ndarray): Derivative gain(s)
+        Returns:
+            dict: 'open_magnitude_db', 'open_phase_deg', 'closed_magnitude_db' and 'closed_phase_deg' arrays
+        """
+        forward = self.get_pid_response(kp, ki, kd) * self.get_plant_response()
+        loop = forward * self.get_sensor_response()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            closed = forward / (1 + loop)
+            return {
+                "open_magnitude_db": 20 * np.log10(np.abs(loop)),
+                "open_phase_deg": np.degrees(np.unwrap(np.angle(loop))),
+                "closed_magnitude_db": 20 * np.log10(np.abs(closed)),
+                "closed_phase_deg": np.degrees(np.unwrap(np.angle(closed)))
+            }
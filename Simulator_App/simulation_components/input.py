@@ -7,6 +7,7 @@ import math
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from utils.input_utils import must_be_nonnegative, must_be_positive, cannot_be_zero, must_be_negative
+from simulation_components.signal_generator import StepSignal, get_signal
 
 MIN_SAMPLES = 10
 MAX_SAMPLES = 10000
@@ -34,6 +35,10 @@ class Input:
         self.final_value_description = ("Final Value:\nThe value of the step input at the end of the simulation.\n")
         self.total_time_description = ("Total Time:\nThe total duration for which the step input is applied (seconds).\n")
         self.sample_time_description = ("Sample Time:\nThis parameter defines the sampling rate of the system and affects the accuracy of the response in simulations.")
+        self.signal_generator = None  # None means the step described above
+        self.signal_type_description = ("Signal Type:\n"
+                                   "Shape of the reference signal (Step, Ramp, Sine, Chirp, PRBS or File).\n"
+                                   "Non-step signals are simulated in the Reference Response plot.")
         self.input_component_description = ("Input Generator:\n"
                                    "Generates a signal for the control system simulation.\n"
                                    "The signal starts at an initial value, then jumps to a\n"
@@ -130,8 +135,77 @@ class Input:
             "initial_value": self.initial_value_description,
             "final_value": self.final_value_description,
             "total_time": self.total_time_description,
-            "sample_time": self.sample_time_description
+            "sample_time": self.sample_time_description,
+            "signal_type": self.signal_type_description
         }
+
+    def get_signal_type(self):
+        """
+        Get the type of the reference signal.
+        Args:
+            None
+        Returns:
+            str: Signal type name ("Step" by default)
+        """
+        return self.signal_generator.name if self.signal_generator else "Step"
+
+    def get_signal_generator(self):
+        """
+        Get the generator of the reference signal.
+        Args:
+            None
+        Returns:
+            SignalGenerator: Configured signal, a StepSignal built from the step parameters by default
+        """
+        if self.signal_generator is None:
+            return StepSignal(self.step_time, self.initial_value, self.final_value)
+        return self.signal_generator
+
+    def get_signal_parameters(self):
+        """
+        Get the reference signal type and parameters for saving.
+        Args:
+            None
+        Returns:
+            dict: Signal parameters plus a 'type' key
+        """
+        if self.signal_generator is None:
+            return {"type": "Step"}
+        return {"type": self.signal_generator.name, **self.signal_generator.get_parameters()}
+
+    def set_signal(self, signal_type, **kwargs):
+        """
+        Set the reference signal type and parameters.
+        Args:
+            signal_type (str): Name of the signal type
+            kwargs: Signal parameters (the step parameters of the input are used for "Step")
+        Returns:
+            error_log (str): Error messages if any validations fail, None otherwise
+        """
+        if signal_type == "Step":
+            self.signal_generator = None
+            return
+
+        try:
+            signal = get_signal(signal_type)
+        except ValueError as e:
+            return str(e)
+
+        signal.set_parameters(**{key: value for key, value in kwargs.items() if key in signal.get_parameters()})
+        error_log = signal.validate()
+        if error_log:
+            return error_log
+        self.signal_generator = signal
+
+    def generate_reference(self, t):
+        """
+        Evaluate the reference signal on a time grid.
+        Args:
+            t (np.ndarray): Sample times in seconds
+        Returns:
+            np.ndarray: Reference value at every sample time
+        """
+        return self.get_signal_generator().generate(t)
     
     def get_component_description(self):
         """
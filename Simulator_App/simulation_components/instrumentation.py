@@ -0,0 +1,236 @@
+# Standard library imports
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+# Setting this environment variable to a file path enables tracing and writes the trace there at exit
+TRACE_ENV_VARIABLE = "SIMULATOR_TRACE"
+
+# Spans kept in memory for the trace file, the oldest ones are dropped first
+MAX_SPANS = 100000
+
+_enabled = False
+_spans = deque(maxlen=MAX_SPANS)
+_local = threading.local()
+_origin = time.perf_counter()
+
+
+class _Span:
+    """
+    Timed stage, recorded when it ends. The time of nested spans is subtracted from the
+    parent's self time, so the cost of every stage is separated from the stages it calls.
+    """
+    __slots__ = ("name", "start", "children")
+
+    def __init__(self, name):
+        """
+        Initialize the span
+        Args:
+            name (str): Stage name
+        Returns:
+            None
+        """
+        self.name = name
+        self.children = 0.0
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end = time.perf_counter()
+        stack = _local.stack
+        stack.pop()
+        duration = end - self.start
+        if stack:
+            stack[-1].children += duration
+        record = {"name": self.name, "start": self.start - _origin, "duration": duration,
+                  "self": duration - self.children, "depth": len(stack), "thread": threading.get_ident()}
+        _spans.append(record)
+        for collector in getattr(_local, "collectors", ()):
+            collector.append(record)
+        return False
+
+
+class _NullSpan:
+    """
+    Span used while tracing is disabled: entering and leaving it does nothing.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name):
+    """
+    Context manager timing a stage, free when tracing is disabled
+    Args:
+        name (str): Stage name
+    Returns:
+        Context manager
+    """
+    return _Span(name) if _enabled else _NULL_SPAN
+
+
+def traced(name):
+    """
+    Decorator timing every call of a function as a span
+    Args:
+        name (str): Stage name
+    Returns:
+        Decorator
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class capture:
+    """
+    Collect the spans that end in the current thread while the block runs
+    (used by the profiler overlay to show the stages of the last plot).
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty collection
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.spans = []
+
+    def __enter__(self):
+        collectors = getattr(_local, "collectors", None)
+        if collectors is None:
+            collectors = _local.collectors = []
+        collectors.append(self.spans)
+        return self.spans
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _local.collectors.remove(self.spans)
+        return False
+
+
+def enable(enabled=True):
+    """
+    Turn tracing on or off
+    Args:
+        enabled (bool): True to record spans
+    Returns:
+        None
+    """
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def is_enabled():
+    """
+    Check whether spans are recorded
+    Args:
+        None
+    Returns:
+        bool: True if tracing is on
+    """
+    return _enabled
+
+
+def clear():
+    """
+    Drop every recorded span
+    Args:
+        None
+    Returns:
+        None
+    """
+    _spans.clear()
+
+
+def get_spans():
+    """
+    Return the recorded spans, oldest first
+    Args:
+        None
+    Returns:
+        list: Dicts with 'name', 'start' and 'duration' (s), 'self' (s, without nested spans), 'depth' and 'thread'
+    """
+    return list(_spans)
+
+
+def get_summary(spans=None):
+    """
+    Aggregate spans by stage name, the most expensive stage first
+    Args:
+        spans (list or None): Spans to aggregate, every recorded span if None
+    Returns:
+        dict: Stage name -> dict with 'calls', 'total', 'self' and 'max' (s)
+    """
+    summary = {}
+    for record in (get_spans() if spans is None else spans):
+        entry = summary.setdefault(record["name"], {"calls": 0, "total": 0.0, "self": 0.0, "max": 0.0})
+        entry["calls"] += 1
+        entry["total"] += record["duration"]
+        entry["self"] += record["self"]
+        entry["max"] = max(entry["max"], record["duration"])
+    return dict(sorted(summary.items(), key=lambda item: item[1]["self"], reverse=True))
+
+
+def format_spans(spans):
+    """
+    Format spans as an indented call tree with their total and self times
+    Args:
+        spans (list): Spans in the order they ended
+    Returns:
+        str: One line per span
+    """
+    lines = []
+    for record in sorted(spans, key=lambda record: record["start"]):
+        lines.append(f"{'  ' * record['depth']}{record['name']}: {1000 * record['duration']:.1f} ms "
+                     f"(self {1000 * record['self']:.1f} ms)")
+    return "\n".join(lines)
+
+
+def dump_trace(file_path, spans=None):
+    """
+    Write spans in the Chrome trace event format (open it in chrome://tracing or Perfetto)
+    Args:
+        file_path (str): Path of the JSON trace file
+        spans (list or None): Spans to write, every recorded span if None
+    Returns:
+        error_log (str): Error message if the file cannot be written, None otherwise
+    """
+    events = [{"name": record["name"], "ph": "X", "ts": 1e6 * record["start"], "dur": 1e6 * record["duration"],
+               "pid": os.getpid(), "tid": record["thread"], "args": {"self_ms": 1000 * record["self"]}}
+              for record in (get_spans() if spans is None else spans)]
+    try:
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    except OSError as e:
+        return f"Error: Could not write the trace file: {e}"
+
+
+if os.environ.get(TRACE_ENV_VARIABLE):
+    enable()
+    atexit.register(dump_trace, os.environ[TRACE_ENV_VARIABLE])
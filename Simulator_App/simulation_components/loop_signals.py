@@ -0,0 +1,79 @@
+#Scientific imports
+import control as ctrl
+import numpy as np
+
+# Rows of the augmented closed loop, in order
+LOOP_SIGNALS = ("output", "control", "error", "sensor")
+
+
+def _component_matrices(system):
+    """
+    Matrices of a SISO state-space component as float arrays
+    Args:
+        system (ctrl.StateSpace): Plant or sensor realization
+    Returns:
+        tuple: (A, B, C, D) with B a column, C a row and D a float
+    """
+    A = np.asarray(system.A, dtype=float)
+    order = A.shape[0]
+    B = np.asarray(system.B, dtype=float).reshape(order, 1)
+    C = np.asarray(system.C, dtype=float).reshape(1, order)
+    return A, B, C, float(np.asarray(system.D, dtype=float).ravel()[0])
+
+
+def loop_signals_state_space(kp, ki, kd, plant_ss, sensor_ss):
+    """
+    Realize the PID / plant / sensor loop with the reference as input and every loop signal as output.
+
+    The physical plant and sensor states are kept (unlike the series realization, where the PID is
+    moved behind the plant), so the control effort u is an output. With the ideal derivative the
+    error derivative is taken from the states: between reference jumps e' = -m' = -C_m (A x + B u),
+    which needs a strictly proper plant * sensor path. A reference jump of height 1 adds an impulse
+    of area kd / (1 + kd C_m B) to u, applied here as a jump of the plant and sensor states.
+    Args:
+        kp (float): Proportional gain
+        ki (float): Integral gain
+        kd (float): Derivative gain
+        plant_ss (ctrl.StateSpace): Plant realization
+        sensor_ss (ctrl.StateSpace): Sensor realization
+    Returns:
+        tuple: (system, jump, control_impulse) where system is the ctrl.StateSpace with the rows of
+               LOOP_SIGNALS as outputs, jump the state jump and control_impulse the impulse area in u
+               caused by a unit reference jump
+    Raises:
+        ValueError: If the derivative acts on a biproper plant * sensor path (improper control effort)
+    """
+    Ap, Bp, Cp, Dp = _component_matrices(plant_ss)
+    As, Bs, Cs, Ds = _component_matrices(sensor_ss)
+    n_plant, n_sensor = Ap.shape[0], As.shape[0]
+
+    # Plant followed by the sensor: states x = [plant; sensor], input u, outputs y and m
+    A = np.block([[Ap, np.zeros((n_plant, n_sensor))], [Bs @ Cp, As]])
+    B = np.vstack((Bp, Bs * Dp))
+    Cy = np.hstack((Cp, np.zeros((1, n_sensor))))
+    Cm = np.hstack((Ds * Cp, Cs))
+    Dm = Ds * Dp
+    if kd != 0 and Dm != 0:
+        raise ValueError("Error: The derivative of a biproper plant * sensor path has no proper control effort.")
+
+    # u = kp e + ki xi + kd e' solved for u: u = Kx x + Ki xi + Kr r
+    gain = 1.0 / (1.0 + kp * Dm + kd * (Cm @ B)[0, 0])
+    Kx = -gain * (kp * Cm + kd * Cm @ A)
+    Kr = gain * kp
+    Ki = np.array([[gain * ki]]) if ki != 0 else np.zeros((1, 0))
+    n_integral = Ki.shape[1]
+
+    # Closed loop on X = [x; xi], the integrator of the error is only kept with integral action
+    Cx = np.hstack((np.eye(A.shape[0]), np.zeros((A.shape[0], n_integral))))
+    Cu = np.hstack((Kx, Ki))
+    C_sensor = Cm @ Cx + Dm * Cu
+    A_loop = np.vstack((A @ Cx + B @ Cu, -C_sensor[:n_integral]))
+    B_loop = np.vstack((B * Kr, np.full((n_integral, 1), 1.0 - Dm * Kr)))
+
+    # Outputs y, u, e = r - m, m
+    C_loop = np.vstack((Cy @ Cx + Dp * Cu, Cu, -C_sensor, C_sensor))
+    D_loop = np.array([[Dp * Kr], [Kr], [1.0 - Dm * Kr], [Dm * Kr]])
+
+    control_impulse = gain * kd
+    jump = np.concatenate((B[:, 0] * control_impulse, np.zeros(n_integral)))
+    return ctrl.ss(A_loop, B_loop, C_loop, D_loop), jump, control_impulse
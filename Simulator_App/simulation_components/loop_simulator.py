@@ -0,0 +1,382 @@
+#Scientific imports
+import control as ctrl
+import numpy as np
+from scipy.linalg import eigvals
+from scipy.signal import sosfilt, zpk2sos
+
+
+def discretize(sys, sample_time):
+    """
+    Zero-order hold discretization of a SISO system
+    Args:
+        sys (ctrl.StateSpace or ctrl.TransferFunction): Continuous system
+        sample_time (float): Sample time in seconds
+    Returns:
+        tuple: (A, B, C, D) with B and C as 1-D arrays and D as float
+    """
+    sys_d = ctrl.c2d(ctrl.ss(sys), sample_time, method='zoh')
+    A = np.asarray(sys_d.A, dtype=float)
+    B = np.asarray(sys_d.B, dtype=float)[:, 0]
+    C = np.asarray(sys_d.C, dtype=float)[0]
+    D = float(np.asarray(sys_d.D)[0, 0])
+    return A, B, C, D
+
+
+class DelayLine:
+    """
+    Circular buffer delaying a scalar signal by a whole number of samples.
+    """
+
+    def __init__(self, delay_samples, initial_value=0.0):
+        """
+        Initialize the delay line
+        Args:
+            delay_samples (int): Number of samples the signal is delayed by
+            initial_value (float): Value returned before the line is filled
+        Returns:
+            None
+        """
+        self.delay_samples = int(delay_samples)
+        self.buffer = np.full(max(self.delay_samples, 1), float(initial_value))
+        self.index = 0
+
+    def read(self):
+        """
+        Return the value pushed delay_samples pushes ago
+        Args:
+            None
+        Returns:
+            float: Delayed value
+        """
+        return self.buffer[self.index]
+
+    def push(self, value):
+        """
+        Store the newest value, overwriting the oldest one
+        Args:
+            value (float): Current value of the signal
+        Returns:
+            None
+        """
+        self.buffer[self.index] = value
+        self.index = (self.index + 1) % len(self.buffer)
+
+
+class LoopSimulator:
+    """
+    Sample-by-sample simulation of the PID / plant / sensor loop.
+
+    Plant and sensor are discretized with a zero-order hold at the sample time
+    and their transport delays are applied with exact delay lines, so the
+    state dimension does not grow with the delay (no Pade approximation).
+    """
+
+    def __init__(self, pid_object, plant_object, sensor_object, sample_time):
+        """
+        Discretize the loop components
+        Args:
+            pid_object (ControllerPID): PID controller
+            plant_object (Plant): Plant model (with optional delay)
+            sensor_object (Sensor): Sensor model (with optional delay)
+            sample_time (float): Simulation step in seconds
+        Returns:
+            None
+        Raises:
+            ValueError: If the plant or sensor transfer function is invalid
+        """
+        plant_ss = plant_object.get_state_space()
+        if isinstance(plant_ss, str):
+            raise ValueError(plant_ss)
+        sensor_ss = sensor_object.get_state_space()
+        if isinstance(sensor_ss, str):
+            raise ValueError(sensor_ss)
+
+        self.sample_time = sample_time
+        pid = pid_object.get_parameters()
+        self.kp, self.ki, self.kd = pid["kp"], pid["ki"], pid["kd"]
+
+        self.plant_matrices = discretize(plant_ss, sample_time)
+        self.sensor_matrices = discretize(sensor_ss, sample_time)
+        self.plant_delay_samples = int(round(plant_object.get_delay() / sample_time))
+        self.sensor_delay_samples = int(round(sensor_object.get_delay() / sample_time))
+
+    def simulate(self, reference, divergence_bound=None):
+        """
+        Simulate the loop for the given reference samples, starting at rest
+        Args:
+            reference (np.ndarray): Reference value at every sample
+            divergence_bound (float): Stop once the output magnitude exceeds this value, never if None
+        Returns:
+            np.ndarray: Plant output at every sample, up to the first one beyond the divergence bound
+        """
+        return self.simulate_signals(reference, divergence_bound)["output"]
+
+    def simulate_signals(self, reference, divergence_bound=None):
+        """
+        Simulate the loop for the given reference samples, starting at rest, recording every loop signal
+        Args:
+            reference (np.ndarray): Reference value at every sample
+            divergence_bound (float): Stop once the output magnitude exceeds this value, never if None
+        Returns:
+            dict: 'output', 'control', 'error' and 'sensor' arrays, up to the first sample beyond the divergence bound
+        """
+        dt = self.sample_time
+        Ap, Bp, Cp, Dp = self.plant_matrices
+        As, Bs, Cs, Ds = self.sensor_matrices
+        Np, Ns = self.plant_delay_samples, self.sensor_delay_samples
+
+        # Backward-difference PID: u = u_past + gain * e
+        gain = self.kp + self.ki * dt + self.kd / dt
+
+        plant_line = DelayLine(Np)
+        sensor_line = DelayLine(Ns)
+        xp = np.zeros(Ap.shape[0])
+        xs = np.zeros(As.shape[0])
+        integral = 0.0
+        previous_error = 0.0
+
+        reference = np.asarray(reference, dtype=float)
+        y = np.empty_like(reference)
+        control = np.empty_like(reference)
+        errors = np.empty_like(reference)
+
+        for k, r in enumerate(reference):
+            u_past = self.ki * integral - self.kd * previous_error / dt
+            yp_free = Cp @ xp
+            ys_free = Cs @ xs
+
+            if Np == 0 and Ns == 0:
+                # Direct feedthrough around the loop: solve the algebraic loop
+                error = (r - ys_free - Ds * (yp_free + Dp * u_past)) / (1.0 + Ds * Dp * gain)
+                u = u_past + gain * error
+                plant_input = u
+                output = yp_free + Dp * plant_input
+                sensor_input = output
+            elif Ns > 0:
+                sensor_input = sensor_line.read()
+                error = r - (ys_free + Ds * sensor_input)
+                u = u_past + gain * error
+                plant_input = plant_line.read() if Np > 0 else u
+                output = yp_free + Dp * plant_input
+            else:
+                plant_input = plant_line.read()
+                output = yp_free + Dp * plant_input
+                sensor_input = output
+                error = r - (ys_free + Ds * sensor_input)
+                u = u_past + gain * error
+
+            y[k] = output
+            control[k] = u
+            errors[k] = error
+            if divergence_bound is not None and not abs(output) <= divergence_bound:
+                return self._signals(reference, y, control, errors, k + 1)
+            plant_line.push(u)
+            sensor_line.push(output)
+
+            xp = Ap @ xp + Bp * plant_input
+            xs = As @ xs + Bs * sensor_input
+            integral += error * dt
+            previous_error = error
+
+        return self._signals(reference, y, control, errors, len(reference))
+
+    def _signals(self, reference, y, control, errors, samples):
+        """
+        Package the recorded samples of a simulation
+        Args:
+            reference (np.ndarray): Reference samples
+            y (np.ndarray): Plant output samples
+            control (np.ndarray): PID output samples
+            errors (np.ndarray): Error samples
+            samples (int): Number of samples simulated
+        Returns:
+            dict: 'output', 'control', 'error' and 'sensor' arrays of length samples
+        """
+        return {"output": y[:samples], "control": control[:samples], "error": errors[:samples],
+                "sensor": reference[:samples] - errors[:samples]}
+
+
+
+class DiscreteLoopModel:
+    """
+    Fast recomputation of the discrete loop when only the PID gains change.
+
+    The plant and the sensor are discretized once and their delays become shift
+    register states. A gain update only rebuilds the closed-loop state matrix,
+    takes its poles and zeros and filters the reference with second-order
+    sections (scipy.signal.sosfilt), which stays accurate when the poles cluster
+    near z = 1 at small sample times. The result matches LoopSimulator.
+    """
+
+    # Point where the closed loop is evaluated to recover its gain
+    GAIN_EVALUATION_POINT = -1.5
+
+    def __init__(self, plant_object, sensor_object, sample_time, use_reduced_models=False):
+        """
+        Discretize the plant and the sensor
+        Args:
+            plant_object (Plant): Plant model (with optional delay)
+            sensor_object (Sensor): Sensor model (with optional delay)
+            sample_time (float): Simulation step in seconds
+            use_reduced_models (bool): Use the reduced plant and sensor models when their reduction is enabled
+        Returns:
+            None
+        Raises:
+            ValueError: If the plant or sensor transfer function is invalid
+        """
+        if use_reduced_models:
+            plant_ss = plant_object.get_reduced_state_space()
+            sensor_ss = sensor_object.get_reduced_state_space()
+        else:
+            plant_ss = plant_object.get_state_space()
+            sensor_ss = sensor_object.get_state_space()
+        if isinstance(plant_ss, str):
+            raise ValueError(plant_ss)
+        if isinstance(sensor_ss, str):
+            raise ValueError(sensor_ss)
+
+        self.sample_time = sample_time
+        self.plant_matrices = discretize(plant_ss, sample_time)
+        self.sensor_matrices = discretize(sensor_ss, sample_time)
+        self.plant_delay_samples = int(round(plant_object.get_delay() / sample_time))
+        self.sensor_delay_samples = int(round(sensor_object.get_delay() / sample_time))
+
+    def get_closed_loop_state_space(self, kp, ki, kd):
+        """
+        Closed-loop state space from the reference to the plant output
+        Args:
+            kp (float): Proportional gain
+            ki (float): Integral gain
+            kd (float): Derivative gain
+        Returns:
+            tuple: (A, B, C, D) with B and C as 1-D arrays and D as float
+        """
+        dt = self.sample_time
+        Ap, Bp, Cp, Dp = self.plant_matrices
+        As, Bs, Cs, Ds = self.sensor_matrices
+        Np, Ns = self.plant_delay_samples, self.sensor_delay_samples
+        n_p, n_s = len(Ap), len(As)
+
+        # State: plant, sensor, plant delay line (oldest first), sensor delay line, integral, previous error
+        xp, xs = slice(0, n_p), slice(n_p, n_p + n_s)
+        dp = slice(n_p + n_s, n_p + n_s + Np)
+        ds = slice(dp.stop, dp.stop + Ns)
+        integral, previous_error = ds.stop, ds.stop + 1
+        size = ds.stop + 2
+
+        # Loop signals q = [v, y, w, m, e, u] solve q = M q + N x + R r
+        V, Y, W, M_, E, U = range(6)
+        M = np.zeros((6, 6))
+        N = np.zeros((6, size))
+        R = np.zeros(6)
+        if Np:
+            N[V, dp.start] = 1.0
+        else:
+            M[V, U] = 1.0
+        N[Y, xp] = Cp
+        M[Y, V] = Dp
+        if Ns:
+            N[W, ds.start] = 1.0
+        else:
+            M[W, Y] = 1.0
+        N[M_, xs] = Cs
+        M[M_, W] = Ds
+        R[E] = 1.0
+        M[E, M_] = -1.0
+        # Backward-difference PID, as in LoopSimulator
+        M[U, E] = kp + ki * dt + kd / dt
+        N[U, integral] = ki
+        N[U, previous_error] = -kd / dt
+
+        solve = np.linalg.inv(np.eye(6) - M)
+        QX = solve @ N
+        QR = solve @ R
+
+        A = np.zeros((size, size))
+        B = np.zeros(size)
+        A[xp, xp] = Ap
+        A[xp] += np.outer(Bp, QX[V])
+        B[xp] = Bp * QR[V]
+        A[xs, xs] = As
+        A[xs] += np.outer(Bs, QX[W])
+        B[xs] = Bs * QR[W]
+        if Np:
+            A[dp.start:dp.stop - 1, dp.start + 1:dp.stop] += np.eye(Np - 1)
+            A[dp.stop - 1] += QX[U]
+            B[dp.stop - 1] = QR[U]
+        if Ns:
+            A[ds.start:ds.stop - 1, ds.start + 1:ds.stop] += np.eye(Ns - 1)
+            A[ds.stop - 1] += QX[Y]
+            B[ds.stop - 1] = QR[Y]
+        A[integral] += QX[E] * dt
+        A[integral, integral] += 1.0
+        B[integral] = QR[E] * dt
+        A[previous_error] += QX[E]
+        B[previous_error] = QR[E]
+        return A, B, QX[Y], float(QR[Y])
+
+    def get_closed_loop_poles(self, kp, ki, kd):
+        """
+        Closed-loop poles in the z domain that reach the output. With ki = 0 the integral state
+        is never read, its pole at z = 1 is unobservable and left out.
+        Args:
+            kp (float): Proportional gain
+            ki (float): Integral gain
+            kd (float): Derivative gain
+        Returns:
+            np.ndarray: Complex poles
+        """
+        A = self.get_closed_loop_state_space(kp, ki, kd)[0]
+        if ki == 0:
+            # The integral state sits just before the previous error, at the end of the state
+            keep = np.delete(np.arange(len(A)), len(A) - 2)
+            A = A[np.ix_(keep, keep)]
+        return np.linalg.eigvals(A)
+
+    def get_closed_loop_zpk(self, kp, ki, kd):
+        """
+        Closed-loop zeros, poles and gain in the z domain
+        Args:
+            kp (float): Proportional gain
+            ki (float): Integral gain
+            kd (float): Derivative gain
+        Returns:
+            tuple: (zeros, poles, gain)
+        """
+        A, B, C, D = self.get_closed_loop_state_space(kp, ki, kd)
+        size = len(A)
+        poles = np.linalg.eigvals(A)
+
+        # Invariant zeros: finite generalized eigenvalues of the system pencil
+        pencil = np.block([[A, B[:, None]], [C[None, :], np.array([[D]])]])
+        identity = np.zeros((size + 1, size + 1))
+        identity[:size, :size] = np.eye(size)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            zeros = eigvals(pencil, identity)
+        zeros = zeros[np.isfinite(zeros) & (np.abs(zeros) < 1e8)]
+
+        z0 = self.GAIN_EVALUATION_POINT
+        value = C @ np.linalg.solve(z0 * np.eye(size) - A, B) + D
+        gain = value * np.prod(z0 - poles) / np.prod(z0 - zeros)
+        return zeros, poles, float(np.real(gain))
+
+    def simulate(self, kp, ki, kd, reference):
+        """
+        Simulate the loop for the given gains and reference samples, starting at rest
+        Args:
+            kp (float): Proportional gain
+            ki (float): Integral gain
+            kd (float): Derivative gain
+            reference (np.ndarray): Reference value at every sample
+        Returns:
+            np.ndarray: Plant output at every sample
+        """
+        zeros, poles, gain = self.get_closed_loop_zpk(kp, ki, kd)
+        reference = np.asarray(reference, dtype=float)
+        with np.errstate(over='ignore', invalid='ignore'):
+            response = sosfilt(zpk2sos(zeros, poles, gain), reference)
+        # zpk2sos pads the missing zeros at the origin: restore the relative degree as a delay
+        relative_degree = min(len(poles) - len(zeros), len(reference))
+        if relative_degree > 0:
+            response = np.concatenate((np.zeros(relative_degree), response[:-relative_degree]))
+        return response
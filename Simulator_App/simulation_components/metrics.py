@@ -0,0 +1,138 @@
+#Scientific imports
+import numpy as np
+
+# Band (fraction of the step amplitude) used for the settling time
+SETTLING_BAND = 0.02
+
+# Fractions of the step amplitude delimiting the rise time
+RISE_LOW = 0.1
+RISE_HIGH = 0.9
+
+STEP_METRIC_DESCRIPTIONS = {
+    'overshoot': 'Overshoot (%)',
+    'rise_time': 'Rise time 10-90% (s)',
+    'settling_time': 'Settling time 2% (s)',
+    'steady_state_error': 'Steady-state error',
+    'peak_value': 'Peak value'
+}
+
+
+def _first_index(mask):
+    """
+    Index of the first True value of every row
+    Args:
+        mask (np.ndarray): Boolean array of shape (batch, samples)
+    Returns:
+        tuple: (index, found) arrays of shape (batch,)
+    """
+    found = mask.any(axis=1)
+    return np.argmax(mask, axis=1), found
+
+
+def compute_step_metrics(t, responses, step_time, initial_value, final_value, settling_band=SETTLING_BAND):
+    """
+    Compute the classic step response metrics for a batch of responses at once
+    Args:
+        t (np.ndarray): Time vector of shape (samples,)
+        responses (np.ndarray): Responses of shape (samples,) or (batch, samples)
+        step_time (float): Time at which the step is applied
+        initial_value (float): Reference value before the step
+        final_value (float): Reference value after the step
+        settling_band (float): Settling band as a fraction of the step amplitude
+    Returns:
+        dict: Metric name -> np.ndarray of shape (batch,), NaN where a metric is not defined
+    """
+    t = np.asarray(t, dtype=float)
+    responses = np.atleast_2d(np.asarray(responses, dtype=float))
+    batch = responses.shape[0]
+
+    after_step = t >= step_time
+    y = responses[:, after_step]
+    t_step = t[after_step] - step_time
+    if y.shape[1] == 0:
+        nan = np.full(batch, np.nan)
+        return {name: nan.copy() for name in STEP_METRIC_DESCRIPTIONS}
+
+    y_start = responses[:, np.argmax(after_step) - 1] if np.argmax(after_step) > 0 else np.full(batch, initial_value)
+    y_final = y[:, -1]
+    amplitude = y_final - y_start
+    direction = np.where(amplitude >= 0, 1.0, -1.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        normalized = (y - y_start[:, None]) / amplitude[:, None]
+
+        # Overshoot relative to the final value, in the direction of the step
+        peak = np.where(direction > 0, y.max(axis=1), y.min(axis=1))
+        overshoot = np.maximum(0.0, (peak - y_final) / np.abs(amplitude) * direction * 100.0)
+
+        low_index, low_found = _first_index(normalized >= RISE_LOW)
+        high_index, high_found = _first_index(normalized >= RISE_HIGH)
+        rise_time = np.where(low_found & high_found, t_step[high_index] - t_step[low_index], np.nan)
+
+        # Last sample outside the band: the response is settled from the next one
+        outside = np.abs(y - y_final[:, None]) > settling_band * np.abs(amplitude)[:, None]
+        last_outside = y.shape[1] - 1 - np.argmax(outside[:, ::-1], axis=1)
+        settled_index = np.minimum(last_outside + 1, y.shape[1] - 1)
+        settling_time = np.where(outside.any(axis=1), t_step[settled_index], 0.0)
+
+    degenerate = ~np.isfinite(amplitude) | (amplitude == 0)
+    overshoot[degenerate] = np.nan
+    rise_time[degenerate] = np.nan
+    settling_time[degenerate] = np.nan
+
+    return {
+        'overshoot': overshoot,
+        'rise_time': rise_time,
+        'settling_time': settling_time,
+        'steady_state_error': final_value - y_final,
+        'peak_value': peak
+    }
+
+
+LOOP_SIGNAL_METRIC_DESCRIPTIONS = {
+    'peak_control': 'Peak control effort |u|',
+    'rms_control': 'RMS control effort',
+    'control_impulse': 'Derivative kick (impulse area of u)',
+    'peak_error': 'Peak error |e|',
+    'iae': 'Integral of absolute error',
+    'ise': 'Integral of squared error'
+}
+
+
+def compute_loop_signal_metrics(t, control, error, step_time, control_impulse=0.0):
+    """
+    Compute the control effort and error metrics of a batch of loop simulations at once
+    Args:
+        t (np.ndarray): Time vector of shape (samples,)
+        control (np.ndarray): Control signals u of shape (samples,) or (batch, samples)
+        error (np.ndarray): Error signals e of the same shape
+        step_time (float): Time at which the step is applied, the RMS is taken from it on
+        control_impulse (float): Area of the impulse in u at the step (ideal derivative on the error), not in the samples
+    Returns:
+        dict: Metric name -> np.ndarray of shape (batch,), NaN where a metric is not defined
+    """
+    t = np.asarray(t, dtype=float)
+    control = np.atleast_2d(np.asarray(control, dtype=float))
+    error = np.atleast_2d(np.asarray(error, dtype=float))
+    batch = control.shape[0]
+
+    after_step = t >= step_time
+    if np.count_nonzero(after_step) < 2:
+        nan = np.full(batch, np.nan)
+        return {name: nan.copy() for name in LOOP_SIGNAL_METRIC_DESCRIPTIONS}
+
+    t_step = t[after_step]
+    duration = t_step[-1] - t_step[0]
+    with np.errstate(over='ignore', invalid='ignore'):
+        rms_control = np.sqrt(np.trapezoid(control[:, after_step] ** 2, t_step, axis=1) / duration)
+        iae = np.trapezoid(np.abs(error), t, axis=1)
+        ise = np.trapezoid(error ** 2, t, axis=1)
+
+    return {
+        'peak_control': np.max(np.abs(control), axis=1),
+        'rms_control': rms_control,
+        'control_impulse': np.full(batch, float(control_impulse)),
+        'peak_error': np.max(np.abs(error), axis=1),
+        'iae': iae,
+        'ise': ise
+    }
@@ -0,0 +1,134 @@
+#Scientific imports
+import math
+import control as ctrl
+import numpy as np
+from scipy.signal import residue
+
+# Poles closer than this (relative to their magnitude) are merged into a repeated pole,
+# root finding splits a pole of multiplicity m by about eps^(1/m)
+REPEATED_POLE_TOLERANCE = 1e-3
+
+# Times evaluated at once, bounds the size of the (times, terms) exponential matrix
+EVALUATION_CHUNK = 65536
+
+
+def _partial_fractions(numerator, denominator):
+    """
+    Partial-fraction expansion of a strictly proper or biproper rational function
+    Args:
+        numerator (np.ndarray): Numerator coefficients, highest power first
+        denominator (np.ndarray): Denominator coefficients, highest power first
+    Returns:
+        tuple: (residues, poles, powers, direct) where the expansion is
+               sum residues[i] / (s - poles[i]) ** (powers[i] + 1) + direct
+    """
+    roots = np.roots(denominator)
+    scale = max(np.max(np.abs(roots)), 1.0) if roots.size else 1.0
+    residues, poles, direct = residue(numerator, denominator, tol=REPEATED_POLE_TOLERANCE * scale)
+
+    # Repeated poles are listed consecutively with increasing powers
+    powers = np.zeros(len(poles), dtype=int)
+    for i in range(1, len(poles)):
+        if poles[i] == poles[i - 1]:
+            powers[i] = powers[i - 1] + 1
+    direct = float(np.real(direct[0])) if len(direct) else 0.0
+    return np.asarray(residues, dtype=complex), np.asarray(poles, dtype=complex), powers, direct
+
+
+def _evaluate_terms(terms, t):
+    """
+    Inverse Laplace transform of a partial-fraction expansion at arbitrary times
+    Args:
+        terms (tuple): (residues, poles, powers, direct) from _partial_fractions
+        t (np.ndarray): Times in seconds, non-negative
+    Returns:
+        np.ndarray: Sum of residues[i] t^powers[i] / powers[i]! e^(poles[i] t) at every time
+    """
+    residues, poles, powers, _ = terms
+    t = np.asarray(t, dtype=float)
+    flat = t.ravel()
+    values = np.empty(flat.shape)
+    coefficients = residues / np.array([math.factorial(power) for power in powers])
+    with np.errstate(over='ignore', invalid='ignore'):
+        for start in range(0, flat.size, EVALUATION_CHUNK):
+            times = flat[start:start + EVALUATION_CHUNK, None]
+            modes = np.exp(times * poles) * times ** powers
+            values[start:start + EVALUATION_CHUNK] = np.real(modes @ coefficients)
+    return values.reshape(t.shape)
+
+
+class ModalResponse:
+    """
+    Closed-form step and impulse responses of a rational SISO system.
+
+    The system is expanded once into partial fractions (residues over its poles, with
+    repeated poles giving t^k e^(pt) terms). Responses are then evaluated exactly at any
+    set of times with one vectorized sum, so a single time point or a fine grid around
+    the step costs no simulation.
+    """
+
+    def __init__(self, system):
+        """
+        Expand the system into partial fractions
+        Args:
+            system (ctrl.StateSpace or ctrl.TransferFunction): Continuous SISO system
+        Returns:
+            None
+        Raises:
+            ValueError: If the system is improper
+        """
+        tf = ctrl.tf(system)
+        numerator = np.trim_zeros(np.atleast_1d(np.asarray(tf.num[0][0], dtype=float)), 'f')
+        denominator = np.trim_zeros(np.atleast_1d(np.asarray(tf.den[0][0], dtype=float)), 'f')
+        if not numerator.size:
+            numerator = np.zeros(1)
+        if len(numerator) > len(denominator):
+            raise ValueError("Error: The system is improper and has no closed-form time response.")
+
+        # G(s) for the impulse response, G(s)/s for the step response
+        self.impulse_terms = _partial_fractions(numerator, denominator)
+        self.step_terms = _partial_fractions(numerator, np.polymul(denominator, [1.0, 0.0]))
+
+    def get_poles(self):
+        """
+        Return the distinct poles of the system with their multiplicity
+        Args:
+            None
+        Returns:
+            tuple: (poles, multiplicities) numpy arrays
+        """
+        _, poles, powers, _ = self.impulse_terms
+        last = np.append(powers[1:] == 0, True)
+        return poles[last], powers[last] + 1
+
+    def get_direct_term(self):
+        """
+        Feedthrough of the system, the weight of the impulse at t = 0 in the impulse response
+        Args:
+            None
+        Returns:
+            float: Direct term
+        """
+        return self.impulse_terms[3]
+
+    def step(self, t):
+        """
+        Unit step response at arbitrary times
+        Args:
+            t (np.ndarray): Times since the step in seconds, the response is 0 before it
+        Returns:
+            np.ndarray: Response at every time
+        """
+        t = np.asarray(t, dtype=float)
+        return np.where(t >= 0, _evaluate_terms(self.step_terms, np.maximum(t, 0.0)), 0.0)
+
+    def impulse(self, t):
+        """
+        Unit impulse response at arbitrary times, without the impulse of the direct term at t = 0
+        Args:
+            t (np.ndarray): Times since the impulse in seconds, the response is 0 before it
+        Returns:
+            np.ndarray: Response at every time
+        """
+        t = np.asarray(t, dtype=float)
+        return np.where(t >= 0, _evaluate_terms(self.impulse_terms, np.maximum(t, 0.0)), 0.0)
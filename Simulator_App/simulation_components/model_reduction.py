@@ -0,0 +1,184 @@
+#Scientific imports
+import numpy as np
+import control as ctrl
+from scipy.linalg import schur, solve_sylvester, solve_continuous_lyapunov, matrix_balance, eigh, svd, solve
+
+# Local application imports
+from .realization import coefficients_to_zpk, zpk_to_state_space
+
+REDUCTION_METHODS = ["matchdc", "truncate"]
+
+REDUCTION_METHOD_DESCRIPTIONS = {
+    "matchdc": "Match DC gain: singular perturbation of the balanced model, the steady state is kept exactly",
+    "truncate": "Truncate: plain balanced truncation, the high frequency behaviour is kept exactly"
+}
+
+# Poles with a real part above -UNSTABLE_TOLERANCE * ||A|| are kept unreduced (unstable and integrators)
+UNSTABLE_TOLERANCE = 1e-9
+
+# Hankel singular values below MINIMAL_TOLERANCE * sigma_1 belong to non-minimal states and are always removed
+MINIMAL_TOLERANCE = 1e-12
+
+
+def _gramian_factor(gramian):
+    """
+    Square root factor L of a symmetric positive semidefinite gramian, with gramian = L L^T
+    Args:
+        gramian (np.ndarray): Controllability or observability gramian
+    Returns:
+        np.ndarray: Factor L
+    """
+    values, vectors = eigh(0.5 * (gramian + gramian.T))
+    return vectors * np.sqrt(np.clip(values, 0.0, None))
+
+
+class BalancedTruncation:
+    """
+    Balanced truncation of a single input single output transfer function.
+
+    The realization is split into a stable part and the poles on or right of the
+    imaginary axis. Only the stable part is balanced and reduced, so integrators and
+    unstable poles survive unchanged. Removing the states with the smallest Hankel
+    singular values sigma_{r+1}, ... keeps the error within the a priori bound
+    ||G - G_r||_inf <= 2 * (sigma_{r+1} + ... + sigma_n).
+    """
+
+    def __init__(self, numerator, denominator):
+        """
+        Build the balanced realization of N(s) / D(s)
+        Args:
+            numerator (list): Numerator coefficients, highest power first
+            denominator (list): Denominator coefficients, highest power first
+        Returns:
+            None
+        """
+        A, B, C, D = zpk_to_state_space(*coefficients_to_zpk(numerator, denominator))
+        self.full_order = A.shape[0]
+        self.D = np.atleast_2d(D)
+
+        # Diagonal scaling of the cascade before the Schur decomposition
+        if self.full_order:
+            A, (scale, _) = matrix_balance(A, permute=False, separate=True)
+            B = B / scale[:, None]
+            C = C * scale[None, :]
+
+        # Real Schur form with the stable poles first, then decouple the two blocks
+        threshold = -UNSTABLE_TOLERANCE * max(1.0, np.linalg.norm(A, 1))
+        T, Z, stable_order = schur(A, output='real', sort=lambda re, im: re < threshold)
+        B, C = Z.T @ B, C @ Z
+        A_stable, A_unstable = T[:stable_order, :stable_order], T[stable_order:, stable_order:]
+        if stable_order and stable_order < self.full_order:
+            X = solve_sylvester(A_stable, -A_unstable, -T[:stable_order, stable_order:])
+            B = np.vstack([B[:stable_order] - X @ B[stable_order:], B[stable_order:]])
+            C = np.hstack([C[:, :stable_order], C[:, :stable_order] @ X + C[:, stable_order:]])
+        self.unstable = (A_unstable, B[stable_order:], C[:, stable_order:])
+
+        # Square root balancing of the stable part
+        A, B, C = A_stable, B[:stable_order], C[:, :stable_order]
+        self.hankel_singular_values = np.empty(0)
+        self.balanced = (np.zeros((0, 0)), np.zeros((0, 1)), np.zeros((1, 0)))
+        if stable_order:
+            controllability = _gramian_factor(solve_continuous_lyapunov(A, -B @ B.T))
+            observability = _gramian_factor(solve_continuous_lyapunov(A.T, -C.T @ C))
+            U, sigma, Vt = svd(observability.T @ controllability)
+            minimal = sigma > MINIMAL_TOLERANCE * max(sigma[0], np.finfo(float).tiny)
+            U, sigma, Vt = U[:, minimal], sigma[minimal], Vt[minimal]
+            scaling = 1.0 / np.sqrt(sigma)
+            T = controllability @ Vt.T * scaling[None, :]
+            T_inverse = (U * scaling[None, :]).T @ observability.T
+            self.balanced = (T_inverse @ A @ T, T_inverse @ B, C @ T)
+            self.hankel_singular_values = sigma
+
+    def get_hankel_singular_values(self):
+        """
+        Hankel singular values of the stable part, in decreasing order
+        Args:
+            None
+        Returns:
+            np.ndarray: Hankel singular values
+        """
+        return self.hankel_singular_values
+
+    def get_full_order(self):
+        """
+        Order of the original realization
+        Args:
+            None
+        Returns:
+            int: Number of states
+        """
+        return self.full_order
+
+    def get_unstable_order(self):
+        """
+        Number of poles on or right of the imaginary axis, which are never reduced
+        Args:
+            None
+        Returns:
+            int: Number of unstable or marginal states
+        """
+        return self.unstable[0].shape[0]
+
+    def get_error_bound(self, order):
+        """
+        A priori bound of ||G - G_r||_inf when the stable part keeps `order` states
+        Args:
+            order (int): States kept from the stable part
+        Returns:
+            float: Error bound
+        """
+        return 2.0 * float(np.sum(self.hankel_singular_values[order:]))
+
+    def get_order_for_tolerance(self, tolerance):
+        """
+        Smallest stable order whose error bound is within the tolerance
+        Args:
+            tolerance (float): Allowed ||G - G_r||_inf
+        Returns:
+            int: States kept from the stable part
+        """
+        tails = 2.0 * np.cumsum(self.hankel_singular_values[::-1])[::-1]
+        return int(np.count_nonzero(tails > tolerance))
+
+    def reduce(self, order, method="matchdc"):
+        """
+        Reduced model keeping `order` states of the stable part plus every unstable state
+        Args:
+            order (int): States kept from the stable part
+            method (str): One of REDUCTION_METHODS
+        Returns:
+            ctrl.StateSpace: Reduced model
+        """
+        A, B, C = self.balanced
+        D = self.D
+        order = min(max(int(order), 0), A.shape[0])
+        A11, B1, C1 = A[:order, :order], B[:order], C[:, :order]
+        if method == "matchdc" and order < A.shape[0]:
+            # Residualize the discarded states: their derivatives are set to zero
+            A12, A21, A22 = A[:order, order:], A[order:, :order], A[order:, order:]
+            B2, C2 = B[order:], C[:, order:]
+            A22_A21 = solve(A22, A21)
+            A22_B2 = solve(A22, B2)
+            A11, B1 = A11 - A12 @ A22_A21, B1 - A12 @ A22_B2
+            C1, D = C1 - C2 @ A22_A21, D - C2 @ A22_B2
+
+        A_unstable, B_unstable, C_unstable = self.unstable
+        size = order + A_unstable.shape[0]
+        A_reduced = np.zeros((size, size))
+        A_reduced[:order, :order] = A11
+        A_reduced[order:, order:] = A_unstable
+        return ctrl.ss(A_reduced, np.vstack([B1, B_unstable]), np.hstack([C1, C_unstable]), D)
+
+    def reduce_to_tolerance(self, tolerance, method="matchdc"):
+        """
+        Reduced model of the lowest order whose error bound is within the tolerance
+        Args:
+            tolerance (float): Allowed ||G - G_r||_inf
+            method (str): One of REDUCTION_METHODS
+        Returns:
+            ctrl.TransferFunction: Reduced model
+        """
+        reduced = self.reduce(self.get_order_for_tolerance(tolerance), method)
+        if not reduced.nstates:
+            return ctrl.tf(reduced.D[0, 0], 1)
+        return ctrl.ss2tf(reduced)
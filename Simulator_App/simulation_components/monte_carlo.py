@@ -0,0 +1,337 @@
+# Standard library imports
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from numbers import Real
+
+#Scientific imports
+import numpy as np
+from matplotlib.figure import Figure
+
+# Local application imports
+from .batch_simulator import closed_loop_step_batch
+from .symbolic_loop import symbolic_closed_loop_coefficients
+from .metrics import compute_step_metrics, STEP_METRIC_DESCRIPTIONS
+
+DISTRIBUTIONS = ["Fixed", "Normal", "Uniform", "Lognormal"]
+
+DISTRIBUTION_DESCRIPTIONS = {
+    "Fixed": "Fixed: The parameter keeps its nominal value",
+    "Normal": "Normal: nominal * (1 + spread * N(0, 1)), spread is the relative standard deviation",
+    "Uniform": "Uniform: nominal * (1 + U(-spread, spread)), spread is the relative half width",
+    "Lognormal": "Lognormal: nominal * exp(spread * N(0, 1)), keeps the sign of the nominal value"
+}
+
+DEFAULT_SAMPLES = 1000
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+# Samples simulated by each process pool task
+CHUNK_SIZE = 500
+
+# Metrics shown as histograms in the results figure
+HISTOGRAM_METRICS = ('overshoot', 'rise_time', 'settling_time')
+
+
+class ParameterDistribution:
+    """
+    Relative uncertainty of a plant parameter around its nominal value.
+    """
+
+    def __init__(self, kind="Fixed", spread=0.0):
+        """
+        Initialize the distribution
+        Args:
+            kind (str): One of DISTRIBUTIONS
+            spread (float): Relative spread of the distribution (see DISTRIBUTION_DESCRIPTIONS)
+        Returns:
+            None
+        """
+        self.kind = kind
+        self.spread = spread
+
+    def validate(self):
+        """
+        Check the distribution settings
+        Args:
+            None
+        Returns:
+            str: Error message, empty if the distribution is valid
+        """
+        if self.kind not in DISTRIBUTIONS:
+            return f"Error: Unknown distribution: {self.kind}."
+        if not isinstance(self.spread, Real) or self.spread < 0:
+            return f"Error: Spread must be a nonnegative number (got {self.spread})."
+        return ""
+
+    def sample(self, rng, nominal, size):
+        """
+        Draw samples of the parameter
+        Args:
+            rng (np.random.Generator): Random generator
+            nominal (float): Nominal value of the parameter
+            size (int): Number of samples
+        Returns:
+            np.ndarray: Sampled values
+        """
+        if self.kind == "Normal":
+            return nominal * (1.0 + self.spread * rng.standard_normal(size))
+        if self.kind == "Uniform":
+            return nominal * (1.0 + rng.uniform(-self.spread, self.spread, size))
+        if self.kind == "Lognormal":
+            return nominal * np.exp(self.spread * rng.standard_normal(size))
+        return np.full(size, float(nominal))
+
+
+class MonteCarloResult:
+    """
+    Step responses and metrics of every sampled closed loop.
+    """
+
+    def __init__(self, t, responses, nominal_response, samples, stable, metrics, seed):
+        """
+        Store the results of a Monte Carlo run
+        Args:
+            t (np.ndarray): Time vector
+            responses (np.ndarray): Responses of shape (samples, len(t)), NaN for discarded samples
+            nominal_response (np.ndarray): Response of the nominal plant
+            samples (dict): Parameter name -> sampled values
+            stable (np.ndarray): Boolean mask of the stable closed loops
+            metrics (dict): Metric name -> values per sample
+            seed (int): Seed that reproduces the run
+        Returns:
+            None
+        """
+        self.t = t
+        self.responses = responses
+        self.nominal_response = nominal_response
+        self.samples = samples
+        self.stable = stable
+        self.metrics = metrics
+        self.seed = seed
+
+    def get_stable_fraction(self):
+        """
+        Fraction of sampled closed loops that are stable
+        Args:
+            None
+        Returns:
+            float: Value between 0 and 1
+        """
+        return float(np.mean(self.stable)) if self.stable.size else 0.0
+
+    def get_percentile_bands(self, percentiles=DEFAULT_PERCENTILES):
+        """
+        Percentiles of the stable responses at every time sample
+        Args:
+            percentiles (iterable): Percentiles between 0 and 100
+        Returns:
+            dict: Percentile -> np.ndarray of shape (len(t),), empty if no sample is stable
+        """
+        stable_responses = self.responses[self.stable]
+        if not len(stable_responses):
+            return {}
+        bands = np.percentile(stable_responses, percentiles, axis=0)
+        return dict(zip(percentiles, bands))
+
+    def get_metric_statistics(self):
+        """
+        Summary statistics of every metric over the stable samples
+        Args:
+            None
+        Returns:
+            dict: Metric name -> dict with 'mean', 'std', 'p5', 'p50' and 'p95'
+        """
+        statistics = {}
+        for name, values in self.metrics.items():
+            values = values[self.stable & np.isfinite(values)]
+            if not len(values):
+                continue
+            p5, p50, p95 = np.percentile(values, (5, 50, 95))
+            statistics[name] = {'mean': float(np.mean(values)), 'std': float(np.std(values)),
+                                'p5': float(p5), 'p50': float(p50), 'p95': float(p95)}
+        return statistics
+
+    def plot(self):
+        """
+        Plot the percentile bands of the step response and the metric histograms
+        Args:
+            None
+        Returns:
+            Matplotlib Figure object with the results
+        """
+        fig = Figure(dpi=80)
+        grid = fig.add_gridspec(2, len(HISTOGRAM_METRICS), height_ratios=[2, 1])
+
+        ax = fig.add_subplot(grid[0, :])
+        bands = self.get_percentile_bands()
+        if bands:
+            ax.fill_between(self.t, bands[5], bands[95], color='b', alpha=0.15, label='5-95%')
+            ax.fill_between(self.t, bands[25], bands[75], color='b', alpha=0.3, label='25-75%')
+            ax.plot(self.t, bands[50], 'b-', linewidth=2, label='Median')
+        ax.plot(self.t, self.nominal_response, 'k--', linewidth=1.5, label='Nominal')
+        ax.set_title(f'Monte Carlo Step Response ({len(self.stable)} samples, '
+                     f'{100 * self.get_stable_fraction():.1f}% stable, seed {self.seed})', pad=20)
+        ax.set_xlabel('Time (s)')
+        ax.set_ylabel('Amplitude')
+        ax.grid(True, linestyle='--', alpha=0.7)
+        ax.set_facecolor((0.95, 0.95, 0.95))
+        ax.legend()
+        ax.set_xlim(self.t[0], self.t[-1])
+
+        for column, name in enumerate(HISTOGRAM_METRICS):
+            ax = fig.add_subplot(grid[1, column])
+            values = self.metrics[name][self.stable]
+            values = values[np.isfinite(values)]
+            if len(values):
+                ax.hist(values, bins=40, color='b', alpha=0.7)
+            ax.set_xlabel(STEP_METRIC_DESCRIPTIONS[name])
+            ax.grid(True, linestyle='--', alpha=0.7)
+            ax.set_facecolor((0.95, 0.95, 0.95))
+
+        fig.tight_layout()
+        return fig
+
+
+class MonteCarloAnalysis:
+    """
+    Monte Carlo robustness analysis of the closed loop over uncertain plant parameters.
+
+    Samples are drawn up front from a single seeded generator, so a run is reproducible
+    no matter how many worker processes simulate it. The sampled closed loops are
+    simulated in vectorized chunks distributed over a process pool.
+    """
+
+    def __init__(self, pid_object, plant_object, input_params, sensor_object):
+        """
+        Initialize the analysis with the loop components
+        Args:
+            pid_object (ControllerPID): PID controller
+            plant_object (Plant): Nominal plant
+            input_params (Input): Step input and time grid
+            sensor_object (Sensor): Sensor in the feedback path
+        Returns:
+            None
+        """
+        self.pid_object = pid_object
+        self.plant_object = plant_object
+        self.input_params = input_params
+        self.sensor_object = sensor_object
+        self.distributions = {name: ParameterDistribution() for name in self.get_uncertain_parameters()}
+
+    def get_uncertain_parameters(self):
+        """
+        Names of the plant parameters that can be sampled (scalar parameters)
+        Args:
+            None
+        Returns:
+            list: Parameter names
+        """
+        return [name for name, value in self.plant_object.get_parameters().items() if isinstance(value, Real)]
+
+    def get_distributions(self):
+        """
+        Return the distribution of every uncertain parameter
+        Args:
+            None
+        Returns:
+            dict: Parameter name -> ParameterDistribution
+        """
+        return self.distributions
+
+    def set_distribution(self, name, kind, spread=0.0):
+        """
+        Set the distribution of a plant parameter
+        Args:
+            name (str): Parameter name
+            kind (str): One of DISTRIBUTIONS
+            spread (float): Relative spread of the distribution
+        Returns:
+            error_log (str): Error message if the distribution is invalid, None otherwise
+        """
+        if name not in self.distributions:
+            return f"Error: {name} is not an uncertain parameter of {self.plant_object.name}."
+        distribution = ParameterDistribution(kind, spread)
+        error_log = distribution.validate()
+        if error_log:
+            return error_log
+        self.distributions[name] = distribution
+
+    def draw_samples(self, num_samples, seed):
+        """
+        Draw the parameter samples of a run
+        Args:
+            num_samples (int): Number of samples
+            seed (int): Seed of the random generator
+        Returns:
+            dict: Parameter name -> np.ndarray of sampled values
+        """
+        rng = np.random.default_rng(seed)
+        nominal = self.plant_object.get_parameters()
+        return {name: distribution.sample(rng, nominal[name], num_samples)
+                for name, distribution in self.distributions.items()}
+
+    def run(self, num_samples=DEFAULT_SAMPLES, seed=None, workers=None):
+        """
+        Simulate the step response of every sampled closed loop
+        Args:
+            num_samples (int): Number of samples
+            seed (int or None): Seed of the random generator, None draws a new one
+            workers (int or None): Worker processes, None uses every core and 1 runs in this process
+        Returns:
+            MonteCarloResult: Results of the run
+            error message (str) if the analysis cannot be run
+        """
+        if not isinstance(num_samples, int) or num_samples <= 0:
+            return f"Error: Number of samples must be a positive integer (got {num_samples})."
+        if self.plant_object.get_delay() > 0 or self.sensor_object.get_delay() > 0:
+            return "Error: Monte Carlo analysis does not support transport delay."
+        for tf in (self.plant_object.get_transfer_function(), self.sensor_object.get_transfer_function()):
+            if isinstance(tf, str):
+                return tf
+
+        if seed is None:
+            seed = int(np.random.SeedSequence().entropy % 2**32)
+        samples = self.draw_samples(num_samples, seed)
+
+        # A physical parameter cannot change sign: such samples are discarded
+        nominal = self.plant_object.get_parameters()
+        valid = np.ones(num_samples, dtype=bool)
+        for name, values in samples.items():
+            valid &= np.sign(values) == np.sign(nominal[name])
+
+        # Closed-loop coefficients of every sample from the compiled kernel of the plant type
+        pid = self.pid_object.get_parameters()
+        numerators, denominators = symbolic_closed_loop_coefficients(self.plant_object, self.sensor_object,
+                                                                     pid["kp"], pid["ki"], pid["kd"], **samples)
+        numerators = np.broadcast_to(numerators, (num_samples, numerators.shape[1]))
+        denominators = np.broadcast_to(denominators, (num_samples, denominators.shape[1]))
+
+        nominal_num, nominal_den = symbolic_closed_loop_coefficients(self.plant_object, self.sensor_object,
+                                                                     pid["kp"], pid["ki"], pid["kd"])
+        nominal_result = closed_loop_step_batch(nominal_num, nominal_den, self.input_params.get_parameters())
+        if isinstance(nominal_result, str):
+            return nominal_result
+        t, nominal_response, _ = nominal_result
+
+        bounds = range(0, num_samples, CHUNK_SIZE)
+        num_chunks = [numerators[start:start + CHUNK_SIZE] for start in bounds]
+        den_chunks = [denominators[start:start + CHUNK_SIZE] for start in bounds]
+        arguments = (num_chunks, den_chunks, repeat(self.input_params.get_parameters()))
+
+        workers = min(workers or os.cpu_count() or 1, len(num_chunks))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunks = list(executor.map(closed_loop_step_batch, *arguments))
+        else:
+            chunks = list(map(closed_loop_step_batch, *arguments))
+
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                return chunk
+        responses = np.concatenate([chunk[1] for chunk in chunks])
+        stable = np.concatenate([chunk[2] for chunk in chunks]) & valid
+        responses[~valid] = np.nan
+
+        params = self.input_params.get_parameters()
+        metrics = compute_step_metrics(t, responses, params["step_time"], params["initial_value"], params["final_value"])
+        return MonteCarloResult(t, responses, nominal_response[0], samples, stable, metrics, seed)
@@ -0,0 +1,180 @@
+# Standard library imports
+import math
+
+#Scientific imports
+import control as ctrl
+import numpy as np
+
+# Maximum beam angle (rad) reached before the servo saturates
+MAX_BEAM_ANGLE = math.radians(30)
+
+# Bounds for the number of RK4 substeps taken per sample
+MIN_SUBSTEPS = 2
+MAX_SUBSTEPS = 200
+
+
+class BallAndBeamNonlinearModel:
+    """
+    Nonlinear Ball and Beam dynamics closed with the PID controller and sensor.
+
+    The ball obeys (J/R^2 + m) r'' = -m g sin(alpha) + m r alpha'^2, where the
+    beam angle alpha = (d/L) * theta is driven by the servo gear angle theta
+    (the PID output) and saturates at +-max_beam_angle. Linearizing around
+    alpha = 0 gives back BallAndBeamPlant.get_transfer_function().
+    """
+
+    def __init__(self, plant_object, max_beam_angle=MAX_BEAM_ANGLE):
+        """
+        Initialize the nonlinear model from a Ball and Beam plant
+        Args:
+            plant_object (BallAndBeamPlant): Plant providing m, R, d, g, L, J
+            max_beam_angle (float or None): Beam angle saturation (rad), None disables it
+        Returns:
+            None
+        """
+        self.plant_object = plant_object
+        self.max_beam_angle = max_beam_angle
+
+    def get_beam_angle(self, theta):
+        """
+        Convert the servo gear angle into the (saturated) beam angle
+        Args:
+            theta (np.ndarray): Servo gear angle commanded by the PID
+        Returns:
+            np.ndarray: Beam angle alpha
+        """
+        p = self.plant_object.get_parameters()
+        alpha = p['d'] / p['L'] * theta
+        if self.max_beam_angle is not None:
+            alpha = np.clip(alpha, -self.max_beam_angle, self.max_beam_angle)
+        return alpha
+
+    def get_ball_acceleration(self, r, alpha, alpha_dot):
+        """
+        Evaluate the ball acceleration for a batch of states
+        Args:
+            r (np.ndarray): Ball positions
+            alpha (np.ndarray): Beam angles
+            alpha_dot (np.ndarray): Beam angular velocities
+        Returns:
+            np.ndarray: Ball accelerations r''
+        """
+        p = self.plant_object.get_parameters()
+        effective_mass = p['J'] / p['R']**2 + p['m']
+        return (-p['m'] * p['g'] * np.sin(alpha) + p['m'] * r * alpha_dot**2) / effective_mass
+
+    def simulate_closed_loop(self, pid_object, sensor_object, input_params, initial_conditions=None):
+        """
+        Simulate the nonlinear closed loop with a fixed-step RK4 solver.
+        The step size is chosen from the fastest pole of the linearized loop and
+        every initial condition of the batch is integrated simultaneously.
+        Args:
+            pid_object (ControllerPID): PID controller
+            sensor_object (Sensor): Sensor in the feedback path
+            input_params (Input): Step input and time grid
+            initial_conditions (array-like or None): Rows of (r0, r_dot0). None starts
+                at rest on the equilibrium of the initial reference value
+        Returns:
+            tuple: (t, positions, beam_angles) with positions and beam_angles of shape (batch, samples)
+            error message (str) if the loop cannot be built
+        """
+        sensor_tf = sensor_object.get_transfer_function()
+        if isinstance(sensor_tf, str):
+            return sensor_tf
+        plant_tf = self.plant_object.get_transfer_function()
+        if isinstance(plant_tf, str):
+            return plant_tf
+
+        pid = pid_object.get_parameters()
+        kp, ki, kd = pid["kp"], pid["ki"], pid["kd"]
+
+        params = input_params.get_parameters()
+        step_time = params["step_time"]
+        initial_value = params["initial_value"]
+        final_value = params["final_value"]
+        total_time = params["total_time"]
+        sample_time = params["sample_time"]
+
+        num_points = int(total_time / sample_time) + 1
+        t = np.linspace(0, total_time, num_points)
+        dt = t[1] - t[0]
+
+        # Sensor realization: ym = Cs xs + Ds r, xs' = As xs + Bs r
+        sensor_ss = ctrl.tf2ss(sensor_tf)
+        As, Bs = np.asarray(sensor_ss.A), np.asarray(sensor_ss.B)[:, 0]
+        Cs, Ds = np.asarray(sensor_ss.C)[0], float(np.asarray(sensor_ss.D)[0, 0])
+        sensor_dc_gain = float(np.real(ctrl.dcgain(sensor_tf)))
+
+        # Fixed step resolving the fastest mode of the linearized closed loop
+        closed_loop = ctrl.feedback(ctrl.series(plant_tf, pid_object.get_transfer_function()), sensor_tf)
+        fastest = max([np.max(np.abs(ctrl.poles(closed_loop)), initial=0.0)] + [np.max(np.abs(np.linalg.eigvals(As)), initial=0.0)])
+        substeps = int(min(MAX_SUBSTEPS, max(MIN_SUBSTEPS, math.ceil(dt * fastest))))
+        h = dt / substeps
+
+        # Batch of initial conditions (equilibrium of the initial reference by default)
+        if initial_conditions is None:
+            r0 = initial_value / sensor_dc_gain if sensor_dc_gain != 0 else 0.0
+            initial_conditions = [[r0, 0.0]]
+        initial_conditions = np.atleast_2d(np.asarray(initial_conditions, dtype=float))
+        batch = initial_conditions.shape[0]
+
+        r = initial_conditions[:, 0].copy()
+        v = initial_conditions[:, 1].copy()
+        # Sensor states at rest for the initial ball position
+        if As.size:
+            xs = -np.linalg.solve(As, np.outer(Bs, r)).T if np.linalg.matrix_rank(As) == As.shape[0] else np.zeros((batch, As.shape[0]))
+        else:
+            xs = np.zeros((batch, 0))
+        z = np.zeros(batch)  # Integral of the error
+
+        p = self.plant_object.get_parameters()
+        effective_mass = p['J'] / p['R']**2 + p['m']
+        impulse_gain = -p['m'] * p['g'] * p['d'] / (p['L'] * effective_mass)
+
+        def derivatives(r, v, xs, z, ref, alpha_dot):
+            xs_dot = xs @ As.T + np.outer(r, Bs)
+            ym = xs @ Cs + Ds * r
+            ym_dot = xs_dot @ Cs + Ds * v
+            error = ref - ym
+            theta = kp * error + ki * z + kd * (-ym_dot)
+            alpha = self.get_beam_angle(theta)
+            v_dot = self.get_ball_acceleration(r, alpha, alpha_dot)
+            return v, v_dot, xs_dot, error, alpha
+
+        positions = np.empty((batch, num_points))
+        beam_angles = np.empty((batch, num_points))
+        alpha_prev = None
+        alpha_dot = np.zeros(batch)
+        step_index = np.argmax(t >= step_time) if step_time <= total_time else num_points
+
+        for k in range(num_points):
+            ref = initial_value if k < step_index else final_value
+
+            # Derivative kick of the reference step: an impulse in theta that only
+            # reaches the ball when the beam angle is not saturated
+            if k == step_index and self.max_beam_angle is None:
+                v = v + impulse_gain * kd * (final_value - initial_value)
+
+            _, _, _, _, alpha = derivatives(r, v, xs, z, ref, alpha_dot)
+            positions[:, k] = r
+            beam_angles[:, k] = alpha
+
+            # Beam angular velocity estimated from the previous sample
+            if alpha_prev is not None:
+                alpha_dot = (alpha - alpha_prev) / dt
+            alpha_prev = alpha
+
+            if k == num_points - 1:
+                break
+
+            for _ in range(substeps):
+                k1 = derivatives(r, v, xs, z, ref, alpha_dot)
+                k2 = derivatives(r + 0.5*h*k1[0], v + 0.5*h*k1[1], xs + 0.5*h*k1[2], z + 0.5*h*k1[3], ref, alpha_dot)
+                k3 = derivatives(r + 0.5*h*k2[0], v + 0.5*h*k2[1], xs + 0.5*h*k2[2], z + 0.5*h*k2[3], ref, alpha_dot)
+                k4 = derivatives(r + h*k3[0], v + h*k3[1], xs + h*k3[2], z + h*k3[3], ref, alpha_dot)
+                r = r + h/6 * (k1[0] + 2*k2[0] + 2*k3[0] + k4[0])
+                v = v + h/6 * (k1[1] + 2*k2[1] + 2*k3[1] + k4[1])
+                xs = xs + h/6 * (k1[2] + 2*k2[2] + 2*k3[2] + k4[2])
+                z = z + h/6 * (k1[3] + 2*k2[3] + 2*k3[3] + k4[3])
+
+        return t, positions, beam_angles
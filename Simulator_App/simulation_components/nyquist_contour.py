@@ -0,0 +1,254 @@
+#Scientific imports
+import numpy as np
+
+# Local application imports
+from .pole_zero_analysis import CANCELLATION_TOLERANCE, cancel_common_roots
+
+# Poles with |Re| below this fraction of their magnitude (or of 1) lie on the imaginary axis
+IMAGINARY_AXIS_TOLERANCE = 1e-6
+
+# Radius of the indentations, as a fraction of the distance to the nearest other pole or zero
+INDENT_FRACTION = 1e-3
+
+# Decades of the imaginary axis sampled beyond the slowest and fastest poles and zeros
+AXIS_MARGIN_DECADES = 2
+
+# Extra decades tried at high frequency until the loop magnitude is negligible
+MAX_EXTRA_DECADES = 10
+
+# |L| below which the end of the axis cannot encircle -1 any more
+NEGLIGIBLE_MAGNITUDE = 1e-3
+
+# Initial samples of every contour segment
+INITIAL_SAMPLES = 64
+
+# Largest step of the curve, as a fraction of its distance to -1 (about 3 degrees seen from -1)
+ARC_FRACTION = 0.05
+
+# Largest number of contour points, the winding count is reported unreliable beyond it
+MAX_POINTS = 50000
+
+# Distance of 1 + L to 0 below which the closed loop has poles on the contour
+CRITICAL_DISTANCE = 1e-9
+
+
+def _refine(segment, evaluate):
+    """
+    Sample a contour segment adaptively by arc length: intervals whose image step is large compared
+    with the distance of the curve to -1 are halved until the whole curve is resolved
+    Args:
+        segment (callable): Contour point s(t) for an array of parameters t in [0, 1]
+        evaluate (callable): Loop response L(s)
+    Returns:
+        tuple: (s, response) arrays along the segment
+    """
+    t = np.linspace(0.0, 1.0, INITIAL_SAMPLES)
+    s = segment(t)
+    response = evaluate(s)
+    while len(t) < MAX_POINTS:
+        step = np.abs(np.diff(response))
+        distance = np.minimum(np.abs(1 + response[:-1]), np.abs(1 + response[1:]))
+        coarse = ~(step <= ARC_FRACTION * np.maximum(distance, CRITICAL_DISTANCE))
+        if not coarse.any():
+            break
+        middle = 0.5 * (t[:-1] + t[1:])[coarse]
+        middle_s = segment(middle)
+        order = np.argsort(np.concatenate((t, middle)), kind='stable')
+        t = np.concatenate((t, middle))[order]
+        s = np.concatenate((s, middle_s))[order]
+        response = np.concatenate((response, evaluate(middle_s)))[order]
+    return s, response
+
+
+class NyquistContour:
+    """
+    Nyquist contour of the loop L(s) = k prod(s - z) / prod(s - p) e^{-sT}.
+
+    The upper half of the D-contour runs up the imaginary axis from 0 to a frequency where
+    |L| is negligible, going round every imaginary-axis pole (integrators, 1/s^2 plants,
+    undamped modes) on a small semicircle in the right half-plane. Every segment is sampled
+    adaptively by arc length, so the image stays resolved near -1 even where the curve
+    sweeps to infinity. The winding of 1 + L around 0 then gives the clockwise encirclements
+    N of -1, and Z = N + P closed-loop poles in the right half-plane, P being the open-loop
+    poles there.
+    """
+
+    def __init__(self, numerator, denominator, delay=0.0, cancellation_tolerance=CANCELLATION_TOLERANCE):
+        """
+        Build the contour and count the encirclements of -1
+        Args:
+            numerator (np.ndarray): Numerator coefficients of the rational part of L, highest power first
+            denominator (np.ndarray): Denominator coefficients, highest power first
+            delay (float): Total transport delay T of the loop in seconds
+            cancellation_tolerance (float): Relative distance below which a pole-zero pair of the loop cancels
+                                            (the PID integrator when Ki = 0), see PoleZeroAnalysis
+        Returns:
+            None
+        """
+        numerator = np.trim_zeros(np.atleast_1d(np.asarray(numerator, dtype=float)), 'f')
+        denominator = np.trim_zeros(np.atleast_1d(np.asarray(denominator, dtype=float)), 'f')
+        self.delay = float(delay)
+        self.gain = numerator[0] / denominator[0] if numerator.size else 0.0
+        self.poles, self.zeros = cancel_common_roots(np.roots(denominator), np.roots(numerator) if numerator.size else np.empty(0),
+                                                     cancellation_tolerance)
+
+        on_axis = np.abs(self.poles.real) <= IMAGINARY_AXIS_TOLERANCE * np.maximum(np.abs(self.poles), 1.0)
+        frequencies = np.sort(np.abs(self.poles[on_axis].imag))
+        self.indented_frequencies = frequencies[np.append(True, np.diff(frequencies) > IMAGINARY_AXIS_TOLERANCE * np.maximum(frequencies[1:], 1.0))] if frequencies.size else frequencies
+        self.open_loop_rhp_poles = int(np.count_nonzero(~on_axis & (self.poles.real > 0)))
+        self.relative_degree = len(self.poles) - len(self.zeros)
+
+        self.s, self.response, self.segments = self._build_contour()
+        self.encirclements, self.minimum_distance = self._count_encirclements()
+
+    def evaluate(self, s):
+        """
+        Evaluate the loop at complex frequencies from its poles and zeros (accurate next to the poles)
+        Args:
+            s (np.ndarray): Complex frequencies
+        Returns:
+            np.ndarray: Complex loop response
+        """
+        s = np.asarray(s, dtype=complex)
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            response = self.gain * np.prod(s[:, None] - self.zeros, axis=1) / np.prod(s[:, None] - self.poles, axis=1)
+            return response * np.exp(-s * self.delay) if self.delay else response
+
+    def _indent_radius(self, frequency):
+        """
+        Radius of the semicircle around an imaginary-axis pole
+        Args:
+            frequency (float): Frequency of the pole in rad/s
+        Returns:
+            float: Radius, small compared with the distance to every other pole or zero
+        """
+        center = 1j * frequency
+        roots = np.concatenate((self.poles, self.zeros, np.conj(self.poles), [center + 1.0]))
+        distances = np.abs(roots - center)
+        distances = distances[distances > IMAGINARY_AXIS_TOLERANCE * max(1.0, frequency)]
+        return INDENT_FRACTION * np.min(distances)
+
+    def _get_axis_limit(self, start):
+        """
+        Highest frequency of the contour: beyond the fastest pole or zero, and where |L| is negligible
+        Args:
+            start (float): Lowest frequency of the axis segments
+        Returns:
+            float: Frequency in rad/s
+        """
+        roots = np.abs(np.concatenate((self.poles, self.zeros)))
+        roots = roots[roots > 0]
+        limit = 10 ** (np.log10(roots.max() if roots.size else 1.0) + AXIS_MARGIN_DECADES)
+        limit = max(limit, 10 * start, 1.0 / self.delay if self.delay else 0.0)
+        if self.relative_degree > 0:
+            for _ in range(MAX_EXTRA_DECADES):
+                if np.abs(self.evaluate(np.array([1j * limit])))[0] < NEGLIGIBLE_MAGNITUDE:
+                    break
+                limit *= 10.0
+        return limit
+
+    def _build_contour(self):
+        """
+        Sample the upper half of the indented D-contour, from the real axis to the highest frequency
+        Args:
+            None
+        Returns:
+            tuple: (s, response, segments) arrays of the points and the segment index of every point
+        """
+        segments = []
+        frequencies = list(self.indented_frequencies)
+
+        # Start on the real axis: at 0, or on the quarter circle round a pole at the origin
+        start = 0.0
+        if frequencies and frequencies[0] == 0.0:
+            radius = self._indent_radius(0.0)
+            segments.append(lambda t, r=radius: r * np.exp(0.5j * np.pi * t))
+            start = radius
+            frequencies.pop(0)
+        limit = self._get_axis_limit(max(start, frequencies[-1] if frequencies else 0.0))
+
+        roots = np.abs(np.concatenate((self.poles, self.zeros)))
+        roots = roots[roots > 0]
+        low = 10 ** (np.log10(roots.min() if roots.size else 1.0) - AXIS_MARGIN_DECADES)
+
+        def axis(w_from, w_to):
+            if w_from <= 0:
+                # Linear up to the slow frequencies, then geometric
+                if w_to <= low:
+                    return [lambda t: 1j * w_to * t]
+                return [lambda t: 1j * low * t, lambda t: 1j * low * (w_to / low) ** t]
+            return [lambda t: 1j * w_from * (w_to / w_from) ** t]
+
+        for frequency in frequencies:
+            radius = self._indent_radius(frequency)
+            segments.extend(axis(start, frequency - radius))
+            segments.append(lambda t, w=frequency, r=radius: 1j * w + r * np.exp(1j * np.pi * (t - 0.5)))
+            start = frequency + radius
+        segments.extend(axis(start, limit))
+
+        points, responses, owners = [], [], []
+        for index, segment in enumerate(segments):
+            s, response = _refine(segment, self.evaluate)
+            points.append(s)
+            responses.append(response)
+            owners.append(np.full(len(s), index))
+        return np.concatenate(points), np.concatenate(responses), np.concatenate(owners)
+
+    def _count_encirclements(self):
+        """
+        Clockwise encirclements of -1 by the whole closed contour, from the winding of 1 + L along its upper half
+        Args:
+            None
+        Returns:
+            tuple: (encirclements, minimum_distance) integer count (None if the curve is not resolved) and the
+                   smallest |1 + L| met on the contour
+        """
+        shifted = 1 + self.response
+        minimum_distance = float(np.min(np.abs(shifted))) if np.all(np.isfinite(shifted)) else 0.0
+        steps = np.angle(shifted[1:] / shifted[:-1])
+        if not np.all(np.isfinite(steps)) or np.any(np.abs(steps) > np.pi / 2):
+            return None, minimum_distance
+
+        # Lower half by symmetry, plus the semicircle at infinity: -relative degree * pi for improper loops
+        winding = 2 * np.sum(steps)
+        if self.relative_degree < 0:
+            if self.delay:
+                return None, minimum_distance
+            winding += self.relative_degree * np.pi
+        return int(np.rint(-winding / (2 * np.pi))), minimum_distance
+
+    def get_stability(self):
+        """
+        Closed-loop stability verdict of the Nyquist criterion
+        Args:
+            None
+        Returns:
+            dict: 'stable' (True, False, or None when the curve passes through -1 or is not resolved),
+                  'encirclements' (clockwise, N), 'open_loop_rhp_poles' (P), 'closed_loop_rhp_poles' (Z = N + P),
+                  'indented_frequencies' (rad/s) and 'minimum_distance' (smallest |1 + L|)
+        """
+        marginal = self.minimum_distance <= CRITICAL_DISTANCE
+        if self.encirclements is None or marginal:
+            closed_loop_rhp_poles = None
+            stable = None
+        else:
+            closed_loop_rhp_poles = self.encirclements + self.open_loop_rhp_poles
+            stable = closed_loop_rhp_poles == 0
+        return {
+            "stable": stable,
+            "encirclements": self.encirclements,
+            "open_loop_rhp_poles": self.open_loop_rhp_poles,
+            "closed_loop_rhp_poles": closed_loop_rhp_poles,
+            "indented_frequencies": self.indented_frequencies,
+            "minimum_distance": self.minimum_distance
+        }
+
+    def get_curve(self):
+        """
+        Points of the contour and their image for the upper half, the lower half is the complex conjugate
+        Args:
+            None
+        Returns:
+            tuple: (s, response, segments) arrays, segments gives the contour segment of every point
+        """
+        return self.s, self.response, self.segments
@@ -8,12 +8,34 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
 
-# Third-party imports
-from PyQt5.QtGui import QPixmap
-from PyQt5.QtCore import Qt
+# Local application imports
+from .nonlinear_plant import BallAndBeamNonlinearModel
+from .loop_simulator import LoopSimulator
+from .stability_margins import StabilityMarginAnalyzer
+from .realization import pid_series_state_space
+from .time_horizon import suggest_time_parameters
+from .divergence import DIVERGENCE_BOUND, first_divergent_index, is_asymptotically_stable, step_response_until_divergence
+from .modal_response import ModalResponse
+from .frequency_response import FrequencyResponseCache
+from .sensitivity_peaks import sensitivity_peaks
+from .nyquist_contour import NyquistContour
+from .pole_zero_analysis import CANCELLATION_TOLERANCE, PoleZeroAnalysis
+from .loop_signals import LOOP_SIGNALS, loop_signals_state_space
+from .metrics import LOOP_SIGNAL_METRIC_DESCRIPTIONS, compute_loop_signal_metrics
+from .dependency_graph import DependencyGraph, memoized
+from .instrumentation import span, traced
+
+# Frequencies of the Bode diagram (rad/s)
+BODE_OMEGA = np.logspace(-2, 3, 1000)
+
+# Points of the closed-form curve drawn over the visible time window after a zoom
+ZOOM_POINTS = 2000
+
+# Radius beyond which the Nyquist curve is drawn clipped (dotted) on a circle
+NYQUIST_MAX_MAGNITUDE = 20.0
 
 class Output:
-    def __init__(self, pid_object=None, plant_object=None, input_params=None, sensor_object=None):
+    def __init__(self, pid_object=None, plant_object=None, input_params=None, sensor_object=None, use_reduced_models=False):
         """
         Initialize Output with PID, Plant, Input Parameters, and Sensor objects
         Args:
@@ -21,6 +43,7 @@ class Output:
             plant_object: Plant model object
             input_params: Input parameters for the simulation
             sensor_object: Sensor model object
+            use_reduced_models (bool): Use the reduced plant and sensor models when their reduction is enabled
         Returns:
             None
         """
@@ -28,6 +51,25 @@ class Output:
         self.plant_object = plant_object
         self.input_params = input_params
         self.sensor_object = sensor_object
+        self.use_reduced_models = use_reduced_models
+        self.divergence_bound = DIVERGENCE_BOUND
+        self.frequency_caches = {}
+        self.cancellation_tolerance = CANCELLATION_TOLERANCE
+
+        # Lazy graph of the derived results: component models -> open loop -> closed loop -> responses
+        # and metrics. Every source fingerprints what an editor can change, so an edit only recomputes
+        # the results downstream of the edited component. Figures are built fresh from these results
+        # on every call: a canvas and its toolbar zoom the figure they display
+        self.graph = DependencyGraph()
+        self.graph.add_source("pid", lambda: self.pid_object.get_parameters())
+        self.graph.add_source("plant", lambda: self.get_component_fingerprint(self.plant_object))
+        self.graph.add_source("sensor", lambda: self.get_component_fingerprint(self.sensor_object))
+        self.graph.add_source("delays", lambda: (self.plant_object.get_delay(), self.sensor_object.get_delay()))
+        self.graph.add_source("input", lambda: (self.input_params.get_parameters(), self.input_params.get_signal_type(),
+                                                self.input_params.get_signal_parameters()))
+        self.graph.add_source("reduced_models", lambda: self.use_reduced_models)
+        self.graph.add_source("cancellation_tolerance", lambda: self.cancellation_tolerance)
+        self.graph.add_source("divergence_bound", lambda: self.divergence_bound)
 
     def get_pid_function(self):
         """"
@@ -71,19 +113,184 @@ class Output:
     
 
     
+    def set_use_reduced_models(self, use_reduced_models):
+        """
+        Switch between the reduced and the full plant and sensor models
+        Args:
+            use_reduced_models (bool): Use the reduced models when their reduction is enabled
+        Returns:
+            None
+        """
+        self.use_reduced_models = use_reduced_models
+
+    def set_divergence_bound(self, divergence_bound):
+        """
+        Set the bound beyond which time simulations are stopped as divergent
+        Args:
+            divergence_bound (float): Largest response magnitude, in multiples of the step amplitude
+        Returns:
+            None
+        """
+        self.divergence_bound = divergence_bound
+
+    def set_cancellation_tolerance(self, cancellation_tolerance):
+        """
+        Set the relative pole-zero distance below which the closed loop drops a pair from its realization
+        Args:
+            cancellation_tolerance (float): Relative tolerance, 0 keeps every state of the components
+        Returns:
+            None
+        """
+        self.cancellation_tolerance = cancellation_tolerance
+
+    def get_component_fingerprint(self, component):
+        """
+        Describe everything of the plant or the sensor its models depend on (the delay is a separate source)
+        Args:
+            component: Plant or Sensor object
+        Returns:
+            tuple: Parameters, coefficients, reduction tolerance and reduction method of the component
+        """
+        method = component.get_reduction_method() if hasattr(component, "get_reduction_method") else None
+        return component.get_parameters(), component.get_coefficients(), component.get_reduction_tolerance(), method
+
+    def get_recomputed_nodes(self):
+        """
+        Return the results recomputed since the previous call, to see what an edit invalidated
+        Args:
+            None
+        Returns:
+            list: Names of the graph nodes in the order they were recomputed, sources listed when they changed
+        """
+        return self.graph.pop_recomputed()
+
+    def get_component_transfer_function(self, component):
+        """
+        Return the transfer function of the plant or the sensor, reduced if requested
+        Args:
+            component: Plant or Sensor object
+        Returns:
+            Transfer function of the component
+        """
+        if component is self.plant_object:
+            return self.get_plant_transfer_function()
+        if component is self.sensor_object:
+            return self.get_sensor_transfer_function()
+        if self.use_reduced_models:
+            return component.get_reduced_transfer_function()
+        return component.get_transfer_function()
+
+    def get_component_state_space(self, component):
+        """
+        Return the state-space realization of the plant or the sensor, reduced if requested
+        Args:
+            component: Plant or Sensor object
+        Returns:
+            ctrl.StateSpace: Realization of the component
+            error message (str) if the component is invalid
+        """
+        if component is self.plant_object:
+            return self.get_plant_state_space()
+        if component is self.sensor_object:
+            return self.get_sensor_state_space()
+        if self.use_reduced_models:
+            return component.get_reduced_state_space()
+        return component.get_state_space()
+
+    @memoized("plant_transfer_function", sources=("plant", "reduced_models"))
+    def get_plant_transfer_function(self):
+        """
+        Return the transfer function of the plant, reduced if requested, kept until the plant changes
+        Args:
+            None
+        Returns:
+            Transfer function of the plant, or error message (str) if the plant is invalid
+        """
+        if self.use_reduced_models:
+            return self.plant_object.get_reduced_transfer_function()
+        return self.plant_object.get_transfer_function()
+
+    @memoized("sensor_transfer_function", sources=("sensor", "reduced_models"))
+    def get_sensor_transfer_function(self):
+        """
+        Return the transfer function of the sensor, reduced if requested, kept until the sensor changes
+        Args:
+            None
+        Returns:
+            Transfer function of the sensor, or error message (str) if the sensor is invalid
+        """
+        if self.use_reduced_models:
+            return self.sensor_object.get_reduced_transfer_function()
+        return self.sensor_object.get_transfer_function()
+
+    @memoized("plant_state_space", sources=("plant", "reduced_models"))
+    def get_plant_state_space(self):
+        """
+        Return the realization of the plant, reduced if requested, kept until the plant changes
+        Args:
+            None
+        Returns:
+            ctrl.StateSpace: Realization of the plant, or error message (str) if the plant is invalid
+        """
+        if self.use_reduced_models:
+            return self.plant_object.get_reduced_state_space()
+        return self.plant_object.get_state_space()
+
+    @memoized("sensor_state_space", sources=("sensor", "reduced_models"))
+    def get_sensor_state_space(self):
+        """
+        Return the realization of the sensor, reduced if requested, kept until the sensor changes
+        Args:
+            None
+        Returns:
+            ctrl.StateSpace: Realization of the sensor, or error message (str) if the sensor is invalid
+        """
+        if self.use_reduced_models:
+            return self.sensor_object.get_reduced_state_space()
+        return self.sensor_object.get_state_space()
+
+    @traced("Output.open_loop_state_space")
+    @memoized("open_loop_state_space", sources=("pid",))
+    def get_open_loop_state_space(self):
+        """
+        Realize pid*plant in state space, with the derivative acting on the plant output
+        Args:
+            None
+        Returns:
+            ctrl.StateSpace: Open-loop realization, or None if the plant is invalid or the series is improper
+        """
+        try:
+            plant_ss = self.get_component_state_space(self.get_plant_function())
+            if isinstance(plant_ss, str):
+                return None
+            pid = self.get_pid_function().get_parameters()
+            return ctrl.ss(*pid_series_state_space(pid["kp"], pid["ki"], pid["kd"], plant_ss.A, plant_ss.B, plant_ss.C, plant_ss.D))
+        except Exception as e:
+            #print(f"Error in calculating open-loop state space: {e}")
+            return None
+
     # Métodos de transfer function
-    def get_closed_loop_transfer_function(self):
+    @traced("Output.full_closed_loop")
+    @memoized("full_closed_loop", sources=("pid",))
+    def get_full_closed_loop(self):
         """
-        Calculate the closed-loop transfer function: plant*pid / (1 + plant*pid*sensor)
+        Calculate the closed loop: plant*pid / (1 + plant*pid*sensor), with every state of the components
+        The loop is composed in state space, so high-order plants do not go through polynomial products.
         Args:
             None
         Returns:
-            Closed-loop transfer function object
+            Closed-loop system object (state space, or transfer function for a derivative on a biproper plant)
         """
         try:
+            open_loop = self.get_open_loop_state_space()
+            sensor_ss = self.get_component_state_space(self.get_sensor_function())
+            if open_loop is not None and not isinstance(sensor_ss, str):
+                return ctrl.feedback(open_loop, sensor_ss)
+
+            # The derivative on a biproper plant is improper: only the transfer functions describe it
             pid_tf = self.get_pid_function().get_transfer_function()
-            plant_tf = self.get_plant_function().get_transfer_function()
-            sensor_tf = self.get_sensor_function().get_transfer_function()
+            plant_tf = self.get_component_transfer_function(self.get_plant_function())
+            sensor_tf = self.get_component_transfer_function(self.get_sensor_function())
 
             open_loop = ctrl.series(plant_tf, pid_tf)
             #closed_loop = ctrl.feedback(open_loop, 1)
@@ -93,25 +300,711 @@ class Output:
             #print(f"Error in calculating closed-loop transfer function: {e}")
             return None
 
+    def get_minimal_realization(self, system):
+        """
+        Drop the pole-zero pairs of a system that cancel within the cancellation tolerance
+        Args:
+            system: Single input single output system
+        Returns:
+            Minimal realization of the system (the system itself when nothing cancels)
+        """
+        tolerance = self.graph.get("cancellation_tolerance")
+        with span("PoleZeroAnalysis"):
+            return PoleZeroAnalysis(system, tolerance).get_minimal_realization()
+
+    @traced("Output.pole_zero_analysis")
+    @memoized("pole_zero_analysis", sources=("cancellation_tolerance",))
+    def get_pole_zero_analysis(self):
+        """
+        Analyze the poles and zeros of the full closed loop
+        Args:
+            None
+        Returns:
+            PoleZeroAnalysis: Poles, zeros, near cancellations and minimal realization, or None if the closed loop is not available
+        """
+        try:
+            closed_loop = self.get_full_closed_loop()
+            if closed_loop is None:
+                return None
+            with span("PoleZeroAnalysis"):
+                return PoleZeroAnalysis(closed_loop, self.cancellation_tolerance)
+        except Exception as e:
+            #print(f"Error in analyzing poles and zeros: {e}")
+            return None
+
+    @traced("Output.closed_loop")
+    @memoized("closed_loop")
+    def get_closed_loop_transfer_function(self):
+        """
+        Return the minimal realization of the closed loop, without the pole-zero pairs that cancel,
+        so that every analysis works on the order the response actually has
+        Args:
+            None
+        Returns:
+            Closed-loop system object (state space, or transfer function for a derivative on a biproper plant)
+        """
+        analysis = self.get_pole_zero_analysis()
+        if analysis is None:
+            return None
+        return analysis.get_minimal_realization()
+
+    @traced("Output.open_loop")
+    @memoized("open_loop", sources=("pid",))
     def get_open_loop_transfer_function(self):
         """
-        Calculate the open-loop transfer function
+        Calculate the minimal realization of the open loop pid*plant
         Args:
             None
         Returns:
-            Open-loop transfer function object
+            Open-loop system object (state space, or transfer function for a derivative on a biproper plant)
         """
         try:
+            open_loop = self.get_open_loop_state_space()
+            if open_loop is not None:
+                return self.get_minimal_realization(open_loop)
+
             pid_tf = self.get_pid_function().get_transfer_function()
-            plant_tf = self.get_plant_function().get_transfer_function()
+            plant_tf = self.get_component_transfer_function(self.get_plant_function())
 
             open_loop = ctrl.series(plant_tf, pid_tf)
-            return open_loop
+            return self.get_minimal_realization(open_loop)
         except Exception as e:
             #print(f"Error in calculating open-loop transfer function: {e}")
             return None
 
+    def has_delay(self):
+        """
+        Check whether the plant or the sensor has a transport delay
+        Args:
+            None
+        Returns:
+            bool: True if any loop component is delayed
+        """
+        return any(delay > 0 for delay in self.graph.get("delays"))
+
+    def get_frequency_response_cache(self, omega):
+        """
+        Return the cache of the plant and sensor frequency responses on a grid, created on first use
+        Args:
+            omega (np.ndarray): Frequencies in rad/s
+        Returns:
+            FrequencyResponseCache: Cache for the grid and the current model reduction setting
+        """
+        omega = np.asarray(omega, dtype=float)
+        key = (omega.tobytes(), self.use_reduced_models)
+        if key not in self.frequency_caches:
+            self.frequency_caches[key] = FrequencyResponseCache(self.plant_object, self.sensor_object, omega, self.use_reduced_models)
+        return self.frequency_caches[key]
+
+    @traced("Output.closed_loop_frequency_response")
+    def get_closed_loop_frequency_response(self, omega):
+        """
+        Evaluate the closed loop on the imaginary axis, applying the exact e^{-sT} delay factors.
+        The plant and sensor responses are cached per grid: a gain change only re-evaluates the PID.
+        Args:
+            omega (np.ndarray): Frequencies in rad/s
+        Returns:
+            np.ndarray: Complex closed-loop frequency response, or None if the loop is not available
+        """
+        try:
+            pid = self.get_pid_function().get_parameters()
+            return self.get_frequency_response_cache(omega).get_closed_loop_response(pid["kp"], pid["ki"], pid["kd"])
+        except Exception as e:
+            #print(f"Error in calculating closed-loop frequency response: {e}")
+            return None
+
+    def get_open_loop_frequency_response(self, omega):
+        """
+        Evaluate the loop PID * plant * sensor on the imaginary axis, including the delays
+        Args:
+            omega (np.ndarray): Frequencies in rad/s
+        Returns:
+            np.ndarray: Complex loop response, or None if the loop is not available
+        """
+        try:
+            pid = self.get_pid_function().get_parameters()
+            return self.get_frequency_response_cache(omega).get_open_loop_response(pid["kp"], pid["ki"], pid["kd"])
+        except Exception as e:
+            #print(f"Error in calculating open-loop frequency response: {e}")
+            return None
+
+    @traced("Output.stability_margins")
+    @memoized("stability_margins", sources=("pid", "plant", "sensor", "delays"))
+    def get_stability_margins(self):
+        """
+        Gain and phase margins of the loop PID * plant * sensor, including the delays
+        Args:
+            None
+        Returns:
+            dict: Margins and crossovers (see StabilityMarginAnalyzer.get_margins), or None if the loop is not available
+        """
+        try:
+            margins = StabilityMarginAnalyzer(self.pid_object, self.plant_object, self.sensor_object).get_margins()
+            if isinstance(margins, str):
+                return None
+            return margins
+        except Exception as e:
+            #print(f"Error in calculating stability margins: {e}")
+            return None
+
+    @memoized("loop_polynomials", sources=("pid", "plant", "sensor"))
+    def get_loop_polynomials(self):
+        """
+        Numerator and denominator polynomials of the loop PID * plant * sensor (without the delays)
+        Args:
+            None
+        Returns:
+            tuple: (numerator, denominator) np.ndarray coefficients, highest power first
+        """
+        pid = self.pid_object.get_parameters()
+        plant_num, plant_den = self.plant_object.get_coefficients()
+        sensor_num, sensor_den = self.sensor_object.get_coefficients()
+        numerator = np.polymul(np.polymul([pid["kd"], pid["kp"], pid["ki"]], plant_num), sensor_num)
+        denominator = np.polymul(np.polymul([1.0, 0.0], plant_den), sensor_den)
+        return np.asarray(numerator, dtype=float), np.asarray(denominator, dtype=float)
+
+    @traced("Output.nyquist_contour")
+    @memoized("nyquist_contour", sources=("plant", "sensor", "delays", "cancellation_tolerance"))
+    def get_nyquist_contour(self):
+        """
+        Build the indented, adaptively sampled Nyquist contour of the loop PID * plant * sensor, delays included
+        Args:
+            None
+        Returns:
+            NyquistContour: Contour with its encirclement count, or None if the loop is not available
+        """
+        try:
+            for component in (self.plant_object, self.sensor_object):
+                if isinstance(component.get_transfer_function(), str):
+                    return None
+            numerator, denominator = self.get_loop_polynomials()
+            return NyquistContour(numerator, denominator, self.plant_object.get_delay() + self.sensor_object.get_delay(),
+                                  self.graph.get("cancellation_tolerance"))
+        except Exception as e:
+            #print(f"Error in building the Nyquist contour: {e}")
+            return None
+
+    @memoized("nyquist_stability")
+    def get_nyquist_stability(self):
+        """
+        Closed-loop stability from the encirclements of -1 by the loop, valid with transport delays
+        Args:
+            None
+        Returns:
+            dict: Verdict and counts (see NyquistContour.get_stability), or None if the loop is not available
+        """
+        contour = self.get_nyquist_contour()
+        if contour is None:
+            return None
+        return contour.get_stability()
+
+    def get_nyquist_verdict_text(self, stability):
+        """
+        Format the Nyquist stability verdict for the plot annotation
+        Args:
+            stability (dict): Verdict returned by get_nyquist_stability
+        Returns:
+            str: Verdict with the encirclement and pole counts
+        """
+        if stability["stable"] is None:
+            return 'Stability undecided: the curve passes through -1 or is not resolved'
+        counts = f'N = {stability["encirclements"]} encirclements of -1, P = {stability["open_loop_rhp_poles"]} open-loop RHP poles'
+        if stability["stable"]:
+            return 'Closed loop stable\n' + counts
+        return f'Closed loop unstable: Z = {stability["closed_loop_rhp_poles"]} RHP poles\n' + counts
+
+    @traced("Output.sensitivity_peaks")
+    @memoized("sensitivity_peaks")
+    def get_sensitivity_peaks(self):
+        """
+        Exact peaks of the sensitivity S = 1/(1+L) and complementary sensitivity T = L/(1+L) of the loop
+        L = PID * plant * sensor, from the Hamiltonian bisection on its state-space realization
+        Args:
+            None
+        Returns:
+            dict: 'ms', 'ms_frequency', 'mt' and 'mt_frequency' floats (peaks are inf for an unstable closed loop),
+                  or None if the loop is delayed or not available
+        """
+        try:
+            if self.has_delay():
+                return None
+            open_loop = self.get_open_loop_state_space()
+            sensor_ss = self.get_component_state_space(self.sensor_object)
+            if open_loop is None or isinstance(sensor_ss, str):
+                return None
+            loop = self.get_minimal_realization(ctrl.series(open_loop, sensor_ss))
+            peaks = sensitivity_peaks(loop.A, loop.B, loop.C, loop.D)
+            return {name: float(value[0]) for name, value in peaks.items()}
+        except Exception as e:
+            #print(f"Error in calculating sensitivity peaks: {e}")
+            return None
+
+    def get_margins_text(self, margins):
+        """
+        Format the stability margins for the plot annotations
+        Args:
+            margins (dict): Margins returned by get_stability_margins
+        Returns:
+            str: Gain margin and phase margin with their crossover frequencies
+        """
+        if np.isfinite(margins["gain_margin"]):
+            gain_text = f'GM = {margins["gain_margin_db"]:.2f} dB at {margins["phase_crossover"]:.3g} rad/s'
+        else:
+            gain_text = 'GM = inf (no phase crossover)'
+        if np.isfinite(margins["phase_margin"]):
+            phase_text = f'PM = {margins["phase_margin"]:.2f} deg at {margins["gain_crossover"]:.3g} rad/s'
+        else:
+            phase_text = 'PM = inf (no gain crossover)'
+        return gain_text + "\n" + phase_text
+
+    def is_closed_loop_stable(self, closed_loop=None):
+        """
+        Check from the closed-loop poles that the response cannot diverge (transport delays are not represented)
+        Args:
+            closed_loop: Closed-loop system, built from the components if None
+        Returns:
+            bool: True if every pole lies in the open left half-plane, None if the closed loop is not available
+        """
+        try:
+            if closed_loop is None:
+                closed_loop = self.get_closed_loop_transfer_function()
+            if closed_loop is None:
+                return None
+            with span("ctrl.poles"):
+                return is_asymptotically_stable(ctrl.poles(closed_loop))
+        except Exception as e:
+            #print(f"Error in checking closed-loop stability: {e}")
+            return None
+
+    @traced("Output.simulate_delayed_loop")
+    def simulate_delayed_loop(self, reference, divergence_bound=None):
+        """
+        Simulate the loop with delay lines for the given reference samples
+        Args:
+            reference (np.ndarray): Reference value at every sample
+            divergence_bound (float): Stop once the output magnitude exceeds this value, never if None
+        Returns:
+            np.ndarray: Plant output at every sample (up to the divergence), or None if the loop is not available
+        """
+        try:
+            sample_time = self.input_params.get_parameters()["sample_time"]
+            simulator = LoopSimulator(self.pid_object, self.plant_object, self.sensor_object, sample_time)
+            return simulator.simulate(reference, divergence_bound)
+        except Exception as e:
+            #print(f"Error in simulating delayed loop: {e}")
+            return None
+
+    @traced("Output.modal_response")
+    @memoized("modal_response")
+    def get_modal_response(self):
+        """
+        Return the partial-fraction expansion of the closed loop
+        Args:
+            None
+        Returns:
+            ModalResponse: Closed-form evaluator of the closed loop, or None if the loop is delayed, improper or not available
+        """
+        try:
+            if self.has_delay():
+                return None
+            closed_loop = self.get_closed_loop_transfer_function()
+            if closed_loop is None:
+                return None
+            return ModalResponse(closed_loop)
+        except Exception as e:
+            #print(f"Error in expanding the closed loop: {e}")
+            return None
+
+    def evaluate_step_response(self, t):
+        """
+        Evaluate the step response described by the input parameters exactly at arbitrary times
+        Args:
+            t (np.ndarray): Times in seconds
+        Returns:
+            np.ndarray: Response at every time, or None if the closed loop has no closed form (delay, improper)
+        """
+        modal_response = self.get_modal_response()
+        if modal_response is None:
+            return None
+        params = self.input_params.get_parameters()
+        amplitude = params["final_value"] - params["initial_value"]
+        return params["initial_value"] + amplitude * modal_response.step(np.asarray(t, dtype=float) - params["step_time"])
+
+    def evaluate_impulse_response(self, t):
+        """
+        Evaluate the response to a unit impulse at the step time exactly at arbitrary times
+        Args:
+            t (np.ndarray): Times in seconds
+        Returns:
+            np.ndarray: Response at every time, or None if the closed loop has no closed form (delay, improper)
+        """
+        modal_response = self.get_modal_response()
+        if modal_response is None:
+            return None
+        return modal_response.impulse(np.asarray(t, dtype=float) - self.input_params.get_parameters()["step_time"])
+
+    def attach_exact_rerender(self, ax, line, evaluate):
+        """
+        Redraw a time response from its closed form whenever the visible time window changes,
+        so zooming in shows the exact curve instead of the interpolated samples
+        Args:
+            ax: Matplotlib axes holding the curve
+            line: Matplotlib line of the curve
+            evaluate (callable): Exact response at an array of times, evaluate_step_response or evaluate_impulse_response
+        Returns:
+            None
+        """
+        def on_xlim_changed(axes):
+            start, stop = axes.get_xlim()
+            t = np.linspace(max(start, 0.0), max(stop, 0.0), ZOOM_POINTS)
+            with span("Output.exact_rerender"):
+                values = evaluate(t)
+            if values is not None:
+                line.set_data(t, values)
+
+        ax.callbacks.connect('xlim_changed', on_xlim_changed)
+
+    # -------------------------------------- Response Data Methods --------------------------------------
+    @traced("Output.step_response_data")
+    @memoized("step_response", sources=("pid", "plant", "sensor", "input", "divergence_bound"))
+    def get_step_response_result(self):
+        """
+        Calculate the linear closed-loop response to the step described by the input parameters.
+        Stability is checked from the closed-loop poles first: unstable loops are simulated in chunks
+        and stopped once the response exceeds the divergence bound.
+        Args:
+            None
+        Returns:
+            dict: 't' and 'response' arrays (truncated if the response diverged), 'stable' (bool, None for
+                  delayed loops that did not diverge) and 'diverged' (bool), or None if the closed loop is not available
+        """
+        closed_loop_tf = self.get_closed_loop_transfer_function()
+        if closed_loop_tf is None:
+            print("No closed-loop transfer function available")
+            return None
+
+        # Get input parameters
+        params = self.input_params.get_parameters()
+        step_time = params["step_time"]
+        initial_value = params["initial_value"]
+        final_value = params["final_value"]
+        total_time = params["total_time"]
+        sample_time = params["sample_time"]
+
+        # Create time vector
+        num_points = int(total_time / sample_time) + 1
+        t = np.linspace(0, total_time, num_points)
+
+        # Create the custom response
+        response = np.full_like(t, initial_value)
+        step_index = np.argmax(t >= step_time)
+        amplitude = final_value - initial_value
+        bound = self.divergence_bound * max(abs(amplitude), np.finfo(float).tiny)
+
+        if self.has_delay():
+            # Dead time in the loop: simulate the deviation from the initial value with delay lines
+            reference = np.where(t >= step_time, amplitude, 0.0)
+            y_delayed = self.simulate_delayed_loop(reference, bound)
+            if y_delayed is None:
+                return None
+            diverged = len(y_delayed) < len(t)
+            return {"t": t[:len(y_delayed)], "response": initial_value + y_delayed,
+                    "stable": False if diverged else None, "diverged": diverged}
+
+        stable = self.is_closed_loop_stable(closed_loop_tf)
+        diverged = False
+        if step_index < len(t):
+            step_duration = total_time - step_time
+            step_time_points = int(step_duration / sample_time) + 1
+            t_step = np.linspace(0, step_duration, step_time_points)
+
+            if stable or step_time_points < 2:
+                with span("ctrl.step_response"):
+                    _, y_step_actual = ctrl.step_response(closed_loop_tf, T=t_step)
+            else:
+                with span("Output.step_until_divergence"):
+                    y_step_actual, diverged = step_response_until_divergence(closed_loop_tf, t_step, self.divergence_bound)
+
+            y_step_actual = y_step_actual[:len(response[step_index:])]
+            response[step_index:step_index + len(y_step_actual)] = initial_value + amplitude * y_step_actual
+            if diverged:
+                t = t[:step_index + len(y_step_actual)]
+                response = response[:len(t)]
+
+        return {"t": t, "response": response, "stable": stable, "diverged": diverged}
+
+    def get_step_response_data(self):
+        """
+        Calculate the linear closed-loop response to the step described by the input parameters
+        Args:
+            None
+        Returns:
+            tuple: (t, response) numpy arrays, truncated if the response diverged, or None if the closed loop is not available
+        """
+        result = self.get_step_response_result()
+        if result is None:
+            return None
+        return result["t"], result["response"]
+
+    @traced("Output.impulse_response_data")
+    @memoized("impulse_response", sources=("pid", "plant", "sensor", "input"))
+    def get_impulse_response_data(self):
+        """
+        Calculate the closed-loop response to a unit impulse at the step time of the input parameters
+        Args:
+            None
+        Returns:
+            tuple: (t, response) numpy arrays, or None if the closed loop is not available
+        """
+        closed_loop_tf = self.get_closed_loop_transfer_function()
+        if closed_loop_tf is None:
+            print("No closed-loop transfer function available")
+            return None
+
+        params = self.input_params.get_parameters()
+        step_time = params["step_time"]
+        total_time = params["total_time"]
+        sample_time = params["sample_time"]
+
+        # Create time vector from 0 to total_time
+        num_points = int(total_time / sample_time) + 1
+        t = np.linspace(0, total_time, num_points)
+
+        # Find the index where the impulse occurs
+        impulse_index = np.argmax(t >= step_time)
+
+        if self.has_delay():
+            # Unit-area pulse of one sample fed through the delayed loop
+            reference = np.zeros_like(t)
+            reference[impulse_index] = 1.0 / (t[1] - t[0])
+            response = self.simulate_delayed_loop(reference)
+            if response is None:
+                return None
+        else:
+            # Calculate impulse response (siempre comienza en t=0)
+            with span("ctrl.impulse_response"):
+                _, y_impulse = ctrl.impulse_response(closed_loop_tf, T=t)
+
+            # Shift the impulse to step_time
+            # Create a shifted response array
+            response = np.zeros_like(t)
+
+            if impulse_index < len(t):
+                # Copy the shifted impulse response
+                remaining_points = len(t) - impulse_index
+                response[impulse_index:impulse_index + len(y_impulse)] = y_impulse[:remaining_points]
+        return t, response
+
+    @traced("Output.nonlinear_step_response_data")
+    @memoized("nonlinear_step_response", sources=("pid", "plant", "sensor", "input"))
+    def get_nonlinear_step_response_data(self):
+        """
+        Simulate the nonlinear Ball and Beam closed loop on the step described by the input parameters
+        Args:
+            None
+        Returns:
+            dict: 't', 'positions' and 'beam_angles' arrays and 'max_beam_angle' (rad, None without saturation)
+            error message (str) if the nonlinear model cannot be simulated
+        """
+        nonlinear_model = BallAndBeamNonlinearModel(self.plant_object)
+        result = nonlinear_model.simulate_closed_loop(self.pid_object, self.sensor_object, self.input_params)
+        if isinstance(result, str):
+            return result
+        t, positions, beam_angles = result
+        return {"t": t, "positions": positions, "beam_angles": beam_angles, "max_beam_angle": nonlinear_model.max_beam_angle}
+
+    @traced("Output.reference_response_data")
+    @memoized("reference_response", sources=("pid", "plant", "sensor", "input"))
+    def get_reference_response_data(self):
+        """
+        Simulate the closed loop against the configured reference signal in a single forced-response pass
+        Args:
+            None
+        Returns:
+            tuple: (t, reference, response) numpy arrays, or None if the closed loop is not available
+        """
+        closed_loop_tf = self.get_closed_loop_transfer_function()
+        if closed_loop_tf is None:
+            print("No closed-loop transfer function available")
+            return None
+
+        params = self.input_params.get_parameters()
+        total_time = params["total_time"]
+        sample_time = params["sample_time"]
+
+        num_points = int(total_time / sample_time) + 1
+        t = np.linspace(0, total_time, num_points)
+        reference = self.input_params.generate_reference(t)
+
+        if self.has_delay():
+            response = self.simulate_delayed_loop(reference)
+            if response is None:
+                return None
+        else:
+            with span("ctrl.forced_response"):
+                _, response = ctrl.forced_response(closed_loop_tf, T=t, U=reference)
+
+        return t, reference, response
+
+    @traced("Output.loop_signals_data")
+    @memoized("loop_signals", sources=("pid", "plant", "sensor", "input", "divergence_bound"))
+    def get_loop_signals_data(self):
+        """
+        Simulate the step described by the input parameters once and return every loop signal.
+        The plant output, control effort, error and sensor output come from a single propagation of
+        the loop state (see loop_signals_state_space), the delay-line simulation for delayed loops.
+        Output and sensor start at the initial value, control and error are deviations from rest.
+        Args:
+            None
+        Returns:
+            dict: 't', 'reference', 'output', 'control', 'error' and 'sensor' arrays (truncated if the
+                  output diverged), 'control_impulse' (impulse area in u at the step, not in the samples),
+                  'diverged' (bool) and 'metrics' (float per LOOP_SIGNAL_METRIC_DESCRIPTIONS entry),
+                  or None if the loop is not available or the control effort is improper
+        """
+        try:
+            params = self.input_params.get_parameters()
+            step_time = params["step_time"]
+            initial_value = params["initial_value"]
+            total_time = params["total_time"]
+            sample_time = params["sample_time"]
+            amplitude = params["final_value"] - initial_value
+            bound = self.divergence_bound * max(abs(amplitude), np.finfo(float).tiny)
+
+            num_points = int(total_time / sample_time) + 1
+            t = np.linspace(0, total_time, num_points)
+            step_index = np.argmax(t >= step_time) if np.any(t >= step_time) else len(t)
+            signals = {name: np.zeros_like(t) for name in LOOP_SIGNALS}
+            control_impulse = 0.0
+
+            if self.has_delay():
+                reference = np.where(t >= step_time, amplitude, 0.0)
+                simulated = LoopSimulator(self.pid_object, self.plant_object, self.sensor_object, sample_time).simulate_signals(reference, bound)
+                samples = len(simulated["output"])
+                for name in LOOP_SIGNALS:
+                    signals[name] = simulated[name]
+            else:
+                plant_ss = self.get_component_state_space(self.plant_object)
+                sensor_ss = self.get_component_state_space(self.sensor_object)
+                if isinstance(plant_ss, str) or isinstance(sensor_ss, str):
+                    return None
+                pid = self.pid_object.get_parameters()
+                system, jump, unit_impulse = loop_signals_state_space(pid["kp"], pid["ki"], pid["kd"], plant_ss, sensor_ss)
+                samples = len(t)
+                t_step = t[step_index:] - step_time
+                if len(t_step) >= 2:
+                    control_impulse = amplitude * unit_impulse
+                    with span("ctrl.forced_response"), np.errstate(over='ignore', invalid='ignore'):
+                        values = ctrl.forced_response(system, T=t_step, U=np.full_like(t_step, amplitude), X0=amplitude * jump).outputs
+                    for name, row in zip(LOOP_SIGNALS, values):
+                        signals[name][step_index:] = row
+                    divergent = first_divergent_index(values[0], bound)
+                    if divergent is not None:
+                        samples = step_index + divergent + 1
+
+            diverged = samples < len(t)
+            t = t[:samples]
+            data = {name: signal[:samples] for name, signal in signals.items()}
+            data["output"] = initial_value + data["output"]
+            data["sensor"] = initial_value + data["sensor"]
+            data["reference"] = np.where(t >= step_time, initial_value + amplitude, initial_value)
+            metrics = compute_loop_signal_metrics(t, data["control"], data["error"], step_time, control_impulse)
+            data.update({"t": t, "control_impulse": control_impulse, "diverged": diverged,
+                         "metrics": {name: float(value[0]) for name, value in metrics.items()}})
+            return data
+        except Exception as e:
+            #print(f"Error in simulating the loop signals: {e}")
+            return None
+
+    @traced("Output.bode_data")
+    def get_bode_data(self, omega=BODE_OMEGA):
+        """
+        Calculate the closed-loop Bode magnitude and phase, including the delays
+        Args:
+            omega (np.ndarray): Frequencies in rad/s
+        Returns:
+            tuple: (omega, magnitude_db, phase_deg) numpy arrays, or None if the closed loop is not available
+        """
+        frequency_response = self.get_closed_loop_frequency_response(omega)
+        if frequency_response is None:
+            return None
+        with np.errstate(divide='ignore'):
+            magnitude_db = 20 * np.log10(np.abs(frequency_response))
+        return np.asarray(omega), magnitude_db, np.degrees(np.unwrap(np.angle(frequency_response)))
+
+    @traced("Output.nyquist_data")
+    def get_nyquist_data(self):
+        """
+        Points of the plotted Nyquist contour of the loop PID * plant * sensor, delays included
+        Args:
+            None
+        Returns:
+            tuple: (s, response, segments) numpy arrays of the upper half of the contour, s and response are complex,
+                   segments gives the contour segment of every point, or None if the loop is not available
+        """
+        contour = self.get_nyquist_contour()
+        if contour is None:
+            return None
+        return contour.get_curve()
+
+    @traced("Output.root_locus_data")
+    @memoized("root_locus")
+    def get_root_locus_data(self):
+        """
+        Calculate the branches of the root locus of the open loop pid*plant
+        Args:
+            None
+        Returns:
+            tuple: (gains, loci) numpy arrays, loci[i, j] is the complex position of branch j at gains[i],
+                   or None if the open loop is not available
+        """
+        open_loop_tf = self.get_open_loop_transfer_function()
+        if open_loop_tf is None:
+            return None
+        try:
+            with span("ctrl.root_locus_map"):
+                locus = ctrl.root_locus_map(open_loop_tf)
+            return np.asarray(locus.gains), np.atleast_2d(locus.loci)
+        except Exception as e:
+            #print(f"Error in calculating root locus: {e}")
+            return None
+
+    @traced("Output.pole_zero_data")
+    @memoized("pole_zero_data")
+    def get_pole_zero_data(self):
+        """
+        Calculate the closed-loop poles and zeros (transport delays are not represented)
+        Args:
+            None
+        Returns:
+            tuple: (poles, zeros) complex numpy arrays, or None if the closed loop is not available
+        """
+        closed_loop_tf = self.get_closed_loop_transfer_function()
+        if closed_loop_tf is None:
+            return None
+        with span("ctrl.poles_zeros"):
+            return ctrl.poles(closed_loop_tf), ctrl.zeros(closed_loop_tf)
+
+    @traced("Output.auto_time_parameters")
+    def get_auto_time_parameters(self, step_time=None):
+        """
+        Choose the total time and sample time of the simulation from the closed-loop poles and zeros
+        Args:
+            step_time (float): Time at which the step is applied, the one of the input parameters if None
+        Returns:
+            dict: total_time and sample_time in seconds, or None if the closed loop is not available
+        """
+        pole_zero_data = self.get_pole_zero_data()
+        if pole_zero_data is None:
+            return None
+        poles, zeros = pole_zero_data
+        if step_time is None:
+            step_time = self.input_params.get_parameters()["step_time"]
+        delay = self.plant_object.get_delay() + self.sensor_object.get_delay()
+        return suggest_time_parameters(poles, zeros, step_time, delay, self.cancellation_tolerance)
+
     # -------------------------------------- Plotting Methods     --------------------------------------
+    @traced("Output.plot_step_response")
     def plot_step_response(self):
         """
         Plot Step Response and return the matplotlib Figure
@@ -121,52 +1014,27 @@ class Output:
             Matplotlib Figure object with the step response plot
         """
         try:
-            closed_loop_tf = self.get_closed_loop_transfer_function()
-            if closed_loop_tf is None:
-                print("No closed-loop transfer function available")
+            step_result = self.get_step_response_result()
+            if step_result is None:
                 return None
+            t, response = step_result["t"], step_result["response"]
 
-            # Get input parameters
             params = self.input_params.get_parameters()
             step_time = params["step_time"]
-            initial_value = params["initial_value"]
-            final_value = params["final_value"]
             total_time = params["total_time"]
-            sample_time = params["sample_time"]
-            
+
             # Get PID parameters for title
             pid_params = self.pid_object.get_parameters()
             kp = pid_params["kp"]
             ki = pid_params["ki"]
             kd = pid_params["kd"]
-            
-            # Create time vector
-            num_points = int(total_time / sample_time) + 1
-            t = np.linspace(0, total_time, num_points)
-            
-            # Calculate step response
-            _, y_step = ctrl.step_response(closed_loop_tf, T=t)
-            
-            # Create the custom response
-            response = np.full_like(t, initial_value)
-            step_index = np.argmax(t >= step_time)
-            
-            if step_index < len(t):
-                step_duration = total_time - step_time
-                step_time_points = int(step_duration / sample_time) + 1
-                t_step = np.linspace(0, step_duration, step_time_points)
-                
-                _, y_step_actual = ctrl.step_response(closed_loop_tf, T=t_step)
-                
-                amplitude = final_value - initial_value
-                response[step_index:] = initial_value + amplitude * y_step_actual[:len(response[step_index:])]
-            
+
             # Create figure
             fig = Figure(dpi=80)
             ax = fig.add_subplot(111)
             
             # Plot
-            ax.plot(t, response, 'b-', linewidth=2)
+            line, = ax.plot(t, response, 'b-', linewidth=2)
             ax.set_title(f'Step Response (Kp={kp}, Ki={ki}, Kd={kd})', pad=20)
             ax.set_xlabel('Time (s)')
             ax.set_ylabel('Amplitude')
@@ -177,14 +1045,137 @@ class Output:
             ax.axvline(x=step_time, color='r', linestyle='--', alpha=0.7, label=f'Step at {step_time}s')
             ax.legend()
             ax.set_xlim(0, total_time)
+            if not step_result["diverged"] and self.get_modal_response() is not None:
+                self.attach_exact_rerender(ax, line, self.evaluate_step_response)
+
+            # Unstable loops: say so, and where the simulation was stopped
+            if step_result["diverged"]:
+                ax.text(0.02, 0.95, f'Unstable: response diverged, simulation stopped at {t[-1]:.4g}s',
+                        transform=ax.transAxes, color='r', verticalalignment='top')
+            elif step_result["stable"] is False:
+                ax.text(0.02, 0.95, 'Unstable closed loop (poles on or right of the imaginary axis)',
+                        transform=ax.transAxes, color='r', verticalalignment='top')
             
-            fig.tight_layout()
+            with span("Figure.tight_layout"):
+                fig.tight_layout()
             return fig
 
         except Exception as e:
             #print(f"Error plotting step response: {e}")
             return None
 
+    @traced("Output.plot_reference_response")
+    def plot_reference_response(self):
+        """
+        Plot the response to the configured reference signal and return the matplotlib Figure
+        Args:
+            None
+        Returns:
+            Matplotlib Figure object with the reference and the output
+        """
+        try:
+            response_data = self.get_reference_response_data()
+            if response_data is None:
+                return None
+            t, reference, response = response_data
+
+            # Get PID parameters for title
+            pid_params = self.pid_object.get_parameters()
+            kp = pid_params["kp"]
+            ki = pid_params["ki"]
+            kd = pid_params["kd"]
+
+            # Create figure
+            fig = Figure(dpi=80)
+            ax = fig.add_subplot(111)
+
+            # Plot
+            ax.plot(t, reference, 'k--', linewidth=1.5, alpha=0.7, label=f'Reference ({self.input_params.get_signal_type()})')
+            ax.plot(t, response, 'b-', linewidth=2, label='Output')
+            ax.set_title(f'Reference Response (Kp={kp}, Ki={ki}, Kd={kd})', pad=20)
+            ax.set_xlabel('Time (s)')
+            ax.set_ylabel('Amplitude')
+            ax.grid(True, linestyle='--', alpha=0.7)
+            ax.set_facecolor((0.95, 0.95, 0.95))
+            ax.legend()
+            ax.set_xlim(0, t[-1])
+
+            with span("Figure.tight_layout"):
+                fig.tight_layout()
+            return fig
+
+        except Exception as e:
+            #print(f"Error plotting reference response: {e}")
+            return None
+
+    @traced("Output.plot_nonlinear_step_response")
+    def plot_nonlinear_step_response(self):
+        """
+        Plot the nonlinear Ball and Beam step response next to the linearized one
+        Args:
+            None
+        Returns:
+            Matplotlib Figure object with both step responses
+        """
+        try:
+            step_data = self.get_step_response_data()
+            if step_data is None:
+                return None
+            t_linear, linear_response = step_data
+
+            result = self.get_nonlinear_step_response_data()
+            if isinstance(result, str):
+                print(result)
+                return None
+            t, positions, beam_angles = result["t"], result["positions"], result["beam_angles"]
+
+            params = self.input_params.get_parameters()
+            step_time = params["step_time"]
+            total_time = params["total_time"]
+
+            # Get PID parameters for title
+            pid_params = self.pid_object.get_parameters()
+            kp = pid_params["kp"]
+            ki = pid_params["ki"]
+            kd = pid_params["kd"]
+
+            # Create figure
+            fig = Figure(figsize=(10, 8), dpi=80)
+            ax1 = fig.add_subplot(211)
+            ax2 = fig.add_subplot(212, sharex=ax1)
+
+            # Ball position, linear vs nonlinear
+            ax1.plot(t_linear, linear_response, 'b--', linewidth=2, label='Linearized')
+            ax1.plot(t, positions[0], 'm-', linewidth=2, label='Nonlinear')
+            ax1.set_title(f'Nonlinear Step Response (Kp={kp}, Ki={ki}, Kd={kd})', pad=20)
+            ax1.set_ylabel('Ball position (m)')
+            ax1.grid(True, linestyle='--', alpha=0.7)
+            ax1.set_facecolor((0.95, 0.95, 0.95))
+            ax1.axvline(x=step_time, color='r', linestyle='--', alpha=0.7, label=f'Step at {step_time}s')
+            ax1.legend()
+
+            # Beam angle with its saturation limits
+            ax2.plot(t, np.degrees(beam_angles[0]), 'g-', linewidth=2, label='Beam angle')
+            if result["max_beam_angle"] is not None:
+                limit = np.degrees(result["max_beam_angle"])
+                ax2.axhline(limit, color='k', linestyle=':', alpha=0.7, label='Saturation')
+                ax2.axhline(-limit, color='k', linestyle=':', alpha=0.7)
+            ax2.set_xlabel('Time (s)')
+            ax2.set_ylabel('Beam angle (deg)')
+            ax2.grid(True, linestyle='--', alpha=0.7)
+            ax2.set_facecolor((0.95, 0.95, 0.95))
+            ax2.legend()
+            ax2.set_xlim(0, total_time)
+
+            with span("Figure.tight_layout"):
+                fig.tight_layout()
+            return fig
+
+        except Exception as e:
+            #print(f"Error plotting nonlinear step response: {e}")
+            return None
+
+    @traced("Output.plot_impulse_response")
     def plot_impulse_response(self):
         """
         Plot Impulse Response and return the matplotlib Figure
@@ -194,48 +1185,27 @@ class Output:
             Matplotlib Figure object with the impulse response plot
         """
         try:
-            closed_loop_tf = self.get_closed_loop_transfer_function()
-            if closed_loop_tf is None:
-                print("No closed-loop transfer function available")
+            impulse_data = self.get_impulse_response_data()
+            if impulse_data is None:
                 return None
+            t, response = impulse_data
 
-            # Get relevant input parameters
             params = self.input_params.get_parameters()
             step_time = params["step_time"]
             total_time = params["total_time"]
-            sample_time = params["sample_time"]
-            
+
             # Get PID parameters for title
             pid_params = self.pid_object.get_parameters()
             kp = pid_params["kp"]
             ki = pid_params["ki"]
             kd = pid_params["kd"]
-            
-            # Create time vector from 0 to total_time
-            num_points = int(total_time / sample_time) + 1
-            t = np.linspace(0, total_time, num_points)
-            
-            # Calculate impulse response (siempre comienza en t=0)
-            _, y_impulse = ctrl.impulse_response(closed_loop_tf, T=t)
-            
-            # Shift the impulse to step_time
-            # Create a shifted response array
-            response = np.zeros_like(t)
-            
-            # Find the index where the impulse occurs
-            impulse_index = np.argmax(t >= step_time)
-            
-            if impulse_index < len(t):
-                # Copy the shifted impulse response
-                remaining_points = len(t) - impulse_index
-                response[impulse_index:impulse_index + len(y_impulse)] = y_impulse[:remaining_points]
-            
+
             # Create figure
             fig = Figure(figsize=(10, 6), dpi=80)
             ax = fig.add_subplot(111)
             
             # Plot
-            ax.plot(t, response, 'r-', linewidth=2)
+            line, = ax.plot(t, response, 'r-', linewidth=2)
             ax.set_title(f'Impulse Response (Kp={kp}, Ki={ki}, Kd={kd})', pad=20)
             ax.set_xlabel('Time (s)')
             ax.set_ylabel('Amplitude')
@@ -248,9 +1218,12 @@ class Output:
 
             # Set appropriate limits
             ax.set_xlim(0, total_time)
+            if self.get_modal_response() is not None:
+                self.attach_exact_rerender(ax, line, self.evaluate_impulse_response)
             
             # Adjust design
-            fig.tight_layout()
+            with span("Figure.tight_layout"):
+                fig.tight_layout()
             
             #print(f"Impulse response: impulse_time={step_time}, total_time={total_time}")
             return fig
@@ -259,6 +1232,71 @@ class Output:
             #print(f"Error plotting impulse response: {e}")
             return None
 
+    @traced("Output.plot_loop_signals")
+    def plot_loop_signals(self):
+        """
+        Plot the plant output, sensor output, error and control effort of the step on shared time axes
+        Args:
+            None
+        Returns:
+            Matplotlib Figure object with the loop signals and the control effort metrics
+        """
+        try:
+            data = self.get_loop_signals_data()
+            if data is None:
+                return None
+            t = data["t"]
+            params = self.input_params.get_parameters()
+            step_time = params["step_time"]
+
+            pid_params = self.pid_object.get_parameters()
+            kp = pid_params["kp"]
+            ki = pid_params["ki"]
+            kd = pid_params["kd"]
+
+            fig = Figure(figsize=(10, 8), dpi=80)
+            ax_output, ax_error, ax_control = fig.subplots(3, 1, sharex=True)
+
+            ax_output.plot(t, data["reference"], 'k--', linewidth=1.5, label='Reference r')
+            ax_output.plot(t, data["output"], 'b-', linewidth=2, label='Output y')
+            ax_output.plot(t, data["sensor"], 'g-', linewidth=1.5, alpha=0.8, label='Sensor output')
+            ax_output.set_title(f'Loop Signals (Kp={kp}, Ki={ki}, Kd={kd})', pad=20)
+            ax_output.set_ylabel('Amplitude')
+
+            ax_error.plot(t, data["error"], 'm-', linewidth=2, label='Error e')
+            ax_error.set_ylabel('Error')
+
+            ax_control.plot(t, data["control"], 'r-', linewidth=2, label='Control effort u')
+            ax_control.set_ylabel('Control')
+            ax_control.set_xlabel('Time (s)')
+
+            for ax in (ax_output, ax_error, ax_control):
+                ax.axvline(x=step_time, color='gray', linestyle=':', alpha=0.7)
+                ax.grid(True, linestyle='--', alpha=0.7)
+                ax.set_facecolor((0.95, 0.95, 0.95))
+                ax.legend(loc='upper right')
+            ax_control.set_xlim(0, params["total_time"])
+
+            metrics = data["metrics"]
+            lines = [f'{LOOP_SIGNAL_METRIC_DESCRIPTIONS[name]}: {metrics[name]:.4g}'
+                     for name in ('peak_control', 'rms_control', 'iae')]
+            if data["control_impulse"] != 0:
+                lines.append(f'{LOOP_SIGNAL_METRIC_DESCRIPTIONS["control_impulse"]}: {data["control_impulse"]:.4g}')
+            ax_control.text(0.02, 0.95, "\n".join(lines), transform=ax_control.transAxes, verticalalignment='top',
+                            bbox=dict(facecolor='white', alpha=0.8), fontsize=9)
+            if data["diverged"]:
+                ax_output.text(0.02, 0.95, f'Unstable: output diverged, simulation stopped at {t[-1]:.4g}s',
+                               transform=ax_output.transAxes, color='r', verticalalignment='top')
+
+            with span("Figure.tight_layout"):
+                fig.tight_layout()
+            return fig
+
+        except Exception as e:
+            #print(f"Error plotting loop signals: {e}")
+            return None
+
+    @traced("Output.plot_bode")
     def plot_bode(self):
         """
         Plot Bode diagram and return the matplotlib Figure
@@ -280,11 +1318,11 @@ class Output:
             ki = pid_params["ki"]
             kd = pid_params["kd"]
 
-            # Generate frequency range
-            omega = np.logspace(-2, 3, 1000)
-            
-            # Calculate Bode data using control library
-            magnitude, phase, omega = ctrl.bode(closed_loop_tf, omega=omega, plot=False, deg=False)
+            # Calculate Bode data, including the exact delay factors
+            bode_data = self.get_bode_data()
+            if bode_data is None:
+                return None
+            omega, magnitude_db, phase_deg = bode_data
             
             # Create figure with subplots
             fig = Figure(figsize=(10, 8), dpi=80)
@@ -294,24 +1332,52 @@ class Output:
             ax2 = fig.add_subplot(212)
 
             # Magnitude plot (convert to dB)
-            ax1.semilogx(omega, 20 * np.log10(magnitude), 'b-', linewidth=2)
+            ax1.semilogx(omega, magnitude_db, 'b-', linewidth=2, label='Closed loop')
             ax1.set_title(f'Bode Diagram (Kp={kp}, Ki={ki}, Kd={kd})', pad=20)
             ax1.set_ylabel('Magnitude [dB]')
             ax1.grid(True, linestyle='--', alpha=0.7)
             
             # Phase plot (convert to degrees)
-            ax2.semilogx(omega, np.degrees(phase), 'r-', linewidth=2)
+            ax2.semilogx(omega, phase_deg, 'r-', linewidth=2, label='Closed loop')
             ax2.set_ylabel('Phase [deg]')
             ax2.set_xlabel('Frequency [rad/s]')
             ax2.grid(True, linestyle='--', alpha=0.7)
 
-            fig.tight_layout()
+            # Stability margins are read on the loop PID * plant * sensor
+            margins = self.get_stability_margins()
+            if margins is not None:
+                loop_response = self.get_open_loop_frequency_response(omega)
+                loop_phase = np.degrees(np.unwrap(np.angle(loop_response)))
+                ax1.semilogx(omega, 20 * np.log10(np.abs(loop_response)), color='gray', linestyle='--', linewidth=1.5, label='Loop C·P·S')
+                ax2.semilogx(omega, loop_phase, color='gray', linestyle='--', linewidth=1.5, label='Loop C·P·S')
+                ax1.axhline(0, color='k', linewidth=0.8, alpha=0.5)
+
+                if np.isfinite(margins["gain_margin"]):
+                    ax1.vlines(margins["phase_crossover"], -margins["gain_margin_db"], 0, colors='g', linewidth=2, label='Gain margin')
+                if np.isfinite(margins["phase_margin"]):
+                    crossover_phase = np.interp(np.log(margins["gain_crossover"]), np.log(omega), loop_phase)
+                    ax2.vlines(margins["gain_crossover"], crossover_phase - margins["phase_margin"], crossover_phase, colors='g', linewidth=2, label='Phase margin')
+                    ax2.axhline(crossover_phase - margins["phase_margin"], color='k', linewidth=0.8, alpha=0.5)
+
+                margins_text = self.get_margins_text(margins)
+                peaks = self.get_sensitivity_peaks()
+                if peaks is not None and np.isfinite(peaks["ms"]):
+                    margins_text += (f'\nMs = {peaks["ms"]:.3f} at {peaks["ms_frequency"]:.3g} rad/s'
+                                     f'\nMt = {peaks["mt"]:.3f} at {peaks["mt_frequency"]:.3g} rad/s')
+                ax1.text(0.02, 0.05, margins_text, transform=ax1.transAxes,
+                         bbox=dict(facecolor='white', alpha=0.8), fontsize=9)
+            ax1.legend(loc='upper right', fontsize=8)
+            ax2.legend(loc='upper right', fontsize=8)
+
+            with span("Figure.tight_layout"):
+                fig.tight_layout()
             return fig
 
         except Exception as e:
             #print(f"Error plotting Bode diagram: {e}")
             return None
 
+    @traced("Output.plot_nyquist")
     def plot_nyquist(self):
         """
         Plot Nyquist diagram and return the matplotlib Figure
@@ -321,11 +1387,10 @@ class Output:
             Matplotlib Figure object with the Nyquist plot
         """
         try:
-            # Get transfer function from output
-            closed_loop_tf = self.get_closed_loop_transfer_function()
-            if closed_loop_tf is None:
-                print("No closed-loop transfer function available")
+            contour = self.get_nyquist_contour()
+            if contour is None:
                 return None
+            _, response, _ = contour.get_curve()
 
             # Get PID parameters for title
             pid_params = self.pid_object.get_parameters()
@@ -337,24 +1402,48 @@ class Output:
             fig = Figure(figsize=(8, 8), dpi=80)
             ax = fig.add_subplot(111)
 
-            # Use control's built-in nyquist_plot
-            ctrl.nyquist_plot(closed_loop_tf, 
-                            omega_limits=(1e-2, 1e2),
-                            omega_num=500,
-                            plot=True,
-                            ax=ax)
+            # Loop C·P·S on the indented contour; the arcs at infinity are drawn clipped on a circle
+            magnitude = np.abs(response)
+            clipped = magnitude > NYQUIST_MAX_MAGNITUDE
+            with np.errstate(invalid='ignore', divide='ignore'):
+                shown = np.where(clipped, response / magnitude * NYQUIST_MAX_MAGNITUDE, response)
+            inside = np.where(clipped, np.nan, shown)
+            outside = np.where(clipped | np.append(clipped[1:], False) | np.insert(clipped[:-1], 0, False), shown, np.nan)
+            ax.plot(inside.real, inside.imag, 'b-', linewidth=2, label='ω > 0')
+            ax.plot(inside.real, -inside.imag, 'b--', linewidth=1, label='ω < 0')
+            if clipped.any():
+                ax.plot(outside.real, outside.imag, 'b:', linewidth=1.5, label=f'|L| > {NYQUIST_MAX_MAGNITUDE:g} (clipped)')
+                ax.plot(outside.real, -outside.imag, 'b:', linewidth=1.5)
+            ax.plot([-1], [0], 'r+', markersize=12, markeredgewidth=2)
+            ax.set_xlabel('Real')
+            ax.set_ylabel('Imaginary')
+            ax.legend(loc='upper right', fontsize=8)
+
+            # Stability read from the encirclements of -1
+            stability = contour.get_stability()
+            ax.text(0.02, 0.98, self.get_nyquist_verdict_text(stability), transform=ax.transAxes,
+                    color='g' if stability["stable"] else 'r', verticalalignment='top',
+                    bbox=dict(facecolor='white', alpha=0.8), fontsize=9)
 
             # Customize the plot
-            ax.set_title(f'Nyquist Diagram (Kp={kp}, Ki={ki}, Kd={kd})', pad=20)
+            ax.set_title(f'Nyquist Diagram of the loop C·P·S (Kp={kp}, Ki={ki}, Kd={kd})', pad=20)
             ax.grid(True, linestyle='--', alpha=0.7)
 
-            fig.tight_layout()
+            # Stability margins of the loop PID * plant * sensor
+            margins = self.get_stability_margins()
+            if margins is not None:
+                ax.text(0.02, 0.02, self.get_margins_text(margins), transform=ax.transAxes,
+                        bbox=dict(facecolor='white', alpha=0.8), fontsize=9)
+
+            with span("Figure.tight_layout"):
+                fig.tight_layout()
             return fig
 
         except Exception as e:
             #print(f"Error plotting Nyquist diagram: {e}")
             return None
 
+    @traced("Output.plot_root_locus")
     def plot_root_locus(self):
         """
         Plot Root Locus and return the matplotlib Figure
@@ -381,13 +1470,17 @@ class Output:
             ax = fig.add_subplot(111)
 
             # Use control's built-in root_locus
-            ctrl.root_locus(open_loop_tf, plot=True, grid=True, ax=ax)
+            with span("ctrl.root_locus"):
+                ctrl.root_locus(open_loop_tf, plot=True, grid=True, ax=ax)
             
             # Customize the plot
             ax.set_title(f'Root Locus (Kp={kp}, Ki={ki}, Kd={kd})', pad=20)
+            if self.has_delay():
+                ax.text(0.02, 0.02, 'Transport delay not represented', transform=ax.transAxes, color='gray')
             ax.grid(True, linestyle='--', alpha=0.7)
 
-            fig.tight_layout()
+            with span("Figure.tight_layout"):
+                fig.tight_layout()
             return fig
 
         except Exception as e:
@@ -400,19 +1493,24 @@ class Output:
         #print("Real time response plot not implemented yet")
         #return None
     """
+    @traced("Output.plot_pole_zero")
     def plot_pole_zero(self):
         """
-        Plot Pole-Zero diagram using manual scatter plot and return the matplotlib Figure
+        Plot Pole-Zero diagram of the full closed loop, with the damping ratio and natural frequency
+        of every pole and the near pole-zero cancellations, and return the matplotlib Figure
         Args:
             None
         Returns:
             Matplotlib Figure object with the Pole-Zero plot
         """
         try:
-            closed_loop_tf = self.get_closed_loop_transfer_function()
-            if closed_loop_tf is None:
+            analysis = self.get_pole_zero_analysis()
+            if analysis is None:
                 print("No closed-loop transfer function available")
                 return None
+            poles, zeros = analysis.get_poles(), analysis.get_zeros()
+            damping, natural_frequency = analysis.get_damping()
+            cancellations = analysis.get_cancellations()
 
             # Get PID parameters for title
             pid_params = self.pid_object.get_parameters()
@@ -420,10 +1518,6 @@ class Output:
             ki = pid_params["ki"]
             kd = pid_params["kd"]
 
-            # Get poles and zeros using control library functions
-            poles = ctrl.poles(closed_loop_tf)
-            zeros = ctrl.zeros(closed_loop_tf)
-
             # Create figure with horizontal orientation
             fig = Figure(figsize=(10, 10), dpi=80)
             ax = fig.add_subplot(111)
@@ -435,12 +1529,35 @@ class Output:
             if len(poles) > 0:
                 ax.scatter(np.real(poles), np.imag(poles), marker='x', color='red', s=100, label='Poles', linewidths=2)
 
+            # Damping ratio and natural frequency, once per conjugate pair
+            for pole, zeta, wn in zip(poles, damping, natural_frequency):
+                if pole.imag < 0:
+                    continue
+                label = f'ωn={wn:.3g}' if np.isnan(zeta) else f'ζ={zeta:.2f}\nωn={wn:.3g}'
+                ax.annotate(label, (pole.real, pole.imag), textcoords='offset points', xytext=(8, 8), fontsize=8, color='darkred')
+
+            # Near cancellations, ringed in green (solid when dropped from the minimal realization)
+            for index, cancellation in enumerate(cancellations):
+                pair = np.array([cancellation["pole"], cancellation["zero"]])
+                pair = np.concatenate((pair, np.conj(pair))) if pair[0].imag else pair
+                ax.scatter(np.real(pair), np.imag(pair), marker='o', s=400, facecolors='none', edgecolors='green',
+                           linestyles='-' if cancellation["removed"] else '--', linewidths=1.5,
+                           label='Near cancellation' if index == 0 else None)
+
             # Add axes lines
             ax.axhline(0, color='black', linewidth=0.8, alpha=0.7)
             ax.axvline(0, color='black', linewidth=0.8, alpha=0.7)
 
             # Customize the plot
             ax.set_title(f'Pole-Zero Diagram (Kp={kp}, Ki={ki}, Kd={kd})', pad=20)
+            if self.has_delay():
+                ax.text(0.02, 0.02, 'Transport delay not represented', transform=ax.transAxes, color='gray')
+            if cancellations:
+                removed = sum(cancellation["removed"] for cancellation in cancellations)
+                minimal_order = len(analysis.get_minimal_zpk()[1])
+                ax.text(0.02, 0.98, f'Near cancellations: {len(cancellations)} ({removed} removed)\n'
+                        f'Minimal order: {minimal_order} of {len(poles)}', transform=ax.transAxes, va='top',
+                        bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
             ax.set_xlabel('Real')
             ax.set_ylabel('Imaginary')
             ax.grid(True, linestyle='--', alpha=0.7)
@@ -448,10 +1565,11 @@ class Output:
             
             # Add legend if there are poles or zeros
             if len(poles) > 0 or len(zeros) > 0:
-                ax.legend()
+                ax.legend(loc='upper right')
 
             # Adjust margins
-            fig.tight_layout()
+            with span("Figure.tight_layout"):
+                fig.tight_layout()
             return fig
 
         except Exception as e:
@@ -471,7 +1589,10 @@ class Output:
         """
         if fig is None:
             return None
-            
+
+        # Imported here so that Output can run without PyQt (headless service)
+        from PyQt5.QtGui import QPixmap
+
         buf = io.BytesIO()
         fig.savefig(buf, format='png', dpi=80, bbox_inches='tight')
         buf.seek(0)
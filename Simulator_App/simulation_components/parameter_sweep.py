@@ -0,0 +1,449 @@
+# Standard library imports
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from numbers import Real
+
+#Scientific imports
+import numpy as np
+from matplotlib.figure import Figure
+
+# Local application imports
+from .batch_simulator import closed_loop_step_batch
+from .symbolic_loop import symbolic_closed_loop_coefficients
+from .metrics import compute_step_metrics, STEP_METRIC_DESCRIPTIONS
+from .input import Input
+
+SWEEP_GROUPS = ["Plant", "PID", "Input"]
+
+AXIS_SCALES = ["Linear", "Log"]
+
+PID_PARAMETERS = ["kp", "ki", "kd"]
+
+INPUT_PARAMETERS = ["step_time", "initial_value", "final_value", "total_time", "sample_time"]
+
+DEFAULT_POINTS = 21
+
+# Grid points simulated by each process pool task
+CHUNK_SIZE = 500
+
+# Largest grid accepted by a sweep
+MAX_GRID_POINTS = 1000000
+
+
+class SweepAxis:
+    """
+    Values taken by one parameter of the sweep grid.
+    """
+
+    def __init__(self, group, name, values, scale="Linear"):
+        """
+        Initialize the axis
+        Args:
+            group (str): One of SWEEP_GROUPS
+            name (str): Parameter name inside the group
+            values (np.ndarray): Grid values of the parameter
+            scale (str): One of AXIS_SCALES, used to plot the axis
+        Returns:
+            None
+        """
+        self.group = group
+        self.name = name
+        self.values = values
+        self.scale = scale
+
+    def get_label(self):
+        """
+        Label of the axis in the figures
+        Args:
+            None
+        Returns:
+            str: 'Group: name'
+        """
+        return f"{self.group}: {self.name}"
+
+
+class SweepResult:
+    """
+    Step response metrics over the sweep grid, filled chunk by chunk.
+    """
+
+    def __init__(self, axes):
+        """
+        Allocate the metric grids, NaN until their chunk is done
+        Args:
+            axes (list): SweepAxis of every grid dimension
+        Returns:
+            None
+        """
+        self.axes = axes
+        self.shape = tuple(len(axis.values) for axis in axes)
+        self.metrics = {name: np.full(self.shape, np.nan) for name in STEP_METRIC_DESCRIPTIONS}
+        self.stable = np.zeros(self.shape, dtype=bool)
+        self.done = np.zeros(self.shape, dtype=bool)
+
+    def update(self, indices, metrics, stable):
+        """
+        Store the results of a chunk
+        Args:
+            indices (np.ndarray): Flat grid indices of the chunk
+            metrics (dict): Metric name -> values of the chunk
+            stable (np.ndarray): Boolean mask of the stable closed loops of the chunk
+        Returns:
+            None
+        """
+        for name, values in metrics.items():
+            self.metrics[name].flat[indices] = np.where(stable, values, np.nan)
+        self.stable.flat[indices] = stable
+        self.done.flat[indices] = True
+
+    def get_progress(self):
+        """
+        Fraction of the grid already simulated
+        Args:
+            None
+        Returns:
+            float: Value between 0 and 1
+        """
+        return float(np.mean(self.done)) if self.done.size else 1.0
+
+    def get_stable_fraction(self):
+        """
+        Fraction of the simulated grid points whose closed loop is stable
+        Args:
+            None
+        Returns:
+            float: Value between 0 and 1
+        """
+        return float(np.mean(self.stable[self.done])) if self.done.any() else 0.0
+
+    def get_slice(self, metric, x_axis, y_axis=None, fixed=None):
+        """
+        Values of a metric over one or two axes, the other axes being held at fixed indices
+        Args:
+            metric (str): Metric name (key of STEP_METRIC_DESCRIPTIONS)
+            x_axis (int): Grid dimension along the first output axis
+            y_axis (int or None): Grid dimension along the second output axis
+            fixed (dict or None): Grid dimension -> index for the other axes, the middle index by default
+        Returns:
+            np.ndarray: Array of shape (len(x),) or (len(x), len(y))
+        """
+        fixed = fixed or {}
+        index = []
+        for dimension, size in enumerate(self.shape):
+            if dimension in (x_axis, y_axis):
+                index.append(slice(None))
+            else:
+                index.append(fixed.get(dimension, size // 2))
+        values = self.metrics[metric][tuple(index)]
+        if y_axis is not None and y_axis < x_axis:
+            values = values.T
+        return values
+
+    def plot(self, metric, x_axis=0, y_axis=None, fixed=None):
+        """
+        Plot a metric as a curve (one axis) or as a heatmap with contour lines (two axes)
+        Args:
+            metric (str): Metric name (key of STEP_METRIC_DESCRIPTIONS)
+            x_axis (int): Grid dimension on the horizontal axis
+            y_axis (int or None): Grid dimension on the vertical axis, None plots a curve
+            fixed (dict or None): Grid dimension -> index for the other axes, the middle index by default
+        Returns:
+            Matplotlib Figure object with the results
+        """
+        fig = Figure(dpi=80)
+        ax = fig.add_subplot(111)
+        values = self.get_slice(metric, x_axis, y_axis, fixed)
+        x = self.axes[x_axis]
+
+        if y_axis is None:
+            ax.plot(x.values, values, 'b-o', linewidth=2, markersize=3)
+            ax.set_ylabel(STEP_METRIC_DESCRIPTIONS[metric])
+        else:
+            y = self.axes[y_axis]
+            mesh = ax.pcolormesh(x.values, y.values, values.T, shading='nearest', cmap='viridis')
+            fig.colorbar(mesh, ax=ax, label=STEP_METRIC_DESCRIPTIONS[metric])
+            finite = np.isfinite(values)
+            if min(values.shape) > 1 and finite.sum() > 3 and np.ptp(values[finite]) > 0:
+                contours = ax.contour(x.values, y.values, np.ma.masked_invalid(values.T), levels=8, colors='k', linewidths=0.8)
+                ax.clabel(contours, fontsize=8, fmt='%.3g')
+            ax.set_ylabel(y.get_label())
+            if y.scale == "Log":
+                ax.set_yscale('log')
+
+        ax.set_xlabel(x.get_label())
+        if x.scale == "Log":
+            ax.set_xscale('log')
+
+        held = [f"{axis.name}={axis.values[(fixed or {}).get(dimension, len(axis.values) // 2)]:.4g}"
+                for dimension, axis in enumerate(self.axes) if dimension not in (x_axis, y_axis)]
+        title = f"{STEP_METRIC_DESCRIPTIONS[metric]} ({100 * self.get_progress():.0f}% done)"
+        ax.set_title(title + (f"\n{', '.join(held)}" if held else ""), pad=20)
+        ax.grid(True, linestyle='--', alpha=0.7)
+        ax.set_facecolor((0.85, 0.85, 0.85))
+        fig.tight_layout()
+        return fig
+
+
+def sweep_chunk(indices, numerators, denominators, input_parameters):
+    """
+    Step response metrics of a chunk of grid points (process pool worker)
+    Args:
+        indices (np.ndarray): Flat grid indices of the chunk
+        numerators (np.ndarray): Closed-loop numerators of shape (chunk, n)
+        denominators (np.ndarray): Closed-loop denominators of shape (chunk, m)
+        input_parameters (dict): Step and time grid parameters shared by the chunk
+    Returns:
+        tuple: (indices, metrics, stable), or an error message (str)
+    """
+    result = closed_loop_step_batch(numerators, denominators, input_parameters)
+    if isinstance(result, str):
+        return result
+    t, responses, stable = result
+    metrics = compute_step_metrics(t, responses, input_parameters["step_time"], input_parameters["initial_value"],
+                                   input_parameters["final_value"])
+    return indices, metrics, stable
+
+
+class ParameterSweep:
+    """
+    Step response metrics of the closed loop over an N-dimensional grid of plant
+    parameters, PID gains and Input fields.
+
+    Grid points sharing the same Input fields share a time grid, so the Input axes are
+    iterated outermost and the plant / PID points of each Input combination are
+    simulated in vectorized chunks over a process pool. Results are handed back as
+    soon as each chunk completes.
+    """
+
+    def __init__(self, pid_object, plant_object, input_params, sensor_object):
+        """
+        Initialize the sweep with the loop components
+        Args:
+            pid_object (ControllerPID): PID controller
+            plant_object (Plant): Nominal plant
+            input_params (Input): Step input and time grid
+            sensor_object (Sensor): Sensor in the feedback path
+        Returns:
+            None
+        """
+        self.pid_object = pid_object
+        self.plant_object = plant_object
+        self.input_params = input_params
+        self.sensor_object = sensor_object
+        self.axes = []
+
+    def get_sweepable_parameters(self):
+        """
+        Names of the parameters that can be swept, per group
+        Args:
+            None
+        Returns:
+            dict: Group -> list of parameter names
+        """
+        plant_parameters = [name for name, value in self.plant_object.get_parameters().items() if isinstance(value, Real)]
+        return {"Plant": plant_parameters, "PID": list(PID_PARAMETERS), "Input": list(INPUT_PARAMETERS)}
+
+    def get_nominal_value(self, group, name):
+        """
+        Current value of a sweepable parameter
+        Args:
+            group (str): One of SWEEP_GROUPS
+            name (str): Parameter name
+        Returns:
+            float: Current value
+        """
+        if group == "Plant":
+            return float(self.plant_object.get_parameters()[name])
+        if group == "PID":
+            return float(self.pid_object.get_parameters()[name])
+        return float(self.input_params.get_parameters()[name])
+
+    def get_axes(self):
+        """
+        Return the axes of the grid
+        Args:
+            None
+        Returns:
+            list: SweepAxis of every grid dimension
+        """
+        return self.axes
+
+    def clear_axes(self):
+        """
+        Remove every axis of the grid
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.axes = []
+
+    def add_axis(self, group, name, start, stop, points=DEFAULT_POINTS, scale="Linear"):
+        """
+        Add a grid dimension with evenly spaced values
+        Args:
+            group (str): One of SWEEP_GROUPS
+            name (str): Parameter name
+            start (float): First value
+            stop (float): Last value
+            points (int): Number of values
+            scale (str): One of AXIS_SCALES, 'Log' spaces the values geometrically
+        Returns:
+            error_log (str): Error message if the axis is invalid, None otherwise
+        """
+        if name not in self.get_sweepable_parameters().get(group, []):
+            return f"Error: {name} is not a sweepable {group} parameter."
+        if any(axis.group == group and axis.name == name for axis in self.axes):
+            return f"Error: {name} is already swept."
+        if scale not in AXIS_SCALES:
+            return f"Error: Unknown scale: {scale}."
+        if not isinstance(points, int) or points <= 0:
+            return f"Error: Number of points must be a positive integer (got {points})."
+        if not all(isinstance(value, Real) and np.isfinite(value) for value in (start, stop)):
+            return f"Error: The range of {name} must be finite numbers."
+        if scale == "Log":
+            if start <= 0 or stop <= 0:
+                return f"Error: A logarithmic range of {name} must be positive."
+            values = np.geomspace(start, stop, points)
+        else:
+            values = np.linspace(start, stop, points)
+        if group == "Input" and name in ("total_time", "sample_time") and np.any(values <= 0):
+            return f"Error: {name} must be positive."
+        axis = SweepAxis(group, name, values, scale)
+        if group == "Input":
+            error_log = self._validate_input_axes(self.axes + [axis])
+            if error_log:
+                return error_log
+        self.axes.append(axis)
+
+    def _validate_input_axes(self, axes):
+        """
+        Check every combination of the Input axes with the validation of Input,
+        so that the grid respects the same sample budget as a single simulation
+        Args:
+            axes (list): SweepAxis objects of the grid
+        Returns:
+            error_log (str): Error message for the first invalid combination, None otherwise
+        """
+        input_axes = [axis for axis in axes if axis.group == "Input"]
+        for input_index in np.ndindex(*(len(axis.values) for axis in input_axes)):
+            input_parameters = dict(self.input_params.get_parameters())
+            for axis, i in zip(input_axes, input_index):
+                input_parameters[axis.name] = float(axis.values[i])
+            error_log = Input().set_parameters(**input_parameters)
+            if error_log:
+                swept = ", ".join(f"{axis.name}={input_parameters[axis.name]:g}" for axis in input_axes)
+                return f"Error: Invalid input for {swept}:\n{error_log}"
+
+    def get_grid_size(self):
+        """
+        Number of points of the Cartesian product of the axes
+        Args:
+            None
+        Returns:
+            int: Number of grid points
+        """
+        return int(np.prod([len(axis.values) for axis in self.axes]))
+
+    def build_tasks(self):
+        """
+        Split the grid into chunks sharing the same Input fields
+        Args:
+            None
+        Returns:
+            list: Argument tuples of sweep_chunk
+        """
+        shape = tuple(len(axis.values) for axis in self.axes)
+        input_dimensions = [d for d, axis in enumerate(self.axes) if axis.group == "Input"]
+        other_dimensions = [d for d, axis in enumerate(self.axes) if axis.group != "Input"]
+        other_shape = tuple(shape[d] for d in other_dimensions)
+        other_size = int(np.prod(other_shape))
+
+        pid_nominal = self.pid_object.get_parameters()
+        tasks = []
+        for input_index in np.ndindex(*(shape[d] for d in input_dimensions)):
+            input_parameters = dict(self.input_params.get_parameters())
+            for d, i in zip(input_dimensions, input_index):
+                input_parameters[self.axes[d].name] = float(self.axes[d].values[i])
+
+            for start in range(0, other_size, CHUNK_SIZE):
+                flat = np.arange(start, min(start + CHUNK_SIZE, other_size))
+                size = len(flat)
+                grid_index = [None] * len(self.axes)
+                if other_shape:
+                    for d, i in zip(other_dimensions, np.unravel_index(flat, other_shape)):
+                        grid_index[d] = i
+                for d, i in zip(input_dimensions, input_index):
+                    grid_index[d] = np.full(size, i)
+                indices = np.ravel_multi_index(tuple(grid_index), shape) if shape else np.zeros(1, dtype=int)
+
+                plant_values, pid_parameters = {}, dict(pid_nominal)
+                for d in other_dimensions:
+                    axis = self.axes[d]
+                    values = axis.values[grid_index[d]]
+                    if axis.group == "Plant":
+                        plant_values[axis.name] = values
+                    else:
+                        pid_parameters[axis.name] = values
+                # Closed-loop coefficients from the compiled kernel of the plant type
+                numerators, denominators = symbolic_closed_loop_coefficients(
+                    self.plant_object, self.sensor_object, pid_parameters["kp"], pid_parameters["ki"], pid_parameters["kd"], **plant_values)
+                tasks.append((indices, numerators, denominators, input_parameters))
+        return tasks
+
+    def run(self, workers=None, callback=None):
+        """
+        Simulate every grid point, handing the partial result back after each chunk
+        Args:
+            workers (int or None): Worker processes, None uses every core and 1 runs in this process
+            callback (callable or None): Called with the SweepResult after each chunk,
+                                         returning False stops the sweep
+        Returns:
+            SweepResult: Results of the sweep (partial if it was stopped)
+            error message (str) if the sweep cannot be run
+        """
+        if not self.axes:
+            return "Error: Add at least one parameter to sweep."
+        if self.get_grid_size() > MAX_GRID_POINTS:
+            return f"Error: The grid has {self.get_grid_size()} points, the limit is {MAX_GRID_POINTS}."
+        if self.plant_object.get_delay() > 0 or self.sensor_object.get_delay() > 0:
+            return "Error: Parameter sweeps do not support transport delay."
+        for tf in (self.plant_object.get_transfer_function(), self.sensor_object.get_transfer_function()):
+            if isinstance(tf, str):
+                return tf
+
+        result = SweepResult(self.axes)
+        tasks = self.build_tasks()
+        workers = min(workers or os.cpu_count() or 1, len(tasks))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(sweep_chunk, *task) for task in tasks]
+                for future in as_completed(futures):
+                    error_log = self._store_chunk(result, future.result(), callback)
+                    if error_log is not None:
+                        for pending in futures:
+                            pending.cancel()
+                        return result if error_log == "" else error_log
+        else:
+            for task in tasks:
+                error_log = self._store_chunk(result, sweep_chunk(*task), callback)
+                if error_log is not None:
+                    return result if error_log == "" else error_log
+        return result
+
+    def _store_chunk(self, result, chunk, callback):
+        """
+        Store a finished chunk and notify the callback
+        Args:
+            result (SweepResult): Result being filled
+            chunk (tuple or str): Output of sweep_chunk
+            callback (callable or None): Progress callback
+        Returns:
+            str: Error message, "" if the callback stopped the sweep, None to continue
+        """
+        if isinstance(chunk, str):
+            return chunk
+        result.update(*chunk)
+        if callback is not None and callback(result) is False:
+            return ""
+        return None
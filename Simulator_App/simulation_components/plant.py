@@ -3,6 +3,7 @@ import sys
 import os
 
 #Scientific imports
+import numpy as np
 import sympy as sp
 import control as ctrl
 
@@ -13,6 +14,9 @@ from abc import ABC, abstractmethod
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from utils.input_utils import must_be_nonnegative, must_be_positive, cannot_be_zero, must_be_negative
+from .model_reduction import BalancedTruncation, REDUCTION_METHODS
+from .realization import coefficients_to_zpk, zpk_to_state_space
+from .instrumentation import traced
 
 #s = sp.symbols('s')
 s = ctrl.TransferFunction.s
@@ -31,6 +35,10 @@ class Plant(ABC):
         """
         self.name = name
         self.parameters = parameters or {}
+        self.delay = 0.0  # Transport delay (dead time) in seconds
+        self.delay_description = ("Delay:\n"
+                                  "Transport delay (dead time) between the input and the output, in seconds.\n"
+                                  "Simulated exactly with a delay line at the sample time resolution.")
         self.plant_component_description = ("Plant Model:\n"
                                    "The physical system being controlled by the PID.\n"
                                    "Defines the system dynamics through its transfer function.\n\n"
@@ -47,6 +55,18 @@ class Plant(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_coefficients(self, **kwargs):
+        """
+        Return the numerator and denominator coefficients, highest power first.
+        Parameter overrides may be numpy arrays, every coefficient then broadcasts over them.
+        Args:
+            kwargs: Optional parameter values overriding the current ones
+        Returns:
+            tuple: (numerator, denominator) lists of coefficients
+        """
+        pass
+
     @abstractmethod
     def get_latex_equation(self):
         """
@@ -69,6 +89,73 @@ class Plant(ABC):
         """
         pass
 
+    def get_reduction_tolerance(self):
+        """
+        Return the error bound of the model reduction.
+        Predefined plants are low order and are never reduced.
+        Args:
+            None
+        Returns:
+            None
+        """
+        return None
+
+    def get_reduced_transfer_function(self):
+        """
+        Return the transfer function used by the interactive plots.
+        Predefined plants are low order and are never reduced.
+        Args:
+            None
+        Returns:
+            Transfer function of the plant
+            error message (str) if parameters are invalid
+        """
+        return self.get_transfer_function()
+
+    def get_zpk(self):
+        """
+        Return the zeros, poles and gain of the plant, computed from its coefficients.
+        Args:
+            None
+        Returns:
+            tuple: (zeros, poles, gain) with gain the ratio of the leading coefficients
+            error message (str) if parameters are invalid
+        """
+        tf = self.get_transfer_function()
+        if isinstance(tf, str):
+            return tf
+        try:
+            return coefficients_to_zpk(*self.get_coefficients())
+        except ValueError as e:
+            return f"Error: {e}"
+
+    @traced("Plant.state_space")
+    def get_state_space(self):
+        """
+        Return a well-conditioned state-space realization of the plant, built from its poles and zeros.
+        Args:
+            None
+        Returns:
+            ctrl.StateSpace: Realization of the plant
+            error message (str) if parameters are invalid
+        """
+        zpk = self.get_zpk()
+        if isinstance(zpk, str):
+            return zpk
+        return ctrl.ss(*zpk_to_state_space(*zpk))
+
+    def get_reduced_state_space(self):
+        """
+        Return the state-space realization used by the interactive plots.
+        Predefined plants are low order and are never reduced.
+        Args:
+            None
+        Returns:
+            ctrl.StateSpace: Realization of the plant
+            error message (str) if parameters are invalid
+        """
+        return self.get_state_space()
+
     def get_parameters(self):
         """
         Return current internal parameters.
@@ -89,6 +176,39 @@ class Plant(ABC):
         """
         self.parameters.update(kwargs)
 
+    def get_delay(self):
+        """
+        Return the transport delay of the component.
+        Args:
+            None
+        Returns:
+            float: Delay in seconds
+        """
+        return self.delay
+
+    def set_delay(self, delay):
+        """
+        Update the transport delay of the component.
+        Args:
+            delay (float): Delay in seconds
+        Returns:
+            error_log (str): Error message if the delay is invalid, None otherwise
+        """
+        error_log = must_be_nonnegative("Delay", delay)
+        if error_log:
+            return error_log
+        self.delay = float(delay)
+
+    def get_delay_description(self):
+        """
+        Get the description of the delay parameter
+        Args:
+            None
+        Returns:
+            str: Description of the delay parameter
+        """
+        return self.delay_description
+
     def get_component_description(self):
         """
         Get the description of the Plant component
@@ -127,6 +247,7 @@ class BallAndBeamPlant(Plant):
         params = {'m': m, 'R': R, 'd': d, 'g': g, 'L': L, 'J': J}
         super().__init__("Ball and Beam", params)
 
+    @traced("BallAndBeamPlant.transfer_function")
     def get_transfer_function(self):
         """
         Return the transfer function of the Ball and Beam system
@@ -170,6 +291,19 @@ class BallAndBeamPlant(Plant):
         #Reach this point only if there was an exception
         return "\n".join(e for e in errors if e)
 
+    def get_coefficients(self, **kwargs):
+        """
+        Return the coefficients of -m*g*d / (L*(J/R^2 + m)*s^2)
+        Args:
+            kwargs: Optional parameter values (floats or numpy arrays) overriding the current ones
+        Returns:
+            tuple: (numerator, denominator) lists of coefficients
+        """
+        p = {**self.parameters, **kwargs}
+        numerator = [-p['m'] * p['g'] * p['d']]
+        denominator = [p['L'] * (p['J'] / p['R']**2 + p['m']), 0.0, 0.0]
+        return numerator, denominator
+
     def get_latex_equation(self, m=None, R=None, d=None, g=None, L=None, J=None):
             """
             Return LaTeX equation, using provided values or defaults/symbols
@@ -231,6 +365,7 @@ class MotorSpeedPlant(Plant):
         params = {'J': J, 'b': b, 'K': K, 'R': R, 'L': L}
         super().__init__("DC Motor Speed Control", params)
 
+    @traced("MotorSpeedPlant.transfer_function")
     def get_transfer_function(self):
         """
         Return the transfer function of the DC Motor Speed Control system
@@ -272,6 +407,19 @@ class MotorSpeedPlant(Plant):
         #Reach this point only if there was an exception
         return "\n".join(e for e in errors if e)
 
+    def get_coefficients(self, **kwargs):
+        """
+        Return the coefficients of K / ((J*s + b)*(L*s + R) + K^2)
+        Args:
+            kwargs: Optional parameter values (floats or numpy arrays) overriding the current ones
+        Returns:
+            tuple: (numerator, denominator) lists of coefficients
+        """
+        p = {**self.parameters, **kwargs}
+        numerator = [p['K']]
+        denominator = [p['J'] * p['L'], p['J'] * p['R'] + p['b'] * p['L'], p['b'] * p['R'] + p['K']**2]
+        return numerator, denominator
+
     def get_latex_equation(self, J=None, b=None, K=None, R=None, L=None):
         """
         Return LaTeX equation, using provided values or symbols if None
@@ -320,6 +468,7 @@ class MotorPositionPlant(MotorSpeedPlant):
         super().__init__(J, b, K, R, L)
         self.name = "DC Motor Position Control"
 
+    @traced("MotorPositionPlant.transfer_function")
     def get_transfer_function(self):
 
         """
@@ -364,6 +513,17 @@ class MotorPositionPlant(MotorSpeedPlant):
         return "\n".join(e for e in errors if e)
         
 
+    def get_coefficients(self, **kwargs):
+        """
+        Return the coefficients of K / (s*((J*s + b)*(L*s + R) + K^2))
+        Args:
+            kwargs: Optional parameter values (floats or numpy arrays) overriding the current ones
+        Returns:
+            tuple: (numerator, denominator) lists of coefficients
+        """
+        numerator, denominator = super().get_coefficients(**kwargs)
+        return numerator, denominator + [0.0]
+
     def get_latex_equation(self, J=None, b=None, K=None, R=None, L=None):
         """
         Return LaTeX equation for position control, using provided values or symbols if None
@@ -406,6 +566,10 @@ class PersonalizedPlant(Plant):
             den = [1]  # Default to gain 1
         params = {'Numerator': num, 'Denominator': den}
         super().__init__("Personalized Plant", params)
+        self.reduction_tolerance = None  # Model reduction disabled
+        self.reduction_method = "matchdc"
+        self.reduction_cache_key = None
+        self.reduction_cache = None
 
     def _ensure_list(self, coeffs):
         """
@@ -423,6 +587,9 @@ class PersonalizedPlant(Plant):
         if isinstance(coeffs, list):
             return coeffs
 
+        if isinstance(coeffs, tuple):
+            return list(coeffs)
+
         # If single number, convert to list
         if isinstance(coeffs, (int, float)):
             return [coeffs]
@@ -449,6 +616,7 @@ class PersonalizedPlant(Plant):
         return [coeffs]
 
 
+    @traced("PersonalizedPlant.transfer_function")
     def get_transfer_function(self, **kwargs):
         """
         Return the transfer function of the Personalized Plant
@@ -463,41 +631,126 @@ class PersonalizedPlant(Plant):
         params = self.parameters.copy()
         params.update(kwargs)
 
-        error_log = ""
-
         num_coeffs = self._ensure_list(params['Numerator'])
         den_coeffs = self._ensure_list(params['Denominator'])
-        num_poly = sum(coef * s**i for i, coef in enumerate(reversed(num_coeffs)))
-        den_poly = sum(coef * s**i for i, coef in enumerate(reversed(den_coeffs)))
-
-        errors = [
-            cannot_be_zero('Denominator', den_poly)
-        ]
 
         # Verify denominator is not zero
         if all(coef == 0 for coef in den_coeffs):
             return "Error: Denominator cannot be all zeros."
 
+        try:
+            # Built directly from the coefficient arrays, without polynomial arithmetic on transfer functions
+            return ctrl.TransferFunction(np.asarray(num_coeffs, dtype=float), np.asarray(den_coeffs, dtype=float))
+        except ZeroDivisionError:
+            return "Error: Division by zero in transfer function calculation."
+        except Exception as e:
+            return f"Error in transfer function calculation: {e}"
 
+    def get_coefficients(self, **kwargs):
+        """
+        Return the numerator and denominator coefficients of the Personalized Plant
+        Args:
+            kwargs: Optional numerator and denominator coefficients to override
+        Returns:
+            tuple: (numerator, denominator) lists of coefficients
+        """
+        params = self.parameters.copy()
+        params.update(kwargs)
+        return self._ensure_list(params['Numerator']), self._ensure_list(params['Denominator'])
 
-        try:
-            #Create the transfer function using control library
-            
+    def get_reduction_tolerance(self):
+        """
+        Return the error bound of the model reduction
+        Args:
+            None
+        Returns:
+            float: Allowed ||G - G_r||_inf, None if the reduction is disabled
+        """
+        return self.reduction_tolerance
 
-            error_log = "\n".join(e for e in errors if e)
-            if error_log.strip():
-                #print("Errors found in transfer function calculation:")
+    def get_reduction_method(self):
+        """
+        Return the model reduction method
+        Args:
+            None
+        Returns:
+            str: One of REDUCTION_METHODS
+        """
+        return self.reduction_method
+
+    def set_reduction(self, tolerance, method="matchdc"):
+        """
+        Enable or disable the model reduction used by the interactive plots
+        Args:
+            tolerance (float or None): Allowed ||G - G_r||_inf, None disables the reduction
+            method (str): One of REDUCTION_METHODS
+        Returns:
+            error_log (str): Error message if the settings are invalid, None otherwise
+        """
+        if method not in REDUCTION_METHODS:
+            return f"Error: Unknown reduction method: {method}."
+        if tolerance is not None:
+            error_log = must_be_positive("Reduction tolerance", tolerance)
+            if error_log:
                 return error_log
+            tolerance = float(tolerance)
+        self.reduction_tolerance = tolerance
+        self.reduction_method = method
 
-            return ctrl.TransferFunction(num_coeffs, den_coeffs)
-        
-        except ZeroDivisionError:
-            errors.append("Error: Division by zero in transfer function calculation.")
-        except Exception as e:
-            errors.append(f"Error in transfer function calculation: {e}")
+    @traced("PersonalizedPlant.model_reduction")
+    def get_model_reduction(self):
+        """
+        Return the balanced realization of the current coefficients, cached until they change
+        Args:
+            None
+        Returns:
+            BalancedTruncation: Balanced realization with its Hankel singular values
+            error message (str) if the transfer function is invalid
+        """
+        tf = self.get_transfer_function()
+        if isinstance(tf, str):
+            return tf
+        key = repr(self.get_coefficients())
+        if key != self.reduction_cache_key:
+            try:
+                self.reduction_cache = BalancedTruncation(*self.get_coefficients())
+            except Exception as e:
+                return f"Error in model reduction: {e}"
+            self.reduction_cache_key = key
+        return self.reduction_cache
+
+    def get_reduced_transfer_function(self):
+        """
+        Return the reduced transfer function if the reduction is enabled, the full one otherwise
+        Args:
+            None
+        Returns:
+            Transfer function of the (reduced) model
+            error message (str) if parameters are invalid
+        """
+        if self.reduction_tolerance is None:
+            return self.get_transfer_function()
+        reduction = self.get_model_reduction()
+        if isinstance(reduction, str):
+            return reduction
+        return reduction.reduce_to_tolerance(self.reduction_tolerance, self.reduction_method)
 
-        #Reach this point only if there was an exception
-        return "\n".join(e for e in errors if e)
+    @traced("PersonalizedPlant.reduced_state_space")
+    def get_reduced_state_space(self):
+        """
+        Return the reduced realization if the reduction is enabled, the full one otherwise
+        Args:
+            None
+        Returns:
+            ctrl.StateSpace: Realization of the (reduced) model
+            error message (str) if parameters are invalid
+        """
+        if self.reduction_tolerance is None:
+            return self.get_state_space()
+        reduction = self.get_model_reduction()
+        if isinstance(reduction, str):
+            return reduction
+        return reduction.reduce(reduction.get_order_for_tolerance(self.reduction_tolerance), self.reduction_method)
 
     def get_latex_equation(self, **kwargs):
         """
@@ -0,0 +1,254 @@
+#Scientific imports
+import control as ctrl
+import numpy as np
+
+# Local application imports
+from .divergence import STABILITY_TOLERANCE
+from .realization import zpk_to_state_space
+
+# Pole / zero pairs closer than this (relative to their magnitude, or to 1) are reported as near cancellations
+NEAR_CANCELLATION_TOLERANCE = 1e-2
+
+# Pairs closer than this are dropped from the minimal realization
+CANCELLATION_TOLERANCE = 1e-6
+
+# Pairs whose pole is not in the open left half-plane are only dropped when they cancel exactly:
+# a near cancellation there hides a mode that still diverges
+EXACT_CANCELLATION_TOLERANCE = 1e-8
+
+# Roots with |Im| below this fraction of their magnitude (or of 1) are real
+REAL_ROOT_TOLERANCE = 1e-9
+
+
+def damping_and_natural_frequency(poles):
+    """
+    Damping ratio and natural frequency of every pole
+    Args:
+        poles (np.ndarray): Complex poles
+    Returns:
+        tuple: (damping, natural_frequency) arrays, zeta = -Re(p) / |p| (nan for a pole at the origin) and wn = |p| in rad/s
+    """
+    poles = np.asarray(poles, dtype=complex)
+    natural_frequency = np.abs(poles)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        damping = np.where(natural_frequency > 0, -poles.real / natural_frequency, np.nan)
+    return damping, natural_frequency
+
+
+def _relative_distance(pole, zero):
+    """
+    Distance between a pole and a zero, relative to their magnitude (absolute below 1)
+    Args:
+        pole (complex): Pole
+        zero (complex): Zero
+    Returns:
+        float: |p - z| / max(|p|, |z|, 1)
+    """
+    return abs(pole - zero) / max(abs(pole), abs(zero), 1.0)
+
+
+def _is_real(root):
+    """
+    Check whether a root is real up to the rounding of the root finder
+    Args:
+        root (complex): Root
+    Returns:
+        bool: True for a real root
+    """
+    return abs(root.imag) <= REAL_ROOT_TOLERANCE * max(abs(root), 1.0)
+
+
+def _conjugate_index(roots, root, used):
+    """
+    Index of the unused root closest to the conjugate of root
+    Args:
+        roots (np.ndarray): Candidate roots
+        root (complex): Root whose conjugate is searched
+        used (np.ndarray): Boolean mask of the roots already taken
+    Returns:
+        int: Index of the conjugate
+    """
+    distances = np.where(used, np.inf, np.abs(roots - np.conj(root)))
+    return int(np.argmin(distances))
+
+
+def match_cancellations(poles, zeros, tolerance=CANCELLATION_TOLERANCE, near_tolerance=NEAR_CANCELLATION_TOLERANCE):
+    """
+    Match the poles and zeros closer than the near cancellation tolerance, closest pairs first.
+    A real pole goes with a real zero and a complex pole with a complex zero, the conjugates then
+    cancel together. Pairs whose pole is not stable are only dropped when they cancel exactly.
+    Args:
+        poles (np.ndarray): Complex poles
+        zeros (np.ndarray): Complex finite zeros
+        tolerance (float): Relative distance below which a pair is dropped
+        near_tolerance (float): Relative distance below which a pair is reported as a near cancellation
+    Returns:
+        tuple: (cancellations, cancelled_poles, cancelled_zeros) list of the pairs and boolean masks
+               of the poles and zeros dropped
+    """
+    poles = np.asarray(poles, dtype=complex)
+    zeros = np.asarray(zeros, dtype=complex)
+    near_tolerance = max(near_tolerance, tolerance)
+    candidates = []
+    for i, pole in enumerate(poles):
+        for j, zero in enumerate(zeros):
+            if pole.imag < 0 or zero.imag < 0 or _is_real(pole) != _is_real(zero):
+                continue
+            distance = _relative_distance(pole, zero)
+            if distance <= near_tolerance:
+                candidates.append((distance, i, j))
+
+    used_poles = np.zeros(len(poles), dtype=bool)
+    used_zeros = np.zeros(len(zeros), dtype=bool)
+    cancelled_poles = np.zeros(len(poles), dtype=bool)
+    cancelled_zeros = np.zeros(len(zeros), dtype=bool)
+    cancellations = []
+    for distance, i, j in sorted(candidates):
+        if used_poles[i] or used_zeros[j]:
+            continue
+        pole_indices, zero_indices = [i], [j]
+        used_poles[i] = used_zeros[j] = True
+        if not _is_real(poles[i]):
+            pole_indices.append(_conjugate_index(poles, poles[i], used_poles))
+            zero_indices.append(_conjugate_index(zeros, zeros[j], used_zeros))
+            used_poles[pole_indices[1]] = used_zeros[zero_indices[1]] = True
+
+        stable = poles[i].real < -STABILITY_TOLERANCE
+        removed = distance <= (tolerance if stable else min(tolerance, EXACT_CANCELLATION_TOLERANCE))
+        if removed:
+            cancelled_poles[pole_indices] = True
+            cancelled_zeros[zero_indices] = True
+        cancellations.append({"pole": complex(poles[i]), "zero": complex(zeros[j]),
+                              "distance": float(distance), "removed": bool(removed)})
+    return cancellations, cancelled_poles, cancelled_zeros
+
+
+def cancel_common_roots(poles, zeros, tolerance=CANCELLATION_TOLERANCE):
+    """
+    Drop the pole-zero pairs that cancel, with the rules of the minimal realization
+    Args:
+        poles (np.ndarray): Complex poles
+        zeros (np.ndarray): Complex zeros, infinite ones are ignored
+        tolerance (float): Relative distance below which a pair is dropped
+    Returns:
+        tuple: (poles, zeros) left
+    """
+    poles = np.asarray(poles, dtype=complex)
+    zeros = np.asarray(zeros, dtype=complex)
+    zeros = zeros[np.isfinite(zeros)]
+    _, cancelled_poles, cancelled_zeros = match_cancellations(poles, zeros, tolerance, tolerance)
+    return poles[~cancelled_poles], zeros[~cancelled_zeros]
+
+
+class PoleZeroAnalysis:
+    """
+    Poles, zeros and gain of a single input single output system, with its near pole-zero cancellations.
+
+    Pairs are matched by match_cancellations, the engine shared with the Nyquist contour and the
+    automatic time horizon. The minimal realization drops the pairs closer than the cancellation
+    tolerance, except those whose pole is not stable, which must cancel exactly: a PID integrator with Ki = 0 adds such an exact pair, while a
+    zero placed next to an unstable plant pole leaves an internal mode that still diverges.
+    """
+
+    def __init__(self, system, tolerance=CANCELLATION_TOLERANCE, near_tolerance=NEAR_CANCELLATION_TOLERANCE):
+        """
+        Compute the poles, zeros and gain, and match the cancelling pairs
+        Args:
+            system: Single input single output system (ctrl.StateSpace or ctrl.TransferFunction)
+            tolerance (float): Relative distance below which a pair is dropped from the minimal realization
+            near_tolerance (float): Relative distance below which a pair is reported as a near cancellation
+        Returns:
+            None
+        """
+        self.system = system
+        self.tolerance = tolerance
+        self.near_tolerance = max(near_tolerance, tolerance)
+        self.poles = np.asarray(ctrl.poles(system), dtype=complex)
+        self.zeros = np.asarray(ctrl.zeros(system), dtype=complex)
+        self.zeros = self.zeros[np.isfinite(self.zeros)]
+        self.gain = self._get_gain()
+        self.cancellations, self.cancelled_poles, self.cancelled_zeros = match_cancellations(self.poles, self.zeros, tolerance,
+                                                                                             self.near_tolerance)
+        self.minimal_realization = None
+
+    def _get_gain(self):
+        """
+        Ratio of the leading coefficients, from the response at a point away from every root
+        Args:
+            None
+        Returns:
+            float: Gain k of G(s) = k prod(s - z) / prod(s - p)
+        """
+        roots = np.concatenate((self.poles, self.zeros))
+        s = 1j * (1.0 + 2.0 * (np.max(np.abs(roots)) if roots.size else 0.0))
+        response = complex(np.asarray(self.system(s)).ravel()[0])
+        return float((response * np.prod(s - self.poles) / np.prod(s - self.zeros)).real)
+
+    def get_poles(self):
+        """
+        Return the poles of the system
+        Args:
+            None
+        Returns:
+            np.ndarray: Complex poles
+        """
+        return self.poles
+
+    def get_zeros(self):
+        """
+        Return the finite zeros of the system
+        Args:
+            None
+        Returns:
+            np.ndarray: Complex zeros
+        """
+        return self.zeros
+
+    def get_cancellations(self):
+        """
+        Return the near pole-zero cancellations, one entry per real pair or conjugate pair (upper half-plane)
+        Args:
+            None
+        Returns:
+            list: Dicts with 'pole', 'zero', 'distance' (relative) and 'removed' (dropped from the minimal realization)
+        """
+        return self.cancellations
+
+    def get_damping(self):
+        """
+        Damping ratio and natural frequency of every pole
+        Args:
+            None
+        Returns:
+            tuple: (damping, natural_frequency) arrays aligned with get_poles()
+        """
+        return damping_and_natural_frequency(self.poles)
+
+    def get_minimal_zpk(self):
+        """
+        Zeros, poles and gain left once the cancelled pairs are dropped
+        Args:
+            None
+        Returns:
+            tuple: (zeros, poles, gain)
+        """
+        return self.zeros[~self.cancelled_zeros], self.poles[~self.cancelled_poles], self.gain
+
+    def get_minimal_realization(self):
+        """
+        Realization of the system without the cancelled pairs, the system itself when nothing cancels
+        Args:
+            None
+        Returns:
+            ctrl.StateSpace (ctrl.TransferFunction for an improper system) of the minimal order
+        """
+        if self.minimal_realization is None:
+            if not self.cancelled_poles.any():
+                self.minimal_realization = self.system
+            else:
+                zeros, poles, gain = self.get_minimal_zpk()
+                if len(zeros) > len(poles):
+                    self.minimal_realization = ctrl.tf(gain * np.real(np.poly(zeros)), np.real(np.poly(poles)))
+                else:
+                    self.minimal_realization = ctrl.ss(*zpk_to_state_space(zeros, poles, gain))
+        return self.minimal_realization
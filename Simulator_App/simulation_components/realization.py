@@ -0,0 +1,163 @@
+#Scientific imports
+import numpy as np
+from scipy.signal import zpk2sos
+
+
+def trim_coefficients(coefficients):
+    """
+    Convert coefficients to a float array without leading zeros
+    Args:
+        coefficients (list): Polynomial coefficients, highest power first
+    Returns:
+        np.ndarray: Coefficients starting with a nonzero one ([0.] for the zero polynomial)
+    """
+    coefficients = np.atleast_1d(np.asarray(coefficients, dtype=float))
+    nonzero = np.flatnonzero(coefficients)
+    if not nonzero.size:
+        return np.zeros(1)
+    return coefficients[nonzero[0]:]
+
+
+def coefficients_to_zpk(numerator, denominator):
+    """
+    Zeros, poles and gain of N(s) / D(s)
+    Args:
+        numerator (list): Numerator coefficients, highest power first
+        denominator (list): Denominator coefficients, highest power first
+    Returns:
+        tuple: (zeros, poles, gain) with gain the ratio of the leading coefficients
+    """
+    numerator = trim_coefficients(numerator)
+    denominator = trim_coefficients(denominator)
+    if not denominator[0]:
+        raise ValueError("Denominator cannot be all zeros.")
+    if len(numerator) > len(denominator):
+        raise ValueError("The transfer function is improper (numerator degree above denominator degree).")
+    if not numerator[0]:
+        return np.empty(0), np.roots(denominator), 0.0
+    return np.roots(numerator), np.roots(denominator), numerator[0] / denominator[0]
+
+
+def zpk_to_state_space(zeros, poles, gain):
+    """
+    Realize a proper zero-pole-gain model as a cascade of first and second order sections.
+    Every section only involves neighbouring poles and zeros, so the realization stays well
+    conditioned at high order where the companion form of the expanded polynomials does not.
+    Args:
+        zeros (np.ndarray): Zeros of the model
+        poles (np.ndarray): Poles of the model
+        gain (float): Gain (ratio of the leading coefficients)
+    Returns:
+        tuple: (A, B, C, D) np.ndarray matrices of the single input single output realization
+    """
+    A, B, C, D = np.zeros((0, 0)), np.zeros((0, 1)), np.zeros((1, 0)), np.array([[float(gain)]])
+    if not len(poles):
+        return A, B, C, D
+    sections = zpk2sos(zeros, poles, gain, analog=True)
+
+    # zpk2sos puts the whole gain in the first section: spread it so that every section has a
+    # comparable magnitude, otherwise the coupling terms of the cascade span many decades
+    with np.errstate(divide='ignore', invalid='ignore'):
+        magnitudes = np.array([abs(_section_response(section, _section_frequency(section))) for section in sections])
+    magnitudes[~np.isfinite(magnitudes) | (magnitudes == 0)] = 1.0
+    sections[:, :3] /= magnitudes[:, None]
+    sections[:, :3] *= np.prod(magnitudes) ** (1.0 / len(sections))
+
+    D = np.ones((1, 1))
+    for section in sections:
+        A, B, C, D = cascade(A, B, C, D, *section_to_state_space(section))
+    return A, B, C, D
+
+
+def _section_frequency(section):
+    """
+    Natural frequency of a section, 1 rad/s for a pure integrator
+    Args:
+        section (np.ndarray): [b0, b1, b2, a0, a1, a2]
+    Returns:
+        float: Frequency in rad/s
+    """
+    a0, a1, a2 = section[3:]
+    frequency = np.sqrt(abs(a2 / a0)) if a0 else abs(a2 / a1)
+    return frequency if frequency > 0 else 1.0
+
+
+def _section_response(section, omega):
+    """
+    Evaluate a section on the imaginary axis
+    Args:
+        section (np.ndarray): [b0, b1, b2, a0, a1, a2]
+        omega (float): Frequency in rad/s
+    Returns:
+        complex: Response of the section
+    """
+    return np.polyval(section[:3], 1j * omega) / np.polyval(section[3:], 1j * omega)
+
+
+def section_to_state_space(section):
+    """
+    Controllable canonical realization of a proper section (b0 s^2 + b1 s + b2) / (a0 s^2 + a1 s + a2)
+    Args:
+        section (np.ndarray): [b0, b1, b2, a0, a1, a2], first order sections have b0 = a0 = 0
+    Returns:
+        tuple: (A, B, C, D) of the section
+    """
+    numerator, denominator = section[:3], section[3:]
+    order = 2 if denominator[0] else 1
+    numerator = numerator[3 - order - 1:] / denominator[3 - order - 1]
+    denominator = denominator[3 - order - 1:] / denominator[3 - order - 1]
+    direct = numerator[0]
+    remainder = numerator[1:] - direct * denominator[1:]
+    A = np.zeros((order, order))
+    A[0] = -denominator[1:]
+    A[1:, :-1] = np.eye(order - 1)
+    B = np.zeros((order, 1))
+    B[0, 0] = 1.0
+    return A, B, remainder[None, :], np.array([[direct]])
+
+
+def cascade(A1, B1, C1, D1, A2, B2, C2, D2):
+    """
+    Series connection of two single input single output realizations (1 feeding 2)
+    Args:
+        A1, B1, C1, D1 (np.ndarray): First realization
+        A2, B2, C2, D2 (np.ndarray): Second realization
+    Returns:
+        tuple: (A, B, C, D) of the series connection
+    """
+    n1, n2 = A1.shape[0], A2.shape[0]
+    A = np.zeros((n1 + n2, n1 + n2))
+    A[:n1, :n1] = A1
+    A[n1:, :n1] = B2 @ C1
+    A[n1:, n1:] = A2
+    B = np.vstack([B1, B2 @ D1])
+    C = np.hstack([D2 @ C1, C2])
+    return A, B, C, D2 @ D1
+
+
+def pid_series_state_space(kp, ki, kd, A, B, C, D):
+    """
+    Realization of C(s) P(s) with the PID C(s) = kp + ki / s + kd s and P(s) = (A, B, C, D).
+    The derivative acts on the plant output (s P(s) = C A (sI - A)^-1 B + C B), so no
+    improper block is ever built. The PID integrator adds one state.
+    Args:
+        kp (float): Proportional gain
+        ki (float): Integral gain
+        kd (float): Derivative gain
+        A, B, C, D (np.ndarray): Realization of the plant
+    Returns:
+        tuple: (A, B, C, D) of the series connection
+    Raises:
+        ValueError: If kd is not zero and the plant is not strictly proper (the series is improper)
+    """
+    A, B, C, D = (np.atleast_2d(np.asarray(matrix, dtype=float)) for matrix in (A, B, C, D))
+    if kd and np.any(D):
+        raise ValueError("The derivative term needs a strictly proper plant.")
+    n = A.shape[0]
+    A_series = np.zeros((n + 1, n + 1))
+    A_series[:n, :n] = A
+    A_series[n, :n] = C
+    B_series = np.vstack([B.reshape(n, 1), D])
+    C_series = np.hstack([kd * C @ A + kp * C, [[ki]]])
+    D_series = kd * C @ B + kp * D
+    return A_series, B_series, C_series, D_series
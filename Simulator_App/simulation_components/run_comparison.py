@@ -0,0 +1,415 @@
+# Standard library imports
+import copy
+
+#Scientific imports
+import control as ctrl
+import numpy as np
+from matplotlib.figure import Figure
+
+# Local application imports
+from .output import Output
+from .simulation_service import build_project
+from .instrumentation import span, traced
+
+# Views that can be overlaid
+COMPARISON_VIEWS = ["Step Response", "Bode Plot", "Pole-Zero Plot"]
+
+# Frequencies shared by every run and every cached factor
+COMPARISON_OMEGA = np.logspace(-2, 3, 1000)
+
+
+def component_key(component):
+    """
+    Key identifying a plant or a sensor by its type, parameters and delay
+    Args:
+        component: Plant or Sensor object
+    Returns:
+        tuple: Hashable key, equal for components with the same model
+    """
+    return (type(component).__name__, repr(sorted(component.get_parameters().items())), component.get_delay())
+
+
+def input_key(input_params):
+    """
+    Key identifying the input parameters and the reference signal
+    Args:
+        input_params: Input object
+    Returns:
+        tuple: Hashable key
+    """
+    return (repr(sorted(input_params.get_parameters().items())), input_params.get_signal_type(),
+            repr(sorted(input_params.get_signal_parameters().items())))
+
+
+class _SharedFactorOutput(Output):
+    """
+    Output whose plant and sensor realizations come from the factor cache of a comparison,
+    so runs with the same plant or sensor do not realize it again.
+    """
+
+    def __init__(self, comparison, pid_object, plant_object, input_params, sensor_object):
+        """
+        Initialize the output of a run
+        Args:
+            comparison (RunComparison): Comparison holding the shared factors
+            pid_object: PID controller object
+            plant_object: Plant model object
+            input_params: Input parameters object
+            sensor_object: Sensor model object
+        Returns:
+            None
+        """
+        super().__init__(pid_object=pid_object, plant_object=plant_object, input_params=input_params, sensor_object=sensor_object)
+        self.comparison = comparison
+
+    def get_component_state_space(self, component):
+        """
+        Return the realization of the plant or the sensor from the factor cache of the comparison.
+        The cache always holds the full models: use_reduced_models is ignored, runs are never reduced
+        Args:
+            component: Plant or Sensor object
+        Returns:
+            ctrl.StateSpace: Full realization of the component
+            error message (str) if the component is invalid
+        """
+        return self.comparison.get_factor(component)["state_space"]
+
+
+class ComparisonRun:
+    """
+    Pinned configuration: a copy of the loop components, independent of later edits in the simulator.
+    """
+
+    def __init__(self, label, pid_object, plant_object, input_params, sensor_object):
+        """
+        Initialize the run with copies of the components
+        Args:
+            label (str): Name shown in the legends
+            pid_object: PID controller object
+            plant_object: Plant model object
+            input_params: Input parameters object
+            sensor_object: Sensor model object
+        Returns:
+            None
+        """
+        self.label = label
+        self.pid_object = copy.deepcopy(pid_object)
+        self.plant_object = copy.deepcopy(plant_object)
+        self.input_params = copy.deepcopy(input_params)
+        self.sensor_object = copy.deepcopy(sensor_object)
+
+    def get_key(self):
+        """
+        Key of the configuration: runs with equal keys share their cached arrays
+        Args:
+            None
+        Returns:
+            tuple: Hashable key
+        """
+        pid = self.pid_object.get_parameters()
+        return (component_key(self.plant_object), component_key(self.sensor_object),
+                (pid["kp"], pid["ki"], pid["kd"]), input_key(self.input_params))
+
+    def get_description(self):
+        """
+        Describe the run for the list of pinned runs
+        Args:
+            None
+        Returns:
+            str: Label, plant name and PID gains
+        """
+        pid = self.pid_object.get_parameters()
+        return f"{self.label}: {self.plant_object.name} (Kp={pid['kp']}, Ki={pid['ki']}, Kd={pid['kd']})"
+
+
+class RunComparison:
+    """
+    Overlay of the step, Bode and pole-zero results of several pinned runs.
+    Plant and sensor factors are realized and evaluated on the frequency grid once per distinct
+    model, and the arrays of every run are cached, so adding a run only computes what is new
+    and removing one computes nothing.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty comparison
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.runs = {}
+        self.factor_cache = {}
+        self.run_cache = {}
+        self.computations = {"factor": 0, "Step Response": 0, "Bode Plot": 0, "Pole-Zero Plot": 0}
+
+    def add_run(self, label, pid_object, plant_object, input_params, sensor_object):
+        """
+        Pin a copy of a configuration
+        Args:
+            label (str): Name of the run, unique in the comparison
+            pid_object: PID controller object
+            plant_object: Plant model object
+            input_params: Input parameters object
+            sensor_object: Sensor model object
+        Returns:
+            error_log (str): Error message if the label is taken or a component is invalid, None otherwise
+        """
+        if not label:
+            return "Error: The run needs a name."
+        if label in self.runs:
+            return f"Error: A run named '{label}' is already pinned."
+        for component in (plant_object, sensor_object):
+            tf = component.get_transfer_function()
+            if isinstance(tf, str):
+                return tf
+        self.runs[label] = ComparisonRun(label, pid_object, plant_object, input_params, sensor_object)
+
+    def add_project(self, label, project):
+        """
+        Pin the configuration of a project in JSON form (see simulation_service.build_project)
+        Args:
+            label (str): Name of the run
+            project (dict): Project sections
+        Returns:
+            error_log (str): Error message if the project is invalid, None otherwise
+        """
+        components = build_project(project)
+        if isinstance(components, str):
+            return components
+        pid, plant, input_params, sensor = components
+        return self.add_run(label, pid, plant, input_params, sensor)
+
+    def remove_run(self, label):
+        """
+        Unpin a run and drop the cached arrays and factors no other run uses
+        Args:
+            label (str): Name of the run
+        Returns:
+            None
+        """
+        self.runs.pop(label, None)
+        used_runs = {run.get_key() for run in self.runs.values()}
+        used_factors = {key for run in self.runs.values() for key in run.get_key()[:2]}
+        self.run_cache = {key: value for key, value in self.run_cache.items() if key in used_runs}
+        self.factor_cache = {key: value for key, value in self.factor_cache.items() if key in used_factors}
+
+    def get_runs(self):
+        """
+        Return the pinned runs in the order they were added
+        Args:
+            None
+        Returns:
+            list: ComparisonRun objects
+        """
+        return list(self.runs.values())
+
+    def get_factor(self, component):
+        """
+        Realization and frequency response of a plant or a sensor, computed once per distinct model
+        Args:
+            component: Plant or Sensor object
+        Returns:
+            dict: 'state_space' (ctrl.StateSpace or error message) and 'frequency_response' (np.ndarray on
+                  COMPARISON_OMEGA, including the delay, or None if the component is invalid)
+        """
+        key = component_key(component)
+        factor = self.factor_cache.get(key)
+        if factor is None:
+            self.computations["factor"] += 1
+            with span("RunComparison.factor"):
+                state_space = component.get_state_space()
+                frequency_response = None
+                if not isinstance(state_space, str):
+                    s_values = 1j * COMPARISON_OMEGA
+                    frequency_response = np.asarray(state_space(s_values)).reshape(-1) * np.exp(-s_values * component.get_delay())
+            factor = self.factor_cache[key] = {"state_space": state_space, "frequency_response": frequency_response}
+        return factor
+
+    def get_run_data(self, run, view):
+        """
+        Arrays of one view of a run, computed on the first request only
+        Args:
+            run (ComparisonRun): Pinned run
+            view (str): One of COMPARISON_VIEWS
+        Returns:
+            dict: Arrays of the view, or None if the loop of the run is not available
+        """
+        cache = self.run_cache.setdefault(run.get_key(), {})
+        if view not in cache:
+            self.computations[view] += 1
+            if view == "Step Response":
+                cache[view] = self.compute_step(run)
+            elif view == "Bode Plot":
+                cache[view] = self.compute_bode(run)
+            else:
+                cache[view] = self.compute_pole_zero(run)
+        return cache[view]
+
+    def get_output(self, run):
+        """
+        Output of a run reading the plant and sensor realizations from the factor cache
+        Args:
+            run (ComparisonRun): Pinned run
+        Returns:
+            Output: Output object of the run
+        """
+        return _SharedFactorOutput(self, run.pid_object, run.plant_object, run.input_params, run.sensor_object)
+
+    @traced("RunComparison.step")
+    def compute_step(self, run):
+        """
+        Step response of a run
+        Args:
+            run (ComparisonRun): Pinned run
+        Returns:
+            dict: 't' and 'response' arrays, or None if the loop is not available
+        """
+        step_data = self.get_output(run).get_step_response_data()
+        if step_data is None:
+            return None
+        return {"t": step_data[0], "response": step_data[1]}
+
+    @traced("RunComparison.bode")
+    def compute_bode(self, run):
+        """
+        Closed-loop frequency response of a run from the cached plant and sensor responses
+        Args:
+            run (ComparisonRun): Pinned run
+        Returns:
+            dict: 'magnitude_db' and 'phase_deg' arrays on COMPARISON_OMEGA, or None if the loop is not available
+        """
+        plant_response = self.get_factor(run.plant_object)["frequency_response"]
+        sensor_response = self.get_factor(run.sensor_object)["frequency_response"]
+        if plant_response is None or sensor_response is None:
+            return None
+        pid_response = np.asarray(run.pid_object.get_transfer_function()(1j * COMPARISON_OMEGA)).reshape(-1)
+        forward = pid_response * plant_response
+        closed_loop = forward / (1 + forward * sensor_response)
+        with np.errstate(divide="ignore"):
+            magnitude_db = 20 * np.log10(np.abs(closed_loop))
+        return {"magnitude_db": magnitude_db, "phase_deg": np.degrees(np.unwrap(np.angle(closed_loop)))}
+
+    @traced("RunComparison.pole_zero")
+    def compute_pole_zero(self, run):
+        """
+        Closed-loop poles and zeros of a run (transport delays are not represented)
+        Args:
+            run (ComparisonRun): Pinned run
+        Returns:
+            dict: 'poles' and 'zeros' arrays, or None if the loop is not available
+        """
+        closed_loop = self.get_output(run).get_closed_loop_transfer_function()
+        if closed_loop is None:
+            return None
+        return {"poles": ctrl.poles(closed_loop), "zeros": ctrl.zeros(closed_loop)}
+
+    def plot(self, view):
+        """
+        Overlay a view of every pinned run
+        Args:
+            view (str): One of COMPARISON_VIEWS
+        Returns:
+            Matplotlib Figure object, or None if no run is pinned
+        """
+        if not self.runs:
+            return None
+        if view == "Step Response":
+            return self.plot_step_response()
+        if view == "Bode Plot":
+            return self.plot_bode()
+        return self.plot_pole_zero()
+
+    def get_failed_runs(self, view):
+        """
+        Return the labels of the runs whose view could not be computed
+        Args:
+            view (str): One of COMPARISON_VIEWS
+        Returns:
+            list: Run labels
+        """
+        return [run.label for run in self.runs.values() if self.get_run_data(run, view) is None]
+
+    def plot_step_response(self):
+        """
+        Overlay the step responses of the pinned runs
+        Args:
+            None
+        Returns:
+            Matplotlib Figure object
+        """
+        fig = Figure(dpi=80)
+        ax = fig.add_subplot(111)
+        for i, run in enumerate(self.runs.values()):
+            data = self.get_run_data(run, "Step Response")
+            if data is not None:
+                ax.plot(data["t"], data["response"], color=f"C{i}", linewidth=2, label=run.label)
+        ax.set_title('Step Response Comparison', pad=20)
+        ax.set_xlabel('Time (s)')
+        ax.set_ylabel('Amplitude')
+        ax.grid(True, linestyle='--', alpha=0.7)
+        ax.set_facecolor((0.95, 0.95, 0.95))
+        ax.legend()
+        with span("Figure.tight_layout"):
+            fig.tight_layout()
+        return fig
+
+    def plot_bode(self):
+        """
+        Overlay the closed-loop Bode diagrams of the pinned runs
+        Args:
+            None
+        Returns:
+            Matplotlib Figure object
+        """
+        fig = Figure(figsize=(10, 8), dpi=80)
+        ax1 = fig.add_subplot(211)
+        ax2 = fig.add_subplot(212, sharex=ax1)
+        for i, run in enumerate(self.runs.values()):
+            data = self.get_run_data(run, "Bode Plot")
+            if data is not None:
+                ax1.semilogx(COMPARISON_OMEGA, data["magnitude_db"], color=f"C{i}", linewidth=2, label=run.label)
+                ax2.semilogx(COMPARISON_OMEGA, data["phase_deg"], color=f"C{i}", linewidth=2, label=run.label)
+        ax1.set_title('Closed-Loop Bode Diagram Comparison', pad=20)
+        ax1.set_ylabel('Magnitude [dB]')
+        ax1.grid(True, linestyle='--', alpha=0.7)
+        ax1.legend(loc='upper right', fontsize=8)
+        ax2.set_ylabel('Phase [deg]')
+        ax2.set_xlabel('Frequency [rad/s]')
+        ax2.grid(True, linestyle='--', alpha=0.7)
+        with span("Figure.tight_layout"):
+            fig.tight_layout()
+        return fig
+
+    def plot_pole_zero(self):
+        """
+        Overlay the closed-loop poles and zeros of the pinned runs
+        Args:
+            None
+        Returns:
+            Matplotlib Figure object
+        """
+        fig = Figure(figsize=(10, 10), dpi=80)
+        ax = fig.add_subplot(111)
+        for i, run in enumerate(self.runs.values()):
+            data = self.get_run_data(run, "Pole-Zero Plot")
+            if data is None:
+                continue
+            ax.scatter(np.real(data["poles"]), np.imag(data["poles"]), marker='x', color=f"C{i}", s=100,
+                       linewidths=2, label=f"{run.label} poles")
+            if len(data["zeros"]) > 0:
+                ax.scatter(np.real(data["zeros"]), np.imag(data["zeros"]), marker='o', facecolors='none',
+                           edgecolors=f"C{i}", s=100, linewidths=2, label=f"{run.label} zeros")
+        ax.axhline(0, color='black', linewidth=0.8, alpha=0.7)
+        ax.axvline(0, color='black', linewidth=0.8, alpha=0.7)
+        ax.set_title('Pole-Zero Comparison', pad=20)
+        if any(run.plant_object.get_delay() > 0 or run.sensor_object.get_delay() > 0 for run in self.runs.values()):
+            ax.text(0.02, 0.02, 'Transport delay not represented', transform=ax.transAxes, color='gray')
+        ax.set_xlabel('Real')
+        ax.set_ylabel('Imaginary')
+        ax.grid(True, linestyle='--', alpha=0.7)
+        ax.set_facecolor((0.95, 0.95, 0.95))
+        ax.legend(fontsize=8)
+        with span("Figure.tight_layout"):
+            fig.tight_layout()
+        return fig
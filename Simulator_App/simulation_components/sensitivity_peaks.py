@@ -0,0 +1,197 @@
+#Scientific imports
+import control as ctrl
+import numpy as np
+
+# Local application imports
+from .divergence import STABILITY_TOLERANCE
+
+# Relative tolerance of the H-infinity norms: the true norm lies within this fraction of the result
+HINF_TOLERANCE = 1e-6
+
+# Hamiltonian eigenvalues with |Re| below this fraction of their magnitude are on the imaginary axis
+IMAGINARY_TOLERANCE = 1e-8
+
+# Bisection steps, far more than a relative tolerance above machine precision needs
+MAX_BISECTION_STEPS = 200
+
+
+def _stack(A, B, C, D):
+    """
+    Bring one or many SISO realizations to batch form
+    Args:
+        A (np.ndarray): State matrices, shape (n, n) or (batch, n, n)
+        B (np.ndarray): Input columns, shape (n, 1) or (batch, n, 1)
+        C (np.ndarray): Output rows, shape (1, n) or (batch, 1, n)
+        D (float or np.ndarray): Feedthroughs, scalar or shape (batch,)
+    Returns:
+        tuple: (A, B, C, D) with shapes (batch, n, n), (batch, n, 1), (batch, 1, n), (batch,)
+    """
+    A = np.asarray(A, dtype=float)
+    if A.size:
+        A = A.reshape((-1,) + A.shape[-2:])
+    else:
+        # Static gains: the batch size comes from the feedthroughs
+        A = np.zeros((np.asarray(D).size, 0, 0))
+    batch, order = A.shape[0], A.shape[-1]
+    B = np.asarray(B, dtype=float).reshape(batch, order, 1)
+    C = np.asarray(C, dtype=float).reshape(batch, 1, order)
+    D = np.broadcast_to(np.asarray(D, dtype=float).reshape(-1), (batch,)).copy()
+    return A, B, C, D
+
+
+def _magnitudes(A, B, C, D, omega):
+    """
+    |G(j omega)| of every realization of a batch at its own frequencies
+    Args:
+        A, B, C, D (np.ndarray): Batch of realizations (see _stack)
+        omega (np.ndarray): Frequencies in rad/s, shape (batch, points)
+    Returns:
+        np.ndarray: Magnitudes, shape (batch, points)
+    """
+    order = A.shape[-1]
+    if not order:
+        return np.broadcast_to(np.abs(D)[:, None], omega.shape).copy()
+    resolvent = 1j * omega[..., None, None] * np.eye(order) - A[:, None]
+    states = np.linalg.solve(resolvent, np.broadcast_to(B[:, None], resolvent.shape[:-1] + (1,)))
+    return np.abs((C[:, None] @ states)[..., 0, 0] + D[:, None])
+
+
+def _imaginary_frequencies(A, B, C, D, gamma):
+    """
+    Frequencies where some singular value of G(j omega) equals gamma, from the Hamiltonian eigenvalues
+    Args:
+        A, B, C, D (np.ndarray): Batch of stable realizations (see _stack)
+        gamma (np.ndarray): Levels, shape (batch,), above |D|
+    Returns:
+        tuple: (found, frequency) boolean array of the rows reaching gamma and the mean frequency of their crossings
+    """
+    R = gamma ** 2 - D ** 2
+    F = A + B @ C * (D / R)[:, None, None]
+    H = np.block([[F, B @ np.swapaxes(B, 1, 2) / R[:, None, None]],
+                  [-np.swapaxes(C, 1, 2) @ C * (gamma ** 2 / R)[:, None, None], -np.swapaxes(F, 1, 2)]])
+    eigenvalues = np.linalg.eigvals(H)
+    imaginary = np.abs(eigenvalues.real) <= IMAGINARY_TOLERANCE * np.maximum(np.abs(eigenvalues), 1.0)
+    found = imaginary.any(axis=1)
+    with np.errstate(invalid='ignore'):
+        frequency = np.sum(np.where(imaginary, np.abs(eigenvalues.imag), 0.0), axis=1) / np.sum(imaginary, axis=1)
+    return found, frequency
+
+
+def hinf_norm_batch(A, B, C, D, tolerance=HINF_TOLERANCE):
+    """
+    H-infinity norms of a batch of SISO systems by bisection on the Hamiltonian eigenvalues.
+
+    For a stable system and gamma > |D|, the peak gain exceeds gamma exactly when the
+    Hamiltonian H(gamma) has an eigenvalue on the imaginary axis. A lower bound (the
+    largest gain at the feedthrough and at the natural frequencies of the poles) and an
+    upper bound are bisected until upper - lower <= tolerance * lower, so the true norm
+    lies inside the returned bracket whatever the width of the peak. Every row of the
+    batch is bisected in the same eigenvalue calls.
+    Args:
+        A (np.ndarray): State matrices, shape (n, n) or (batch, n, n)
+        B (np.ndarray): Input columns, shape (n, 1) or (batch, n, 1)
+        C (np.ndarray): Output rows, shape (1, n) or (batch, 1, n)
+        D (float or np.ndarray): Feedthroughs, scalar or shape (batch,)
+        tolerance (float): Relative tolerance of the norms
+    Returns:
+        dict: 'norm', 'lower', 'upper' and 'frequency' (rad/s, inf when the supremum is reached at
+              infinite frequency) arrays of shape (batch,), the norm is inf for systems that are not stable
+    """
+    A, B, C, D = _stack(A, B, C, D)
+    batch, order = A.shape[0], A.shape[-1]
+    lower = np.full(batch, np.inf)
+    upper = np.full(batch, np.inf)
+    frequency = np.full(batch, np.nan)
+
+    stable = np.array([np.all(np.linalg.eigvals(a).real < -STABILITY_TOLERANCE) for a in A]) if order else np.ones(batch, dtype=bool)
+    rows = np.flatnonzero(stable)
+    if not rows.size:
+        return {"norm": lower.copy(), "lower": lower, "upper": upper, "frequency": frequency}
+    A, B, C, D = A[rows], B[rows], C[rows], D[rows]
+
+    # Lower bound: feedthrough (infinite frequency) and the gain at DC and at the natural frequency of every pole
+    poles = np.linalg.eigvals(A) if order else np.zeros((len(rows), 0))
+    omega = np.concatenate((np.zeros((len(rows), 1)), np.abs(poles)), axis=1)
+    magnitudes = _magnitudes(A, B, C, D, omega)
+    low = np.max(magnitudes, axis=1)
+    peak = np.where(low > np.abs(D), omega[np.arange(len(rows)), np.argmax(magnitudes, axis=1)], np.inf)
+    low = np.maximum(low, np.abs(D))
+
+    # Upper bound: double until the level is not reached at any frequency
+    high = np.where(low > 0, 2.0 * low, 0.0)
+    pending = low > 0
+    for _ in range(MAX_BISECTION_STEPS):
+        if not pending.any():
+            break
+        found, crossing = _imaginary_frequencies(A[pending], B[pending], C[pending], D[pending], high[pending])
+        index = np.flatnonzero(pending)
+        low[index[found]] = high[index[found]]
+        peak[index[found]] = crossing[found]
+        high[index[found]] *= 2.0
+        pending[index[~found]] = False
+
+    # Bisection on the geometric mean, all unconverged rows at once
+    for _ in range(MAX_BISECTION_STEPS):
+        active = high - low > tolerance * low
+        if not active.any():
+            break
+        index = np.flatnonzero(active)
+        level = np.sqrt(low[index] * high[index])
+        found, crossing = _imaginary_frequencies(A[index], B[index], C[index], D[index], level)
+        low[index[found]] = level[found]
+        peak[index[found]] = crossing[found]
+        high[index[~found]] = level[~found]
+
+    lower[rows], upper[rows], frequency[rows] = low, high, peak
+    return {"norm": 0.5 * (lower + upper), "lower": lower, "upper": upper, "frequency": frequency}
+
+
+def sensitivity_state_space(A, B, C, D):
+    """
+    Realizations of S = 1/(1 + L) and T = L/(1 + L) from a batch of loop realizations L
+    Args:
+        A, B, C, D: One or many loop realizations (see _stack)
+    Returns:
+        tuple: ((A, B, C, D) of S, (A, B, C, D) of T), batched, both share the closed-loop state matrix
+    """
+    A, B, C, D = _stack(A, B, C, D)
+    scale = 1.0 / (1.0 + D)
+    A_loop = A - B @ C * scale[:, None, None]
+    B_loop = B * scale[:, None, None]
+    return (A_loop, B_loop, -C * scale[:, None, None], scale), (A_loop, B_loop, C * scale[:, None, None], D * scale)
+
+
+def sensitivity_peaks(A, B, C, D, tolerance=HINF_TOLERANCE):
+    """
+    Peak sensitivity Ms = ||S||inf and peak complementary sensitivity Mt = ||T||inf of a batch of loops
+    Args:
+        A, B, C, D: One or many loop realizations (see _stack)
+        tolerance (float): Relative tolerance of the peaks
+    Returns:
+        dict: 'ms', 'ms_frequency', 'mt' and 'mt_frequency' arrays of shape (batch,), the peaks are inf
+              when the closed loop is not stable
+    """
+    sensitivity, complementary = sensitivity_state_space(A, B, C, D)
+    ms = hinf_norm_batch(*sensitivity, tolerance)
+    mt = hinf_norm_batch(*complementary, tolerance)
+    return {"ms": ms["norm"], "ms_frequency": ms["frequency"], "mt": mt["norm"], "mt_frequency": mt["frequency"]}
+
+
+def sensitivity_peaks_for_gains(loop, gains, tolerance=HINF_TOLERANCE):
+    """
+    Peaks of S and T for the loop scaled by every gain of a sweep, bisected together
+    Args:
+        loop (ctrl.StateSpace): Loop realization L = C P S (without delay)
+        gains (np.ndarray): Gains k applied to the loop
+        tolerance (float): Relative tolerance of the peaks
+    Returns:
+        dict: See sensitivity_peaks, one value per gain
+    """
+    loop = ctrl.ss(loop)
+    gains = np.atleast_1d(np.asarray(gains, dtype=float))
+    order = loop.A.shape[0]
+    A = np.broadcast_to(np.asarray(loop.A, dtype=float), (len(gains), order, order))
+    B = np.broadcast_to(np.asarray(loop.B, dtype=float).reshape(order, 1), (len(gains), order, 1))
+    C = gains[:, None, None] * np.asarray(loop.C, dtype=float).reshape(1, 1, order)
+    D = gains * float(np.asarray(loop.D).ravel()[0])
+    return sensitivity_peaks(A, B, C, D, tolerance)
@@ -0,0 +1,531 @@
+# Standard library imports
+import sys
+import os
+import io
+import mmap
+
+#Scientific imports
+import numpy as np
+
+# Abstract base class imports
+from abc import ABC, abstractmethod
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.input_utils import must_be_nonnegative, must_be_positive
+
+# Samples resampled per playback chunk and rows read per source block
+CHUNK_SIZE = 4096
+SOURCE_BLOCK_ROWS = 65536
+
+# Feedback taps of the maximum-length 7 bit shift register (x^7 + x^6 + 1)
+PRBS_ORDER = 7
+PRBS_TAPS = (7, 6)
+
+SUPPORTED_FILE_EXTENSIONS = (".csv", ".txt", ".npy", ".bin", ".dat")
+
+
+class SignalGenerator(ABC):
+    """Abstract base class for all reference signals."""
+
+    def __init__(self, name, parameters=None):
+        """
+        Initialize signal with name and parameters dict
+        Args:
+            name (str): Name of the signal type
+            parameters (dict): Dictionary of parameter names to values
+        Returns:
+            None
+        """
+        self.name = name
+        self.parameters = parameters or {}
+
+    @abstractmethod
+    def generate(self, t):
+        """
+        Evaluate the signal on a time grid.
+        Args:
+            t (np.ndarray): Increasing sample times in seconds
+        Returns:
+            np.ndarray: Signal value at every sample time
+        """
+        pass
+
+    @abstractmethod
+    def validate(self):
+        """
+        Check the current parameters.
+        Args:
+            None
+        Returns:
+            str: Error messages separated by new lines, empty string if valid
+        """
+        pass
+
+    def iter_chunks(self, t, chunk_size=CHUNK_SIZE):
+        """
+        Yield the signal in consecutive chunks of the time grid.
+        Args:
+            t (np.ndarray): Increasing sample times in seconds
+            chunk_size (int): Number of samples per chunk
+        Returns:
+            generator: np.ndarray chunks of the signal
+        """
+        for start in range(0, len(t), chunk_size):
+            yield self.generate(t[start:start + chunk_size])
+
+    def get_parameters(self):
+        """
+        Return current signal parameters.
+        Args:
+            None
+        Returns:
+            dict: Current parameters of the signal
+        """
+        return self.parameters
+
+    def set_parameters(self, **kwargs):
+        """
+        Update signal parameters with given values.
+        Args:
+            kwargs: Parameter names and their new values
+        Returns:
+            None
+        """
+        self.parameters.update(kwargs)
+
+    def get_parameter_descriptions(self):
+        """
+        Return dict of parameter descriptions.
+        Args:
+            None
+        Returns:
+            dict: Mapping of parameter names to their descriptions
+        """
+        return self.DESCRIPTIONS
+
+# ---------------- Specific Signals ---------------- #
+
+class StepSignal(SignalGenerator):
+    DESCRIPTIONS = {
+        'step_time': 'Step Time: Time at which the step occurs (s)',
+        'initial_value': 'Initial Value: Value before the step',
+        'final_value': 'Final Value: Value after the step'
+    }
+
+    def __init__(self, step_time=1, initial_value=0, final_value=1):
+        """
+        Initialize a step from initial_value to final_value at step_time
+        Args:
+            step_time (float): Time of the step
+            initial_value (float): Value before the step
+            final_value (float): Value after the step
+        Returns:
+            None
+        """
+        params = {'step_time': step_time, 'initial_value': initial_value, 'final_value': final_value}
+        super().__init__("Step", params)
+
+    def generate(self, t):
+        """
+        Evaluate the signal on a time grid
+        Args:
+            t (np.ndarray): Sample times in seconds
+        Returns:
+            np.ndarray: Signal value at every sample time
+        """
+        p = self.parameters
+        return np.where(np.asarray(t) >= p['step_time'], float(p['final_value']), float(p['initial_value']))
+
+    def validate(self):
+        """
+        Check the signal parameters
+        Args:
+            None
+        Returns:
+            str: Error messages, empty string if valid
+        """
+        return must_be_nonnegative("Step Time", self.parameters['step_time'])
+
+
+class RampSignal(SignalGenerator):
+    DESCRIPTIONS = {
+        'start_time': 'Start Time: Time at which the ramp starts (s)',
+        'slope': 'Slope: Rate of change of the ramp (units/s)',
+        'offset': 'Offset: Value before the ramp starts'
+    }
+
+    def __init__(self, start_time=1, slope=1, offset=0):
+        """
+        Initialize a ramp of the given slope starting at start_time
+        Args:
+            start_time (float): Time at which the ramp starts
+            slope (float): Rate of change after start_time
+            offset (float): Value before the ramp starts
+        Returns:
+            None
+        """
+        params = {'start_time': start_time, 'slope': slope, 'offset': offset}
+        super().__init__("Ramp", params)
+
+    def generate(self, t):
+        """
+        Evaluate the signal on a time grid
+        Args:
+            t (np.ndarray): Sample times in seconds
+        Returns:
+            np.ndarray: Signal value at every sample time
+        """
+        p = self.parameters
+        return p['offset'] + p['slope'] * np.maximum(np.asarray(t) - p['start_time'], 0.0)
+
+    def validate(self):
+        """
+        Check the signal parameters
+        Args:
+            None
+        Returns:
+            str: Error messages, empty string if valid
+        """
+        return must_be_nonnegative("Start Time", self.parameters['start_time'])
+
+
+class SineSignal(SignalGenerator):
+    DESCRIPTIONS = {
+        'amplitude': 'Amplitude: Peak value of the sine wave',
+        'frequency': 'Frequency: Frequency of the sine wave (Hz)',
+        'phase': 'Phase: Initial phase of the sine wave (deg)',
+        'offset': 'Offset: Mean value of the sine wave'
+    }
+
+    def __init__(self, amplitude=1, frequency=0.5, phase=0, offset=0):
+        """
+        Initialize a sine wave
+        Args:
+            amplitude (float): Peak value
+            frequency (float): Frequency in Hz
+            phase (float): Initial phase in degrees
+            offset (float): Mean value
+        Returns:
+            None
+        """
+        params = {'amplitude': amplitude, 'frequency': frequency, 'phase': phase, 'offset': offset}
+        super().__init__("Sine", params)
+
+    def generate(self, t):
+        """
+        Evaluate the signal on a time grid
+        Args:
+            t (np.ndarray): Sample times in seconds
+        Returns:
+            np.ndarray: Signal value at every sample time
+        """
+        p = self.parameters
+        return p['offset'] + p['amplitude'] * np.sin(2 * np.pi * p['frequency'] * np.asarray(t) + np.radians(p['phase']))
+
+    def validate(self):
+        """
+        Check the signal parameters
+        Args:
+            None
+        Returns:
+            str: Error messages, empty string if valid
+        """
+        return must_be_positive("Frequency", self.parameters['frequency'])
+
+
+class ChirpSignal(SignalGenerator):
+    DESCRIPTIONS = {
+        'amplitude': 'Amplitude: Peak value of the chirp',
+        'start_frequency': 'Start Frequency: Frequency at t = 0 (Hz)',
+        'end_frequency': 'End Frequency: Frequency reached at the sweep time (Hz)',
+        'sweep_time': 'Sweep Time: Duration of the linear frequency sweep (s)'
+    }
+
+    def __init__(self, amplitude=1, start_frequency=0.1, end_frequency=2, sweep_time=10):
+        """
+        Initialize a linear frequency sweep
+        Args:
+            amplitude (float): Peak value
+            start_frequency (float): Frequency at t = 0 in Hz
+            end_frequency (float): Frequency at sweep_time in Hz
+            sweep_time (float): Duration of the sweep in seconds
+        Returns:
+            None
+        """
+        params = {'amplitude': amplitude, 'start_frequency': start_frequency,
+                  'end_frequency': end_frequency, 'sweep_time': sweep_time}
+        super().__init__("Chirp", params)
+
+    def generate(self, t):
+        """
+        Evaluate the signal on a time grid
+        Args:
+            t (np.ndarray): Sample times in seconds
+        Returns:
+            np.ndarray: Signal value at every sample time
+        """
+        p = self.parameters
+        t = np.asarray(t)
+        rate = (p['end_frequency'] - p['start_frequency']) / p['sweep_time']
+        return p['amplitude'] * np.sin(2 * np.pi * (p['start_frequency'] * t + 0.5 * rate * t**2))
+
+    def validate(self):
+        """
+        Check the signal parameters
+        Args:
+            None
+        Returns:
+            str: Error messages, empty string if valid
+        """
+        p = self.parameters
+        errors = [
+            must_be_nonnegative("Start Frequency", p['start_frequency']),
+            must_be_nonnegative("End Frequency", p['end_frequency']),
+            must_be_positive("Sweep Time", p['sweep_time'])
+        ]
+        return "\n".join(e for e in errors if e)
+
+
+class PRBSSignal(SignalGenerator):
+    DESCRIPTIONS = {
+        'amplitude': 'Amplitude: Signal switches between +amplitude and -amplitude around the offset',
+        'bit_time': 'Bit Time: Duration of every pseudo-random bit (s)',
+        'offset': 'Offset: Mean value of the sequence'
+    }
+
+    def __init__(self, amplitude=1, bit_time=0.5, offset=0):
+        """
+        Initialize a pseudo-random binary sequence from a maximum-length shift register
+        Args:
+            amplitude (float): Switching amplitude
+            bit_time (float): Duration of every bit in seconds
+            offset (float): Mean value
+        Returns:
+            None
+        """
+        params = {'amplitude': amplitude, 'bit_time': bit_time, 'offset': offset}
+        super().__init__("PRBS", params)
+
+    def get_bits(self, count):
+        """
+        Generate the first bits of the maximum-length sequence
+        Args:
+            count (int): Number of bits
+        Returns:
+            np.ndarray: Array of 0/1 bits
+        """
+        state = [1] * PRBS_ORDER
+        bits = np.empty(count, dtype=np.int8)
+        for i in range(count):
+            bits[i] = state[-1]
+            feedback = state[PRBS_TAPS[0] - 1] ^ state[PRBS_TAPS[1] - 1]
+            state = [feedback] + state[:-1]
+        return bits
+
+    def generate(self, t):
+        """
+        Evaluate the signal on a time grid
+        Args:
+            t (np.ndarray): Sample times in seconds
+        Returns:
+            np.ndarray: Signal value at every sample time
+        """
+        p = self.parameters
+        bit_index = (np.asarray(t) // p['bit_time']).astype(int)
+        period = 2**PRBS_ORDER - 1
+        bits = self.get_bits(period)[bit_index % period]
+        return p['offset'] + p['amplitude'] * (2.0 * bits - 1.0)
+
+    def validate(self):
+        """
+        Check the signal parameters
+        Args:
+            None
+        Returns:
+            str: Error messages, empty string if valid
+        """
+        return must_be_positive("Bit Time", self.parameters['bit_time'])
+
+
+class FileSignal(SignalGenerator):
+    DESCRIPTIONS = {
+        'file_path': 'File: CSV/TXT (time, value columns), NPY (N x 2 array) or raw float64 BIN/DAT (time, value pairs)',
+        'scale': 'Scale: Factor applied to the values read from the file'
+    }
+
+    def __init__(self, file_path="", scale=1):
+        """
+        Initialize a signal played back from a waveform file
+        Args:
+            file_path (str): Path of the waveform file
+            scale (float): Factor applied to the file values
+        Returns:
+            None
+        """
+        params = {'file_path': file_path, 'scale': scale}
+        super().__init__("File", params)
+
+    def _iter_source_blocks(self):
+        """
+        Yield (times, values) blocks of the file without loading it whole, checking every block
+        Args:
+            None
+        Returns:
+            generator: Tuples of (times, values) numpy arrays in increasing time
+        Raises:
+            ValueError: If the file has no samples, fewer than two columns or times that do not increase
+        """
+        if os.path.getsize(self.parameters['file_path']) == 0:
+            raise ValueError("The signal file is empty.")
+        last_time = -np.inf
+        for block in self._read_source_blocks():
+            if block.ndim != 2 or block.shape[1] < 2:
+                raise ValueError("The signal file needs two columns (time, value).")
+            times = np.asarray(block[:, 0], dtype=float)
+            if not (times[0] > last_time and np.all(np.diff(times) > 0)):
+                raise ValueError("The times of the signal file must be strictly increasing.")
+            last_time = times[-1]
+            yield times, np.asarray(block[:, 1], dtype=float)
+        if last_time == -np.inf:
+            raise ValueError("The signal file has no samples.")
+
+    def _read_source_blocks(self):
+        """
+        Yield the rows of the file by blocks without loading it whole.
+        Binary files are memory mapped; CSV files are memory mapped and parsed block by block.
+        Args:
+            None
+        Returns:
+            generator: 2-D numpy arrays with one row per sample
+        Raises:
+            ValueError: If the file cannot be parsed
+        """
+        file_path = self.parameters['file_path']
+        extension = os.path.splitext(file_path)[1].lower()
+
+        if extension in (".npy", ".bin", ".dat"):
+            if extension == ".npy":
+                data = np.load(file_path, mmap_mode='r')
+                if data.ndim == 1:
+                    data = data.reshape(-1, 2)
+            else:
+                data = np.memmap(file_path, dtype=np.float64, mode='r')
+                if data.size % 2:
+                    raise ValueError("The binary signal file must hold (time, value) float64 pairs.")
+                data = data.reshape(-1, 2)
+            for start in range(0, data.shape[0], SOURCE_BLOCK_ROWS):
+                yield data[start:start + SOURCE_BLOCK_ROWS]
+            return
+
+        with open(file_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            first_block = True
+            while True:
+                lines = []
+                for _ in range(SOURCE_BLOCK_ROWS):
+                    line = mapped.readline()
+                    if not line:
+                        break
+                    lines.append(line)
+                if not lines:
+                    return
+                # Skip a header line (non-numeric first row)
+                if first_block:
+                    first_block = False
+                    try:
+                        float(lines[0].replace(b";", b",").split(b",")[0])
+                    except ValueError:
+                        lines = lines[1:]
+                text = b"".join(lines).replace(b";", b",")
+                if text.strip():
+                    yield np.loadtxt(io.BytesIO(text), delimiter=",", ndmin=2)
+
+    def iter_chunks(self, t, chunk_size=CHUNK_SIZE):
+        """
+        Stream the file resampled on the time grid, holding the first/last values outside the file range
+        Args:
+            t (np.ndarray): Increasing sample times in seconds
+            chunk_size (int): Number of samples per chunk
+        Returns:
+            generator: np.ndarray chunks of the signal
+        """
+        scale = self.parameters['scale']
+        source = self._iter_source_blocks()
+        exhausted = False
+        buffer_t = np.empty(0)
+        buffer_v = np.empty(0)
+
+        for start in range(0, len(t), chunk_size):
+            chunk = np.asarray(t[start:start + chunk_size])
+
+            # Read source blocks until the buffer covers the end of the chunk
+            while not exhausted and (len(buffer_t) == 0 or buffer_t[-1] < chunk[-1]):
+                try:
+                    block_t, block_v = next(source)
+                    buffer_t = np.concatenate((buffer_t, block_t))
+                    buffer_v = np.concatenate((buffer_v, block_v))
+                except StopIteration:
+                    exhausted = True
+
+            if len(buffer_t) == 0:
+                yield np.zeros_like(chunk)
+                continue
+
+            yield scale * np.interp(chunk, buffer_t, buffer_v)
+
+            # Keep only the last source sample before the end of the chunk
+            keep = max(np.searchsorted(buffer_t, chunk[-1], side='right') - 1, 0)
+            buffer_t = buffer_t[keep:]
+            buffer_v = buffer_v[keep:]
+
+    def generate(self, t):
+        """
+        Evaluate the signal on a time grid
+        Args:
+            t (np.ndarray): Sample times in seconds
+        Returns:
+            np.ndarray: Signal value at every sample time
+        """
+        return np.concatenate(list(self.iter_chunks(t))) if len(t) else np.empty(0)
+
+    def validate(self):
+        """
+        Check the signal parameters
+        Args:
+            None
+        Returns:
+            str: Error messages, empty string if valid
+        """
+        file_path = self.parameters['file_path']
+        if not file_path or not os.path.isfile(file_path):
+            return f"Error: Signal file not found ({file_path})."
+        if not file_path.lower().endswith(SUPPORTED_FILE_EXTENSIONS):
+            return f"Error: Unsupported signal file type. Use one of: {', '.join(SUPPORTED_FILE_EXTENSIONS)}."
+        # Read the first block: an empty, single-column or unordered file cannot be played back
+        try:
+            next(self._iter_source_blocks())
+        except (ValueError, OSError) as e:
+            return f"Error: Invalid signal file ({e})"
+        return ""
+
+
+SIGNAL_MAP = {
+    "Step": StepSignal,
+    "Ramp": RampSignal,
+    "Sine": SineSignal,
+    "Chirp": ChirpSignal,
+    "PRBS": PRBSSignal,
+    "File": FileSignal
+}
+
+def get_signal(signal_type: str):
+    """
+    Factory method to create a signal generator by name
+    Args:
+        signal_type (str): Name of the signal type
+    Returns:
+        SignalGenerator: Instance of the requested signal type
+    """
+    try:
+        return SIGNAL_MAP[signal_type]()
+    except KeyError:
+        raise ValueError(f"Unknown signal type: {signal_type}")
@@ -0,0 +1,517 @@
+# Standard library imports
+import asyncio
+import hashlib
+import io
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+#Scientific imports
+import numpy as np
+
+# Local application imports
+from .plant import get_plant
+from .controller_pid import ControllerPID
+from .input import Input
+from .sensor import Sensor
+from .output import Output
+from .metrics import compute_step_metrics
+from .stability_margins import StabilityMarginAnalyzer
+from .data_export import collect_tables, export_output
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Latencies kept per endpoint for the percentiles of /metrics
+LATENCY_WINDOW = 1000
+
+# Largest request body accepted (bytes)
+MAX_BODY_SIZE = 1 << 20
+
+# Frequencies of the /bode endpoint
+BODE_POINTS = 500
+
+JSON_CONTENT_TYPE = "application/json"
+BINARY_CONTENT_TYPE = "application/octet-stream"
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+def build_project(project):
+    """
+    Build the loop components from a project in JSON form. The sections have the names
+    of the project file: 'Plant type', 'PID', 'Plant', 'Input', 'Sensor' and the optional
+    'Delay' and 'Signal'.
+    Args:
+        project (dict): Decoded project JSON
+    Returns:
+        tuple: (pid, plant, input, sensor) objects
+        error message (str) if the project is invalid
+    """
+    if not isinstance(project, dict):
+        return "Error: The project must be a JSON object."
+    for section in ("Plant type", "PID", "Plant", "Input", "Sensor"):
+        if section not in project:
+            return f"Error: '{section}' not found in project."
+
+    try:
+        plant = get_plant(project["Plant type"])
+        plant.set_parameters(**project["Plant"])
+        pid = ControllerPID(project["PID"]["kp"], project["PID"]["ki"], project["PID"]["kd"])
+        input_params = Input()
+        error_log = input_params.set_parameters(**project["Input"])
+        if error_log:
+            return error_log
+        sensor = Sensor(project["Sensor"]["Numerator"], project["Sensor"]["Denominator"])
+
+        delay = project.get("Delay", {})
+        error_log = plant.set_delay(delay.get("plant", 0.0)) or sensor.set_delay(delay.get("sensor", 0.0))
+        if error_log:
+            return error_log
+        signal = dict(project.get("Signal", {}))
+        error_log = input_params.set_signal(signal.pop("type", "Step"), **signal)
+        if error_log:
+            return error_log
+    except (KeyError, TypeError, ValueError, ZeroDivisionError) as e:
+        return f"Error: Invalid project: {e}"
+
+    for component in (plant, sensor):
+        tf = component.get_transfer_function()
+        if isinstance(tf, str):
+            return tf
+    return pid, plant, input_params, sensor
+
+
+def compute_step_response(project):
+    """
+    Step response of the closed loop and its metrics (process pool worker)
+    Args:
+        project (dict): Decoded project JSON
+    Returns:
+        dict: 't', 'response' arrays (truncated if the response diverged), the step metrics and the
+              'stable' / 'diverged' flags (1 or 0, stable is null when a delay leaves it undecided)
+        error message (str) if the project cannot be simulated
+    """
+    components = build_project(project)
+    if isinstance(components, str):
+        return components
+    result = Output(*components).get_step_response_result()
+    if result is None:
+        return "Error: The closed loop cannot be simulated."
+    t, response = result["t"], result["response"]
+    params = components[2].get_parameters()
+    metrics = compute_step_metrics(t, response, params["step_time"], params["initial_value"], params["final_value"])
+    return {"t": t, "response": response, **{name: float(values[0]) for name, values in metrics.items()},
+            "stable": np.nan if result["stable"] is None else float(result["stable"]), "diverged": float(result["diverged"])}
+
+
+def compute_reference_response(project):
+    """
+    Closed-loop response to the reference signal of the project (process pool worker)
+    Args:
+        project (dict): Decoded project JSON
+    Returns:
+        dict: 't', 'reference' and 'response' arrays
+        error message (str) if the project cannot be simulated
+    """
+    components = build_project(project)
+    if isinstance(components, str):
+        return components
+    data = Output(*components).get_reference_response_data()
+    if data is None:
+        return "Error: The closed loop cannot be simulated."
+    t, reference, response = data
+    return {"t": t, "reference": reference, "response": response}
+
+
+def compute_margins(project):
+    """
+    Gain and phase margins of the loop, with the sensitivity peaks of undelayed loops (process pool worker)
+    Args:
+        project (dict): Decoded project JSON
+    Returns:
+        dict: Margins and crossovers (see StabilityMarginAnalyzer.get_margins), plus 'ms', 'ms_frequency',
+              'mt' and 'mt_frequency' (see Output.get_sensitivity_peaks)
+        error message (str) if the loop is invalid
+    """
+    components = build_project(project)
+    if isinstance(components, str):
+        return components
+    output = Output(*components)
+    margins = output.get_stability_margins()
+    if margins is None:
+        return "Error: The stability margins cannot be computed."
+    # The margins are memoized by the output: extend a copy
+    margins = dict(margins)
+    peaks = output.get_sensitivity_peaks()
+    if peaks is not None:
+        margins.update(peaks)
+    return margins
+
+
+def compute_bode(project):
+    """
+    Frequency response of the loop PID * plant * sensor, delays included (process pool worker)
+    Args:
+        project (dict): Decoded project JSON
+    Returns:
+        dict: 'omega' (rad/s), 'magnitude_db' and 'phase_deg' arrays
+        error message (str) if the loop is invalid
+    """
+    components = build_project(project)
+    if isinstance(components, str):
+        return components
+    pid, plant, _, sensor = components
+    analyzer = StabilityMarginAnalyzer(pid, plant, sensor)
+    grid = analyzer.get_frequency_grid()
+    omega = np.geomspace(grid[0], grid[-1], BODE_POINTS)
+    response = analyzer.get_open_loop_response(omega)
+    with np.errstate(divide='ignore'):
+        magnitude_db = 20 * np.log10(np.abs(response))
+    return {"omega": omega, "magnitude_db": magnitude_db, "phase_deg": np.degrees(np.unwrap(np.angle(response)))}
+
+
+def compute_export(project):
+    """
+    Every export table of the project (process pool worker)
+    Args:
+        project (dict): Decoded project JSON
+    Returns:
+        dict: '<table>/<column>' -> array, with the tables of data_export.EXPORT_TABLES
+        error message (str) if a table cannot be computed
+    """
+    components = build_project(project)
+    if isinstance(components, str):
+        return components
+    tables = collect_tables(Output(*components))
+    if isinstance(tables, str):
+        return tables
+    return {f"{table.name}/{column}": values for table in tables for column, values in table.columns.items()}
+
+
+def export_project(project, base_path, file_format="CSV"):
+    """
+    Write the export files of a project without the GUI
+    Args:
+        project (dict): Decoded project JSON
+        base_path (str): Path of the exported files (see data_export.export_output)
+        file_format (str): 'CSV', 'NPZ' or 'Parquet'
+    Returns:
+        list: Paths of the written files
+        error message (str) if the project or the export is invalid
+    """
+    components = build_project(project)
+    if isinstance(components, str):
+        return components
+    return export_output(Output(*components), base_path, file_format)
+
+
+ENDPOINTS = {
+    "/step": compute_step_response,
+    "/reference": compute_reference_response,
+    "/margins": compute_margins,
+    "/bode": compute_bode,
+    "/export": compute_export
+}
+
+
+def project_hash(endpoint, project):
+    """
+    Hash identifying a computation, independent of the key order of the project JSON
+    Args:
+        endpoint (str): Endpoint path
+        project (dict): Decoded project JSON
+    Returns:
+        str: Hexadecimal SHA-256 digest
+    """
+    canonical = json.dumps([endpoint, project], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _to_json_value(value):
+    """
+    Convert a result value to plain JSON types, non-finite numbers become null
+    Args:
+        value: Number, numpy array or list
+    Returns:
+        JSON compatible value
+    """
+    if isinstance(value, (np.ndarray, list, tuple)):
+        return [_to_json_value(item) for item in np.asarray(value, dtype=float).tolist()]
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+def encode_result(result, binary=False):
+    """
+    Serialize a computation result
+    Args:
+        result (dict): Name -> number or array
+        binary (bool): NPZ archive instead of JSON
+    Returns:
+        tuple: (body bytes, content type)
+    """
+    if binary:
+        buffer = io.BytesIO()
+        np.savez(buffer, **{name: np.asarray(value, dtype=float) for name, value in result.items()})
+        return buffer.getvalue(), BINARY_CONTENT_TYPE
+    body = json.dumps({name: _to_json_value(value) for name, value in result.items()})
+    return body.encode("utf-8"), JSON_CONTENT_TYPE
+
+
+class LatencyRecorder:
+    """
+    Request counts and latency percentiles of every endpoint.
+    """
+
+    def __init__(self, window=LATENCY_WINDOW):
+        """
+        Initialize empty statistics
+        Args:
+            window (int): Latest latencies kept per endpoint
+        Returns:
+            None
+        """
+        self.window = window
+        self.statistics = {}
+
+    def record(self, endpoint, seconds, status, coalesced=False):
+        """
+        Record a served request
+        Args:
+            endpoint (str): Endpoint path
+            seconds (float): Time from the request to the response
+            status (int): HTTP status code
+            coalesced (bool): True if the request reused a computation already in flight
+        Returns:
+            None
+        """
+        entry = self.statistics.setdefault(endpoint, {"requests": 0, "errors": 0, "coalesced": 0,
+                                                      "latencies": deque(maxlen=self.window)})
+        entry["requests"] += 1
+        entry["errors"] += status >= 400
+        entry["coalesced"] += bool(coalesced)
+        entry["latencies"].append(seconds)
+
+    def get_summary(self):
+        """
+        Summary of every endpoint, latencies in milliseconds over the latest window
+        Args:
+            None
+        Returns:
+            dict: Endpoint -> 'requests', 'errors', 'coalesced', 'mean_ms', 'p50_ms', 'p95_ms', 'max_ms'
+        """
+        summary = {}
+        for endpoint, entry in self.statistics.items():
+            latencies = 1000 * np.asarray(entry["latencies"])
+            p50, p95 = np.percentile(latencies, (50, 95))
+            summary[endpoint] = {"requests": entry["requests"], "errors": entry["errors"], "coalesced": entry["coalesced"],
+                                 "mean_ms": float(np.mean(latencies)), "p50_ms": float(p50), "p95_ms": float(p95),
+                                 "max_ms": float(np.max(latencies))}
+        return summary
+
+
+class SimulationService:
+    """
+    Headless HTTP service computing responses and margins of projects sent as JSON.
+
+    Requests run in a process pool. Concurrent requests for the same endpoint and the
+    same project (same hash) share a single computation: later ones wait for the
+    result of the first instead of queuing a duplicate.
+    """
+
+    def __init__(self, workers=None):
+        """
+        Initialize the service
+        Args:
+            workers (int or None): Worker processes, None uses every core
+        Returns:
+            None
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = None
+        self.server = None
+        self.in_flight = {}
+        self.latencies = LatencyRecorder()
+        self.computations = 0
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """
+        Start the process pool and listen for connections
+        Args:
+            host (str): Interface to listen on, local only by default
+            port (int): TCP port, 0 picks a free one
+        Returns:
+            int: Port the service listens on
+        """
+        # Every worker is started before listening: a worker forked later would inherit the open
+        # client sockets and keep their connections from closing
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.executor, os.getpid) for _ in range(self.workers)))
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """
+        Serve requests until the task is cancelled
+        Args:
+            None
+        Returns:
+            None
+        """
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        """
+        Stop listening and shut the process pool down
+        Args:
+            None
+        Returns:
+            None
+        """
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+
+    async def compute(self, endpoint, project):
+        """
+        Run a computation in the process pool, sharing it with identical requests in flight
+        Args:
+            endpoint (str): Endpoint path (key of ENDPOINTS)
+            project (dict): Decoded project JSON
+        Returns:
+            tuple: (result, coalesced) with result a dict or an error message (str)
+        """
+        key = project_hash(endpoint, project)
+        future = self.in_flight.get(key)
+        if future is not None:
+            return await asyncio.shield(future), True
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, ENDPOINTS[endpoint], project)
+        self.in_flight[key] = future
+        self.computations += 1
+        try:
+            return await asyncio.shield(future), False
+        finally:
+            self.in_flight.pop(key, None)
+
+    async def handle_request(self, method, target, headers, body):
+        """
+        Route a request
+        Args:
+            method (str): HTTP method
+            target (str): Request target (path and query)
+            headers (dict): Lowercase header name -> value
+            body (bytes): Request body
+        Returns:
+            tuple: (status, body bytes, content type, coalesced)
+        """
+        url = urlsplit(target)
+        if url.path == "/health":
+            return 200, b'{"status": "ok"}', JSON_CONTENT_TYPE, False
+        if url.path == "/metrics":
+            summary = {"computations": self.computations, "endpoints": self.latencies.get_summary()}
+            return 200, json.dumps(summary).encode("utf-8"), JSON_CONTENT_TYPE, False
+        if url.path not in ENDPOINTS:
+            return 404, self.error_body(f"Error: Unknown endpoint {url.path}."), JSON_CONTENT_TYPE, False
+        if method != "POST":
+            return 405, self.error_body("Error: Send the project with POST."), JSON_CONTENT_TYPE, False
+
+        try:
+            project = json.loads(body.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            return 400, self.error_body(f"Error: Invalid JSON: {e}"), JSON_CONTENT_TYPE, False
+
+        result, coalesced = await self.compute(url.path, project)
+        if isinstance(result, str):
+            return 400, self.error_body(result), JSON_CONTENT_TYPE, coalesced
+
+        query_format = parse_qs(url.query).get("format", [""])[0]
+        binary = query_format == "npz" or (not query_format and BINARY_CONTENT_TYPE in headers.get("accept", ""))
+        body, content_type = encode_result(result, binary)
+        return 200, body, content_type, coalesced
+
+    def error_body(self, message):
+        """
+        JSON body of an error response
+        Args:
+            message (str): Error message
+        Returns:
+            bytes: Encoded body
+        """
+        return json.dumps({"error": message}).encode("utf-8")
+
+    async def handle_connection(self, reader, writer):
+        """
+        Serve one HTTP/1.1 request per connection
+        Args:
+            reader (asyncio.StreamReader): Connection input
+            writer (asyncio.StreamWriter): Connection output
+        Returns:
+            None
+        """
+        start = time.perf_counter()
+        path, coalesced = None, False
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1")
+                if line in ("\r\n", "\n", ""):
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if len(request_line) < 2:
+                return
+            method, target = request_line[0], request_line[1]
+            path = urlsplit(target).path
+
+            length = int(headers.get("content-length", 0) or 0)
+            if length > MAX_BODY_SIZE:
+                status, body, content_type = 413, self.error_body("Error: Request body too large."), JSON_CONTENT_TYPE
+            else:
+                body = await reader.readexactly(length) if length else b""
+                try:
+                    status, body, content_type, coalesced = await self.handle_request(method, target, headers, body)
+                except Exception as e:
+                    status, body, content_type = 500, self.error_body(f"Error: {e}"), JSON_CONTENT_TYPE
+
+            writer.write(f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                         f"Content-Type: {content_type}\r\n"
+                         f"Content-Length: {len(body)}\r\n"
+                         f"Connection: close\r\n\r\n".encode("latin-1") + body)
+            await writer.drain()
+            if path in ENDPOINTS:
+                self.latencies.record(path, time.perf_counter() - start, status, coalesced)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def run_service(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None):
+    """
+    Run the service until interrupted
+    Args:
+        host (str): Interface to listen on
+        port (int): TCP port
+        workers (int or None): Worker processes, None uses every core
+    Returns:
+        None
+    """
+    service = SimulationService(workers)
+    port = await service.start(host, port)
+    print(f"Simulation service listening on http://{host}:{port} ({service.workers} workers)")
+    try:
+        await service.serve_forever()
+    finally:
+        await service.close()
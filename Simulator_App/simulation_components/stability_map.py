@@ -0,0 +1,341 @@
+# Standard library imports
+import time
+from numbers import Real
+
+#Scientific imports
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.colors import ListedColormap
+from matplotlib.patches import Patch
+
+# Local application imports
+from .symbolic_loop import symbolic_closed_loop_coefficients
+from .batch_simulator import cancel_common_integrators
+from .instrumentation import span, traced
+
+# PID gains that can span the grid
+GAINS = ("kp", "ki", "kd")
+
+# Default number of values per gain
+DEFAULT_POINTS = 200
+
+# Largest grid evaluated, and grid points whose polynomials are held in memory at a time
+MAX_GRID_POINTS = 8_000_000
+CHUNK_POINTS = 262_144
+
+# Leading coefficients smaller than this fraction of the largest one are treated as zero
+ZERO_TOLERANCE = 1e-12
+
+# Fill colors of the unstable and stable regions
+REGION_COLORS = ("#f4cccc", "#d9ead3")
+
+
+def _routh_first_column_positive(coefficients):
+    """
+    Routh-Hurwitz test of polynomials of the same degree with a non-zero leading coefficient.
+    The Routh array is built row by row for the whole batch at once.
+    Args:
+        coefficients (np.ndarray): Array of shape (batch, degree + 1), highest power first
+    Returns:
+        np.ndarray: Boolean mask of the polynomials with every root in the open left half-plane
+    """
+    batch, width = coefficients.shape
+    coefficients = coefficients * np.sign(coefficients[:, :1])
+    columns = (width + 1) // 2
+    previous = np.zeros((batch, columns))
+    current = np.zeros((batch, columns))
+    previous[:, :len(range(0, width, 2))] = coefficients[:, 0::2]
+    current[:, :len(range(1, width, 2))] = coefficients[:, 1::2]
+
+    # A zero or negative entry in the first column means a root on or right of the imaginary axis
+    positive = previous[:, 0] > 0
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for _ in range(width - 1):
+            positive &= current[:, 0] > 0
+            following = np.zeros_like(previous)
+            following[:, :-1] = previous[:, 1:] - (previous[:, :1] / current[:, :1]) * current[:, 1:]
+            previous, current = current, following
+    return positive
+
+
+def routh_hurwitz_stable(coefficients):
+    """
+    Stability of a batch of characteristic polynomials by the Routh-Hurwitz criterion.
+    Leading coefficients that vanish lower the degree of the polynomial they belong to.
+    Args:
+        coefficients (np.ndarray): Array of shape (batch, order + 1), highest power first
+    Returns:
+        np.ndarray: Boolean mask of the stable polynomials (marginal ones count as unstable)
+    """
+    coefficients = np.atleast_2d(np.asarray(coefficients, dtype=float))
+    batch, width = coefficients.shape
+    stable = np.zeros(batch, dtype=bool)
+
+    magnitude = np.abs(coefficients)
+    significant = magnitude > ZERO_TOLERANCE * np.max(magnitude, axis=1, keepdims=True)
+    significant &= np.isfinite(coefficients).all(axis=1, keepdims=True)
+    leading = np.where(significant.any(axis=1), np.argmax(significant, axis=1), width)
+
+    # Group the polynomials by degree, there are at most a few distinct ones
+    for first in np.unique(leading):
+        if first == width:
+            continue
+        rows = leading == first
+        stable[rows] = _routh_first_column_positive(coefficients[rows, first:])
+    return stable
+
+
+class StabilityAxis:
+    """
+    Values of one PID gain along a dimension of the stability map.
+    """
+
+    def __init__(self, name, values):
+        """
+        Initialize the axis
+        Args:
+            name (str): Gain name, one of GAINS
+            values (np.ndarray): Gain values
+        Returns:
+            None
+        """
+        self.name = name
+        self.values = values
+
+    def get_label(self):
+        """
+        Return the label of the axis for plots and selectors
+        Args:
+            None
+        Returns:
+            str: Axis label
+        """
+        return f"PID: {self.name}"
+
+
+class StabilityMapResult:
+    """
+    Closed-loop stability over a grid of PID gains.
+    """
+
+    def __init__(self, axes, stable, current, current_stable, elapsed):
+        """
+        Initialize the result
+        Args:
+            axes (list): StabilityAxis of every grid dimension
+            stable (np.ndarray): Boolean grid of the stable closed loops
+            current (dict): Gains of the current PID controller
+            current_stable (bool): Whether the current closed loop is stable
+            elapsed (float): Evaluation time in seconds
+        Returns:
+            None
+        """
+        self.axes = axes
+        self.stable = stable
+        self.current = current
+        self.current_stable = current_stable
+        self.elapsed = elapsed
+
+    def get_stable_fraction(self):
+        """
+        Fraction of the grid points whose closed loop is stable
+        Args:
+            None
+        Returns:
+            float: Value between 0 and 1
+        """
+        return float(np.mean(self.stable)) if self.stable.size else 0.0
+
+    def get_default_slice(self):
+        """
+        Index of the third axis closest to the current gain
+        Args:
+            None
+        Returns:
+            int: Index along the third axis, 0 for a two-dimensional map
+        """
+        if len(self.axes) < 3:
+            return 0
+        axis = self.axes[2]
+        return int(np.argmin(np.abs(axis.values - self.current[axis.name])))
+
+    def get_slice(self, slice_index=None):
+        """
+        Stable region over the first two axes
+        Args:
+            slice_index (int or None): Index along the third axis, closest to the current gain if None
+        Returns:
+            np.ndarray: Boolean array of shape (len(x), len(y))
+        """
+        if len(self.axes) < 3:
+            return self.stable
+        return self.stable[:, :, self.get_default_slice() if slice_index is None else slice_index]
+
+    def plot(self, slice_index=None):
+        """
+        Plot the stable region over the first two axes with the current PID gains marked
+        Args:
+            slice_index (int or None): Index along the third axis, closest to the current gain if None
+        Returns:
+            Matplotlib Figure object with the results
+        """
+        fig = Figure(dpi=80)
+        ax = fig.add_subplot(111)
+        x, y = self.axes[0], self.axes[1]
+        values = self.get_slice(slice_index)
+
+        ax.pcolormesh(x.values, y.values, values.T.astype(float), shading='nearest', vmin=0, vmax=1,
+                      cmap=ListedColormap(REGION_COLORS))
+        if values.any() and not values.all():
+            ax.contour(x.values, y.values, values.T.astype(float), levels=[0.5], colors='k', linewidths=1.2)
+        ax.plot(self.current[x.name], self.current[y.name], marker='*', color='b', markersize=16,
+                markeredgecolor='k', linestyle='None', label="Current PID")
+
+        handles = [Patch(facecolor=REGION_COLORS[1], edgecolor='k', label="Stable"),
+                   Patch(facecolor=REGION_COLORS[0], edgecolor='k', label="Unstable")]
+        ax.legend(handles=handles + ax.get_legend_handles_labels()[0], loc='upper right')
+        ax.set_xlabel(x.get_label())
+        ax.set_ylabel(y.get_label())
+
+        held = [f"{name}={self.current[name]:.4g}" for name in GAINS if name not in [axis.name for axis in self.axes]]
+        if len(self.axes) > 2:
+            z = self.axes[2]
+            held.append(f"{z.name}={z.values[self.get_default_slice() if slice_index is None else slice_index]:.4g}")
+        title = f"Closed-loop stability ({100 * np.mean(values):.1f}% stable)"
+        ax.set_title(title + (f"\n{', '.join(held)}" if held else ""), pad=20)
+        ax.grid(True, linestyle='--', alpha=0.7)
+        fig.tight_layout()
+        return fig
+
+
+
+class StabilityMap:
+    """
+    Closed-loop stability over a grid of PID gains for the current plant and sensor.
+    The characteristic polynomials come from the compiled symbolic kernel of the loop and are
+    checked with a batched Routh-Hurwitz test, without computing any root.
+    """
+
+    def __init__(self, pid_object, plant_object, sensor_object):
+        """
+        Initialize the map
+        Args:
+            pid_object (ControllerPID): PID controller, gives the gains that are not on the grid and the marked point
+            plant_object (Plant): Plant model
+            sensor_object (Sensor): Sensor model
+        Returns:
+            None
+        """
+        self.pid_object = pid_object
+        self.plant_object = plant_object
+        self.sensor_object = sensor_object
+        self.axes = []
+
+    def get_current_point(self):
+        """
+        Gains of the PID controller
+        Args:
+            None
+        Returns:
+            dict: 'kp', 'ki' and 'kd' values
+        """
+        return {name: float(self.pid_object.get_parameters()[name]) for name in GAINS}
+
+    def add_axis(self, name, start, stop, points=DEFAULT_POINTS):
+        """
+        Add a grid dimension with evenly spaced gain values
+        Args:
+            name (str): Gain name, one of GAINS
+            start (float): First value
+            stop (float): Last value
+            points (int): Number of values
+        Returns:
+            error_log (str): Error message if the axis is invalid, None otherwise
+        """
+        if name not in GAINS:
+            return f"Error: {name} is not a PID gain."
+        if any(axis.name == name for axis in self.axes):
+            return f"Error: {name} is already on the grid."
+        if len(self.axes) == 3:
+            return "Error: The stability map has at most three dimensions."
+        if not isinstance(points, int) or points < 2:
+            return f"Error: Number of points must be an integer of at least 2 (got {points})."
+        if not all(isinstance(value, Real) and np.isfinite(value) for value in (start, stop)):
+            return f"Error: The range of {name} must be finite numbers."
+        self.axes.append(StabilityAxis(name, np.linspace(start, stop, points)))
+
+    def clear_axes(self):
+        """
+        Remove every grid dimension
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.axes = []
+
+    def get_axes(self):
+        """
+        Return the grid dimensions
+        Args:
+            None
+        Returns:
+            list: StabilityAxis objects
+        """
+        return self.axes
+
+    def get_grid_size(self):
+        """
+        Number of points of the Cartesian product of the axes
+        Args:
+            None
+        Returns:
+            int: Number of grid points
+        """
+        return int(np.prod([len(axis.values) for axis in self.axes]))
+
+    def evaluate(self, kp, ki, kd):
+        """
+        Stability of the closed loops of a batch of gains. The integrator of a PID with Ki = 0 cancels
+        exactly and is divided out, so P and PD designs are not flagged marginal by its pole at s = 0.
+        Args:
+            kp, ki, kd (float or np.ndarray): PID gains, scalars or arrays of shape (batch,)
+        Returns:
+            np.ndarray: Boolean mask of the stable closed loops
+        """
+        numerators, denominators = symbolic_closed_loop_coefficients(self.plant_object, self.sensor_object, kp, ki, kd)
+        denominators, _ = cancel_common_integrators(numerators, denominators)
+        return routh_hurwitz_stable(denominators)
+
+    @traced("StabilityMap.compute")
+    def compute(self):
+        """
+        Evaluate the stability of every grid point
+        Args:
+            None
+        Returns:
+            StabilityMapResult: Stable region and current point
+            error message (str) if the grid is invalid
+        """
+        if len(self.axes) < 2:
+            return "Error: Select at least two gains for the stability map."
+        if self.get_grid_size() > MAX_GRID_POINTS:
+            return f"Error: The grid has {self.get_grid_size()} points, the maximum is {MAX_GRID_POINTS}."
+        if self.plant_object.get_delay() > 0 or self.sensor_object.get_delay() > 0:
+            return "Error: The Routh-Hurwitz criterion does not apply to loops with transport delay."
+
+        start = time.perf_counter()
+        current = self.get_current_point()
+        shape = tuple(len(axis.values) for axis in self.axes)
+        dimensions = {axis.name: dimension for dimension, axis in enumerate(self.axes)}
+        stable = np.zeros(shape, dtype=bool)
+        size = stable.size
+
+        with span("StabilityMap.routh_hurwitz"):
+            for first in range(0, size, CHUNK_POINTS):
+                indices = np.unravel_index(np.arange(first, min(first + CHUNK_POINTS, size)), shape)
+                gains = {name: self.axes[dimensions[name]].values[indices[dimensions[name]]] if name in dimensions
+                         else current[name] for name in GAINS}
+                stable.flat[first:first + CHUNK_POINTS] = self.evaluate(gains["kp"], gains["ki"], gains["kd"])
+        current_stable = bool(self.evaluate(current["kp"], current["ki"], current["kd"])[0])
+        return StabilityMapResult(list(self.axes), stable, current, current_stable, time.perf_counter() - start)
@@ -0,0 +1,279 @@
+#Scientific imports
+import numpy as np
+
+# Points of the cached logarithmic frequency grid used to bracket the crossovers
+DEFAULT_POINTS = 2000
+
+# Decades added below the slowest and above the fastest pole / zero of the loop
+GRID_MARGIN_DECADES = 2
+
+# Bisection steps on log(omega): 60 steps shrink a grid cell below double precision
+BISECTION_STEPS = 60
+
+
+def _bisect(func, low, high, steps=BISECTION_STEPS):
+    """
+    Refine every bracket [low, high] of func at once by bisection on log(omega)
+    Args:
+        func (callable): Vectorized function whose sign changes inside every bracket
+        low (np.ndarray): Lower frequencies of the brackets
+        high (np.ndarray): Upper frequencies of the brackets
+        steps (int): Number of bisection steps
+    Returns:
+        np.ndarray: Frequencies of the roots
+    """
+    low, high = np.log(low), np.log(high)
+    f_low = func(np.exp(low))
+    for _ in range(steps):
+        middle = 0.5 * (low + high)
+        f_middle = func(np.exp(middle))
+        same_sign = np.sign(f_middle) == np.sign(f_low)
+        low = np.where(same_sign, middle, low)
+        f_low = np.where(same_sign, f_middle, f_low)
+        high = np.where(same_sign, high, middle)
+    return np.exp(0.5 * (low + high))
+
+
+def _wrap_phase_margin(phase):
+    """
+    Phase margin 180 + phase, wrapped into (-180, 180] degrees
+    Args:
+        phase (np.ndarray): Loop phase in degrees
+    Returns:
+        np.ndarray: Phase margin in degrees
+    """
+    return 180.0 - np.mod(-phase, 360.0)
+
+
+class StabilityMarginAnalyzer:
+    """
+    Gain and phase margins of the loop L(s) = C(s) P(s) S(s) e^{-s (Tp + Ts)}.
+
+    The loop is evaluated once on a logarithmic grid and cached. Crossovers are
+    bracketed on that grid and refined by bisection on the exact loop response, so
+    the cost does not depend on the accuracy requested. A gain k applied to the loop
+    only rescales |L|, so gain sweeps reuse the same cache.
+    """
+
+    def __init__(self, pid_object, plant_object, sensor_object, points=DEFAULT_POINTS):
+        """
+        Initialize the analyzer with the loop components
+        Args:
+            pid_object (ControllerPID): PID controller
+            plant_object (Plant): Plant model (with optional delay)
+            sensor_object (Sensor): Sensor model (with optional delay)
+            points (int): Points of the cached frequency grid
+        Returns:
+            None
+        """
+        self.pid_object = pid_object
+        self.plant_object = plant_object
+        self.sensor_object = sensor_object
+        self.points = points
+        self.cache_key = None
+        self.cache = None
+
+    def _get_loop_polynomials(self):
+        """
+        Numerator and denominator polynomials of C*P*S (without the delay)
+        Args:
+            None
+        Returns:
+            tuple: (numerator, denominator) np.ndarray coefficients, highest power first
+        """
+        pid = self.pid_object.get_parameters()
+        plant_num, plant_den = self.plant_object.get_coefficients()
+        sensor_num, sensor_den = self.sensor_object.get_coefficients()
+        numerator = np.polymul(np.polymul([pid["kd"], pid["kp"], pid["ki"]], plant_num), sensor_num)
+        denominator = np.polymul(np.polymul([1.0, 0.0], plant_den), sensor_den)
+        return np.asarray(numerator, dtype=float), np.asarray(denominator, dtype=float)
+
+    def _get_cache_key(self):
+        """
+        Snapshot of every parameter the loop response depends on
+        Args:
+            None
+        Returns:
+            str: Key identifying the current loop
+        """
+        return repr((self.pid_object.get_parameters(), self.plant_object.get_coefficients(),
+                     self.sensor_object.get_coefficients(), self.plant_object.get_delay(), self.sensor_object.get_delay()))
+
+    def _evaluate(self, omega):
+        """
+        Evaluate the cached loop polynomials and delay on the imaginary axis
+        Args:
+            omega (np.ndarray): Frequencies in rad/s
+        Returns:
+            np.ndarray: Complex loop response L(j omega)
+        """
+        numerator, denominator = self.cache["polynomials"]
+        s = 1j * np.asarray(omega, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.polyval(numerator, s) / np.polyval(denominator, s) * np.exp(-s * self.cache["delay"])
+
+    def get_open_loop_response(self, omega):
+        """
+        Evaluate the loop on the imaginary axis, including the exact delay factor
+        Args:
+            omega (np.ndarray): Frequencies in rad/s
+        Returns:
+            np.ndarray: Complex loop response L(j omega)
+        """
+        self._get_cache()
+        return self._evaluate(omega)
+
+    def _get_cache(self):
+        """
+        Return the cached loop response on the frequency grid, rebuilding it if the loop changed
+        Args:
+            None
+        Returns:
+            dict: 'polynomials', 'delay', 'omega' and 'response' of the current loop
+        """
+        key = self._get_cache_key()
+        if self.cache is None or key != self.cache_key:
+            polynomials = self._get_loop_polynomials()
+            roots = np.abs(np.concatenate([np.roots(polynomials[0]), np.roots(polynomials[1])]))
+            roots = roots[roots > 1e-12]
+            delay = self.plant_object.get_delay() + self.sensor_object.get_delay()
+            if delay > 0:
+                roots = np.append(roots, 1.0 / delay)
+            slowest = roots.min() if roots.size else 1.0
+            fastest = roots.max() if roots.size else 1.0
+            omega = np.logspace(np.log10(slowest) - GRID_MARGIN_DECADES, np.log10(fastest) + GRID_MARGIN_DECADES, self.points)
+            self.cache = {"polynomials": polynomials, "delay": delay, "omega": omega}
+            self.cache["response"] = self._evaluate(omega)
+            self.cache_key = key
+        return self.cache
+
+    def get_frequency_grid(self):
+        """
+        Return the cached frequency grid
+        Args:
+            None
+        Returns:
+            np.ndarray: Frequencies in rad/s
+        """
+        return self._get_cache()["omega"]
+
+    def _find_crossings(self, values, func):
+        """
+        Bracket the sign changes of grid values along the last axis and refine them
+        Args:
+            values (np.ndarray): Function values on the grid, shape (..., points)
+            func (callable): Exact function, receives the frequencies and the row indices of the brackets
+        Returns:
+            tuple: (rows, omega) indices of the rows owning every crossing and its frequency
+        """
+        omega = self._get_cache()["omega"]
+        values = np.atleast_2d(values)
+        finite = np.isfinite(values[:, :-1]) & np.isfinite(values[:, 1:])
+        change = finite & (np.sign(values[:, :-1]) != np.sign(values[:, 1:]))
+        rows, columns = np.nonzero(change)
+        if not rows.size:
+            return rows, np.empty(0)
+        roots = _bisect(lambda w: func(w, rows), omega[columns], omega[columns + 1])
+        return rows, roots
+
+    def get_phase_crossovers(self):
+        """
+        Frequencies where the loop crosses the negative real axis (phase of -180 degrees)
+        Args:
+            None
+        Returns:
+            np.ndarray: Phase crossover frequencies in rad/s
+        """
+        response = self._get_cache()["response"]
+        _, roots = self._find_crossings(response.imag, lambda w, rows: self._evaluate(w).imag)
+        if not roots.size:
+            return roots
+        # Sign changes across imaginary-axis poles are not crossings
+        response = self._evaluate(roots)
+        crossing = (response.real < 0) & (np.abs(response.imag) <= 1e-6 * np.abs(response))
+        return roots[crossing]
+
+    def get_gain_crossovers(self, gains=1.0):
+        """
+        Frequencies where |k L(j omega)| = 1 for one or many gains k
+        Args:
+            gains (float or np.ndarray): Gains k applied to the loop
+        Returns:
+            tuple: (rows, omega) index of the gain owning every crossover and its frequency
+        """
+        gains = np.atleast_1d(np.asarray(gains, dtype=float))
+        log_magnitude = np.log(np.abs(self._get_cache()["response"]))
+        values = log_magnitude[None, :] + np.log(gains)[:, None]
+        return self._find_crossings(values, lambda w, rows: np.log(np.abs(self._evaluate(w))) + np.log(gains[rows]))
+
+    def get_margins(self):
+        """
+        Gain margin, phase margin and crossover frequencies of the loop
+        Args:
+            None
+        Returns:
+            dict: 'gain_margin' (absolute), 'gain_margin_db', 'phase_margin' (deg), 'phase_crossover',
+                  'gain_crossover' (rad/s) of the critical crossings (inf / nan when there is none),
+                  plus every 'phase_crossovers' and 'gain_crossovers'
+            error message (str) if the loop is invalid
+        """
+        for component in (self.plant_object, self.sensor_object):
+            tf = component.get_transfer_function()
+            if isinstance(tf, str):
+                return tf
+
+        margins = self.get_margins_for_gains(np.array([1.0]))
+        phase_crossovers = self.get_phase_crossovers()
+        _, gain_crossovers = self.get_gain_crossovers(1.0)
+        return {
+            "gain_margin": float(margins["gain_margin"][0]),
+            "gain_margin_db": float(margins["gain_margin_db"][0]),
+            "phase_margin": float(margins["phase_margin"][0]),
+            "phase_crossover": float(margins["phase_crossover"][0]),
+            "gain_crossover": float(margins["gain_crossover"][0]),
+            "phase_crossovers": phase_crossovers,
+            "gain_crossovers": gain_crossovers
+        }
+
+    def get_margins_for_gains(self, gains):
+        """
+        Margins of the loop scaled by every gain of a sweep, sharing a single loop evaluation
+        Args:
+            gains (np.ndarray): Positive gains k applied to the loop
+        Returns:
+            dict: 'gain_margin', 'gain_margin_db', 'phase_margin', 'phase_crossover' and 'gain_crossover'
+                  arrays with one value per gain
+        """
+        gains = np.atleast_1d(np.asarray(gains, dtype=float))
+
+        # Phase crossovers do not move with k: the critical one has the largest |L|
+        phase_crossovers = self.get_phase_crossovers()
+        if phase_crossovers.size:
+            magnitudes = np.abs(self._evaluate(phase_crossovers))
+            critical = int(np.argmax(magnitudes))
+            gain_margin = 1.0 / (gains * magnitudes[critical])
+            phase_crossover = np.full(gains.shape, phase_crossovers[critical])
+        else:
+            gain_margin = np.full(gains.shape, np.inf)
+            phase_crossover = np.full(gains.shape, np.nan)
+
+        # Gain crossovers move with k: keep the one with the smallest phase margin per gain
+        phase_margin = np.full(gains.shape, np.inf)
+        gain_crossover = np.full(gains.shape, np.nan)
+        rows, crossovers = self.get_gain_crossovers(gains)
+        if rows.size:
+            margins = _wrap_phase_margin(np.degrees(np.angle(self._evaluate(crossovers))))
+            for row, crossover, margin in zip(rows, crossovers, margins):
+                if abs(margin) < abs(phase_margin[row]):
+                    phase_margin[row] = margin
+                    gain_crossover[row] = crossover
+
+        with np.errstate(divide='ignore'):
+            gain_margin_db = 20 * np.log10(gain_margin)
+        return {
+            "gain_margin": gain_margin,
+            "gain_margin_db": gain_margin_db,
+            "phase_margin": phase_margin,
+            "phase_crossover": phase_crossover,
+            "gain_crossover": gain_crossover
+        }
@@ -0,0 +1,172 @@
+#Scientific imports
+import numpy as np
+import sympy as sp
+
+# Local application imports
+from .plant import PersonalizedPlant
+from .batch_simulator import stack_coefficients
+from .instrumentation import span
+
+# Laplace variable and PID gains of the symbolic loop
+S, KP, KI, KD = sp.symbols("s kp ki kd")
+
+# Compiled kernels, one per plant type and coefficient orders
+_KERNELS = {}
+
+
+def get_symbolic_parameters(plant):
+    """
+    Symbols standing for the parameters of a plant. The coefficients of a Personalized Plant
+    (or a sensor) are symbols themselves, so one kernel serves every model of the same orders.
+    Args:
+        plant (Plant): Plant or sensor
+    Returns:
+        dict: Parameter name -> symbol, or list of symbols for the coefficient lists
+    """
+    if isinstance(plant, PersonalizedPlant):
+        numerator, denominator = plant.get_coefficients()
+        prefix = "sensor_" if plant.name == "Sensor" else ""
+        return {"Numerator": list(sp.symbols(f"{prefix}b0:{len(numerator)}")),
+                "Denominator": list(sp.symbols(f"{prefix}a0:{len(denominator)}"))}
+    return {name: sp.Symbol(name) for name in plant.get_parameters()}
+
+
+def get_kernel_key(plant, sensor):
+    """
+    Key of the kernel of a loop: plant type and orders of the coefficient lists
+    Args:
+        plant (Plant): Plant model
+        sensor (Sensor): Sensor model
+    Returns:
+        tuple: Hashable key
+    """
+    plant_orders = tuple(len(c) for c in plant.get_coefficients()) if isinstance(plant, PersonalizedPlant) else None
+    return (plant.name, plant_orders, tuple(len(c) for c in sensor.get_coefficients()))
+
+
+def _polynomial(coefficients):
+    """
+    Polynomial in s from its coefficients, highest power first
+    Args:
+        coefficients (list): Numbers or sympy expressions
+    Returns:
+        sympy expression
+    """
+    order = len(coefficients) - 1
+    return sum(sp.sympify(c) * S**(order - i) for i, c in enumerate(coefficients))
+
+
+def _coefficients(expression, width):
+    """
+    Coefficients of a polynomial in s, highest power first, padded to a fixed width
+    Args:
+        expression: sympy polynomial in s
+        width (int): Number of coefficients
+    Returns:
+        list: sympy expressions
+    """
+    coefficients = sp.Poly(sp.expand(expression), S).all_coeffs()
+    return [sp.Integer(0)] * (width - len(coefficients)) + coefficients
+
+
+class ClosedLoopKernel:
+    """
+    Closed-loop coefficients of C*P / (1 + C*P*S) derived symbolically for one plant type,
+    with C = (kd*s^2 + kp*s + ki) / s, and compiled into a vectorized NumPy function.
+    The coefficients match batch_simulator.closed_loop_coefficients, without building
+    transfer function objects or multiplying polynomials at evaluation time.
+    """
+
+    def __init__(self, plant, sensor):
+        """
+        Derive and compile the closed-loop coefficients
+        Args:
+            plant (Plant): Plant model, its type and coefficient orders define the kernel
+            sensor (Sensor): Sensor model, its coefficient orders define the kernel
+        Returns:
+            None
+        """
+        self.plant_symbols = get_symbolic_parameters(plant)
+        self.sensor_symbols = get_symbolic_parameters(sensor)
+        self.personalized = isinstance(plant, PersonalizedPlant)
+
+        plant_num, plant_den = plant.get_coefficients(**self.plant_symbols)
+        sensor_num, sensor_den = self.sensor_symbols["Numerator"], self.sensor_symbols["Denominator"]
+        pid_num = [KD, KP, KI]
+
+        forward = _polynomial(pid_num) * _polynomial(plant_num)
+        numerator_width = len(pid_num) + len(plant_num) + len(sensor_den) - 2
+        denominator_width = max(len(plant_den) + len(sensor_den), len(pid_num) + len(plant_num) + len(sensor_num) - 2)
+        self.numerator = _coefficients(forward * _polynomial(sensor_den), numerator_width)
+        self.denominator = _coefficients(S * _polynomial(plant_den) * _polynomial(sensor_den) + forward * _polynomial(sensor_num),
+                                         denominator_width)
+
+        self.arguments = self.get_plant_arguments(self.plant_symbols) + [KP, KI, KD] + sensor_num + sensor_den
+        self.function = sp.lambdify(self.arguments, [self.numerator, self.denominator], modules="numpy", cse=True)
+
+    def get_plant_arguments(self, values):
+        """
+        Flatten plant parameter values in the order of the kernel arguments
+        Args:
+            values (dict): Parameter name -> value, coefficient lists for a Personalized Plant
+        Returns:
+            list: Values
+        """
+        if self.personalized:
+            return list(values["Numerator"]) + list(values["Denominator"])
+        return [values[name] for name in self.plant_symbols]
+
+    def evaluate(self, plant, sensor, kp, ki, kd, **plant_values):
+        """
+        Closed-loop coefficients for a batch of parameter and gain values
+        Args:
+            plant (Plant): Plant model giving the values of the parameters that are not overridden
+            sensor (Sensor): Sensor model
+            kp, ki, kd (float or np.ndarray): PID gains, scalars or arrays of shape (batch,)
+            plant_values: Plant parameter overrides, floats or arrays of shape (batch,)
+        Returns:
+            tuple: (numerators, denominators) arrays with one row per closed loop
+        """
+        if self.personalized:
+            numerator, denominator = plant.get_coefficients(**plant_values)
+            plant_arguments = self.get_plant_arguments({"Numerator": numerator, "Denominator": denominator})
+        else:
+            plant_arguments = self.get_plant_arguments({**plant.get_parameters(), **plant_values})
+        sensor_num, sensor_den = sensor.get_coefficients()
+        arguments = plant_arguments + [kp, ki, kd] + list(sensor_num) + list(sensor_den)
+
+        batch = max(np.size(value) for value in arguments)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            numerator, denominator = self.function(*(np.asarray(value, dtype=float) for value in arguments))
+        return stack_coefficients(numerator, batch), stack_coefficients(denominator, batch)
+
+
+def get_closed_loop_kernel(plant, sensor):
+    """
+    Return the compiled kernel of a loop, deriving it on first use
+    Args:
+        plant (Plant): Plant model
+        sensor (Sensor): Sensor model
+    Returns:
+        ClosedLoopKernel: Kernel shared by every loop with the same plant type and orders
+    """
+    key = get_kernel_key(plant, sensor)
+    kernel = _KERNELS.get(key)
+    if kernel is None:
+        with span("ClosedLoopKernel.compile"):
+            kernel = _KERNELS[key] = ClosedLoopKernel(plant, sensor)
+    return kernel
+
+
+def symbolic_closed_loop_coefficients(plant, sensor, kp, ki, kd, **plant_values):
+    """
+    Closed-loop coefficients of a batch of loops through the compiled kernel of the plant type
+    Args:
+        plant (Plant): Plant model
+        sensor (Sensor): Sensor model
+        kp, ki, kd (float or np.ndarray): PID gains, scalars or arrays of shape (batch,)
+        plant_values: Plant parameter overrides, floats or arrays of shape (batch,)
+    Returns:
+        tuple: (numerators, denominators) arrays with one row per closed loop
+    """
+    return get_closed_loop_kernel(plant, sensor).evaluate(plant, sensor, kp, ki, kd, **plant_values)
@@ -0,0 +1,185 @@
+#Scientific imports
+import math
+import numpy as np
+
+# Local application imports
+from .input import MAX_SAMPLES
+from .metrics import SETTLING_BAND
+from .pole_zero_analysis import CANCELLATION_TOLERANCE, cancel_common_roots
+
+# Settling horizons are stretched by this factor to cover the residues of the modes
+HORIZON_FACTOR = 1.5
+
+# Poles closer than this (relative to their magnitude) decay together like a repeated pole
+MULTIPLICITY_TOLERANCE = 0.1
+
+# Samples per time constant of the fastest pole (about 60 samples per period of an oscillatory pair)
+SAMPLES_PER_TIME_CONSTANT = 10
+
+# Samples drawn over the response after the step, at least
+MIN_CURVE_SAMPLES = 200
+
+# Each round trip of the loop adds the dead time to the settling, roughly this many are shown
+DELAY_ROUND_TRIPS = 3
+
+# Samples per transport delay, so the delay lines round the delay to a small fraction of it
+SAMPLES_PER_DELAY = 20
+
+# Decades of growth shown for an unstable loop, and periods shown for a marginally stable one
+UNSTABLE_GROWTH_DECADES = 3
+MARGINAL_PERIODS = 5
+
+# Horizon after the step when the poles say nothing about it (no dynamics, pure integrators)
+DEFAULT_HORIZON = 10.0
+
+# Largest total time accepted by Input
+MAX_TOTAL_TIME = 1000.0
+
+# Mantissas of the rounded sample times
+NICE_STEPS = (1.0, 2.0, 5.0)
+
+
+def _nice_down(value):
+    """
+    Largest number of the 1-2-5 sequence not greater than value
+    Args:
+        value (float): Positive number
+    Returns:
+        float: Rounded value
+    """
+    exponent = math.floor(math.log10(value))
+    for step in reversed(NICE_STEPS):
+        candidate = float(f"{step}e{exponent}")
+        if candidate <= value:
+            return candidate
+    return float(f"{NICE_STEPS[-1]}e{exponent - 1}")
+
+
+def _nice_up(value):
+    """
+    Smallest number of the 1-2-5 sequence not lower than value
+    Args:
+        value (float): Positive number
+    Returns:
+        float: Rounded value
+    """
+    exponent = math.floor(math.log10(value))
+    for step in NICE_STEPS:
+        candidate = float(f"{step}e{exponent}")
+        if candidate >= value:
+            return candidate
+    return float(f"{NICE_STEPS[0]}e{exponent + 1}")
+
+
+def _round_up(value, digits=2):
+    """
+    Round a positive number up to the given significant digits
+    Args:
+        value (float): Positive number
+        digits (int): Significant digits kept
+    Returns:
+        float: Rounded value
+    """
+    exponent = math.floor(math.log10(value)) - digits + 1
+    return float(f"{math.ceil(round(value / 10.0 ** exponent, 9))}e{exponent}")
+
+
+def get_multiplicities(poles, tolerance=MULTIPLICITY_TOLERANCE):
+    """
+    Number of poles clustered around every pole, itself included
+    Args:
+        poles (np.ndarray): Complex poles
+        tolerance (float): Relative distance below which two poles count as repeated
+    Returns:
+        np.ndarray: Multiplicity of every pole
+    """
+    poles = np.asarray(poles, dtype=complex)
+    distances = np.abs(poles[:, None] - poles[None, :])
+    return np.sum(distances <= tolerance * np.maximum(np.abs(poles)[:, None], 1e-12), axis=1)
+
+
+def mode_settling_time(decay, multiplicity=1):
+    """
+    Time after which the envelope t^(m-1) e^(-decay t) / (m-1)! of a pole of multiplicity m stays in the settling band
+    Args:
+        decay (float): Decay rate -Re(p) of the pole, positive
+        multiplicity (int): Multiplicity of the pole
+    Returns:
+        float: Settling time in seconds
+    """
+    # x = decay * t solves x - (m-1) ln(x) = ln(1/band) - ln((m-1)!) on the decreasing side of the envelope,
+    # where the fixed-point iteration contracts
+    order = multiplicity - 1
+    target = math.log(1.0 / SETTLING_BAND) - math.lgamma(multiplicity)
+    x = max(target, 2.0 * order, 1.0)
+    for _ in range(100):
+        previous, x = x, target + order * math.log(x)
+        if abs(x - previous) <= 1e-9 * x:
+            break
+    return x / decay
+
+
+def estimate_response_horizon(poles):
+    """
+    Time after the step the response needs to show its behavior
+    Args:
+        poles (np.ndarray): Complex poles of the response
+    Returns:
+        float: Horizon in seconds, settling for stable poles, growth or oscillation otherwise
+    """
+    poles = np.asarray(poles, dtype=complex)
+    scale = max(np.max(np.abs(poles)), 1.0) if poles.size else 1.0
+    decaying = poles.real < -1e-9 * scale
+    if poles.size and decaying.all():
+        # Slowest mode decays into the settling band, repeated poles stretch their envelope by t^(m-1)
+        multiplicities = get_multiplicities(poles)
+        return HORIZON_FACTOR * max(mode_settling_time(-p.real, m) for p, m in zip(poles, multiplicities))
+
+    growth = np.max(poles.real) if poles.size else 0.0
+    if growth > 1e-9 * scale:
+        return UNSTABLE_GROWTH_DECADES * math.log(10.0) / growth
+
+    # Marginal modes: a few periods of the slowest oscillation on the imaginary axis
+    marginal = poles[~decaying]
+    frequencies = np.abs(marginal.imag[np.abs(marginal.imag) > 1e-9 * scale])
+    if frequencies.size:
+        return MARGINAL_PERIODS * 2.0 * math.pi / np.min(frequencies)
+    return DEFAULT_HORIZON
+
+
+def suggest_time_parameters(poles, zeros=(), step_time=0.0, delay=0.0, cancellation_tolerance=CANCELLATION_TOLERANCE):
+    """
+    Choose the total time and the sample time of a simulation from the closed-loop poles and zeros.
+    The horizon covers the settling of the slowest mode after the step, the sample time resolves
+    the fastest one, and both are rounded so the run uses few samples within the Input limits.
+    Args:
+        poles (np.ndarray): Closed-loop poles
+        zeros (np.ndarray): Closed-loop zeros
+        step_time (float): Time at which the step is applied
+        delay (float): Total transport delay of the loop in seconds
+        cancellation_tolerance (float): Relative distance below which a pole cancelled by a zero is ignored, see PoleZeroAnalysis
+    Returns:
+        dict: total_time and sample_time in seconds
+    """
+    poles = np.asarray(poles, dtype=complex)
+    poles, _ = cancel_common_roots(poles[np.isfinite(poles)], zeros, cancellation_tolerance)
+    horizon = estimate_response_horizon(poles) + DELAY_ROUND_TRIPS * delay
+
+    total_time = min(round(step_time + _round_up(horizon), 12), MAX_TOTAL_TIME)
+    horizon = total_time - step_time
+
+    # Resolve the fastest mode, the delay and the curve itself. Parasitic modes that die out
+    # within one sample of the finest grid allowed by the budget are not worth resolving.
+    sample_time = horizon / MIN_CURVE_SAMPLES
+    magnitudes = np.abs(poles)
+    magnitudes = magnitudes[(magnitudes > 0) & (magnitudes < MAX_SAMPLES / total_time)]
+    if magnitudes.size:
+        sample_time = min(sample_time, 1.0 / (SAMPLES_PER_TIME_CONSTANT * np.max(magnitudes)))
+    if delay > 0:
+        sample_time = min(sample_time, delay / SAMPLES_PER_DELAY)
+    sample_time = _nice_down(sample_time)
+
+    # Keep within the sample budget
+    while total_time / sample_time > MAX_SAMPLES:
+        sample_time = _nice_up(sample_time * 1.0000001)
+    return {"total_time": total_time, "sample_time": sample_time}
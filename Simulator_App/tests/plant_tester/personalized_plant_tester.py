@@ -1,5 +1,11 @@
 from unittest import TestCase
+import numpy as np
+import control as ctrl
 from simulation_components.plant import get_plant
+from simulation_components.sensor import Sensor
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.input import Input
+from simulation_components.output import Output
 
 class PersonalizedPlantTester(TestCase):
 
@@ -21,3 +27,24 @@ class PersonalizedPlantTester(TestCase):
         tf = self.plant.get_transfer_function()
         self.assertIsInstance(tf, str)
         self.assertIn("Denominator cannot be all zeros", tf)
+
+    def test_plant_improper_state_space(self): # (s^2 + 3s + 4) / (s + 5) has no state-space realization
+        self.assertIn("improper", self.plant.get_state_space())
+
+    def test_plant_high_order_state_space(self):
+        poles = -np.linspace(1.0, 3.0, 24)
+        zeros = -np.linspace(1.5, 2.5, 6)
+        self.plant.set_parameters(Numerator=list(np.poly(zeros)), Denominator=list(np.poly(poles)))
+        realization = self.plant.get_state_space()
+        s_values = 1j * np.logspace(-1, 2, 50)
+        exact = np.prod(s_values[:, None] - zeros, axis=1) / np.prod(s_values[:, None] - poles, axis=1)
+        np.testing.assert_allclose(realization(s_values), exact, rtol=1e-6)
+
+    def test_closed_loop_composed_in_state_space(self):
+        self.plant.set_parameters(Numerator=[1.0, 3.0], Denominator=[1.0, 4.0, 6.0, 4.0])
+        pid, sensor = ControllerPID(2.0, 1.0, 0.5), Sensor([1], [0.1, 1])
+        closed_loop = Output(pid, self.plant, Input(), sensor).get_closed_loop_transfer_function()
+        self.assertIsInstance(closed_loop, ctrl.StateSpace)
+        reference = ctrl.feedback(ctrl.series(self.plant.get_transfer_function(), pid.get_transfer_function()), sensor.get_transfer_function())
+        s_values = 1j * np.logspace(-2, 2, 50)
+        np.testing.assert_allclose(closed_loop(s_values), reference(s_values), rtol=1e-9)
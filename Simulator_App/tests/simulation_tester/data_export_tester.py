@@ -0,0 +1,66 @@
+from unittest import TestCase
+import os
+import tempfile
+import numpy as np
+from simulation_components.plant import get_plant
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.input import Input
+from simulation_components.sensor import Sensor
+from simulation_components.output import Output
+from simulation_components.data_export import export_output, EXPORT_TABLES
+from simulation_components.simulation_service import compute_export
+
+PROJECT = {
+    "Plant type": "DC Motor Position Control",
+    "PID": {"kp": 2.0, "ki": 1.0, "kd": 0.5},
+    "Plant": {"J": 1.0, "b": 1.0, "K": 1.0, "R": 1.0, "L": 1.0},
+    "Input": {"step_time": 1.0, "initial_value": 0.0, "final_value": 1.0, "total_time": 10.0, "sample_time": 0.001},
+    "Sensor": {"Numerator": "1", "Denominator": "1"}
+}
+
+class DataExportTester(TestCase):
+
+    def setUp(self):
+        self.output = Output(ControllerPID(2.0, 1.0, 0.5), get_plant("DC Motor Position Control"), Input(1.0, 0.0, 1.0, 10.0, 0.001), Sensor())
+        self.directory = tempfile.TemporaryDirectory()
+        self.base_path = os.path.join(self.directory.name, "run")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_npz_export_in_chunks(self):
+        paths = export_output(self.output, self.base_path + ".npz", "NPZ", chunk_rows=777)
+        self.assertEqual(paths, [self.base_path + ".npz"])
+        with np.load(paths[0]) as archive:
+            t, response = self.output.get_step_response_data()
+            self.assertTrue(np.array_equal(archive["time_response/t"], t))
+            self.assertTrue(np.array_equal(archive["time_response/response"], response))
+
+            poles, zeros = self.output.get_pole_zero_data()
+            self.assertTrue(np.array_equal(archive["poles/real"] + 1j * archive["poles/imag"], poles))
+            gains, loci = self.output.get_root_locus_data()
+            self.assertEqual(len(archive["root_locus/gain"]), loci.size)
+            self.assertTrue(np.array_equal(archive["root_locus/real"].reshape(loci.shape), loci.real))
+
+            # The Nyquist table is the plotted contour, with its segments
+            s, response, segments = self.output.get_nyquist_contour().get_curve()
+            self.assertTrue(np.array_equal(archive["nyquist/s_real"] + 1j * archive["nyquist/s_imag"], s))
+            self.assertTrue(np.array_equal(archive["nyquist/real"] + 1j * archive["nyquist/imag"], response))
+            self.assertTrue(np.array_equal(archive["nyquist/segment"], segments))
+
+    def test_csv_export(self):
+        paths = export_output(self.output, self.base_path, "CSV", chunk_rows=1000)
+        self.assertEqual(len(paths), len(EXPORT_TABLES))
+        with open(paths[1], encoding="utf-8") as f:
+            self.assertEqual(f.readline().strip(), "omega,magnitude_db,phase_deg")
+        bode = np.loadtxt(paths[1], delimiter=",", skiprows=1)
+        omega, magnitude_db, phase_deg = self.output.get_bode_data()
+        self.assertTrue(np.allclose(bode[:, 0], omega))
+        self.assertTrue(np.allclose(bode[:, 1], magnitude_db))
+        self.assertTrue(export_output(self.output, self.base_path, "XLS").startswith("Error"))
+
+    def test_headless_export(self):
+        result = compute_export(PROJECT)
+        self.assertEqual({name.split("/")[0] for name in result}, set(EXPORT_TABLES))
+        t, response = self.output.get_step_response_data()
+        self.assertTrue(np.allclose(result["time_response/response"], response))
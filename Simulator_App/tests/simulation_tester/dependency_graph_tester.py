@@ -0,0 +1,115 @@
+from unittest import TestCase
+import numpy as np
+from simulation_components.plant import get_plant
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.input import Input
+from simulation_components.sensor import Sensor
+from simulation_components.output import Output, BODE_OMEGA
+from simulation_components.dependency_graph import DependencyGraph
+
+class DependencyGraphTester(TestCase):
+
+    def test_recomputes_only_downstream_nodes(self):
+        state = {"a": 1, "b": 10}
+        calls = []
+        graph = DependencyGraph()
+        graph.add_source("a", lambda: state["a"])
+        graph.add_source("b", lambda: state["b"])
+        graph.add_node("double", lambda: calls.append("double") or 2 * graph.get("a"))
+        graph.add_node("sum", lambda: calls.append("sum") or graph.get("double") + graph.get("b"))
+        self.assertEqual(graph.get("sum"), 12)
+        self.assertEqual(graph.get_inputs("sum"), ["double", "b"])
+        self.assertEqual(graph.pop_recomputed(), ["a", "double", "b", "sum"])
+
+        # Nothing changed: memoized
+        self.assertEqual(graph.get("sum"), 12)
+        self.assertEqual(graph.pop_recomputed(), [])
+
+        # Same fingerprint after a round trip: nothing recomputed
+        state["b"] = 10
+        graph.get("sum")
+        self.assertEqual(graph.pop_recomputed(), [])
+
+        state["b"] = 20
+        self.assertEqual(graph.get("sum"), 22)
+        self.assertEqual(graph.pop_recomputed(), ["b", "sum"])
+        self.assertEqual(calls, ["sum", "double", "sum"])
+        self.assertEqual(graph.get_revisions()["double"], 1)
+
+        graph.add_node("loop", lambda: graph.get("loop"))
+        with self.assertRaises(RuntimeError):
+            graph.get("loop")
+
+    def test_sensor_edit_keeps_plant_results(self):
+        plant = get_plant("DC Motor Position Control")
+        sensor = Sensor()
+        pid = ControllerPID(2.0, 1.0, 0.5)
+        input_params = Input()
+        output = Output(pid, plant, input_params, sensor, use_reduced_models=True)
+        output.plot_step_response()
+        output.plot_bode()
+        plant_ss = output.get_plant_state_space()
+        plant_response = output.get_frequency_response_cache(BODE_OMEGA).get_plant_response()
+        output.get_recomputed_nodes()
+
+        sensor.set_parameters(Numerator=[1], Denominator=[0.05, 1])
+        output.plot_step_response()
+        output.plot_bode()
+        recomputed = output.get_recomputed_nodes()
+        self.assertIn("sensor_state_space", recomputed)
+        self.assertIn("closed_loop", recomputed)
+        for name in ("plant", "plant_state_space", "plant_transfer_function", "open_loop_state_space", "pid"):
+            self.assertNotIn(name, recomputed)
+        self.assertIs(output.get_plant_state_space(), plant_ss)
+        self.assertIs(output.get_frequency_response_cache(BODE_OMEGA).get_plant_response(), plant_response)
+
+        # An input edit leaves the loop models and the frequency results alone
+        input_params.set_parameters(1, 0, 2, 10, 0.01)
+        output.plot_step_response()
+        output.plot_bode()
+        self.assertEqual(output.get_recomputed_nodes(), ["input", "step_response"])
+
+        # A PID edit keeps both component realizations
+        pid.set_parameters(3.0, 1.0, 0.5)
+        output.get_step_response_result()
+        recomputed = output.get_recomputed_nodes()
+        self.assertIn("open_loop_state_space", recomputed)
+        self.assertNotIn("plant_state_space", recomputed)
+        self.assertNotIn("sensor_state_space", recomputed)
+
+    def test_memoized_results_match_fresh_output(self):
+        plant = get_plant("Personalized Plant")
+        plant.set_parameters(Numerator=[1, 2], Denominator=[1, 3, 2, 1])
+        sensor = Sensor()
+        pid = ControllerPID(1.0, 0.5, 0.0)
+        output = Output(pid, plant, Input(), sensor)
+        output.get_step_response_result()
+        output.get_sensitivity_peaks()
+
+        edits = [lambda: sensor.set_parameters(Numerator=[1], Denominator=[0.1, 1]),
+                 lambda: plant.set_parameters(Numerator=[2, 1], Denominator=[1, 4, 3, 1]),
+                 lambda: sensor.set_delay(0.05),
+                 lambda: output.set_use_reduced_models(True),
+                 lambda: pid.set_parameters(2.0, 0.0, 0.0)]
+        for edit in edits:
+            edit()
+            fresh = Output(pid, plant, Input(), sensor, use_reduced_models=output.use_reduced_models)
+            np.testing.assert_allclose(output.get_step_response_result()["response"], fresh.get_step_response_result()["response"])
+            self.assertEqual(output.get_sensitivity_peaks(), fresh.get_sensitivity_peaks())
+            margins, fresh_margins = output.get_stability_margins(), fresh.get_stability_margins()
+            self.assertEqual(margins["phase_margin"], fresh_margins["phase_margin"])
+            self.assertEqual(margins["gain_margin"], fresh_margins["gain_margin"])
+
+    def test_every_plot_gets_a_fresh_figure(self):
+        # A zoom in one plotter never carries over to the next display of the same plot
+        input_params = Input(1.0, 0.0, 1.0, 10.0, 0.01)
+        output = Output(ControllerPID(2.0, 1.0, 0.5), get_plant("DC Motor Position Control"), input_params, Sensor())
+        for plot in (output.plot_step_response, output.plot_impulse_response):
+            figure = plot()
+            figure.axes[0].set_xlim(2.0, 3.0)
+            output.get_recomputed_nodes()
+            again = plot()
+            self.assertIsNot(again, figure)
+            self.assertEqual(again.axes[0].get_xlim(), (0.0, 10.0))
+            self.assertEqual(len(again.axes[0].lines[0].get_xdata()), 1001)
+            self.assertEqual(output.get_recomputed_nodes(), [])
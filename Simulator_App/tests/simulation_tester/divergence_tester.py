@@ -0,0 +1,90 @@
+from unittest import TestCase
+import numpy as np
+import control as ctrl
+from simulation_components.plant import get_plant
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.input import Input
+from simulation_components.sensor import Sensor
+from simulation_components.output import Output
+from simulation_components.batch_simulator import simulate_step_batch
+from simulation_components.monte_carlo import MonteCarloAnalysis
+from simulation_components.divergence import step_response_until_divergence, is_asymptotically_stable
+
+class DivergenceTester(TestCase):
+
+    def setUp(self):
+        # Negative proportional gain on the speed loop: one pole in the right half-plane
+        self.plant = get_plant("DC Motor Speed Control")
+        self.input = Input(1.0, 0.0, 2.0, 100.0, 0.01)
+
+    def test_streaming_matches_step_response_until_bound(self):
+        system = ctrl.tf([1.0], [1.0, -0.5, 2.0])
+        t = np.linspace(0, 100, 10001)
+        response, diverged = step_response_until_divergence(system, t, 1e6)
+        self.assertTrue(diverged)
+        self.assertGreater(abs(response[-1]), 1e6)
+        self.assertTrue(np.all(np.abs(response[:-1]) <= 1e6))
+        _, expected = ctrl.step_response(system, T=t[:len(response)])
+        np.testing.assert_allclose(response, expected, rtol=1e-6, atol=1e-9)
+
+        # Fast growth shortens the chunks instead of overflowing
+        response, diverged = step_response_until_divergence(ctrl.tf([1.0], [1.0, -500.0]), t, 1e6)
+        self.assertTrue(diverged)
+        self.assertTrue(np.all(np.isfinite(response)))
+
+        stable = ctrl.tf([1.0], [1.0, 2.0, 2.0])
+        response, diverged = step_response_until_divergence(stable, t)
+        self.assertFalse(diverged)
+        np.testing.assert_allclose(response, ctrl.step_response(stable, T=t)[1], atol=1e-9)
+        self.assertTrue(is_asymptotically_stable(stable.poles()))
+        self.assertFalse(is_asymptotically_stable([0.0, -1.0]))
+
+    def test_output_truncates_unstable_step_response(self):
+        output = Output(ControllerPID(-5.0, 1.0, 0.0), self.plant, self.input, Sensor())
+        result = output.get_step_response_result()
+        self.assertFalse(result["stable"])
+        self.assertTrue(result["diverged"])
+        self.assertLess(len(result["t"]), 10001)
+        self.assertEqual(len(result["t"]), len(result["response"]))
+        self.assertLessEqual(np.max(np.abs(result["response"][:-1])), 2.0 * 1e6)
+        self.assertIsNotNone(output.plot_step_response())
+
+        # Stable loops keep the full horizon
+        result = Output(ControllerPID(2.0, 1.0, 0.5), self.plant, self.input, Sensor()).get_step_response_result()
+        self.assertTrue(result["stable"])
+        self.assertFalse(result["diverged"])
+        self.assertEqual(len(result["t"]), 10001)
+
+    def test_delayed_loop_stops_at_bound(self):
+        self.plant.set_delay(0.5)
+        output = Output(ControllerPID(-5.0, 1.0, 0.0), self.plant, self.input, Sensor())
+        output.set_divergence_bound(1e3)
+        result = output.get_step_response_result()
+        self.assertTrue(result["diverged"])
+        self.assertFalse(result["stable"])
+        self.assertGreater(abs(result["response"][-1]), 2.0 * 1e3)
+
+    def test_batch_drops_diverged_rows(self):
+        numerators = np.array([[0.0, 0.0, 1.0], [0.0, 0.0, 1.0]])
+        denominators = np.array([[1.0, 2.0, 2.0], [1.0, -1.0, 2.0]])
+        t = np.linspace(0, 50, 5001)
+        responses, stable = simulate_step_batch(numerators, denominators, t, 0)
+        np.testing.assert_array_equal(stable, [True, False])
+        self.assertTrue(np.all(np.isfinite(responses[0])))
+        diverged_at = np.argmax(np.isnan(responses[1]))
+        self.assertGreater(diverged_at, 0)
+        self.assertGreater(abs(responses[1, diverged_at - 1]), 1e6)
+        _, expected = ctrl.step_response(ctrl.tf([1.0], [1.0, -1.0, 2.0]), T=t[:diverged_at])
+        np.testing.assert_allclose(responses[1, :diverged_at], expected, rtol=1e-6)
+
+    def test_batch_verdict_matches_output(self):
+        # P-only Ball and Beam: undamped oscillation, marginal loops count as unstable.
+        # The PD speed loop with Ki = 0 is stable once the PID integrator is cancelled.
+        cases = [("Ball and Beam", ControllerPID(2.0, 0.0, 0.0)), ("DC Motor Speed Control", ControllerPID(2.0, 0.0, 0.5)),
+                 ("DC Motor Position Control", ControllerPID(0.0, 0.0, 0.5))]
+        for plant_type, pid in cases:
+            plant = get_plant(plant_type)
+            expected = Output(pid, plant, self.input, Sensor()).is_closed_loop_stable()
+            result = MonteCarloAnalysis(pid, plant, Input(1.0, 0.0, 1.0, 5.0, 0.01), Sensor()).run(10, seed=0, workers=1)
+            self.assertEqual(result.get_stable_fraction(), float(expected), plant_type)
+        self.assertFalse(Output(ControllerPID(2.0, 0.0, 0.0), get_plant("Ball and Beam"), self.input, Sensor()).is_closed_loop_stable())
@@ -0,0 +1,58 @@
+from unittest import TestCase
+import numpy as np
+import control as ctrl
+from simulation_components.plant import get_plant, PLANT_MAP
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.input import Input
+from simulation_components.sensor import Sensor
+from simulation_components.output import Output, BODE_OMEGA
+from simulation_components.frequency_response import FrequencyResponseCache
+
+class FrequencyResponseTester(TestCase):
+
+    def test_matches_transfer_function_evaluation(self):
+        s_values = 1j * BODE_OMEGA
+        for plant_type in PLANT_MAP:
+            plant = get_plant(plant_type)
+            plant.set_delay(0.05)
+            sensor = Sensor([1], [0.1, 1])
+            pid = ControllerPID(2.0, 1.0, 0.5)
+            output = Output(pid, plant, Input(), sensor)
+
+            forward = pid.get_transfer_function()(s_values) * plant.get_transfer_function()(s_values) * np.exp(-0.05 * s_values)
+            loop = forward * sensor.get_transfer_function()(s_values)
+            np.testing.assert_allclose(output.get_closed_loop_frequency_response(BODE_OMEGA), forward / (1 + loop), rtol=1e-9, err_msg=plant_type)
+            np.testing.assert_allclose(output.get_open_loop_frequency_response(BODE_OMEGA), loop, rtol=1e-9, err_msg=plant_type)
+
+            # New gains: same result as a fresh evaluation
+            pid.set_parameters(5.0, 0.0, 0.1)
+            expected = ctrl.tf([0.1, 5.0], [1.0])(s_values) * plant.get_transfer_function()(s_values) * np.exp(-0.05 * s_values)
+            np.testing.assert_allclose(output.get_closed_loop_frequency_response(BODE_OMEGA),
+                                       expected / (1 + expected * sensor.get_transfer_function()(s_values)), rtol=1e-9)
+
+    def test_gain_changes_reuse_component_responses(self):
+        plant = get_plant("DC Motor Position Control")
+        sensor = Sensor()
+        cache = FrequencyResponseCache(plant, sensor, BODE_OMEGA)
+        bode = cache.get_bode_data(2.0, 1.0, 0.5)
+        plant_response = cache.get_plant_response()
+        sensor_response = cache.get_sensor_response()
+
+        cache.get_bode_data(4.0, 0.0, 0.1)
+        self.assertIs(cache.get_plant_response(), plant_response)
+        self.assertIs(cache.get_sensor_response(), sensor_response)
+
+        # A sensor edit only re-evaluates the sensor
+        sensor.set_parameters(Numerator=[1], Denominator=[0.01, 1])
+        cache.get_bode_data(2.0, 1.0, 0.5)
+        self.assertIs(cache.get_plant_response(), plant_response)
+        self.assertIsNot(cache.get_sensor_response(), sensor_response)
+
+        # Arrays of gains give one row per gain
+        gains = np.array([1.0, 2.0, 4.0])
+        closed = cache.get_closed_loop_response(gains, 1.0, 0.5)
+        self.assertEqual(closed.shape, (3, len(BODE_OMEGA)))
+        np.testing.assert_allclose(closed[1], cache.get_closed_loop_response(2.0, 1.0, 0.5))
+        sweep = cache.get_bode_data(gains, 1.0, 0.5)
+        np.testing.assert_allclose(sweep["open_magnitude_db"][0], cache.get_bode_data(1.0, 1.0, 0.5)["open_magnitude_db"])
+        self.assertEqual(bode["closed_phase_deg"].shape, BODE_OMEGA.shape)
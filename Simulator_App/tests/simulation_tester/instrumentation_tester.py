@@ -0,0 +1,66 @@
+from unittest import TestCase
+import json
+import os
+import tempfile
+import time
+from simulation_components import instrumentation
+from simulation_components.plant import get_plant
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.input import Input
+from simulation_components.sensor import Sensor
+from simulation_components.output import Output
+
+class InstrumentationTester(TestCase):
+
+    def setUp(self):
+        self.was_enabled = instrumentation.is_enabled()
+        instrumentation.clear()
+
+    def tearDown(self):
+        instrumentation.enable(self.was_enabled)
+        instrumentation.clear()
+
+    def test_disabled_tracing_records_nothing(self):
+        instrumentation.enable(False)
+        with instrumentation.span("outer"):
+            pass
+        self.assertEqual(instrumentation.get_spans(), [])
+
+    def test_nested_spans_self_time(self):
+        instrumentation.enable()
+        with instrumentation.capture() as spans:
+            with instrumentation.span("outer"):
+                time.sleep(0.02)
+                with instrumentation.span("inner"):
+                    time.sleep(0.03)
+        records = {record["name"]: record for record in spans}
+        self.assertEqual(set(records), {"outer", "inner"})
+        self.assertEqual(records["outer"]["depth"], 0)
+        self.assertEqual(records["inner"]["depth"], 1)
+        self.assertAlmostEqual(records["outer"]["self"], records["outer"]["duration"] - records["inner"]["duration"])
+        self.assertGreaterEqual(records["inner"]["self"], 0.03)
+        self.assertIn("  inner:", instrumentation.format_spans(spans))
+        self.assertEqual(list(instrumentation.get_summary(spans))[0], "inner")
+
+    def test_dump_chrome_trace(self):
+        instrumentation.enable()
+        with instrumentation.span("stage"):
+            pass
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "trace.json")
+            self.assertIsNone(instrumentation.dump_trace(file_path))
+            with open(file_path, encoding="utf-8") as f:
+                trace = json.load(f)
+            self.assertIsNotNone(instrumentation.dump_trace(os.path.join(directory, "missing", "trace.json")))
+        self.assertEqual(trace["traceEvents"][0]["name"], "stage")
+        self.assertEqual(trace["traceEvents"][0]["ph"], "X")
+
+    def test_step_response_plot_stages(self):
+        instrumentation.enable()
+        output = Output(ControllerPID(2.0, 1.0, 0.5), get_plant("DC Motor Position Control"), Input(1.0, 0.0, 1.0, 10.0, 0.01), Sensor())
+        with instrumentation.capture() as spans:
+            output.plot_step_response()
+        names = {record["name"] for record in spans}
+        self.assertTrue({"Output.plot_step_response", "Output.closed_loop", "ctrl.step_response",
+                         "Figure.tight_layout"} <= names)
+        self.assertEqual(max(spans, key=lambda record: record["duration"])["name"], "Output.plot_step_response")
@@ -0,0 +1,70 @@
+from unittest import TestCase
+import numpy as np
+import control as ctrl
+from simulation_components.plant import get_plant, PLANT_MAP
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.input import Input
+from simulation_components.sensor import Sensor
+from simulation_components.output import Output
+from simulation_components.loop_signals import loop_signals_state_space
+
+class LoopSignalsTester(TestCase):
+
+    def test_signals_match_closed_loop_transfer_functions(self):
+        for plant_type in PLANT_MAP:
+            plant = get_plant(plant_type)
+            sensor = Sensor([1], [0.1, 1])
+            pid = ControllerPID(2.0, 1.0, 0.0)
+            output = Output(pid, plant, Input(1.0, 0.5, 2.0, 10.0, 0.01), sensor)
+            data = output.get_loop_signals_data()
+
+            # The output is the step response, e = r - m
+            t, response = output.get_step_response_data()
+            np.testing.assert_allclose(data["output"], response, atol=1e-9, err_msg=plant_type)
+            np.testing.assert_allclose(data["error"], data["reference"] - data["sensor"], atol=1e-12)
+
+            # u = C / (1 + C P S) r, built independently from the transfer functions
+            loop = ctrl.series(plant.get_transfer_function(), sensor.get_transfer_function())
+            _, control = ctrl.step_response(ctrl.feedback(pid.get_transfer_function(), loop), T=t[100:] - 1.0)
+            np.testing.assert_allclose(data["control"][100:], 1.5 * control, atol=1e-8, err_msg=plant_type)
+            np.testing.assert_array_equal(data["control"][:100], 0.0)
+
+            metrics = data["metrics"]
+            self.assertAlmostEqual(metrics["peak_control"], np.max(np.abs(data["control"])))
+            self.assertGreater(metrics["peak_control"], metrics["rms_control"])
+            self.assertEqual(metrics["control_impulse"], 0.0)
+
+    def test_derivative_kick(self):
+        plant = get_plant("DC Motor Speed Control")
+        output = Output(ControllerPID(2.0, 1.0, 0.5), plant, Input(1.0, 0.0, 2.0, 10.0, 0.01), Sensor())
+        data = output.get_loop_signals_data()
+        np.testing.assert_allclose(data["output"], output.get_step_response_data()[1], atol=1e-9)
+
+        # The plant is strictly proper: the derivative of the step is an impulse of area kd * 2
+        self.assertAlmostEqual(data["control_impulse"], 1.0)
+        self.assertAlmostEqual(data["metrics"]["control_impulse"], 1.0)
+        self.assertIsNotNone(output.plot_loop_signals())
+
+        # The derivative of a unity-feedback biproper plant has no proper control effort
+        biproper = get_plant("Personalized Plant")
+        with self.assertRaises(ValueError):
+            loop_signals_state_space(2.0, 1.0, 0.5, biproper.get_state_space(), Sensor().get_state_space())
+
+    def test_delayed_and_divergent_loops(self):
+        plant = get_plant("DC Motor Speed Control")
+        plant.set_delay(0.1)
+        output = Output(ControllerPID(2.0, 1.0, 0.0), plant, Input(1.0, 0.0, 1.0, 10.0, 0.01), Sensor())
+        data = output.get_loop_signals_data()
+        np.testing.assert_allclose(data["output"], output.get_step_response_data()[1], atol=1e-12)
+        np.testing.assert_allclose(data["error"], data["reference"] - data["sensor"], atol=1e-12)
+        self.assertAlmostEqual(data["control"][105], 2.0 * data["error"][105] + 0.01 * np.sum(data["error"][:106]))
+
+        plant.set_delay(0.0)
+        output.pid_object.set_parameters(-5.0, 1.0, 0.0)
+        output.set_divergence_bound(1e2)
+        data = output.get_loop_signals_data()
+        self.assertTrue(data["diverged"])
+        self.assertGreater(abs(data["output"][-1]), 1e2)
+        self.assertTrue(np.all(np.abs(data["output"][:-1]) <= 1e2))
+        self.assertEqual(len(data["t"]), len(data["control"]))
+        self.assertIsNotNone(output.plot_loop_signals())
@@ -0,0 +1,73 @@
+from unittest import TestCase
+import os
+import tempfile
+import numpy as np
+from simulation_components.plant import get_plant
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.input import Input
+from simulation_components.sensor import Sensor
+from simulation_components.output import Output
+from simulation_components.loop_simulator import DelayLine, LoopSimulator, DiscreteLoopModel
+from utils.file_utils import save_simulation_config, extract_delays_from_file, validate_project_file
+
+class LoopSimulatorTester(TestCase):
+
+    def setUp(self):
+        self.plant = get_plant("DC Motor Speed Control")
+        self.plant.set_parameters(J=0.01, b=0.1, K=0.01, R=1.0, L=0.5)
+        self.pid = ControllerPID(100.0, 200.0, 0.0)
+        self.sensor = Sensor('1', '1')
+        self.input = Input(1.0, 0.0, 1.0, 10.0, 0.001)
+
+    def test_delay_line(self):
+        line = DelayLine(3)
+        outputs = []
+        for value in range(6):
+            outputs.append(line.read())
+            line.push(value)
+        self.assertEqual(outputs, [0, 0, 0, 0, 1, 2])
+
+    def test_no_delay_matches_continuous_response(self):
+        output = Output(self.pid, self.plant, self.input, self.sensor)
+        t, continuous = output.get_step_response_data()
+        discrete = output.simulate_delayed_loop(np.where(t >= 1.0, 1.0, 0.0))
+        self.assertLess(np.max(np.abs(discrete - continuous)), 1e-2)
+
+    def test_plant_dead_time(self):
+        self.assertIsNotNone(self.plant.set_delay(-1.0))
+        self.plant.set_delay(0.2)
+        simulator = LoopSimulator(self.pid, self.plant, self.sensor, 0.001)
+        self.assertEqual(simulator.plant_delay_samples, 200)
+        y = simulator.simulate(np.ones(1000))
+        self.assertTrue(np.all(y[:201] == 0))
+        self.assertGreater(y[300], 0)
+
+    def test_discrete_loop_model_matches_loop_simulator(self):
+        self.plant.set_delay(0.02)
+        self.sensor = Sensor([2, 1], [0.1, 1])
+        self.sensor.set_delay(0.01)
+        reference = np.ones(10001)
+        model = DiscreteLoopModel(self.plant, self.sensor, 0.001)
+        for kp, ki, kd in ((20.0, 20.0, 0.0), (10.0, 5.0, 0.1)):
+            expected = LoopSimulator(ControllerPID(kp, ki, kd), self.plant, self.sensor, 0.001).simulate(reference)
+            self.assertLess(np.max(np.abs(model.simulate(kp, ki, kd, reference) - expected)), 1e-8 * np.max(np.abs(expected)))
+
+    def test_discrete_loop_model_poles(self):
+        # Position plant with (10, 5, 1): closed-loop poles at Re(s) = +0.40, finite over 10 s
+        model = DiscreteLoopModel(get_plant("DC Motor Position Control"), Sensor(), 0.01)
+        poles = model.get_closed_loop_poles(10.0, 5.0, 1.0)
+        self.assertGreater(np.max(np.abs(poles)), 1.0)
+        self.assertTrue(np.all(np.isfinite(model.simulate(10.0, 5.0, 1.0, np.ones(1001)))))
+        self.assertLess(np.max(np.abs(model.get_closed_loop_poles(2.0, 1.0, 0.5))), 1.0)
+
+        # Without integral gain the unobservable integrator pole at z = 1 is left out
+        poles = model.get_closed_loop_poles(2.0, 0.0, 0.5)
+        self.assertEqual(len(poles), len(model.get_closed_loop_zpk(2.0, 0.0, 0.5)[1]) - 1)
+        self.assertLess(np.max(np.abs(poles)), 1.0)
+
+    def test_delay_file_round_trip(self):
+        file_path = os.path.join(tempfile.mkdtemp(), "delay_project.txt")
+        save_simulation_config(file_path, ControllerPID().get_parameters(), self.plant.get_parameters(), Input().get_parameters(),
+                               self.sensor.get_parameters(), plant_type_fallback=self.plant.name, delay_params={'plant': 0.2, 'sensor': 0.05})
+        self.assertEqual(validate_project_file(file_path), (True, "", ""))
+        self.assertEqual(extract_delays_from_file(file_path), {'plant': 0.2, 'sensor': 0.05})
@@ -0,0 +1,69 @@
+from unittest import TestCase
+import numpy as np
+import control as ctrl
+from simulation_components.plant import get_plant, PLANT_MAP
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.input import Input
+from simulation_components.sensor import Sensor
+from simulation_components.output import Output, ZOOM_POINTS
+from simulation_components.modal_response import ModalResponse
+
+class ModalResponseTester(TestCase):
+
+    def test_repeated_poles(self):
+        # 1/(s+1)^3 and 1/((s+2)^4 ((s+1)^2+1)^2)
+        t = np.linspace(0, 20, 2001)
+        modal = ModalResponse(ctrl.tf([1.0], [1.0, 3.0, 3.0, 1.0]))
+        np.testing.assert_allclose(modal.step(t), 1 - np.exp(-t) * (1 + t + t ** 2 / 2), atol=1e-12)
+        np.testing.assert_allclose(modal.impulse(t), t ** 2 / 2 * np.exp(-t), atol=1e-12)
+        poles, multiplicities = modal.get_poles()
+        np.testing.assert_allclose(poles, [-1.0])
+        np.testing.assert_array_equal(multiplicities, [3])
+
+        system = ctrl.tf([1.0], np.poly([-2, -2, -2, -2, -1 + 1j, -1 - 1j, -1 + 1j, -1 - 1j]).real)
+        np.testing.assert_allclose(ModalResponse(system).step(t), ctrl.step_response(system, T=t)[1], atol=1e-12)
+        self.assertEqual(sorted(ModalResponse(system).get_poles()[1]), [2, 2, 4])
+
+    def test_matches_sampled_closed_loop(self):
+        for plant_type in PLANT_MAP:
+            output = Output(ControllerPID(2.0, 1.0, 0.5), get_plant(plant_type), Input(1.0, 0.0, 2.0, 10.0, 0.01), Sensor([1], [0.1, 1]))
+            if isinstance(output.get_closed_loop_transfer_function(), ctrl.TransferFunction):
+                # Derivative on a biproper plant: improper, no time response at all
+                self.assertIsNone(output.get_modal_response())
+                continue
+            t, response = output.get_step_response_data()
+            np.testing.assert_allclose(output.evaluate_step_response(t), response, atol=1e-9, err_msg=plant_type)
+
+            # A single time point, and the response before the step
+            self.assertAlmostEqual(float(output.evaluate_step_response(np.array([t[537]]))[0]), response[537], places=9)
+            np.testing.assert_array_equal(output.evaluate_step_response(np.array([0.0, 0.5])), [0.0, 0.0])
+
+            closed_loop = output.get_closed_loop_transfer_function()
+            _, impulse = ctrl.impulse_response(closed_loop, T=t[100:] - 1.0)
+            np.testing.assert_allclose(output.evaluate_impulse_response(t[100:]), impulse, atol=1e-9, err_msg=plant_type)
+
+    def test_cache_and_delayed_loop(self):
+        pid = ControllerPID(2.0, 1.0, 0.5)
+        plant = get_plant("DC Motor Position Control")
+        output = Output(pid, plant, Input(1.0, 0.0, 1.0, 10.0, 0.01), Sensor())
+        modal = output.get_modal_response()
+        self.assertIs(output.get_modal_response(), modal)
+        pid.set_parameters(3.0, 1.0, 0.5)
+        self.assertIsNot(output.get_modal_response(), modal)
+
+        plant.set_delay(0.1)
+        self.assertIsNone(output.get_modal_response())
+        self.assertIsNone(output.evaluate_step_response(np.array([2.0])))
+
+    def test_zoom_redraws_exact_curve(self):
+        output = Output(ControllerPID(2.0, 1.0, 0.5), get_plant("DC Motor Speed Control"), Input(1.0, 0.0, 1.0, 10.0, 0.5), Sensor())
+        fig = output.plot_step_response()
+        ax = fig.axes[0]
+        line = ax.get_lines()[0]
+        self.assertEqual(len(line.get_xdata()), 21)
+
+        ax.set_xlim(1.0, 1.2)
+        t, values = line.get_data()
+        self.assertEqual(len(t), ZOOM_POINTS)
+        self.assertAlmostEqual(t[0], 1.0)
+        np.testing.assert_allclose(values, output.evaluate_step_response(t))
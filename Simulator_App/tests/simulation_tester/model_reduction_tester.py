@@ -0,0 +1,66 @@
+from unittest import TestCase
+import numpy as np
+import control as ctrl
+from simulation_components.plant import PersonalizedPlant
+from simulation_components.sensor import Sensor
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.input import Input
+from simulation_components.output import Output
+from simulation_components.model_reduction import BalancedTruncation
+
+class ModelReductionTester(TestCase):
+
+    def setUp(self):
+        # Order 30 plant made of lightly to well damped modes spread over three decades, unit DC gain
+        rng = np.random.default_rng(0)
+        poles = []
+        for _ in range(15):
+            natural_frequency = 10 ** rng.uniform(-1, 2)
+            damping = rng.uniform(0.05, 0.9)
+            poles += [natural_frequency * (-damping + 1j * np.sqrt(1 - damping ** 2)),
+                      natural_frequency * (-damping - 1j * np.sqrt(1 - damping ** 2))]
+        self.denominator = list(np.real(np.poly(poles)))
+        zeros = np.real(np.poly(-10 ** rng.uniform(-1, 2, 10)))
+        self.numerator = list(zeros / zeros[-1] * self.denominator[-1])
+        self.omega = np.logspace(-3, 4, 2000)
+
+    def test_error_within_bound(self):
+        reduction = BalancedTruncation(self.numerator, self.denominator)
+        hankel_values = reduction.get_hankel_singular_values()
+        self.assertEqual(reduction.get_full_order(), 30)
+        self.assertTrue(np.all(np.diff(hankel_values) <= 0))
+
+        full = ctrl.tf(self.numerator, self.denominator)
+        for tolerance in (1e-1, 1e-3):
+            order = reduction.get_order_for_tolerance(tolerance)
+            self.assertLess(order, 30)
+            self.assertLessEqual(reduction.get_error_bound(order), tolerance)
+            for method in ("matchdc", "truncate"):
+                reduced = reduction.reduce_to_tolerance(tolerance, method)
+                error = np.max(np.abs(full(1j * self.omega) - reduced(1j * self.omega)))
+                self.assertLessEqual(error, reduction.get_error_bound(order) * (1 + 1e-6))
+
+    def test_matchdc_keeps_steady_state_and_integrator(self):
+        denominator = np.polymul(self.denominator, [1, 0])
+        reduction = BalancedTruncation(self.numerator, denominator)
+        self.assertEqual(reduction.get_unstable_order(), 1)
+        reduced = reduction.reduce(reduction.get_order_for_tolerance(1e-2))
+        self.assertIn(0.0, np.round(np.abs(reduced.poles()), 12))
+
+        reduction = BalancedTruncation(self.numerator, self.denominator)
+        reduced = reduction.reduce_to_tolerance(1e-2, "matchdc")
+        self.assertAlmostEqual(float(np.real(reduced(0))), 1.0, places=8)
+
+    def test_output_uses_reduced_plant_only_when_requested(self):
+        plant = PersonalizedPlant(self.numerator, self.denominator)
+        self.assertIn("Error", plant.set_reduction(-1.0))
+        self.assertIsNone(plant.set_reduction(1e-2))
+
+        pid, input_params, sensor = ControllerPID(1.0, 0.5, 0.0), Input(), Sensor()
+        full_loop = Output(pid, plant, input_params, sensor).get_closed_loop_transfer_function()
+        reduced_loop = Output(pid, plant, input_params, sensor, use_reduced_models=True).get_closed_loop_transfer_function()
+        self.assertGreater(len(full_loop.poles()), len(reduced_loop.poles()))
+
+        plant.set_reduction(None)
+        unreduced_loop = Output(pid, plant, input_params, sensor, use_reduced_models=True).get_closed_loop_transfer_function()
+        self.assertEqual(len(full_loop.poles()), len(unreduced_loop.poles()))
@@ -0,0 +1,49 @@
+from unittest import TestCase
+import numpy as np
+from simulation_components.plant import get_plant
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.input import Input
+from simulation_components.sensor import Sensor
+from simulation_components.output import Output
+from simulation_components.metrics import compute_step_metrics
+from simulation_components.monte_carlo import MonteCarloAnalysis
+
+class MonteCarloTester(TestCase):
+
+    def setUp(self):
+        self.plant = get_plant("DC Motor Position Control")
+        self.pid = ControllerPID(2.0, 1.0, 0.5)
+        self.input = Input(1.0, 0.0, 1.0, 10.0, 0.01)
+        self.sensor = Sensor()
+        self.analysis = MonteCarloAnalysis(self.pid, self.plant, self.input, self.sensor)
+
+    def test_fixed_parameters_match_nominal_response(self):
+        result = self.analysis.run(20, seed=1, workers=1)
+        _, expected = Output(self.pid, self.plant, self.input, self.sensor).get_step_response_data()
+        self.assertTrue(np.allclose(result.responses, expected, atol=1e-9))
+        self.assertEqual(result.get_stable_fraction(), 1.0)
+
+    def test_runs_are_reproducible_across_workers(self):
+        for name in ("J", "K", "R"):
+            self.assertIsNone(self.analysis.set_distribution(name, "Normal", 0.1))
+        serial = self.analysis.run(1200, seed=7, workers=1)
+        parallel = self.analysis.run(1200, seed=7, workers=2)
+        self.assertTrue(np.array_equal(serial.responses, parallel.responses, equal_nan=True))
+        self.assertFalse(np.allclose(serial.responses[0], serial.responses[1]))
+        bands = serial.get_percentile_bands()
+        self.assertTrue(np.all(bands[5] <= bands[95]))
+
+    def test_invalid_settings(self):
+        self.assertIsInstance(self.analysis.set_distribution("J", "Gamma", 0.1), str)
+        self.assertIsInstance(self.analysis.set_distribution("J", "Normal", -0.1), str)
+        self.assertIsInstance(self.analysis.run(0), str)
+        self.plant.set_delay(0.1)
+        self.assertIsInstance(self.analysis.run(10), str)
+
+    def test_first_order_metrics(self):
+        t = np.linspace(0, 20, 20001)
+        response = np.where(t >= 1.0, 1 - np.exp(-(t - 1.0)), 0.0)
+        metrics = compute_step_metrics(t, response, 1.0, 0.0, 1.0)
+        self.assertAlmostEqual(metrics['rise_time'][0], np.log(9), places=2)
+        self.assertAlmostEqual(metrics['settling_time'][0], np.log(50), places=2)
+        self.assertAlmostEqual(metrics['overshoot'][0], 0.0)
@@ -0,0 +1,38 @@
+from unittest import TestCase
+import numpy as np
+from simulation_components.plant import get_plant
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.input import Input
+from simulation_components.sensor import Sensor
+from simulation_components.output import Output
+from simulation_components.nonlinear_plant import BallAndBeamNonlinearModel
+
+class NonlinearPlantTester(TestCase):
+
+    def setUp(self):
+        # Ball and Beam example project parameters
+        self.plant = get_plant("Ball and Beam")
+        self.plant.set_parameters(m=0.111, R=0.015, d=0.03, g=-9.8, L=1.0, J=9.99e-06)
+        self.pid = ControllerPID(10.0, 0.0, 10.0)
+        self.sensor = Sensor('1', '1')
+
+    def test_small_signal_matches_linear_response(self):
+        input_params = Input(0.0, 0.0, 0.01, 10.0, 0.01)
+        model = BallAndBeamNonlinearModel(self.plant, max_beam_angle=None)
+        t, positions, _ = model.simulate_closed_loop(self.pid, self.sensor, input_params)
+        _, linear = Output(self.pid, self.plant, input_params, self.sensor).get_step_response_data()
+        self.assertTrue(np.allclose(positions[0], linear, atol=1e-6))
+
+    def test_batch_initial_conditions(self):
+        input_params = Input(1.0, 0.0, 0.25, 10.0, 0.01)
+        model = BallAndBeamNonlinearModel(self.plant)
+        t, positions, beam_angles = model.simulate_closed_loop(self.pid, self.sensor, input_params, initial_conditions=[[0.0, 0.0], [0.1, 0.0], [-0.1, 0.0]])
+        self.assertEqual(positions.shape, (3, len(t)))
+        self.assertEqual(positions[1, 0], 0.1)
+        self.assertLessEqual(np.max(np.abs(beam_angles)), model.max_beam_angle + 1e-12)
+
+    def test_invalid_plant_returns_error(self):
+        self.plant.set_parameters(m=-1.0)
+        model = BallAndBeamNonlinearModel(self.plant)
+        result = model.simulate_closed_loop(self.pid, self.sensor, Input())
+        self.assertIsInstance(result, str)
@@ -0,0 +1,76 @@
+from unittest import TestCase
+import numpy as np
+import control as ctrl
+from simulation_components.plant import get_plant, PLANT_MAP
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.input import Input
+from simulation_components.sensor import Sensor
+from simulation_components.output import Output
+from simulation_components.nyquist_contour import NyquistContour
+
+class NyquistContourTester(TestCase):
+
+    def test_verdict_matches_closed_loop_poles(self):
+        rng = np.random.default_rng(0)
+        for plant_type in PLANT_MAP:
+            for trial in range(20):
+                kp, ki, kd = rng.uniform(-2.0, 20.0, 3) * [1.0, 1.0, 0.3]
+                if plant_type == "Personalized Plant":
+                    kd = 0.0
+                delay = (0.0, 0.05, 0.3)[trial % 3]
+                plant = get_plant(plant_type)
+                plant.set_delay(delay)
+                output = Output(ControllerPID(kp, ki, kd), plant, Input(), Sensor([1], [0.1, 1]))
+                stability = output.get_nyquist_stability()
+
+                # Reference: poles of the minimal closed loop, the delay as a high-order Pade approximation
+                loop = ctrl.minreal(ctrl.tf(*output.get_loop_polynomials()), verbose=False)
+                if delay:
+                    loop = loop * ctrl.tf(*ctrl.pade(delay, 14))
+                expected = bool(np.all(ctrl.poles(ctrl.feedback(loop, 1)).real < -1e-7))
+                self.assertEqual(stability["stable"], expected, f"{plant_type} {kp} {ki} {kd} {delay}")
+
+    def test_indentation_around_imaginary_axis_poles(self):
+        # Ball and beam (1/s^2) with the PID integrator: triple pole at the origin
+        output = Output(ControllerPID(2.0, 1.0, 0.5), get_plant("Ball and Beam"), Input(), Sensor())
+        contour = output.get_nyquist_contour()
+        np.testing.assert_array_equal(contour.get_stability()["indented_frequencies"], [0.0])
+        s, response, _ = contour.get_curve()
+        self.assertTrue(np.all(np.isfinite(response)))
+        self.assertGreater(np.max(np.abs(response)), 1e6)
+        self.assertEqual(s[0].imag, 0.0)
+        self.assertGreater(s[0].real, 0.0)
+        self.assertTrue(output.get_nyquist_stability()["stable"])
+
+        # Undamped mode at 2 rad/s: 1/(s^2 + 4) passes through -1 at sqrt(5) rad/s, undecided
+        contour = NyquistContour([1.0], [1.0, 0.0, 4.0])
+        stability = contour.get_stability()
+        np.testing.assert_allclose(stability["indented_frequencies"], [2.0])
+        self.assertIsNone(stability["stable"])
+        self.assertLess(stability["minimum_distance"], 1e-9)
+        s, _, _ = contour.get_curve()
+        self.assertGreater(np.min(np.abs(s - 2j)), 0.0)
+
+        # 1/(s (s^2 + 4)): indented at 0 and 2 rad/s, closed loop s^3 + 4s + 1 has two RHP poles
+        stability = NyquistContour([1.0], [1.0, 0.0, 4.0, 0.0]).get_stability()
+        np.testing.assert_allclose(stability["indented_frequencies"], [0.0, 2.0])
+        self.assertEqual(stability["closed_loop_rhp_poles"], 2)
+        self.assertFalse(stability["stable"])
+
+        # An open-loop unstable pole stabilized by feedback: N = -1, P = 1
+        stability = NyquistContour([3.0], [1.0, -1.0]).get_stability()
+        self.assertEqual((stability["encirclements"], stability["open_loop_rhp_poles"]), (-1, 1))
+        self.assertTrue(stability["stable"])
+
+    def test_adaptive_sampling_resolves_the_curve(self):
+        # Lightly damped resonance: the arc-length refinement adds points around the peak
+        contour = NyquistContour([1.0], [1.0, 0.002, 1.0])
+        s, response, _ = contour.get_curve()
+        steps = np.abs(np.diff(response))
+        distance = np.minimum(np.abs(1 + response[:-1]), np.abs(1 + response[1:]))
+        self.assertTrue(np.all(steps <= 0.05 * distance + 1e-12))
+        self.assertGreater(np.max(np.abs(response)), 400)
+        self.assertTrue(contour.get_stability()["stable"])
+
+        figure = Output(ControllerPID(20.0, 10.0, 0.1), get_plant("DC Motor Position Control"), Input(), Sensor()).plot_nyquist()
+        self.assertIsNotNone(figure)
@@ -0,0 +1,65 @@
+from unittest import TestCase
+import numpy as np
+from simulation_components.plant import get_plant
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.input import Input
+from simulation_components.sensor import Sensor
+from simulation_components.output import Output
+from simulation_components.metrics import compute_step_metrics
+from simulation_components.parameter_sweep import ParameterSweep
+
+class ParameterSweepTester(TestCase):
+
+    def setUp(self):
+        self.plant = get_plant("DC Motor Position Control")
+        self.pid = ControllerPID(2.0, 1.0, 0.5)
+        self.input = Input(1.0, 0.0, 1.0, 10.0, 0.01)
+        self.sensor = Sensor()
+        self.sweep = ParameterSweep(self.pid, self.plant, self.input, self.sensor)
+
+    def test_grid_point_matches_single_simulation(self):
+        self.assertIsNone(self.sweep.add_axis("Plant", "J", 0.5, 2.0, 4))
+        self.assertIsNone(self.sweep.add_axis("PID", "kd", 0.1, 1.0, 3))
+        self.assertIsNone(self.sweep.add_axis("Input", "final_value", 1.0, 3.0, 2))
+        result = self.sweep.run(workers=1)
+        self.assertEqual(result.metrics['overshoot'].shape, (4, 3, 2))
+
+        self.plant.set_parameters(J=result.axes[0].values[2])
+        self.pid.set_parameters(2.0, 1.0, result.axes[1].values[1])
+        self.input.set_parameters(1.0, 0.0, 3.0, 10.0, 0.01)
+        t, y = Output(self.pid, self.plant, self.input, self.sensor).get_step_response_data()
+        expected = compute_step_metrics(t, y, 1.0, 0.0, 3.0)
+        for name in ('overshoot', 'rise_time', 'settling_time'):
+            self.assertAlmostEqual(result.metrics[name][2, 1, 1], expected[name][0], places=6)
+
+    def test_streamed_chunks_match_across_workers(self):
+        self.sweep.add_axis("Plant", "J", 0.1, 10.0, 30, "Log")
+        self.sweep.add_axis("PID", "kp", 0.5, 20.0, 40)
+        progress = []
+        serial = self.sweep.run(workers=1, callback=lambda result: progress.append(result.get_progress()))
+        parallel = self.sweep.run(workers=2)
+        self.assertEqual(progress[-1], 1.0)
+        self.assertGreater(len(progress), 1)
+        self.assertTrue(np.all(np.diff(progress) > 0))
+        for name, values in serial.metrics.items():
+            self.assertTrue(np.array_equal(values, parallel.metrics[name], equal_nan=True))
+        self.assertTrue(np.array_equal(serial.stable, parallel.stable))
+
+        stopped = self.sweep.run(workers=1, callback=lambda result: False)
+        self.assertLess(stopped.get_progress(), 1.0)
+
+    def test_invalid_settings(self):
+        self.assertIsInstance(self.sweep.run(), str)
+        self.assertIsInstance(self.sweep.add_axis("Plant", "Numerator", 0.0, 1.0), str)
+        self.assertIsInstance(self.sweep.add_axis("PID", "kp", -1.0, 1.0, 5, "Log"), str)
+        self.assertIsInstance(self.sweep.add_axis("Input", "sample_time", 0.0, 0.1), str)
+        # 10 s sampled every 0.5 ms is past the sample budget of a single simulation
+        self.assertIsInstance(self.sweep.add_axis("Input", "sample_time", 0.0005, 0.01, 5, "Log"), str)
+        self.assertIsNone(self.sweep.add_axis("Input", "sample_time", 0.001, 0.01, 5, "Log"))
+        # Together with the sample time axis, a 100 s horizon needs more than the budget
+        self.assertIsInstance(self.sweep.add_axis("Input", "total_time", 10.0, 100.0, 3), str)
+        self.assertIsNone(self.sweep.add_axis("Input", "total_time", 5.0, 10.0, 3))
+        self.assertIsNone(self.sweep.add_axis("PID", "kp", 1.0, 2.0))
+        self.assertIsInstance(self.sweep.add_axis("PID", "kp", 1.0, 2.0), str)
+        self.plant.set_delay(0.1)
+        self.assertIsInstance(self.sweep.run(), str)
@@ -0,0 +1,87 @@
+from unittest import TestCase
+import numpy as np
+import control as ctrl
+from simulation_components.plant import get_plant, PLANT_MAP
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.input import Input
+from simulation_components.sensor import Sensor
+from simulation_components.output import Output
+from simulation_components.pole_zero_analysis import PoleZeroAnalysis, damping_and_natural_frequency
+from simulation_components.nyquist_contour import NyquistContour
+from simulation_components.time_horizon import suggest_time_parameters
+
+class PoleZeroAnalysisTester(TestCase):
+
+    def test_integrator_without_gain_is_dropped(self):
+        # Ki = 0 leaves the PID integrator state unobservable: a pole and a zero at the origin
+        for plant_type in PLANT_MAP:
+            kd = 0.0 if plant_type == "Personalized Plant" else 0.5
+            output = Output(ControllerPID(2.0, 0.0, kd), get_plant(plant_type), Input(), Sensor())
+            full = output.get_full_closed_loop()
+            minimal = output.get_closed_loop_transfer_function()
+            self.assertEqual(minimal.A.shape[0], full.A.shape[0] - 1, plant_type)
+            cancellations = output.get_pole_zero_analysis().get_cancellations()
+            self.assertEqual(len(cancellations), 1, plant_type)
+            self.assertTrue(cancellations[0]["removed"])
+
+            # Same response, and the loop is no longer flagged marginal by the extra pole
+            t = np.linspace(0.0, 5.0, 200)
+            np.testing.assert_allclose(ctrl.step_response(minimal, t).outputs, ctrl.step_response(full, t).outputs, atol=1e-9)
+            self.assertTrue(output.is_closed_loop_stable(), plant_type)
+            self.assertTrue(np.isfinite(output.get_sensitivity_peaks()["ms"]), plant_type)
+
+    def test_near_cancellation_tolerance(self):
+        # PID zero at -1.01 next to the closed-loop pole at -0.962 (4.8% apart)
+        output = Output(ControllerPID(20.0, 20.2, 0.0), get_plant("DC Motor Speed Control"), Input(), Sensor())
+        self.assertEqual(output.get_pole_zero_analysis().get_cancellations(), [])
+        self.assertEqual(output.get_closed_loop_transfer_function().A.shape[0], 3)
+
+        output.set_cancellation_tolerance(0.1)
+        cancellations = output.get_pole_zero_analysis().get_cancellations()
+        self.assertEqual(len(cancellations), 1)
+        self.assertAlmostEqual(cancellations[0]["zero"].real, -1.01)
+        self.assertAlmostEqual(cancellations[0]["distance"], 0.0477, places=4)
+        minimal = output.get_closed_loop_transfer_function()
+        self.assertEqual(minimal.A.shape[0], 2)
+        self.assertEqual(len(output.get_pole_zero_data()[0]), 2)
+
+        # The minimal model keeps the high-frequency gain
+        full = output.get_full_closed_loop()
+        self.assertAlmostEqual(abs(minimal(1e4j)) / abs(full(1e4j)), 1.0, places=6)
+
+    def test_conjugate_and_unstable_pairs(self):
+        # Complex pair cancelled together, the realization keeps the remaining dynamics
+        system = ctrl.tf(np.poly([-1 + 2.001j, -1 - 2.001j]) * 3.0, np.poly([-1 + 2j, -1 - 2j, -5.0]))
+        analysis = PoleZeroAnalysis(system, tolerance=1e-3)
+        self.assertEqual(len(analysis.get_cancellations()), 1)
+        minimal = analysis.get_minimal_realization()
+        np.testing.assert_allclose(ctrl.poles(minimal), [-5.0])
+        self.assertAlmostEqual(float(minimal(0.0).real), 3.0 / 5.0, places=9)
+
+        # A zero next to an unstable pole is reported but never hides the mode
+        unstable = PoleZeroAnalysis(ctrl.tf([1.0, -1.0001], np.poly([1.0, -2.0])), tolerance=1e-2)
+        self.assertFalse(unstable.get_cancellations()[0]["removed"])
+        self.assertEqual(len(ctrl.poles(unstable.get_minimal_realization())), 2)
+
+    def test_damping_annotations(self):
+        damping, natural_frequency = damping_and_natural_frequency([-3 + 4j, -2.0, 0.0])
+        np.testing.assert_allclose(damping[:2], [0.6, 1.0])
+        np.testing.assert_allclose(natural_frequency, [5.0, 2.0, 0.0])
+        self.assertTrue(np.isnan(damping[2]))
+
+        output = Output(ControllerPID(2.0, 0.0, 0.5), get_plant("DC Motor Position Control"), Input(), Sensor())
+        figure = output.plot_pole_zero()
+        texts = [text.get_text() for text in figure.axes[0].texts]
+        self.assertTrue(any(text.startswith('ζ=') for text in texts))
+        self.assertTrue(any('Minimal order: 3 of 4' in text for text in texts))
+
+    def test_analyses_share_the_cancellations(self):
+        # A stable pair 5e-7 apart cancels everywhere, an unstable one only if exact
+        for pole, cancelled in ((-0.01, True), (0.01, False)):
+            zeros, poles = [pole + 5e-7], [pole, -2.0]
+            system = ctrl.tf(np.poly(zeros), np.poly(poles))
+            order = 1 if cancelled else 2
+            self.assertEqual(len(ctrl.poles(PoleZeroAnalysis(system).get_minimal_realization())), order)
+            self.assertEqual(len(NyquistContour(np.poly(zeros), np.poly(poles)).poles), order)
+            horizon = suggest_time_parameters(np.array(poles), zeros)["total_time"]
+            self.assertEqual(horizon < 10.0, cancelled)
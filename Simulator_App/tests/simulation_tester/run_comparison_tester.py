@@ -0,0 +1,61 @@
+from unittest import TestCase
+import os
+import numpy as np
+from simulation_components.plant import get_plant
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.input import Input
+from simulation_components.sensor import Sensor
+from simulation_components.output import Output
+from simulation_components.run_comparison import RunComparison, COMPARISON_OMEGA
+from utils.file_utils import extract_project_from_file
+
+class RunComparisonTester(TestCase):
+
+    def setUp(self):
+        self.plant = get_plant("DC Motor Position Control")
+        self.input = Input(1.0, 0.0, 1.0, 10.0, 0.01)
+        self.comparison = RunComparison()
+        self.comparison.add_run("A", ControllerPID(2.0, 1.0, 0.5), self.plant, self.input, Sensor())
+        self.comparison.add_run("B", ControllerPID(5.0, 1.0, 0.5), self.plant, self.input, Sensor())
+
+    def test_runs_match_output(self):
+        run = self.comparison.get_runs()[1]
+        output = Output(ControllerPID(5.0, 1.0, 0.5), self.plant, self.input, Sensor())
+        t, expected = output.get_step_response_data()
+        step = self.comparison.get_run_data(run, "Step Response")
+        self.assertTrue(np.allclose(step["t"], t))
+        self.assertTrue(np.allclose(step["response"], expected))
+
+        frequency_response = output.get_closed_loop_frequency_response(COMPARISON_OMEGA)
+        bode = self.comparison.get_run_data(run, "Bode Plot")
+        self.assertTrue(np.allclose(bode["magnitude_db"], 20 * np.log10(np.abs(frequency_response))))
+
+        poles = self.comparison.get_run_data(run, "Pole-Zero Plot")["poles"]
+        self.assertTrue(np.allclose(np.sort_complex(poles), np.sort_complex(output.get_closed_loop_transfer_function().poles())))
+
+    def test_shared_factors_and_delta_computation(self):
+        for view in ("Step Response", "Bode Plot", "Pole-Zero Plot"):
+            self.assertIsNotNone(self.comparison.plot(view))
+        # One plant and one sensor model for both runs
+        self.assertEqual(self.comparison.computations["factor"], 2)
+        self.assertEqual(self.comparison.computations["Step Response"], 2)
+
+        # Pinned copies do not follow later edits of the components
+        self.plant.set_parameters(J=2.0, b=1.0, K=1.0, R=1.0, L=1.0)
+        self.comparison.add_run("C", ControllerPID(2.0, 1.0, 0.5), self.plant, self.input, Sensor())
+        self.comparison.plot("Step Response")
+        self.assertEqual(self.comparison.computations["factor"], 3)
+        self.assertEqual(self.comparison.computations["Step Response"], 3)
+
+        self.comparison.remove_run("C")
+        self.comparison.plot("Step Response")
+        self.assertEqual(self.comparison.computations["Step Response"], 3)
+        self.assertEqual(len(self.comparison.factor_cache), 2)
+        self.assertIsNotNone(self.comparison.add_run("A", ControllerPID(), self.plant, self.input, Sensor()))
+
+    def test_add_project_file(self):
+        project = extract_project_from_file(os.path.join(os.path.dirname(__file__), "../file_tester/DCMotorSpeedControlExample.txt"))
+        self.assertIsNone(self.comparison.add_project(project["Project"], project))
+        self.assertEqual(len(self.comparison.get_runs()), 3)
+        self.assertEqual(self.comparison.get_failed_runs("Step Response"), [])
+        self.assertTrue(extract_project_from_file("missing.txt").startswith("Error"))
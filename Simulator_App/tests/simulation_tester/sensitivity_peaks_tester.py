@@ -0,0 +1,63 @@
+from unittest import TestCase
+import numpy as np
+import control as ctrl
+from simulation_components.plant import get_plant, PLANT_MAP
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.input import Input
+from simulation_components.sensor import Sensor
+from simulation_components.output import Output, BODE_OMEGA
+from simulation_components.sensitivity_peaks import hinf_norm_batch, sensitivity_peaks_for_gains, HINF_TOLERANCE
+
+class SensitivityPeaksTester(TestCase):
+
+    def test_narrow_resonance_within_tolerance(self):
+        # Resonance of width 2e-4 rad/s between two points of the Bode grid
+        zeta, wn = 1e-4, 1.2345
+        system = ctrl.ss(ctrl.tf([wn ** 2], [1.0, 2 * zeta * wn, wn ** 2]))
+        exact = 1.0 / (2 * zeta * np.sqrt(1 - zeta ** 2))
+        result = hinf_norm_batch(system.A, system.B, system.C, system.D)
+        self.assertLessEqual(result["lower"][0], exact * (1 + 1e-12))
+        self.assertGreaterEqual(result["upper"][0], exact * (1 - 1e-12))
+        self.assertLessEqual(abs(result["norm"][0] - exact), HINF_TOLERANCE * exact)
+        self.assertAlmostEqual(result["frequency"][0], wn * np.sqrt(1 - 2 * zeta ** 2), places=4)
+        self.assertLess(np.max(np.abs(system(1j * BODE_OMEGA))), 0.5 * exact)
+
+        # Unstable systems have no finite norm
+        unstable = ctrl.ss(ctrl.tf([1.0], [1.0, -1.0]))
+        self.assertEqual(hinf_norm_batch(unstable.A, unstable.B, unstable.C, unstable.D)["norm"][0], np.inf)
+
+    def test_output_peaks_match_dense_grid(self):
+        omega = np.logspace(-3, 4, 20001)
+        for plant_type in PLANT_MAP:
+            kd = 0.0 if plant_type == "Personalized Plant" else 0.5
+            output = Output(ControllerPID(2.0, 1.0, kd), get_plant(plant_type), Input(), Sensor([1], [0.1, 1]))
+            peaks = output.get_sensitivity_peaks()
+            loop = output.get_open_loop_frequency_response(omega)
+            grid_ms = np.max(np.abs(1 / (1 + loop)))
+            grid_mt = np.max(np.abs(loop / (1 + loop)))
+            # The grid can only underestimate the peaks
+            self.assertGreaterEqual(peaks["ms"] * (1 + HINF_TOLERANCE), grid_ms, plant_type)
+            self.assertGreaterEqual(peaks["mt"] * (1 + HINF_TOLERANCE), grid_mt, plant_type)
+            self.assertAlmostEqual(peaks["ms"], grid_ms, places=3, msg=plant_type)
+            self.assertAlmostEqual(peaks["mt"], grid_mt, places=3, msg=plant_type)
+
+        delayed = get_plant("DC Motor Speed Control")
+        delayed.set_delay(0.1)
+        self.assertIsNone(Output(ControllerPID(), delayed, Input(), Sensor()).get_sensitivity_peaks())
+
+    def test_gain_sweep_batch(self):
+        output = Output(ControllerPID(2.0, 1.0, 0.5), get_plant("DC Motor Position Control"), Input(), Sensor())
+        loop = ctrl.series(output.get_open_loop_state_space(), output.sensor_object.get_state_space())
+        gains = np.array([0.5, 1.0, 2.0, 50.0])
+        sweep = sensitivity_peaks_for_gains(loop, gains)
+        self.assertAlmostEqual(sweep["ms"][1], output.get_sensitivity_peaks()["ms"])
+        for index in (0, 2):
+            output.pid_object.set_parameters(2.0 * gains[index], 1.0 * gains[index], 0.5 * gains[index])
+            self.assertAlmostEqual(sweep["ms"][index], output.get_sensitivity_peaks()["ms"], places=5)
+            self.assertAlmostEqual(sweep["mt"][index], output.get_sensitivity_peaks()["mt"], places=5)
+
+        # The loop scaled by 50 is unstable
+        output.pid_object.set_parameters(100.0, 50.0, 25.0)
+        self.assertFalse(output.is_closed_loop_stable())
+        self.assertEqual(sweep["ms"][3], np.inf)
+        self.assertTrue(np.isnan(sweep["ms_frequency"][3]))
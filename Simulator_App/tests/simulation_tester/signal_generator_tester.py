@@ -0,0 +1,100 @@
+from unittest import TestCase
+import os
+import tempfile
+import numpy as np
+from simulation_components.signal_generator import get_signal, SIGNAL_MAP
+from simulation_components.plant import get_plant
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.input import Input
+from simulation_components.sensor import Sensor
+from simulation_components.output import Output
+from utils.file_utils import save_simulation_config, validate_project_file, extract_signal_from_file
+
+class SignalGeneratorTester(TestCase):
+
+    def setUp(self):
+        self.t = np.linspace(0, 10, 1001)
+        self.directory = tempfile.mkdtemp()
+        # Waveform sampled faster than the simulation grid
+        self.file_t = np.linspace(0, 12, 20001)
+        self.file_v = np.sin(self.file_t) + 0.1 * self.file_t
+
+    def test_default_signals_are_valid(self):
+        for signal_type in SIGNAL_MAP:
+            if signal_type == "File":
+                continue
+            signal = get_signal(signal_type)
+            self.assertEqual(signal.validate(), "")
+            self.assertEqual(signal.generate(self.t).shape, self.t.shape)
+
+    def test_invalid_signal(self):
+        self.assertIsInstance(Input().set_signal("Sine", frequency=0.0), str)
+        self.assertIsInstance(Input().set_signal("File", file_path="missing.csv"), str)
+        with self.assertRaises(ValueError):
+            get_signal("Square")
+
+    def test_malformed_waveform_is_rejected(self):
+        # Empty, single-column and unordered files are refused before playback
+        contents = {"empty.csv": "", "header.csv": "time,value\n", "one_column.csv": "time\n0.0\n1.0\n",
+                    "unordered.csv": "0.0,1.0\n2.0,1.0\n1.0,1.0\n"}
+        for name, text in contents.items():
+            file_path = os.path.join(self.directory, name)
+            with open(file_path, "w") as file:
+                file.write(text)
+            self.assertIsInstance(Input().set_signal("File", file_path=file_path), str, name)
+            signal = get_signal("File")
+            signal.set_parameters(file_path=file_path)
+            with self.assertRaises(ValueError):
+                signal.generate(self.t)
+
+    def test_missing_waveform_falls_back_to_step(self):
+        # A project whose File signal lost its waveform still opens, with the Step input
+        file_path = os.path.join(self.directory, "wave.csv")
+        np.savetxt(file_path, np.column_stack((self.file_t, self.file_v)), delimiter=",")
+        project_path = os.path.join(self.directory, "project.txt")
+        plant = get_plant("DC Motor Speed Control")
+        save_simulation_config(project_path, ControllerPID().get_parameters(), plant.get_parameters(), Input().get_parameters(),
+                               Sensor().get_parameters(), plant_type_fallback=plant.name,
+                               signal_params={"type": "File", "file_path": file_path, "scale": 1})
+        self.assertEqual(extract_signal_from_file(project_path)["type"], "File")
+
+        os.remove(file_path)
+        self.assertEqual(validate_project_file(project_path), (True, "", ""))
+        warnings = []
+        self.assertEqual(extract_signal_from_file(project_path, warnings), {"type": "Step"})
+        self.assertIn("not found", warnings[0])
+
+    def test_prbs_levels(self):
+        signal = get_signal("PRBS")
+        signal.set_parameters(amplitude=2.0, bit_time=0.1, offset=1.0)
+        values = signal.generate(self.t)
+        self.assertEqual(set(np.unique(values)), {-1.0, 3.0})
+
+    def test_csv_playback_streams_in_chunks(self):
+        file_path = os.path.join(self.directory, "wave.csv")
+        np.savetxt(file_path, np.column_stack((self.file_t, self.file_v)), delimiter=",", header="time,value", comments="")
+        signal = get_signal("File")
+        signal.set_parameters(file_path=file_path, scale=2.0)
+        self.assertEqual(signal.validate(), "")
+        chunks = list(signal.iter_chunks(self.t, chunk_size=100))
+        self.assertEqual(len(chunks), 11)
+        self.assertTrue(np.allclose(np.concatenate(chunks), 2.0 * np.interp(self.t, self.file_t, self.file_v)))
+
+    def test_binary_playback_is_memory_mapped(self):
+        bin_path = os.path.join(self.directory, "wave.bin")
+        np.column_stack((self.file_t, self.file_v)).astype(np.float64).tofile(bin_path)
+        npy_path = os.path.join(self.directory, "wave.npy")
+        np.save(npy_path, np.column_stack((self.file_t, self.file_v)))
+        expected = np.interp(self.t, self.file_t, self.file_v)
+        for file_path in (bin_path, npy_path):
+            signal = get_signal("File")
+            signal.set_parameters(file_path=file_path)
+            self.assertTrue(np.allclose(signal.generate(self.t), expected))
+
+    def test_reference_response(self):
+        plant = get_plant("DC Motor Speed Control")
+        input_params = Input(1, 0, 1, 10, 0.01)
+        self.assertIsNone(input_params.set_signal("Sine", amplitude=1.0, frequency=0.2))
+        t, reference, response = Output(ControllerPID(), plant, input_params, Sensor()).get_reference_response_data()
+        self.assertTrue(np.allclose(reference, np.sin(2 * np.pi * 0.2 * t)))
+        self.assertEqual(response.shape, t.shape)
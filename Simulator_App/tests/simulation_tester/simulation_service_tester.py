@@ -0,0 +1,94 @@
+from unittest import TestCase
+import asyncio
+import io
+import json
+import os
+import subprocess
+import sys
+import numpy as np
+from simulation_components.plant import get_plant
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.input import Input
+from simulation_components.sensor import Sensor
+from simulation_components.output import Output
+from simulation_components.simulation_service import SimulationService, project_hash
+
+PROJECT = {
+    "Plant type": "DC Motor Position Control",
+    "PID": {"kp": 2.0, "ki": 1.0, "kd": 0.5},
+    "Plant": {"J": 1.0, "b": 1.0, "K": 1.0, "R": 1.0, "L": 1.0},
+    "Input": {"step_time": 1.0, "initial_value": 0.0, "final_value": 1.0, "total_time": 10.0, "sample_time": 0.01},
+    "Sensor": {"Numerator": "1", "Denominator": "1"}
+}
+
+async def send_request(port, method, path, project=None, accept=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(project).encode() if project is not None else b""
+    headers = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n"
+    if accept:
+        headers += f"Accept: {accept}\r\n"
+    writer.write((headers + "\r\n").encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), payload
+
+class SimulationServiceTester(TestCase):
+
+    def run_with_service(self, scenario):
+        async def main():
+            service = SimulationService(workers=1)
+            port = await service.start(port=0)
+            try:
+                return await scenario(service, port)
+            finally:
+                await service.close()
+        return asyncio.run(main())
+
+    def test_step_response_matches_output(self):
+        async def scenario(service, port):
+            return await send_request(port, "POST", "/step", PROJECT)
+        status, payload = self.run_with_service(scenario)
+        self.assertEqual(status, 200)
+        result = json.loads(payload)
+
+        plant = get_plant("DC Motor Position Control")
+        t, expected = Output(ControllerPID(2.0, 1.0, 0.5), plant, Input(1.0, 0.0, 1.0, 10.0, 0.01), Sensor()).get_step_response_data()
+        self.assertTrue(np.allclose(result["t"], t))
+        self.assertTrue(np.allclose(result["response"], expected))
+        self.assertIn("overshoot", result)
+
+    def test_identical_concurrent_requests_are_coalesced(self):
+        async def scenario(service, port):
+            responses = await asyncio.gather(*(send_request(port, "POST", "/margins", PROJECT) for _ in range(6)))
+            binary = await send_request(port, "POST", "/bode", PROJECT, accept="application/octet-stream")
+            metrics = await send_request(port, "GET", "/metrics")
+            return responses, binary, service.computations, json.loads(metrics[1])
+        responses, binary, computations, metrics = self.run_with_service(scenario)
+        self.assertEqual({status for status, _ in responses}, {200})
+        self.assertEqual(len({payload for _, payload in responses}), 1)
+        self.assertEqual(computations, 2)
+        self.assertEqual(metrics["endpoints"]["/margins"]["requests"], 6)
+        self.assertEqual(metrics["endpoints"]["/margins"]["coalesced"], 5)
+        arrays = np.load(io.BytesIO(binary[1]))
+        self.assertEqual(set(arrays.keys()), {"omega", "magnitude_db", "phase_deg"})
+
+        reordered = dict(reversed(list(PROJECT.items())))
+        self.assertEqual(project_hash("/step", PROJECT), project_hash("/step", reordered))
+        self.assertNotEqual(project_hash("/step", PROJECT), project_hash("/bode", PROJECT))
+
+    def test_invalid_requests(self):
+        async def scenario(service, port):
+            return [await send_request(port, "POST", "/step", {**PROJECT, "Plant type": "Unknown"}),
+                    await send_request(port, "POST", "/step", {**PROJECT, "Input": {**PROJECT["Input"], "sample_time": 0.0}}),
+                    await send_request(port, "GET", "/step"),
+                    await send_request(port, "POST", "/unknown", PROJECT)]
+        statuses = [status for status, _ in self.run_with_service(scenario)]
+        self.assertEqual(statuses, [400, 400, 405, 404])
+
+    def test_service_runs_without_pyqt(self):
+        code = "import sys, simulation_components.simulation_service; print(any(m.startswith('PyQt5') for m in sys.modules))"
+        root = os.path.join(os.path.dirname(__file__), "..", "..")
+        output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True)
+        self.assertEqual(output.stdout.strip(), "False")
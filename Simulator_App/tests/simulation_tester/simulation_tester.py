@@ -0,0 +1,54 @@
+import unittest
+from tests.simulation_tester import nonlinear_plant_tester as NonlinearTester
+from tests.simulation_tester import loop_simulator_tester as LoopTester
+from tests.simulation_tester import signal_generator_tester as SignalTester
+from tests.simulation_tester import monte_carlo_tester as MonteCarloTester
+from tests.simulation_tester import stability_margins_tester as MarginsTester
+from tests.simulation_tester import model_reduction_tester as ReductionTester
+from tests.simulation_tester import parameter_sweep_tester as SweepTester
+from tests.simulation_tester import simulation_service_tester as ServiceTester
+from tests.simulation_tester import instrumentation_tester as InstrumentationTester
+from tests.simulation_tester import run_comparison_tester as ComparisonTester
+from tests.simulation_tester import data_export_tester as ExportTester
+from tests.simulation_tester import symbolic_loop_tester as SymbolicTester
+from tests.simulation_tester import stability_map_tester as StabilityMapTester
+from tests.simulation_tester import time_horizon_tester as TimeHorizonTester
+from tests.simulation_tester import divergence_tester as DivergenceTester
+from tests.simulation_tester import modal_response_tester as ModalResponseTester
+from tests.simulation_tester import loop_signals_tester as LoopSignalsTester
+from tests.simulation_tester import frequency_response_tester as FrequencyResponseTester
+from tests.simulation_tester import sensitivity_peaks_tester as SensitivityPeaksTester
+from tests.simulation_tester import nyquist_contour_tester as NyquistContourTester
+from tests.simulation_tester import pole_zero_analysis_tester as PoleZeroAnalysisTester
+from tests.simulation_tester import dependency_graph_tester as DependencyGraphTester
+
+class SimulationTester:
+    def run_all_tests(self, verbosity=2):
+        loader = unittest.TestLoader()
+        suite = unittest.TestSuite()
+
+        suite.addTests(loader.loadTestsFromTestCase(NonlinearTester.NonlinearPlantTester))
+        suite.addTests(loader.loadTestsFromTestCase(LoopTester.LoopSimulatorTester))
+        suite.addTests(loader.loadTestsFromTestCase(SignalTester.SignalGeneratorTester))
+        suite.addTests(loader.loadTestsFromTestCase(MonteCarloTester.MonteCarloTester))
+        suite.addTests(loader.loadTestsFromTestCase(MarginsTester.StabilityMarginsTester))
+        suite.addTests(loader.loadTestsFromTestCase(ReductionTester.ModelReductionTester))
+        suite.addTests(loader.loadTestsFromTestCase(SweepTester.ParameterSweepTester))
+        suite.addTests(loader.loadTestsFromTestCase(ServiceTester.SimulationServiceTester))
+        suite.addTests(loader.loadTestsFromTestCase(InstrumentationTester.InstrumentationTester))
+        suite.addTests(loader.loadTestsFromTestCase(ComparisonTester.RunComparisonTester))
+        suite.addTests(loader.loadTestsFromTestCase(ExportTester.DataExportTester))
+        suite.addTests(loader.loadTestsFromTestCase(SymbolicTester.SymbolicLoopTester))
+        suite.addTests(loader.loadTestsFromTestCase(StabilityMapTester.StabilityMapTester))
+        suite.addTests(loader.loadTestsFromTestCase(TimeHorizonTester.TimeHorizonTester))
+        suite.addTests(loader.loadTestsFromTestCase(DivergenceTester.DivergenceTester))
+        suite.addTests(loader.loadTestsFromTestCase(ModalResponseTester.ModalResponseTester))
+        suite.addTests(loader.loadTestsFromTestCase(LoopSignalsTester.LoopSignalsTester))
+        suite.addTests(loader.loadTestsFromTestCase(FrequencyResponseTester.FrequencyResponseTester))
+        suite.addTests(loader.loadTestsFromTestCase(SensitivityPeaksTester.SensitivityPeaksTester))
+        suite.addTests(loader.loadTestsFromTestCase(NyquistContourTester.NyquistContourTester))
+        suite.addTests(loader.loadTestsFromTestCase(PoleZeroAnalysisTester.PoleZeroAnalysisTester))
+        suite.addTests(loader.loadTestsFromTestCase(DependencyGraphTester.DependencyGraphTester))
+
+        runner = unittest.TextTestRunner(verbosity=verbosity)
+        runner.run(suite)
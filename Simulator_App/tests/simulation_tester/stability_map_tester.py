@@ -0,0 +1,81 @@
+from unittest import TestCase
+import time
+import numpy as np
+from simulation_components.plant import get_plant, PLANT_MAP
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.sensor import Sensor
+from simulation_components.input import Input
+from simulation_components.output import Output
+from simulation_components.symbolic_loop import symbolic_closed_loop_coefficients
+from simulation_components.stability_map import StabilityMap, StabilityMapResult, routh_hurwitz_stable
+
+class StabilityMapTester(TestCase):
+
+    def test_routh_hurwitz_matches_roots(self):
+        rng = np.random.default_rng(0)
+        for plant_type in PLANT_MAP:
+            plant = get_plant(plant_type)
+            kp, ki, kd = rng.uniform(-5.0, 20.0, (3, 500))
+            _, denominators = symbolic_closed_loop_coefficients(plant, Sensor(), kp, ki, kd)
+            expected = [np.all(np.roots(np.trim_zeros(d, 'f')).real < 0) for d in denominators]
+            np.testing.assert_array_equal(routh_hurwitz_stable(denominators), expected, err_msg=plant_type)
+
+    def test_reduced_degree_and_marginal_polynomials(self):
+        # s^2 + 3s + 2 with a vanishing leading term, s^2 + 1 on the imaginary axis, s^2 - 1
+        polynomials = [[0.0, 1.0, 3.0, 2.0], [0.0, 1.0, 0.0, 1.0], [0.0, 1.0, 0.0, -1.0], [-1.0, -2.0, -2.0, -1.0]]
+        np.testing.assert_array_equal(routh_hurwitz_stable(polynomials), [True, False, False, True])
+
+    def test_grid_500x500_and_current_point(self):
+        pid = ControllerPID(2.0, 1.0, 0.5)
+        stability_map = StabilityMap(pid, get_plant("DC Motor Position Control"), Sensor())
+        self.assertIsNotNone(stability_map.add_axis("gain", 0.0, 20.0, 500))
+        self.assertIsNone(stability_map.add_axis("kp", 0.0, 20.0, 500))
+        self.assertIsNone(stability_map.add_axis("ki", 0.0, 20.0, 500))
+        self.assertIsNotNone(stability_map.add_axis("kp", 0.0, 1.0, 10))
+
+        start = time.perf_counter()
+        result = stability_map.compute()
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertIsInstance(result, StabilityMapResult)
+        self.assertEqual(result.stable.shape, (500, 500))
+        self.assertEqual(result.current, {"kp": 2.0, "ki": 1.0, "kd": 0.5})
+        self.assertTrue(result.current_stable)
+
+        # Spot check grid points against the poles of the closed loop
+        for i, j in [(0, 0), (10, 400), (250, 250), (499, 3)]:
+            kp, ki = result.axes[0].values[i], result.axes[1].values[j]
+            numerator, denominator = symbolic_closed_loop_coefficients(stability_map.plant_object, Sensor(), kp, ki, 0.5)
+            # Factors s shared with the numerator cancel (the PID integrator when ki = 0)
+            common = min(len(c) - len(np.trim_zeros(c, 'b')) for c in (numerator[0], denominator[0]))
+            polynomial = np.trim_zeros(denominator[0][:len(denominator[0]) - common], 'f')
+            self.assertEqual(result.stable[i, j], np.all(np.roots(polynomial).real < 0))
+        result.plot()
+
+    def test_three_dimensional_grid_slices(self):
+        stability_map = StabilityMap(ControllerPID(2.0, 1.0, 0.5), get_plant("DC Motor Speed Control"), Sensor())
+        for name in ("kp", "ki", "kd"):
+            stability_map.add_axis(name, 0.0, 5.0, 21)
+        result = stability_map.compute()
+        self.assertEqual(result.stable.shape, (21, 21, 21))
+        self.assertEqual(result.get_default_slice(), 2)
+        np.testing.assert_array_equal(result.get_slice(), result.stable[:, :, 2])
+        result.plot(10)
+
+    def test_integrator_cancelled_without_ki(self):
+        # Ki = 0: the PID integrator cancels, P and PD designs are judged on the remaining poles
+        for plant_type in ("DC Motor Speed Control", "Ball and Beam"):
+            pid = ControllerPID(2.0, 0.0, 0.5)
+            plant = get_plant(plant_type)
+            stability_map = StabilityMap(pid, plant, Sensor())
+            stability_map.add_axis("kp", 0.1, 20.0, 40)
+            stability_map.add_axis("kd", 0.1, 5.0, 40)
+            result = stability_map.compute()
+            self.assertGreater(result.get_stable_fraction(), 0.5, plant_type)
+            for i, j in [(0, 0), (5, 30), (39, 39)]:
+                kp, kd = result.axes[0].values[i], result.axes[1].values[j]
+                loop = Output(ControllerPID(kp, 0.0, kd), plant, Input(), Sensor())
+                self.assertEqual(result.stable[i, j], loop.is_closed_loop_stable(), f"{plant_type} {kp} {kd}")
+
+            expected = Output(pid, plant, Input(), Sensor()).get_step_response_result()["stable"]
+            self.assertTrue(expected, plant_type)
+            self.assertEqual(result.current_stable, expected, plant_type)
@@ -0,0 +1,40 @@
+from unittest import TestCase
+import numpy as np
+import control as ctrl
+from simulation_components.plant import get_plant
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.sensor import Sensor
+from simulation_components.stability_margins import StabilityMarginAnalyzer
+
+class StabilityMarginsTester(TestCase):
+
+    def setUp(self):
+        self.plant = get_plant("DC Motor Position Control")
+        self.pid = ControllerPID(2.0, 1.0, 0.5)
+        self.sensor = Sensor([1], [0.1, 1])
+        self.analyzer = StabilityMarginAnalyzer(self.pid, self.plant, self.sensor)
+
+    def test_margins_match_control_library(self):
+        margins = self.analyzer.get_margins()
+        loop = ctrl.series(self.pid.get_transfer_function(), self.plant.get_transfer_function(), self.sensor.get_transfer_function())
+        gain_margin, phase_margin, phase_crossover, gain_crossover = ctrl.margin(loop)
+        self.assertAlmostEqual(margins["gain_margin"], gain_margin, places=8)
+        self.assertAlmostEqual(margins["phase_margin"], phase_margin, places=8)
+        self.assertAlmostEqual(margins["phase_crossover"], phase_crossover, places=8)
+        self.assertAlmostEqual(margins["gain_crossover"], gain_crossover, places=8)
+
+    def test_gain_sweep_matches_scaled_controller(self):
+        gains = np.array([0.5, 1.0, 1.3])
+        sweep = self.analyzer.get_margins_for_gains(gains)
+        for index, gain in enumerate(gains):
+            scaled = StabilityMarginAnalyzer(ControllerPID(2.0 * gain, 1.0 * gain, 0.5 * gain), self.plant, self.sensor).get_margins()
+            self.assertAlmostEqual(sweep["gain_margin"][index], scaled["gain_margin"], places=8)
+            self.assertAlmostEqual(sweep["phase_margin"][index], scaled["phase_margin"], places=6)
+
+    def test_delay_reduces_phase_margin(self):
+        margins = self.analyzer.get_margins()
+        self.plant.set_delay(0.05)
+        delayed = self.analyzer.get_margins()
+        self.assertAlmostEqual(delayed["gain_crossover"], margins["gain_crossover"], places=8)
+        expected = margins["phase_margin"] - np.degrees(0.05 * margins["gain_crossover"])
+        self.assertAlmostEqual(delayed["phase_margin"], expected, places=6)
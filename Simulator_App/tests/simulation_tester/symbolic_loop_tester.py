@@ -0,0 +1,51 @@
+from unittest import TestCase
+from numbers import Real
+import numpy as np
+from simulation_components.plant import PLANT_MAP, get_plant
+from simulation_components.sensor import Sensor
+from simulation_components.batch_simulator import closed_loop_coefficients, stack_coefficients
+from simulation_components.symbolic_loop import symbolic_closed_loop_coefficients, get_closed_loop_kernel
+
+class SymbolicLoopTester(TestCase):
+
+    def setUp(self):
+        self.sensor = Sensor("1", "0.01,1")
+        self.rng = np.random.default_rng(0)
+
+    def test_kernels_match_polynomial_products(self):
+        batch = 200
+        kp, ki, kd = self.rng.uniform(0.0, 5.0, (3, batch))
+        for plant_type in PLANT_MAP:
+            plant = get_plant(plant_type)
+            if plant_type == "Personalized Plant":
+                plant.set_parameters(Numerator="1,3,4", Denominator="1,5,2,1")
+            values = {name: value * self.rng.uniform(0.5, 2.0, batch)
+                      for name, value in plant.get_parameters().items() if isinstance(value, Real)}
+
+            numerators, denominators = symbolic_closed_loop_coefficients(plant, self.sensor, kp, ki, kd, **values)
+            plant_num, plant_den = plant.get_coefficients(**values)
+            expected_num, expected_den = closed_loop_coefficients(stack_coefficients(plant_num, batch), stack_coefficients(plant_den, batch),
+                                                                  kp, ki, kd, *self.sensor.get_coefficients())
+            self.assertEqual(numerators.shape, expected_num.shape, plant_type)
+            self.assertTrue(np.allclose(numerators, expected_num), plant_type)
+            self.assertTrue(np.allclose(denominators, expected_den), plant_type)
+
+    def test_kernel_cache(self):
+        plant = get_plant("DC Motor Speed Control")
+        kernel = get_closed_loop_kernel(plant, self.sensor)
+        plant.set_parameters(J=2.0, b=1.0, K=1.0, R=1.0, L=1.0)
+        self.assertIs(get_closed_loop_kernel(plant, self.sensor), kernel)
+        self.assertIsNot(get_closed_loop_kernel(plant, Sensor()), kernel)
+
+        personalized = get_plant("Personalized Plant")
+        personalized.set_parameters(Numerator="1", Denominator="1,1")
+        first = get_closed_loop_kernel(personalized, self.sensor)
+        personalized.set_parameters(Numerator="2", Denominator="3,1")
+        self.assertIs(get_closed_loop_kernel(personalized, self.sensor), first)
+        personalized.set_parameters(Numerator="1", Denominator="1,1,1")
+        self.assertIsNot(get_closed_loop_kernel(personalized, self.sensor), first)
+
+        # Scalar gains and parameters give a single closed loop
+        numerators, denominators = symbolic_closed_loop_coefficients(plant, self.sensor, 1.0, 0.0, 0.0)
+        self.assertEqual(numerators.shape[0], 1)
+        self.assertEqual(denominators.shape[0], 1)
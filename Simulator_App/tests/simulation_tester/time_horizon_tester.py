@@ -0,0 +1,76 @@
+from unittest import TestCase
+import numpy as np
+from simulation_components.plant import get_plant, PLANT_MAP
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.input import Input, MAX_SAMPLES
+from simulation_components.sensor import Sensor
+from simulation_components.output import Output
+from simulation_components.metrics import compute_step_metrics
+from simulation_components.time_horizon import suggest_time_parameters, mode_settling_time
+from simulation_components.pole_zero_analysis import cancel_common_roots
+
+class TimeHorizonTester(TestCase):
+
+    def test_auto_parameters_settle_and_pass_input_validation(self):
+        for plant_type in PLANT_MAP:
+            for pid in (ControllerPID(), ControllerPID(2.0, 1.0, 0.5)):
+                input_params = Input(1.0, 0.0, 1.0, 10.0, 0.01)
+                output = Output(pid, get_plant(plant_type), input_params, Sensor())
+                time_params = output.get_auto_time_parameters()
+                self.assertIsNone(input_params.set_parameters(1.0, 0.0, 1.0, time_params["total_time"], time_params["sample_time"]), plant_type)
+
+                # The curve ends inside the settling band
+                t, response = output.get_step_response_data()
+                settling_time = compute_step_metrics(t, response, 1.0, 0.0, 1.0)["settling_time"][0]
+                self.assertLess(1.0 + settling_time, time_params["total_time"], plant_type)
+
+    def test_motor_position_example_skips_parasitic_pole(self):
+        plant = get_plant("DC Motor Position Control")
+        plant.set_parameters(J=3.2284e-06, b=3.5077e-06, K=0.0274, R=4.0, L=2.75e-06)
+        output = Output(ControllerPID(21.0, 500.0, 0.25), plant, Input(0.0, 0.0, 1.0, 0.15, 1e-5), Sensor())
+        t, response = output.get_step_response_data()
+
+        # The electrical pole near -1.5e6 rad/s does not set the sample time
+        time_params = output.get_auto_time_parameters()
+        self.assertLessEqual(time_params["total_time"] / time_params["sample_time"], MAX_SAMPLES / 4)
+
+        # Same curve as the finely sampled run
+        output.input_params.set_parameters(0.0, 0.0, 1.0, time_params["total_time"], time_params["sample_time"])
+        t_auto, response_auto = output.get_step_response_data()
+        self.assertLess(np.max(np.abs(response_auto - np.interp(t_auto, t, response))), 1e-3)
+
+    def test_unstable_marginal_and_cancelled_poles(self):
+        unstable = suggest_time_parameters(np.array([0.5, -10.0]), step_time=0.0)
+        self.assertAlmostEqual(unstable["total_time"], 14.0)
+        marginal = suggest_time_parameters(np.array([2j, -2j, -1.0]))
+        self.assertGreaterEqual(marginal["total_time"], 5 * np.pi)
+
+        # A pole cancelled by a zero does not set the horizon
+        poles = np.array([-0.01, -1.0])
+        np.testing.assert_allclose(cancel_common_roots(poles, [-0.01 + 1e-7])[0], [-1.0])
+        self.assertLess(suggest_time_parameters(poles, [-0.01])["total_time"], 10.0)
+
+        # Stiff loops are clipped to the sample budget
+        stiff = suggest_time_parameters(np.array([-0.01, -1e5]))
+        self.assertLessEqual(stiff["total_time"] / stiff["sample_time"], MAX_SAMPLES)
+
+        # Transport delays lengthen the horizon and bound the sample time
+        delayed = suggest_time_parameters(np.array([-1.0]), delay=0.5)
+        self.assertLessEqual(delayed["sample_time"], 0.5 / 20)
+        self.assertGreater(delayed["total_time"], suggest_time_parameters(np.array([-1.0]))["total_time"])
+
+    def test_repeated_poles_stretch_the_horizon(self):
+        # Default PID on the speed loop: triple closed-loop pole at -1
+        input_params = Input(1.0, 0.0, 1.0, 30.0, 0.001)
+        output = Output(ControllerPID(1.0, 1.0, 1.0), get_plant("DC Motor Speed Control"), input_params, Sensor())
+        t, response = output.get_step_response_data()
+        settling_time = compute_step_metrics(t, response, 1.0, 0.0, 1.0)["settling_time"][0]
+        time_params = output.get_auto_time_parameters()
+        self.assertLess(1.0 + settling_time, time_params["total_time"])
+
+        # The t^2 e^-t envelope of a triple pole needs longer than a simple pole
+        self.assertAlmostEqual(mode_settling_time(1.0, 1), np.log(50.0))
+        t = mode_settling_time(2.0, 3)
+        self.assertAlmostEqual(t**2 * np.exp(-2.0 * t) * 2.0**2 / 2.0, 0.02)
+        self.assertGreater(suggest_time_parameters(np.array([-1.0, -1.0, -1.0]))["total_time"],
+                           suggest_time_parameters(np.array([-1.0]))["total_time"] * 1.5)
@@ -0,0 +1,221 @@
+# Standard library imports
+from collections import OrderedDict
+
+# Third-party imports
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, Qt, pyqtSignal
+from PyQt5.QtGui import QPixmap
+
+# Local application imports
+from utils.input_utils import render_equation_png
+
+# Quiet time after the last edit before a preview is rendered
+DEBOUNCE_MS = 150
+
+# Rendered equations kept in memory, shared by every preview
+CACHE_SIZE = 64
+
+_render_cache = OrderedDict()
+_render_pool = None
+
+
+def _get_render_pool():
+    """
+    Return the thread pool shared by every preview.
+    A single thread is enough: render_equation_png serializes the renders anyway, as mathtext
+    is not safe to run concurrently (the Simulator labels still render in the GUI thread).
+    Args:
+        None
+    Returns:
+        QThreadPool: The render thread pool
+    """
+    global _render_pool
+    if _render_pool is None:
+        _render_pool = QThreadPool()
+        _render_pool.setMaxThreadCount(1)
+    return _render_pool
+
+
+class _EquationRenderJob(QRunnable):
+    def __init__(self, preview, generation, equation, fontsize, dpi):
+        """
+        Render one equation in the worker thread.
+        Args:
+            preview (EquationPreview): Preview that requested the render
+            generation (int): Request number, used to drop superseded renders
+            equation (str): The equation in LaTeX format
+            fontsize (int): Font size for the equation
+            dpi (int): Resolution of the image
+        Returns:
+            None
+        """
+        super().__init__()
+        self.preview = preview
+        self.generation = generation
+        self.equation = equation
+        self.fontsize = fontsize
+        self.dpi = dpi
+
+    def run(self):
+        """
+        Render the equation unless a newer request was made meanwhile.
+        Args:
+            None
+        Returns:
+            None
+        """
+        try:
+            if not self.preview.is_current(self.generation):
+                return
+            try:
+                png = render_equation_png(self.equation, self.fontsize, self.dpi)
+            except Exception as e:
+                self.preview.failed.emit(self.generation, str(e))
+                return
+            self.preview.rendered.emit(self.generation, self.equation, png)
+        except RuntimeError:
+            # The preview was deleted (dialog closed) before the render finished
+            pass
+
+
+class EquationPreview(QObject):
+    """
+    Debounced LaTeX preview of a QLabel.
+
+    Every request restarts a short timer, so a burst of keystrokes renders only the last
+    equation. Rendering runs in a worker thread and the pixmap is built back in the GUI
+    thread; results of requests that were superseded in the meantime are dropped.
+    """
+    rendered = pyqtSignal(int, str, bytes)
+    failed = pyqtSignal(int, str)
+
+    def __init__(self, label, fontsize=10, dpi=200, debounce_ms=DEBOUNCE_MS):
+        """
+        Attach a preview to a label.
+        Args:
+            label (QLabel): Label that displays the equation
+            fontsize (int): Font size for the equation
+            dpi (int): Resolution of the image
+            debounce_ms (int): Quiet time after the last request before rendering
+        Returns:
+            None
+        """
+        super().__init__(label)
+        self.label = label
+        self.fontsize = fontsize
+        self.dpi = dpi
+        self.generation = 0
+        self.equation = None
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(debounce_ms)
+        self.timer.timeout.connect(self.start_render)
+
+        # Queued connections: the signals are emitted from the worker thread
+        self.rendered.connect(self.on_rendered, Qt.QueuedConnection)
+        self.failed.connect(self.on_failed, Qt.QueuedConnection)
+
+    def request(self, equation):
+        """
+        Schedule the render of an equation, superseding any pending one.
+        Args:
+            equation (str): The equation in LaTeX format
+        Returns:
+            None
+        """
+        self.generation += 1
+        self.equation = equation
+        png = _render_cache.get((equation, self.fontsize, self.dpi))
+        if png is not None:
+            _render_cache.move_to_end((equation, self.fontsize, self.dpi))
+            self.timer.stop()
+            self.show_png(png)
+        else:
+            self.timer.start()
+
+    def flush(self):
+        """
+        Start the pending render now instead of waiting for the debounce timer.
+        Args:
+            None
+        Returns:
+            None
+        """
+        if self.timer.isActive():
+            self.timer.stop()
+            self.start_render()
+
+    def cancel(self):
+        """
+        Drop the pending and running renders.
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.generation += 1
+        self.timer.stop()
+
+    def is_current(self, generation):
+        """
+        Check whether a render still matches the latest request.
+        Args:
+            generation (int): Request number of the render
+        Returns:
+            bool: True if no newer request was made
+        """
+        return generation == self.generation
+
+    def start_render(self):
+        """
+        Hand the latest equation to the render thread.
+        Args:
+            None
+        Returns:
+            None
+        """
+        _get_render_pool().start(_EquationRenderJob(self, self.generation, self.equation, self.fontsize, self.dpi))
+
+    def on_rendered(self, generation, equation, png):
+        """
+        Cache a rendered equation and display it if it is still current.
+        Args:
+            generation (int): Request number of the render
+            equation (str): The rendered equation
+            png (bytes): PNG image of the equation
+        Returns:
+            None
+        """
+        _render_cache[(equation, self.fontsize, self.dpi)] = png
+        if len(_render_cache) > CACHE_SIZE:
+            _render_cache.popitem(last=False)
+        if self.is_current(generation):
+            self.show_png(png)
+
+    def on_failed(self, generation, message):
+        """
+        Show an error in the label if the current equation cannot be rendered.
+        Args:
+            generation (int): Request number of the render
+            message (str): Error raised by the renderer
+        Returns:
+            None
+        """
+        if self.is_current(generation):
+            self.label.setText("Error: Invalid input")
+
+    def show_png(self, png):
+        """
+        Display a rendered equation scaled to the label.
+        Args:
+            png (bytes): PNG image of the equation
+        Returns:
+            None
+        """
+        pixmap = QPixmap()
+        pixmap.loadFromData(png)
+        pixmap = pixmap.scaled(self.label.width(),
+                               self.label.height(),
+                               Qt.KeepAspectRatio,
+                               Qt.SmoothTransformation)
+        self.label.setPixmap(pixmap)
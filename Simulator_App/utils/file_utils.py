@@ -10,6 +10,7 @@ from PyQt5.QtCore import QStandardPaths
 # Local application imports
 from simulation_components.plant import get_plant
 from simulation_components.sensor import Sensor
+from simulation_components.signal_generator import get_signal
 
 
 MIN_SAMPLES = 10
@@ -46,7 +47,7 @@ def create_project_file(project_name, plant_type, project_path, pid_params, plan
     
     return file_to_save
 
-def save_simulation_config(file_path, pid_params, plant_params, input_params, sensor_params, plant_type_fallback=None, project_name=None):
+def save_simulation_config(file_path, pid_params, plant_params, input_params, sensor_params, plant_type_fallback=None, project_name=None, delay_params=None, signal_params=None):
     """
     Saves the current simulator configuration to a text file.
     If the file already contains 'Project:' and 'Plant type:' lines, they are reused.
@@ -60,6 +61,8 @@ def save_simulation_config(file_path, pid_params, plant_params, input_params, se
         sensor_params (dict): Sensor parameters.
         plant_type_fallback (str, optional): Fallback plant type if it cannot be read from the file.
         project_name (str, optional): Project name to use (for Save As). If None, extracted from file.
+        delay_params (dict, optional): Transport delays {'plant': float, 'sensor': float}. Omitted if None.
+        signal_params (dict, optional): Reference signal type and parameters. Omitted if None.
     """
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
@@ -98,6 +101,10 @@ def save_simulation_config(file_path, pid_params, plant_params, input_params, se
             f.write(f"Plant: {plant_params}\n")
             f.write(f"Input: {input_params}\n")
             f.write(f"Sensor: {sensor_params}\n")
+            if delay_params is not None:
+                f.write(f"Delay: {delay_params}\n")
+            if signal_params is not None:
+                f.write(f"Signal: {signal_params}\n")
 
         print(f"Configuration saved successfully at: {file_path}")
 
@@ -105,7 +112,7 @@ def save_simulation_config(file_path, pid_params, plant_params, input_params, se
         print(f"Error saving configuration: {e}")
 
 
-def save_simulation_config_as(parent_window, current_file_path, pid_params, plant_params, input_params, sensor_params, plant_type_fallback=None):
+def save_simulation_config_as(parent_window, current_file_path, pid_params, plant_params, input_params, sensor_params, plant_type_fallback=None, delay_params=None, signal_params=None):
     """
     Handle Save As functionality with file dialog and save to new location.
     
@@ -117,6 +124,8 @@ def save_simulation_config_as(parent_window, current_file_path, pid_params, plan
         input_params (dict): Input parameters
         sensor_params (dict): Sensor parameters.
         plant_type_fallback (str, optional): Fallback plant type
+        delay_params (dict, optional): Transport delays of plant and sensor
+        signal_params (dict, optional): Reference signal type and parameters
         
     Returns:
         str or None: New file path if saved successfully, None if canceled
@@ -154,7 +163,9 @@ def save_simulation_config_as(parent_window, current_file_path, pid_params, plan
             plant_params=plant_params,
             input_params=input_params,
             sensor_params=sensor_params,
-            plant_type_fallback=plant_type_fallback
+            plant_type_fallback=plant_type_fallback,
+            delay_params=delay_params,
+            signal_params=signal_params
         )
         
         print(f"Project saved as: {file_path}")
@@ -360,6 +371,22 @@ def validate_project_file(file_path):
     except Exception as e:
         return False, f"Sensor error", f"{str(e)}"
 
+    # Validate optional Delay section (older project files do not have it)
+    delay_section = re.search(r"Delay:\s*(\{.*?\})", content, re.DOTALL)
+    if delay_section:
+        delay_params, delay_error = parse_section_dict(delay_section, "Delay")
+        if delay_error:
+            return False, "Delay parameter error", delay_error
+        delay_errors = validate_numeric_params(delay_params, ["plant", "sensor"], "Delay")
+        for key in ("plant", "sensor"):
+            if isinstance(delay_params.get(key), (int, float)) and delay_params[key] < 0:
+                delay_errors.append(f"Key '{key}' must be non-negative.")
+        if delay_errors:
+            return False, "Delay parameter error", "; ".join(delay_errors)
+
+    # The optional Signal section never blocks the load: an invalid signal (e.g. a File signal whose
+    # waveform was moved) falls back to the Step input when the project is opened, see extract_signal_from_file
+
     # If all checks passed, return validation success
     return True, "", ""
 
@@ -403,4 +430,123 @@ def extract_params_from_file(file_path):
     input_params = extract_dict("Input:")
     sensor_params = extract_dict("Sensor:")
 
-    return pid_params, plant_params, input_params, sensor_params
\ No newline at end of file
+    return pid_params, plant_params, input_params, sensor_params
+
+
+def extract_delays_from_file(file_path):
+    """
+    Extract the plant and sensor transport delays from a project file.
+    Project files saved before delays were supported default to zero delay.
+
+    Args:
+        file_path (str): Path to the project file
+
+    Returns:
+        dict: {'plant': float, 'sensor': float} delays in seconds
+    """
+    delays = {"plant": 0.0, "sensor": 0.0}
+    try:
+        with open(file_path, "r", encoding="utf-8") as file:
+            content = file.read()
+    except Exception as e:
+        print(f"Error reading file: {e}")
+        return delays
+
+    match = re.search(r"Delay:\s*(\{.*?\})", content, re.DOTALL)
+    if not match:
+        return delays
+    try:
+        section = ast.literal_eval(match.group(1))
+        for key in delays:
+            delays[key] = float(section.get(key, 0.0))
+    except Exception as e:
+        print(f"Error parsing Delay: section: {e}")
+    return delays
+
+
+def extract_signal_from_file(file_path, warnings=None):
+    """
+    Extract the reference signal type and parameters from a project file.
+    Project files saved before signals were supported default to the step input, and so do
+    invalid Signal sections (e.g. a File signal whose waveform no longer exists).
+
+    Args:
+        file_path (str): Path to the project file
+        warnings (list or None): Receives the reason when the Signal section is ignored
+
+    Returns:
+        dict: Signal parameters plus a 'type' key
+    """
+    signal_params = {"type": "Step"}
+    try:
+        with open(file_path, "r", encoding="utf-8") as file:
+            content = file.read()
+    except Exception as e:
+        print(f"Error reading file: {e}")
+        return signal_params
+
+    match = re.search(r"Signal:\s*(\{.*?\})", content, re.DOTALL)
+    if not match:
+        return signal_params
+    try:
+        parsed_params = ast.literal_eval(match.group(1))
+        signal_error = validate_signal_params(parsed_params)
+    except Exception as e:
+        signal_error = f"Error parsing Signal: section: {e}"
+    if signal_error:
+        print(f"Warning: Signal section ignored, the Step input is used. {signal_error}")
+        if warnings is not None:
+            warnings.append(signal_error)
+        return signal_params
+    return parsed_params
+
+
+def validate_signal_params(signal_params):
+    """
+    Check the parameters of a Signal section.
+
+    Args:
+        signal_params (dict): Signal parameters plus a 'type' key
+
+    Returns:
+        str: Error message, empty string if the signal can be generated
+    """
+    if not isinstance(signal_params, dict):
+        return "Error: The Signal section must be a dictionary."
+    try:
+        signal_params = dict(signal_params)
+        signal_instance = get_signal(signal_params.pop("type", "Step"))
+        signal_instance.set_parameters(**signal_params)
+        return signal_instance.validate()
+    except Exception as e:
+        return f"{e}"
+
+
+def extract_project_from_file(file_path):
+    """
+    Extract every section of a validated project file, in the JSON form of the simulation service.
+
+    Args:
+        file_path (str): Path to the project file
+
+    Returns:
+        dict: Sections 'Project', 'Plant type', 'PID', 'Plant', 'Input', 'Sensor', 'Delay' and 'Signal'
+        error message (str) if the file is invalid
+    """
+    is_valid, error_message, error_log = validate_project_file(file_path)
+    if not is_valid:
+        return f"Error: {error_message}: {error_log}"
+
+    with open(file_path, "r", encoding="utf-8") as file:
+        content = file.read()
+    pid_params, plant_params, input_params, sensor_params = extract_params_from_file(file_path)
+    return {
+        "Project": re.search(r"Project:\s*(.+)", content).group(1).strip(),
+        "Plant type": re.search(r"Plant type:\s*(.+)", content).group(1).strip(),
+        "PID": pid_params,
+        "Plant": plant_params,
+        "Input": input_params,
+        "Sensor": sensor_params,
+        "Delay": extract_delays_from_file(file_path),
+        "Signal": extract_signal_from_file(file_path),
+    }
@@ -1,10 +1,17 @@
 # Standard library imports
 import os
 import io
+import threading
 
 # Third-party imports
-import matplotlib.pyplot as plt
-from PyQt5.QtGui import QPixmap
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# Local application imports
+from simulation_components.instrumentation import span, traced
+
+# mathtext is not safe to run concurrently: the preview thread and the GUI thread render one at a time
+_render_lock = threading.Lock()
 
 def create_project_validate_inputs(file_path, project_name):
     """
@@ -33,7 +40,35 @@ def create_project_validate_inputs(file_path, project_name):
 
 
 
-def simulator_create_pixmap_equation(equation: str, fontsize: int = 20, dpi: int = 200) -> QPixmap:
+@traced("render_equation_png")
+def render_equation_png(equation: str, fontsize: int = 20, dpi: int = 200) -> bytes:
+    """
+    Render a LaTeX equation to PNG bytes.
+    Uses a standalone Agg figure instead of pyplot, so it can run outside the GUI thread,
+    and holds a module lock so renders from different threads never overlap.
+
+    Args:
+        equation (str): The equation in LaTeX format (e.g., r"$K_p + \frac{K_i}{s} + K_d s$")
+        fontsize (int): Font size for the equation
+        dpi (int):      Resolution of the image
+
+    Returns:
+        bytes: PNG image of the equation
+    """
+    with _render_lock:
+        fig = Figure(figsize=(0.01, 0.01))
+        FigureCanvasAgg(fig)
+        fig.text(0.5, 0.5, equation, fontsize=fontsize, ha='center', va='center')
+
+        # Save figure to a bytes buffer
+        buf = io.BytesIO()
+        with span("Figure.savefig"):
+            fig.savefig(buf, format='png', bbox_inches='tight', dpi=dpi, transparent=True)
+    return buf.getvalue()
+
+
+@traced("simulator_create_pixmap_equation")
+def simulator_create_pixmap_equation(equation: str, fontsize: int = 20, dpi: int = 200) -> "QPixmap":
     """
     Generate an QPixmap from a LaTeX equation.
     
@@ -45,20 +80,14 @@ def simulator_create_pixmap_equation(equation: str, fontsize: int = 20, dpi: int
     Returns:
         QPixmap: Rendered image of the equation
     """
-    # Create a matplotlib figure
-    fig = plt.figure(figsize=(0.01, 0.01))
-    fig.text(0.5, 0.5, equation, fontsize=fontsize, ha='center', va='center')
-    plt.axis('off')
-
-    # Save figure to a bytes buffer
-    buf = io.BytesIO()
-    fig.savefig(buf, format='png', bbox_inches='tight', dpi=dpi, transparent=True)
-    plt.close(fig)
-    buf.seek(0)
-
-    # Create QPixmap from buffer
+    # Imported here so that the validators of this module stay usable without PyQt (headless service)
+    from PyQt5.QtGui import QPixmap
+
+    # Create QPixmap from the rendered image
     pixmap = QPixmap()
-    pixmap.loadFromData(buf.getvalue())
+    png = render_equation_png(equation, fontsize, dpi)
+    with span("QPixmap.loadFromData"):
+        pixmap.loadFromData(png)
     return pixmap
 
 
@@ -11,7 +11,7 @@ from PyQt5.QtCore import QRegExp
 
 # Local application imports
 from simulation_components.controller_pid import ControllerPID
-from utils.input_utils import simulator_create_pixmap_equation
+from utils.equation_preview import EquationPreview
 class ControlEditor(QDialog):
     def __init__(self, controller_pid: ControllerPID, parent=None):
         """
@@ -41,6 +41,7 @@ class ControlEditor(QDialog):
 
         # PID label configuration
         self.pidLabel.setAlignment(Qt.AlignCenter)
+        self.pid_preview = EquationPreview(self.pidLabel)
 
         # Button Configuration
         self.applyButton.clicked.connect(self.apply_changes_to_model)
@@ -67,6 +68,7 @@ class ControlEditor(QDialog):
 
         # Load current values from the model (if any)
         self.load_from_model()
+        self.pid_preview.flush()
 
     def load_from_model(self):
         """
@@ -94,13 +96,7 @@ class ControlEditor(QDialog):
         kd = self.kdInput.text() or "Kd"
 
         latex_eq = self.controller_pid.get_latex_equation(kp, ki, kd)
-        pixmap = simulator_create_pixmap_equation(latex_eq, fontsize=10)
-
-        pixmap = pixmap.scaled(self.pidLabel.width(),
-                               self.pidLabel.height(),
-                               Qt.KeepAspectRatio,
-                               Qt.SmoothTransformation)
-        self.pidLabel.setPixmap(pixmap)
+        self.pid_preview.request(latex_eq)
 
     def apply_changes_to_model(self):
         """
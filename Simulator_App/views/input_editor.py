@@ -2,24 +2,37 @@
 import os
 
 # Third-party imports
-from PyQt5.QtWidgets import QDialog
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QFileDialog
 from PyQt5.uic import loadUi
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QDoubleValidator
 from PyQt5.QtGui import QRegExpValidator
 from PyQt5.QtCore import QRegExp
 
+#Scientific imports
+import numpy as np
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
 # Local application imports
 from simulation_components.input import Input
+from simulation_components.output import Output
+from simulation_components.signal_generator import SIGNAL_MAP, get_signal
+
+# Number of parameter slots available for signal parameters
+MAX_SIGNAL_PARAMS = 4
 
 
 
 class InputEditor(QDialog):
-    def __init__(self, input_controller: Input, parent=None):
+    def __init__(self, input_controller: Input, parent=None, pid_controller=None, plant_controller=None, sensor_controller=None):
         """
         Dialog for editing Input parameters.
         Args:
             input_controller (Input): The Input controller object to edit.
+            pid_controller (ControllerPID): PID of the loop, used by the automatic time selection
+            plant_controller (Plant): Plant of the loop, used by the automatic time selection
+            sensor_controller (Sensor): Sensor of the loop, used by the automatic time selection
         Returns:
             None
         """
@@ -29,6 +42,9 @@ class InputEditor(QDialog):
         loadUi(ui_path, self)
 
         self.input_controller = input_controller
+        self.pid_controller = pid_controller
+        self.plant_controller = plant_controller
+        self.sensor_controller = sensor_controller
 
         # Input Validators
         regex = QRegExp(r"^\d+(\.\d{1,4})?$")  # Allow only non-negative decimal numbers 
@@ -46,6 +62,8 @@ class InputEditor(QDialog):
         self.applyButton.clicked.connect(self.apply_changes_to_model)
         self.cancelButton.clicked.connect(self.reject)
         self.clearButton.clicked.connect(self.clear_inputs)
+        self.autoTimeButton.clicked.connect(self.fill_auto_time)
+        self.autoTimeButton.setEnabled(None not in (pid_controller, plant_controller, sensor_controller))
 
         # Set tooltips
         self.stepTimeLabelInfo.setToolTip(self.input_controller.get_descriptions()["step_time"])
@@ -54,13 +72,194 @@ class InputEditor(QDialog):
         self.totalTimeLabelInfo.setToolTip(self.input_controller.get_descriptions()["total_time"])
         self.sampleTimeLabelInfo.setToolTip(self.input_controller.get_descriptions()["sample_time"])
 
+        # Signal generator configuration
+        self.signal_validator = QRegExpValidator(regex_initial_final)
+        self.signalTypeComboBox.addItems(list(SIGNAL_MAP.keys()))
+        self.signalTypeLabelInfo.setToolTip(self.input_controller.get_descriptions()["signal_type"])
+        self.signalBrowseButton.clicked.connect(self.browse_signal_file)
+        self.setup_signal_preview()
+
         # Load current values from the model (if any)
         self.load_from_model()
 
+        # Real-time connection of inputs to the waveform preview
+        self.signalTypeComboBox.currentTextChanged.connect(self.on_signal_type_changed)
+        for widget in (self.stepTimeInput, self.initialValueInput, self.finalValueInput, self.totalTimeInput, self.sampleTimeInput):
+            widget.textChanged.connect(lambda text: self.update_signal_preview())
+        for i in range(1, MAX_SIGNAL_PARAMS + 1):
+            getattr(self, f"signalParam{i}Input").textChanged.connect(lambda text: self.update_signal_preview())
+        self.update_signal_preview()
+
         # Hide error labels initially
         self.errorLabel.hide()
         self.errorLabelInfo.hide()
 
+    def setup_signal_preview(self):
+        """
+        Create the matplotlib canvas used to preview the reference waveform
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.preview_figure = Figure(figsize=(8, 1.5), dpi=80)
+        self.preview_axes = self.preview_figure.add_subplot(111)
+        self.preview_canvas = FigureCanvas(self.preview_figure)
+
+        layout = QVBoxLayout(self.signalPreviewWidget)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.preview_canvas)
+
+    def configure_signal_params(self, signal_type, values=None):
+        """
+        Show the parameter slots of the selected signal type
+        Args:
+            signal_type (str): Name of the signal type
+            values (dict or None): Values to load, defaults of the signal type if None
+        Returns:
+            None
+        """
+        signal = get_signal(signal_type)
+        descriptions = signal.get_parameter_descriptions() if signal_type != "Step" else {}
+        values = values if values is not None else signal.get_parameters()
+
+        for i in range(1, MAX_SIGNAL_PARAMS + 1):
+            label = getattr(self, f"signalParam{i}Label")
+            info_label = getattr(self, f"signalParam{i}LabelInfo")
+            line_edit = getattr(self, f"signalParam{i}Input")
+            line_edit.blockSignals(True)
+            if i <= len(descriptions):
+                key, desc = list(descriptions.items())[i - 1]
+                label.setText(key)
+                info_label.setToolTip(desc)
+                line_edit.setValidator(None if key == "file_path" else self.signal_validator)
+                line_edit.setText(str(values.get(key, "")))
+                for widget in (label, info_label, line_edit):
+                    widget.show()
+            else:
+                line_edit.clear()
+                for widget in (label, info_label, line_edit):
+                    widget.hide()
+            line_edit.blockSignals(False)
+
+        # File playback needs a path picker; the step fields only describe the Step signal
+        self.signalBrowseButton.setVisible(signal_type == "File")
+        self.signalParam1LabelInfo.setVisible(signal_type not in ("Step", "File"))
+        for widget in (self.stepTimeInput, self.initialValueInput, self.finalValueInput):
+            widget.setEnabled(signal_type == "Step")
+
+    def on_signal_type_changed(self, signal_type):
+        """
+        Load the parameters of the newly selected signal type
+        Args:
+            signal_type (str): Name of the signal type
+        Returns:
+            None
+        """
+        values = None
+        if signal_type == self.input_controller.get_signal_type():
+            values = self.input_controller.get_signal_parameters()
+        self.configure_signal_params(signal_type, values)
+        self.update_signal_preview()
+
+    def browse_signal_file(self):
+        """
+        Select the waveform file played back by the File signal
+        Args:
+            None
+        Returns:
+            None
+        """
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Open Waveform", "",
+            "Waveform Files (*.csv *.txt *.npy *.bin *.dat);;All files (*)"
+        )
+        if file_path:
+            self.signalParam1Input.setText(file_path)
+
+    def collect_signal_params(self):
+        """
+        Read the selected signal type and its parameters from the inputs
+        Args:
+            None
+        Returns:
+            tuple: (signal_type, params dict)
+        Raises:
+            ValueError: If a numeric parameter cannot be converted
+        """
+        signal_type = self.signalTypeComboBox.currentText()
+        params = {}
+        if signal_type == "Step":
+            return signal_type, params
+
+        for i, key in enumerate(get_signal(signal_type).get_parameters().keys(), start=1):
+            text = getattr(self, f"signalParam{i}Input").text()
+            if text:
+                params[key] = text if key == "file_path" else float(text)
+        return signal_type, params
+
+    def update_signal_preview(self):
+        """
+        Redraw the waveform preview from the current input values
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.preview_axes.clear()
+        try:
+            params = self.input_controller.get_parameters()
+            total_time = float(self.totalTimeInput.text() or params["total_time"])
+            sample_time = float(self.sampleTimeInput.text() or params["sample_time"])
+            num_points = int(min(total_time / sample_time, 10000)) + 1
+            t = np.linspace(0, total_time, num_points)
+
+            signal_type, signal_params = self.collect_signal_params()
+            signal = get_signal(signal_type)
+            if signal_type == "Step":
+                signal_params = {
+                    "step_time": float(self.stepTimeInput.text() or params["step_time"]),
+                    "initial_value": float(self.initialValueInput.text() or params["initial_value"]),
+                    "final_value": float(self.finalValueInput.text() or params["final_value"])
+                }
+            signal.set_parameters(**signal_params)
+
+            if not signal.validate():
+                self.preview_axes.plot(t, signal.generate(t), 'b-', linewidth=1.5)
+            self.preview_axes.set_xlim(0, total_time)
+        except (ValueError, ZeroDivisionError, OSError):
+            # Incomplete input: leave the preview empty
+            pass
+        self.preview_axes.grid(True, linestyle='--', alpha=0.7)
+        self.preview_axes.set_xlabel('Time (s)')
+        self.preview_figure.tight_layout()
+        self.preview_canvas.draw_idle()
+
+    def fill_auto_time(self):
+        """
+        Fill the total time and sample time from the poles and zeros of the closed loop
+        Args:
+            None
+        Returns:
+            None
+        """
+        try:
+            step_time = float(self.stepTimeInput.text() or self.input_controller.get_parameters()["step_time"])
+        except ValueError:
+            step_time = self.input_controller.get_parameters()["step_time"]
+
+        output = Output(self.pid_controller, self.plant_controller, self.input_controller, self.sensor_controller)
+        time_params = output.get_auto_time_parameters(step_time)
+        if time_params is None:
+            self.errorLabel.show()
+            self.errorLabelInfo.show()
+            self.errorLabelInfo.setToolTip("The closed loop is not available: check the plant and sensor.")
+            return
+        self.errorLabel.hide()
+        self.errorLabelInfo.hide()
+        self.totalTimeInput.setText(np.format_float_positional(time_params["total_time"], trim='-'))
+        self.sampleTimeInput.setText(np.format_float_positional(time_params["sample_time"], trim='-'))
+
     def load_from_model(self):
         """
         Initialize the input fields with current input values
@@ -76,6 +275,12 @@ class InputEditor(QDialog):
         self.totalTimeInput.setText(str(params["total_time"]))
         self.sampleTimeInput.setText(str(params["sample_time"]))
 
+        signal_type = self.input_controller.get_signal_type()
+        self.signalTypeComboBox.blockSignals(True)
+        self.signalTypeComboBox.setCurrentText(signal_type)
+        self.signalTypeComboBox.blockSignals(False)
+        self.configure_signal_params(signal_type, self.input_controller.get_signal_parameters())
+
     def apply_changes_to_model(self):
         """
         Apply changes from input fields to the input model
@@ -91,6 +296,7 @@ class InputEditor(QDialog):
             final_value = float(self.finalValueInput.text() or params["final_value"])
             total_time = float(self.totalTimeInput.text() or params["total_time"])
             sample_time = float(self.sampleTimeInput.text() or params["sample_time"])
+            signal_type, signal_params = self.collect_signal_params()
         except ValueError:
             # Handle invalid input (e.g., show an error message)
             #print("Invalid input. Please enter valid numbers.")
@@ -101,6 +307,8 @@ class InputEditor(QDialog):
         
         old_params = self.input_controller.get_parameters()
         response = self.input_controller.set_parameters(step_time, initial_value, final_value, total_time, sample_time)
+        if not isinstance(response, str):
+            response = self.input_controller.set_signal(signal_type, **signal_params)
         if isinstance(response, str):
             # There were errors; show them
             self.errorLabel.show()
@@ -126,4 +334,6 @@ class InputEditor(QDialog):
         self.initialValueInput.clear()
         self.finalValueInput.clear()
         self.totalTimeInput.clear()
-        self.sampleTimeInput.clear()
\ No newline at end of file
+        self.sampleTimeInput.clear()
+        for i in range(1, MAX_SIGNAL_PARAMS + 1):
+            getattr(self, f"signalParam{i}Input").clear()
\ No newline at end of file
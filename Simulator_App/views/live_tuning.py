@@ -0,0 +1,294 @@
+#Standard library imports
+import os
+import time
+
+#Third-party imports
+from PyQt5.QtWidgets import QDialog, QVBoxLayout
+from PyQt5.uic import loadUi
+from PyQt5 import QtWidgets
+
+#Scientific imports
+import numpy as np
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+#Local application imports
+from simulation_components.input import Input
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.plant import Plant
+from simulation_components.sensor import Sensor
+from simulation_components.loop_simulator import DiscreteLoopModel
+from simulation_components.metrics import compute_step_metrics
+from simulation_components.frequency_response import FrequencyResponseCache
+from simulation_components.output import BODE_OMEGA
+from simulation_components.divergence import STABILITY_TOLERANCE
+
+# Resolution of the gain sliders
+SLIDER_STEPS = 1000
+
+# Fraction of the y range added above and below the response when rescaling the axes
+Y_MARGIN = 0.1
+
+class LiveTuning(QDialog):
+    def __init__(self, plant_model: Plant, pid_controller: ControllerPID, input_signal: Input, sensor_model: Sensor, parent=None):
+        """
+        Dialog to tune the PID gains with sliders while the step response and the Bode diagram update live.
+        Args:
+            plant_model (Plant): The plant model.
+            pid_controller (ControllerPID): The PID controller, updated on apply.
+            input_signal (Input): The step input and time grid.
+            sensor_model (Sensor): The sensor model.
+            parent: The parent widget.
+        Returns:
+            None
+        """
+        super().__init__(parent)
+        ui_path = os.path.join(os.path.dirname(__file__), "../ui/live_tuning.ui")
+        loadUi(ui_path, self)
+
+        self.plant_model = plant_model
+        self.pid_controller = pid_controller
+        self.input_signal = input_signal
+
+        self.setWindowTitle(self.plant_model.name + " - Live Tuning")
+        self.errorlabel.hide()
+
+        self.sliders = {"kp": self.kpSlider, "ki": self.kiSlider, "kd": self.kdSlider}
+        self.value_labels = {"kp": self.kpValueLabel, "ki": self.kiValueLabel, "kd": self.kdValueLabel}
+        self.ranges = {}
+        self.gains = dict(self.pid_controller.get_parameters())
+        self.background = None
+
+        # Time grid and step reference (deviation from the initial value)
+        params = self.input_signal.get_parameters()
+        num_points = int(params["total_time"] / params["sample_time"]) + 1
+        self.t = np.linspace(0, params["total_time"], num_points)
+        self.reference = np.where(self.t >= params["step_time"], params["final_value"] - params["initial_value"], 0.0)
+
+        # Plant and sensor are discretized and evaluated on the frequency grid once, only the gains change while dragging
+        self.frequency_cache = FrequencyResponseCache(self.plant_model, sensor_model, BODE_OMEGA, use_reduced_models=True)
+        try:
+            self.loop_model = DiscreteLoopModel(self.plant_model, sensor_model, params["sample_time"], use_reduced_models=True)
+            self.frequency_cache.get_open_loop_response(0.0, 0.0, 0.0)
+        except Exception as e:
+            self.loop_model = None
+            self.errorlabel.setText(f"Error: {e}")
+            self.errorlabel.show()
+
+        self.setup_plot_canvas()
+        self.setup_sliders()
+
+        # Button Configuration
+        self.rescaleButton.clicked.connect(self.rescale_ranges)
+        self.applyButton.clicked.connect(self.apply_changes_to_model)
+        self.cancelButton.clicked.connect(self.reject)
+
+        self.update_response(redraw=True)
+
+    def setup_plot_canvas(self):
+        """
+        Create the canvas with the reference and response lines, and the open- and closed-loop Bode diagram.
+        Args:
+            None
+        Returns:
+            None
+        """
+        params = self.input_signal.get_parameters()
+        fig = Figure(dpi=80)
+        grid = fig.add_gridspec(2, 2)
+        self.axes = fig.add_subplot(grid[:, 0])
+        self.magnitude_axes = fig.add_subplot(grid[0, 1])
+        self.phase_axes = fig.add_subplot(grid[1, 1], sharex=self.magnitude_axes)
+        self.axes.plot(self.t, params["initial_value"] + self.reference, 'k--', linewidth=1.5, alpha=0.7, label='Reference')
+        # The response is animated: it is blitted over a cached background while dragging
+        self.response_line, = self.axes.plot(self.t, np.full_like(self.t, params["initial_value"]), 'b-', linewidth=2,
+                                             label='Output', animated=True)
+        self.axes.set_title('Live Step Response (discrete loop)', pad=20)
+        self.axes.set_xlabel('Time (s)')
+        self.axes.set_ylabel('Amplitude')
+        self.axes.grid(True, linestyle='--', alpha=0.7)
+        self.axes.set_facecolor((0.95, 0.95, 0.95))
+        self.axes.set_xlim(self.t[0], self.t[-1])
+        self.axes.legend(handles=[self.axes.lines[0], self.response_line])
+
+        # Bode lines, animated as well
+        self.bode_lines = {}
+        for axes, quantity, ylabel in ((self.magnitude_axes, "magnitude_db", 'Magnitude [dB]'), (self.phase_axes, "phase_deg", 'Phase [deg]')):
+            closed_line, = axes.semilogx(BODE_OMEGA, np.zeros_like(BODE_OMEGA), 'b-', linewidth=1.5, label='Closed loop', animated=True)
+            open_line, = axes.semilogx(BODE_OMEGA, np.zeros_like(BODE_OMEGA), color='gray', linestyle='--', linewidth=1.5,
+                                       label='Loop C·P·S', animated=True)
+            self.bode_lines[f"closed_{quantity}"] = closed_line
+            self.bode_lines[f"open_{quantity}"] = open_line
+            axes.set_ylabel(ylabel)
+            axes.grid(True, linestyle='--', alpha=0.7)
+            axes.set_facecolor((0.95, 0.95, 0.95))
+            axes.legend(handles=[closed_line, open_line], loc='lower left', fontsize=8)
+        self.magnitude_axes.set_title('Live Bode Diagram', pad=20)
+        self.magnitude_axes.axhline(0, color='k', linewidth=0.8, alpha=0.5)
+        self.phase_axes.set_xlabel('Frequency [rad/s]')
+        self.magnitude_axes.set_xlim(BODE_OMEGA[0], BODE_OMEGA[-1])
+
+        self.canvas = FigureCanvas(fig)
+        self.canvas.setStyleSheet("background-color: white;")
+        self.canvas.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+
+        plot_container = self.findChild(QtWidgets.QWidget, "widget")
+        layout = QVBoxLayout(plot_container)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.canvas)
+
+    def setup_sliders(self):
+        """
+        Configure the sliders around the current gains.
+        Args:
+            None
+        Returns:
+            None
+        """
+        for name, slider in self.sliders.items():
+            slider.setRange(0, SLIDER_STEPS)
+            slider.setToolTip(self.pid_controller.get_descriptions()[name])
+            slider.valueChanged.connect(lambda value, name=name: self.on_slider_changed(name, value))
+        self.rescale_ranges()
+
+    def rescale_ranges(self):
+        """
+        Center the range of every slider on its current gain.
+        Args:
+            None
+        Returns:
+            None
+        """
+        for name, slider in self.sliders.items():
+            gain = self.gains[name]
+            self.ranges[name] = (min(0.0, 2 * gain), max(1.0, 2 * gain))
+            low, high = self.ranges[name]
+            slider.blockSignals(True)
+            slider.setValue(int(round((gain - low) / (high - low) * SLIDER_STEPS)))
+            slider.blockSignals(False)
+            self.value_labels[name].setText(f"{gain:.4g}")
+
+    def on_slider_changed(self, name, value):
+        """
+        Update a gain from its slider and recompute the response.
+        Args:
+            name (str): Gain name ('kp', 'ki' or 'kd')
+            value (int): Slider position
+        Returns:
+            None
+        """
+        low, high = self.ranges[name]
+        self.gains[name] = low + (high - low) * value / SLIDER_STEPS
+        self.value_labels[name].setText(f"{self.gains[name]:.4g}")
+        self.update_response()
+
+    def update_response(self, redraw=False):
+        """
+        Recompute the closed loop for the current gains and update the lines in place.
+        Args:
+            redraw (bool): Force a full redraw (rescales the y axes)
+        Returns:
+            None
+        """
+        if self.loop_model is None:
+            return
+        start = time.perf_counter()
+        params = self.input_signal.get_parameters()
+        response = params["initial_value"] + self.loop_model.simulate(self.gains["kp"], self.gains["ki"], self.gains["kd"], self.reference)
+        self.response_line.set_ydata(response)
+
+        # A diverging response can stay finite over the horizon: the verdict comes from the poles,
+        # inside the circle of radius exp(-tolerance * dt), the image of Re(s) < -tolerance
+        poles = self.loop_model.get_closed_loop_poles(self.gains["kp"], self.gains["ki"], self.gains["kd"])
+        stable = np.all(np.abs(poles) < np.exp(-STABILITY_TOLERANCE * params["sample_time"]))
+        metrics = compute_step_metrics(self.t, response, params["step_time"], params["initial_value"], params["final_value"])
+        if stable and np.all(np.isfinite(response)):
+            self.metricsLabel.setText(f"Overshoot: {metrics['overshoot'][0]:.2f}%   Rise time: {metrics['rise_time'][0]:.3g} s   "
+                                      f"Settling time: {metrics['settling_time'][0]:.3g} s   Steady-state error: {metrics['steady_state_error'][0]:.3g}")
+        else:
+            self.metricsLabel.setText("The closed loop is unstable.")
+
+        # Bode diagram: only the PID response is evaluated, the plant and sensor ones are cached
+        bode_start = time.perf_counter()
+        bode = self.frequency_cache.get_bode_data(self.gains["kp"], self.gains["ki"], self.gains["kd"])
+        bode_time = time.perf_counter() - bode_start
+        for name, line in self.bode_lines.items():
+            line.set_ydata(bode[name])
+
+        # Full redraw only when a curve leaves the current y limits
+        redraw = self.fit_limits(self.axes, response, (params["initial_value"], params["final_value"]), redraw)
+        redraw = self.fit_limits(self.magnitude_axes, np.concatenate((bode["closed_magnitude_db"], bode["open_magnitude_db"])), (0.0,), redraw)
+        redraw = self.fit_limits(self.phase_axes, np.concatenate((bode["closed_phase_deg"], bode["open_phase_deg"])), (), redraw)
+        if redraw or self.background is None:
+            self.canvas.draw()
+        else:
+            self.blit_response()
+        self.timingLabel.setText(f"Update: {1000 * (time.perf_counter() - start):.1f} ms (Bode: {1e6 * bode_time:.0f} µs)")
+
+    def fit_limits(self, axes, values, included, redraw):
+        """
+        Rescale the y axis of a plot around its values if they leave the current limits or a redraw is forced.
+        Args:
+            axes: Matplotlib axes
+            values (np.ndarray): Values of the animated curves
+            included (tuple): Values always kept inside the limits
+            redraw (bool): Rescale even if the values are inside the limits
+        Returns:
+            bool: True if the axis was rescaled (or a redraw was already forced)
+        """
+        finite = values[np.isfinite(values)]
+        low, high = axes.get_ylim()
+        if not finite.size or not (redraw or finite.min() < low or finite.max() > high or self.background is None):
+            return redraw
+        y_min = min(finite.min(), *included) if included else finite.min()
+        y_max = max(finite.max(), *included) if included else finite.max()
+        span = max(y_max - y_min, 1e-9)
+        axes.set_ylim(y_min - Y_MARGIN * span, y_max + Y_MARGIN * span)
+        return True
+
+    def on_draw(self, event):
+        """
+        Cache the static background after every full redraw.
+        Args:
+            event: Matplotlib draw event
+        Returns:
+            None
+        """
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self.draw_animated()
+
+    def blit_response(self):
+        """
+        Draw the response and Bode lines over the cached background.
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.canvas.restore_region(self.background)
+        self.draw_animated()
+        self.canvas.blit(self.canvas.figure.bbox)
+
+    def draw_animated(self):
+        """
+        Draw every animated line on its axes.
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.axes.draw_artist(self.response_line)
+        for line in self.bode_lines.values():
+            line.axes.draw_artist(line)
+
+    def apply_changes_to_model(self):
+        """
+        Store the tuned gains in the PID controller.
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.pid_controller.set_parameters(float(self.gains["kp"]), float(self.gains["ki"]), float(self.gains["kd"]))
+        self.accept()
@@ -0,0 +1,253 @@
+#Standard library imports
+import os
+
+#Third-party imports
+from PyQt5.QtWidgets import QDialog, QVBoxLayout
+from PyQt5.uic import loadUi
+from PyQt5.QtGui import QRegExpValidator
+from PyQt5.QtCore import QRegExp
+from PyQt5 import QtWidgets
+
+#Scientific imports
+import numpy as np
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+#Local application imports
+from simulation_components.plant import Plant, PersonalizedPlant
+from simulation_components.sensor import Sensor
+from simulation_components.model_reduction import REDUCTION_METHODS, REDUCTION_METHOD_DESCRIPTIONS
+
+# Error bound proposed for components that are not reduced yet
+DEFAULT_TOLERANCE = 1e-3
+
+# Points of the Bode magnitude comparison
+BODE_POINTS = 500
+
+class ModelReduction(QDialog):
+    def __init__(self, plant_model: Plant, sensor_model: Sensor, parent=None):
+        """
+        Dialog to reduce the order of the personalized plant and the sensor by balanced truncation.
+        Args:
+            plant_model (Plant): The plant model, reducible if it is a Personalized Plant.
+            sensor_model (Sensor): The sensor model.
+            parent: The parent widget.
+        Returns:
+            None
+        """
+        super().__init__(parent)
+        ui_path = os.path.join(os.path.dirname(__file__), "../ui/model_reduction.ui")
+        loadUi(ui_path, self)
+
+        self.setWindowTitle(plant_model.name + " - Model Reduction")
+        self.errorlabel.hide()
+
+        self.components = {}
+        if isinstance(plant_model, PersonalizedPlant):
+            self.components["Plant"] = plant_model
+        self.components["Sensor"] = sensor_model
+
+        # Input Validators
+        self.toleranceInput.setValidator(QRegExpValidator(QRegExp(r"^\d*\.?\d*([eE]-?\d+)?$")))
+        self.toleranceInput.setToolTip("Allowed H-infinity norm of the error between the full and the reduced model.\n"
+                                       "The reduced order is the lowest one whose bound 2 * (sum of the discarded\n"
+                                       "Hankel singular values) stays within this value.")
+        self.methodComboBox.addItems(REDUCTION_METHODS)
+        self.methodComboBox.setToolTip("\n".join(REDUCTION_METHOD_DESCRIPTIONS[method] for method in REDUCTION_METHODS))
+        self.componentComboBox.addItems(list(self.components))
+
+        self.setup_plot_canvas()
+
+        self.componentComboBox.currentTextChanged.connect(self.load_component)
+        self.toleranceInput.textChanged.connect(lambda text: self.update_preview())
+        self.methodComboBox.currentTextChanged.connect(lambda text: self.update_preview())
+        self.applyButton.clicked.connect(self.apply_reduction)
+        self.disableButton.clicked.connect(self.disable_reduction)
+        self.closeButton.clicked.connect(self.accept)
+
+        self.load_component(self.componentComboBox.currentText())
+
+    def setup_plot_canvas(self):
+        """
+        Create the canvas for the Hankel singular values and the Bode comparison.
+        Args:
+            None
+        Returns:
+            None
+        """
+        fig = Figure(dpi=80)
+        self.hsv_axes = fig.add_subplot(211)
+        self.bode_axes = fig.add_subplot(212)
+        self.canvas = FigureCanvas(fig)
+        self.canvas.setStyleSheet("background-color: white;")
+        self.canvas.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+
+        plot_container = self.findChild(QtWidgets.QWidget, "widget")
+        layout = QVBoxLayout(plot_container)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.canvas)
+
+    def get_component(self):
+        """
+        Return the selected component.
+        Args:
+            None
+        Returns:
+            PersonalizedPlant: The selected plant or sensor
+        """
+        return self.components[self.componentComboBox.currentText()]
+
+    def load_component(self, name):
+        """
+        Show the reduction settings of a component.
+        Args:
+            name (str): 'Plant' or 'Sensor'
+        Returns:
+            None
+        """
+        component = self.components[name]
+        tolerance = component.get_reduction_tolerance()
+        self.methodComboBox.blockSignals(True)
+        self.methodComboBox.setCurrentText(component.get_reduction_method())
+        self.methodComboBox.blockSignals(False)
+        self.toleranceInput.setText(str(tolerance if tolerance is not None else DEFAULT_TOLERANCE))
+        self.update_status()
+        self.update_preview()
+
+    def get_tolerance(self):
+        """
+        Read the error bound from its input.
+        Args:
+            None
+        Returns:
+            float: Error bound, None if the input is not a positive number
+        """
+        try:
+            tolerance = float(self.toleranceInput.text())
+        except ValueError:
+            return None
+        return tolerance if tolerance > 0 else None
+
+    def show_error(self, message):
+        """
+        Display an error message below the settings.
+        Args:
+            message (str): Error message
+        Returns:
+            None
+        """
+        self.errorlabel.setText(message)
+        self.errorlabel.show()
+
+    def update_status(self):
+        """
+        Show whether the selected component is currently reduced.
+        Args:
+            None
+        Returns:
+            None
+        """
+        tolerance = self.get_component().get_reduction_tolerance()
+        if tolerance is None:
+            self.statusLabel.setText("The plots use the full model.")
+        else:
+            self.statusLabel.setText(f"The interactive plots use the reduced model (error bound {tolerance:.3g}).\n"
+                                     "The full model stays available in the Output Plotter.")
+
+    def update_preview(self):
+        """
+        Plot the Hankel singular values and compare the full and reduced models for the current settings.
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.errorlabel.hide()
+        self.hsv_axes.clear()
+        self.bode_axes.clear()
+
+        reduction = self.get_component().get_model_reduction()
+        tolerance = self.get_tolerance()
+        valid = False
+        if isinstance(reduction, str):
+            self.show_error(reduction)
+        elif tolerance is None:
+            self.show_error("Error: The error bound must be a positive number.")
+        else:
+            self.plot_reduction(reduction, tolerance)
+            valid = True
+        self.applyButton.setEnabled(valid)
+        self.canvas.draw()
+
+    def plot_reduction(self, reduction, tolerance):
+        """
+        Draw the Hankel singular values and the Bode magnitudes, and summarize the reduction.
+        Args:
+            reduction (BalancedTruncation): Balanced realization of the component
+            tolerance (float): Error bound
+        Returns:
+            None
+        """
+        hankel_values = reduction.get_hankel_singular_values()
+        order = reduction.get_order_for_tolerance(tolerance)
+        unstable_order = reduction.get_unstable_order()
+        error_bound = reduction.get_error_bound(order)
+
+        self.summaryLabel.setText(f"Full order: {reduction.get_full_order()} "
+                                  f"({unstable_order} unstable or marginal poles, never reduced)\n"
+                                  f"Reduced order: {order + unstable_order}\n"
+                                  f"Error bound: {error_bound:.3g}")
+
+        indices = np.arange(1, len(hankel_values) + 1)
+        if len(hankel_values):
+            self.hsv_axes.bar(indices[:order], hankel_values[:order], color='b', alpha=0.7, label='Kept')
+            self.hsv_axes.bar(indices[order:], hankel_values[order:], color='gray', alpha=0.7, label='Discarded')
+            self.hsv_axes.set_yscale('log')
+            self.hsv_axes.legend()
+        self.hsv_axes.set_title('Hankel Singular Values')
+        self.hsv_axes.set_xlabel('State')
+        self.hsv_axes.grid(True, linestyle='--', alpha=0.7)
+        self.hsv_axes.set_facecolor((0.95, 0.95, 0.95))
+
+        full_tf = self.get_component().get_transfer_function()
+        reduced_tf = reduction.reduce_to_tolerance(tolerance, self.methodComboBox.currentText())
+        poles = np.abs(full_tf.poles())
+        poles = poles[poles > 0]
+        low, high = (np.log10(poles.min()) - 2, np.log10(poles.max()) + 2) if poles.size else (-2, 2)
+        omega = np.logspace(low, high, BODE_POINTS)
+        with np.errstate(divide='ignore'):
+            full_db = 20 * np.log10(np.abs(full_tf(1j * omega)))
+            reduced_db = 20 * np.log10(np.abs(reduced_tf(1j * omega)))
+        self.bode_axes.semilogx(omega, full_db, 'k-', linewidth=2, label=f'Full (order {reduction.get_full_order()})')
+        self.bode_axes.semilogx(omega, reduced_db, 'r--', linewidth=1.5, label=f'Reduced (order {order + unstable_order})')
+        self.bode_axes.set_xlabel('Frequency (rad/s)')
+        self.bode_axes.set_ylabel('Magnitude (dB)')
+        self.bode_axes.grid(True, which='both', linestyle='--', alpha=0.7)
+        self.bode_axes.set_facecolor((0.95, 0.95, 0.95))
+        self.bode_axes.legend()
+        self.canvas.figure.tight_layout()
+
+    def apply_reduction(self):
+        """
+        Use the reduced model of the selected component in the interactive plots.
+        Args:
+            None
+        Returns:
+            None
+        """
+        error_log = self.get_component().set_reduction(self.get_tolerance(), self.methodComboBox.currentText())
+        if error_log:
+            self.show_error(error_log)
+            return
+        self.update_status()
+
+    def disable_reduction(self):
+        """
+        Go back to the full model of the selected component.
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.get_component().set_reduction(None, self.methodComboBox.currentText())
+        self.update_status()
@@ -0,0 +1,197 @@
+#Standard library imports
+import os
+
+#Third-party imports
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QComboBox, QTableWidgetItem, QApplication, QHeaderView
+from PyQt5.uic import loadUi
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QRegExpValidator
+from PyQt5.QtCore import QRegExp
+from PyQt5 import QtWidgets
+
+#Scientific imports
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+
+#Local application imports
+from simulation_components.input import Input
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.plant import Plant
+from simulation_components.sensor import Sensor
+from simulation_components.monte_carlo import MonteCarloAnalysis, DISTRIBUTIONS, DISTRIBUTION_DESCRIPTIONS, DEFAULT_SAMPLES
+
+# Default relative spread proposed when a distribution is selected
+DEFAULT_SPREAD = 0.1
+
+class MonteCarloAnalysisDialog(QDialog):
+    def __init__(self, plant_model: Plant, pid_controller: ControllerPID, input_signal: Input, sensor_model: Sensor, parent=None):
+        """
+        Dialog to configure and run a Monte Carlo analysis of the closed loop.
+        Args:
+            plant_model (Plant): The nominal plant model.
+            pid_controller (ControllerPID): The PID controller.
+            input_signal (Input): The step input and time grid.
+            sensor_model (Sensor): The sensor model.
+            parent: The parent widget.
+        Returns:
+            None
+        """
+        super().__init__(parent)
+        ui_path = os.path.join(os.path.dirname(__file__), "../ui/monte_carlo_analysis.ui")
+        loadUi(ui_path, self)
+
+        self.plant_model = plant_model
+        self.analysis = MonteCarloAnalysis(pid_controller, plant_model, input_signal, sensor_model)
+        self.canvas = None
+
+        self.setWindowTitle(self.plant_model.name + " - Monte Carlo Analysis")
+        self.errorlabel.hide()
+
+        # Input Validators
+        integer_validator = QRegExpValidator(QRegExp(r"^\d+$"))
+        self.samplesInput.setValidator(integer_validator)
+        self.seedInput.setValidator(integer_validator)
+        self.workersInput.setValidator(integer_validator)
+
+        #Placeholders for inputs
+        self.samplesInput.setText(str(DEFAULT_SAMPLES))
+        self.seedInput.setPlaceholderText("Random if empty")
+        self.workersInput.setPlaceholderText("All cores if empty")
+
+        self.runButton.clicked.connect(self.run_analysis)
+        self.setup_distribution_table()
+
+    def setup_distribution_table(self):
+        """
+        Fill the table with one row per uncertain plant parameter.
+        Args:
+            None
+        Returns:
+            None
+        """
+        names = self.analysis.get_uncertain_parameters()
+        descriptions = self.plant_model.get_parameter_descriptions()
+        tooltip = "\n".join(DISTRIBUTION_DESCRIPTIONS[kind] for kind in DISTRIBUTIONS)
+
+        self.distributionTable.setRowCount(len(names))
+        self.distributionTable.verticalHeader().setVisible(False)
+        self.distributionTable.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        for row, name in enumerate(names):
+            name_item = QTableWidgetItem(name)
+            name_item.setFlags(name_item.flags() & ~Qt.ItemIsEditable)
+            name_item.setToolTip(descriptions.get(name, name))
+            self.distributionTable.setItem(row, 0, name_item)
+
+            combo = QComboBox()
+            combo.addItems(DISTRIBUTIONS)
+            combo.setToolTip(tooltip)
+            combo.currentTextChanged.connect(lambda kind, row=row: self.on_distribution_changed(row, kind))
+            self.distributionTable.setCellWidget(row, 1, combo)
+            self.distributionTable.setItem(row, 2, QTableWidgetItem("0"))
+
+        if not names:
+            self.show_error(f"{self.plant_model.name} has no scalar parameters to sample.")
+            self.runButton.setEnabled(False)
+
+    def on_distribution_changed(self, row, kind):
+        """
+        Propose a default spread when a parameter becomes uncertain.
+        Args:
+            row (int): Table row of the parameter
+            kind (str): Selected distribution
+        Returns:
+            None
+        """
+        spread_item = self.distributionTable.item(row, 2)
+        if kind != "Fixed" and spread_item.text() in ("", "0"):
+            spread_item.setText(str(DEFAULT_SPREAD))
+
+    def show_error(self, message):
+        """
+        Display an error message below the settings.
+        Args:
+            message (str): Error message
+        Returns:
+            None
+        """
+        self.errorlabel.setText(message)
+        self.errorlabel.show()
+
+    def apply_distributions(self):
+        """
+        Copy the table settings into the analysis.
+        Args:
+            None
+        Returns:
+            str: Error message, empty if every row is valid
+        """
+        errors = []
+        for row in range(self.distributionTable.rowCount()):
+            name = self.distributionTable.item(row, 0).text()
+            kind = self.distributionTable.cellWidget(row, 1).currentText()
+            try:
+                spread = float(self.distributionTable.item(row, 2).text())
+            except ValueError:
+                errors.append(f"Error: Invalid spread for {name}.")
+                continue
+            error_log = self.analysis.set_distribution(name, kind, spread)
+            if error_log:
+                errors.append(f"{name}: {error_log}")
+        return "\n".join(errors)
+
+    def run_analysis(self):
+        """
+        Run the Monte Carlo analysis and display the results.
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.errorlabel.hide()
+        error_log = self.apply_distributions()
+        if error_log:
+            self.show_error(error_log)
+            return
+
+        num_samples = int(self.samplesInput.text() or 0)
+        seed = int(self.seedInput.text()) if self.seedInput.text() else None
+        workers = int(self.workersInput.text()) if self.workersInput.text() else None
+
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            result = self.analysis.run(num_samples, seed=seed, workers=workers)
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        if isinstance(result, str):
+            self.show_error(result)
+            return
+
+        # Show the seed so the run can be reproduced
+        self.seedInput.setText(str(result.seed))
+        lines = [f"Stable closed loops: {100 * result.get_stable_fraction():.1f}%"]
+        for name, statistics in result.get_metric_statistics().items():
+            lines.append(f"{name}: median {statistics['p50']:.4g} (5-95%: {statistics['p5']:.4g} to {statistics['p95']:.4g})")
+        self.statusLabel.setText("\n".join(lines))
+        self.display_figure(result.plot())
+
+    def display_figure(self, fig):
+        """
+        Replace the canvas content with a new figure.
+        Args:
+            fig (Figure): Matplotlib figure to display
+        Returns:
+            None
+        """
+        plot_container = self.findChild(QtWidgets.QWidget, "widget")
+        layout = plot_container.layout()
+        if layout is None:
+            layout = QVBoxLayout(plot_container)
+            layout.setContentsMargins(0, 0, 0, 0)
+        for i in reversed(range(layout.count())):
+            layout.itemAt(i).widget().setParent(None)
+
+        self.canvas = FigureCanvas(fig)
+        self.canvas.setStyleSheet("background-color: white;")
+        self.canvas.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        layout.addWidget(self.canvas)
+        self.canvas.draw()
@@ -2,7 +2,7 @@
 import os
 
 #Third-party imports
-from PyQt5.QtWidgets import QDialog, QVBoxLayout
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel, QFileDialog
 from PyQt5.uic import loadUi
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QDoubleValidator, QRegExpValidator
@@ -13,14 +13,17 @@ from PyQt5 import QtWidgets
 import control as ctrl
 import numpy as np
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 from matplotlib.figure import Figure
 
 #Local application imports
 from simulation_components.input import Input
 from simulation_components.controller_pid import ControllerPID
-from simulation_components.plant import Plant
+from simulation_components.plant import Plant, BallAndBeamPlant
 from simulation_components.sensor import Sensor
 from simulation_components.output import Output
+from simulation_components import instrumentation
+from simulation_components.data_export import export_output, EXPORT_FORMATS, EXPORT_TABLES
 
 class MplCanvas(FigureCanvas):
     def __init__(self, parent=None, width=5, height=4, dpi=100):
@@ -41,7 +44,7 @@ class MplCanvas(FigureCanvas):
         fig.tight_layout()
 
 class OutputPlotter(QDialog):
-    def __init__(self, plant_model: Plant, pid_controller: ControllerPID, input_signal: Input, sensor_model: Sensor, parent=None):
+    def __init__(self, plant_model: Plant, pid_controller: ControllerPID, input_signal: Input, sensor_model: Sensor, parent=None, output=None):
         """
         Initialize the output plotter.
         Args:
@@ -50,6 +53,7 @@ class OutputPlotter(QDialog):
             input_signal (Input): The input signal.
             sensor_model (Sensor): The sensor model.
             parent: The parent widget.
+            output (Output): Output of the project, kept between openings so its results stay cached. A new one if None.
         Returns:
             None
         """
@@ -66,7 +70,11 @@ class OutputPlotter(QDialog):
 
         #print("Output Initialized:", sensor_model.get_latex_equation())
         # Business Logic 
-        self.output = Output(pid_object=self.pid_controller, plant_object=self.plant_model, input_params=self.input_signal, sensor_object=sensor_model)
+        self.sensor_model = sensor_model
+        self.output = output
+        if self.output is None:
+            self.output = Output(pid_object=self.pid_controller, plant_object=self.plant_model, input_params=self.input_signal, sensor_object=sensor_model,
+                                 use_reduced_models=True)
 
         # Config UI
         self.setup_ui()
@@ -91,10 +99,120 @@ class OutputPlotter(QDialog):
         # Button Configuration
         #self.plotButton.clicked.connect(self.plot_output)
         # Combobox configuration
-        self.plotTypecomboBox.addItems(["Step Response", "Impulse Response", "Bode Plot", "Nyquist Plot", "Root Locus", "Pole-Zero Plot"])
+        self.plotTypecomboBox.addItems(["Step Response", "Reference Response", "Loop Signals", "Impulse Response", "Bode Plot", "Nyquist Plot", "Root Locus", "Pole-Zero Plot"])
+        if isinstance(self.plant_model, BallAndBeamPlant):
+            # Nonlinear model is only available for the Ball and Beam plant
+            self.plotTypecomboBox.addItem("Nonlinear Step Response")
         self.plotTypecomboBox.setCurrentIndex(0)
+        if self.input_signal.get_signal_type() != "Step":
+            self.plotTypecomboBox.setCurrentText("Reference Response")
         self.plotTypecomboBox.currentIndexChanged.connect(self.plot_output)
-        
+
+        # Reduced models are only offered when a model reduction is enabled
+        summary = self.get_reduction_summary()
+        self.reducedModelCheckBox.setVisible(bool(summary))
+        self.reducedModelCheckBox.setText(f"Use reduced models ({summary})")
+        self.reducedModelCheckBox.setToolTip("Reduced models speed up the plots.\nUncheck to plot with the full models.")
+        self.reducedModelCheckBox.setChecked(self.output.use_reduced_models)
+        self.reducedModelCheckBox.toggled.connect(self.on_reduced_models_toggled)
+
+        # Timing overlay: records the stages of every plot and shows those of the last one
+        self.profilerCheckBox.setChecked(instrumentation.is_enabled())
+        self.profilerCheckBox.setToolTip("Time the stages of every plot.\n"
+                                         f"Set {instrumentation.TRACE_ENV_VARIABLE}=trace.json to save a Chrome trace at exit.")
+        self.profilerCheckBox.toggled.connect(self.on_profiler_toggled)
+        self.profilerLabel = None
+
+        # Export of the numerical results behind every plot
+        self.exportButton.setToolTip("Save the time response, Bode, Nyquist, root locus and pole/zero data.\n"
+                                     "CSV and Parquet write one file per table, NPZ one archive.\n\n"
+                                     + "\n".join(EXPORT_TABLES.values()))
+        self.exportButton.clicked.connect(self.on_export_button_clicked)
+
+    def get_reduction_summary(self):
+        """
+        Describe the orders of the reduced plant and sensor.
+        Args:
+            None
+        Returns:
+            str: Full and reduced order of every reduced component, empty if none is reduced
+        """
+        parts = []
+        for label, component in (("plant", self.plant_model), ("sensor", self.sensor_model)):
+            if component.get_reduction_tolerance() is None:
+                continue
+            reduction = component.get_model_reduction()
+            if isinstance(reduction, str):
+                continue
+            order = reduction.get_order_for_tolerance(component.get_reduction_tolerance()) + reduction.get_unstable_order()
+            parts.append(f"{label}: {reduction.get_full_order()} \u2192 {order} states")
+        return ", ".join(parts)
+
+    def on_reduced_models_toggled(self, checked):
+        """
+        Switch between the reduced and the full models and redraw the plot.
+        Args:
+            checked (bool): Use the reduced models
+        Returns:
+            None
+        """
+        self.output.set_use_reduced_models(checked)
+        self.plot_output()
+
+    def on_export_button_clicked(self):
+        """
+        Ask for a file and export the numerical results in the chosen format.
+        Args:
+            None
+        Returns:
+            None
+        """
+        filters = {f"{file_format} files (*{extension})": file_format for file_format, extension in EXPORT_FORMATS.items()}
+        file_path, selected_filter = QFileDialog.getSaveFileName(self, "Export Data", self.plant_model.name, ";;".join(filters))
+        if not file_path:
+            return
+        paths = export_output(self.output, file_path, filters[selected_filter])
+        if isinstance(paths, str):
+            self.errorlabel.setText(paths)
+            self.errorlabel.show()
+            return
+        self.errorlabel.hide()
+
+    def on_profiler_toggled(self, checked):
+        """
+        Turn the stage timing on or off and redraw the plot.
+        Args:
+            checked (bool): Record the stages and show the overlay
+        Returns:
+            None
+        """
+        instrumentation.enable(checked)
+        self.plot_output()
+
+    def show_profiler_overlay(self, spans, recomputed=()):
+        """
+        Show the stages of the last plot, and the results it recomputed, on top of the canvas.
+        Args:
+            spans (list): Spans recorded while the plot was built
+            recomputed (list): Results recomputed since the previous plot (see Output.get_recomputed_nodes)
+        Returns:
+            None
+        """
+        plot_container = self.findChild(QtWidgets.QWidget, "widget")
+        if self.profilerLabel is None:
+            self.profilerLabel = QLabel(plot_container)
+            self.profilerLabel.setStyleSheet("background-color: rgba(255, 255, 255, 200); color: black;"
+                                             "font-family: monospace; padding: 4px;")
+            self.profilerLabel.setAttribute(Qt.WA_TransparentForMouseEvents)
+        if not self.profilerCheckBox.isChecked() or not spans:
+            self.profilerLabel.hide()
+            return
+        self.profilerLabel.setText(instrumentation.format_spans(spans) + "\nRecomputed: " + (", ".join(recomputed) or "nothing (cached)"))
+        self.profilerLabel.adjustSize()
+        self.profilerLabel.move(8, 8)
+        self.profilerLabel.raise_()
+        self.profilerLabel.show()
+
 
     def setup_plot_canvas(self):
         """
@@ -130,8 +248,11 @@ class OutputPlotter(QDialog):
             None
         """
         plot_type = self.plotTypecomboBox.currentText()
-        self.display_plot_data(plot_type)
+        with instrumentation.capture() as spans:
+            self.display_plot_data(plot_type)
+        self.show_profiler_overlay(spans, self.output.get_recomputed_nodes())
 
+    @instrumentation.traced("OutputPlotter.display_plot_data")
     def display_plot_data(self, plot_type):
         """
         Display the plot data on the canvas.
@@ -145,6 +266,12 @@ class OutputPlotter(QDialog):
             if plot_type == "Step Response":
                 fig = self.output.plot_step_response()
             
+            elif plot_type == "Reference Response":
+                fig = self.output.plot_reference_response()
+
+            elif plot_type == "Loop Signals":
+                fig = self.output.plot_loop_signals()
+
             elif plot_type == "Impulse Response":
                 fig = self.output.plot_impulse_response()
             
@@ -159,6 +286,9 @@ class OutputPlotter(QDialog):
 
             elif plot_type == "Pole-Zero Plot":
                 fig = self.output.plot_pole_zero()
+
+            elif plot_type == "Nonlinear Step Response":
+                fig = self.output.plot_nonlinear_step_response()
             
             else:
                 print("No valid plot type selected.")
@@ -179,18 +309,21 @@ class OutputPlotter(QDialog):
                             layout.itemAt(i).widget().setParent(None)
                     
                     # Create new canvas with new figure
-                    new_canvas = FigureCanvas(fig)
+                    with instrumentation.span("FigureCanvas.create"):
+                        new_canvas = FigureCanvas(fig)
                     new_canvas.setStyleSheet("background-color: white;")
                     new_canvas.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
                     
-                    # Add to layout
+                    # Add to layout, with a toolbar to zoom (time responses are redrawn exactly on zoom)
+                    layout.addWidget(NavigationToolbar(new_canvas, self))
                     layout.addWidget(new_canvas)
                     
                     # Replace canvas reference
                     self.canvas = new_canvas
                     
                     # Adjust Size
-                    self.canvas.draw()
+                    with instrumentation.span("FigureCanvas.draw"):
+                        self.canvas.draw()
                     plot_container.updateGeometry()
                     
             else:
@@ -0,0 +1,315 @@
+#Standard library imports
+import os
+import time
+
+#Third-party imports
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QComboBox, QTableWidgetItem, QApplication, QHeaderView
+from PyQt5.uic import loadUi
+from PyQt5.QtGui import QRegExpValidator
+from PyQt5.QtCore import QRegExp
+from PyQt5 import QtWidgets
+
+#Scientific imports
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+
+#Local application imports
+from simulation_components.input import Input
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.plant import Plant
+from simulation_components.sensor import Sensor
+from simulation_components.metrics import STEP_METRIC_DESCRIPTIONS
+from simulation_components.parameter_sweep import ParameterSweep, AXIS_SCALES, DEFAULT_POINTS
+
+# Minimum time between two redraws of the partial results
+REDRAW_INTERVAL = 0.5
+
+# Range proposed for a new axis, relative to the current value of the parameter
+DEFAULT_RANGE = (0.5, 2.0)
+
+# Text of the vertical axis selector when the metric is plotted as a curve
+NO_AXIS = "None (curve)"
+
+class ParameterSweepDialog(QDialog):
+    def __init__(self, plant_model: Plant, pid_controller: ControllerPID, input_signal: Input, sensor_model: Sensor, parent=None):
+        """
+        Dialog to sweep plant parameters, PID gains and input fields over a grid and map the step response metrics.
+        Args:
+            plant_model (Plant): The plant model.
+            pid_controller (ControllerPID): The PID controller.
+            input_signal (Input): The step input and time grid.
+            sensor_model (Sensor): The sensor model.
+            parent: The parent widget.
+        Returns:
+            None
+        """
+        super().__init__(parent)
+        ui_path = os.path.join(os.path.dirname(__file__), "../ui/parameter_sweep.ui")
+        loadUi(ui_path, self)
+
+        self.plant_model = plant_model
+        self.sweep = ParameterSweep(pid_controller, plant_model, input_signal, sensor_model)
+        self.result = None
+        self.canvas = None
+        self.stop_requested = False
+        self.last_redraw = 0.0
+
+        self.setWindowTitle(self.plant_model.name + " - Parameter Sweep")
+        self.errorlabel.hide()
+
+        self.parameters = [f"{group}: {name}" for group, names in self.sweep.get_sweepable_parameters().items() for name in names]
+        self.axisTable.verticalHeader().setVisible(False)
+        self.axisTable.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+
+        self.workersInput.setValidator(QRegExpValidator(QRegExp(r"^\d+$")))
+        self.workersInput.setPlaceholderText("All cores if empty")
+        for name, description in STEP_METRIC_DESCRIPTIONS.items():
+            self.metricComboBox.addItem(description, name)
+        self.stopButton.setEnabled(False)
+
+        self.addAxisButton.clicked.connect(lambda: self.add_axis_row())
+        self.removeAxisButton.clicked.connect(self.remove_axis_row)
+        self.runButton.clicked.connect(self.run_sweep)
+        self.stopButton.clicked.connect(self.request_stop)
+        self.metricComboBox.currentIndexChanged.connect(lambda index: self.display_result())
+        self.xAxisComboBox.currentIndexChanged.connect(lambda index: self.display_result())
+        self.yAxisComboBox.currentIndexChanged.connect(lambda index: self.display_result())
+
+        # Start with a two dimensional grid: the first plant parameter against kp
+        plant_parameters = self.sweep.get_sweepable_parameters()["Plant"]
+        if plant_parameters:
+            self.add_axis_row(f"Plant: {plant_parameters[0]}")
+        self.add_axis_row("PID: kp")
+
+    def add_axis_row(self, parameter=None):
+        """
+        Add a table row for a new grid axis around the current value of the parameter.
+        Args:
+            parameter (str or None): 'Group: name' of the parameter, the first unused one if None
+        Returns:
+            None
+        """
+        used = {self.axisTable.cellWidget(row, 0).currentText() for row in range(self.axisTable.rowCount())}
+        if parameter is None:
+            parameter = next((p for p in self.parameters if p not in used), self.parameters[0])
+
+        row = self.axisTable.rowCount()
+        self.axisTable.insertRow(row)
+        combo = QComboBox()
+        combo.addItems(self.parameters)
+        combo.setCurrentText(parameter)
+        combo.currentTextChanged.connect(lambda text, combo=combo: self.fill_default_range(self.find_row(combo)))
+        self.axisTable.setCellWidget(row, 0, combo)
+
+        scale = QComboBox()
+        scale.addItems(AXIS_SCALES)
+        scale.setToolTip("Log spaces the values geometrically (positive ranges only)")
+        self.axisTable.setCellWidget(row, 4, scale)
+        self.axisTable.setItem(row, 3, QTableWidgetItem(str(DEFAULT_POINTS)))
+        self.fill_default_range(row)
+
+    def find_row(self, widget):
+        """
+        Return the table row holding a cell widget.
+        Args:
+            widget (QWidget): Cell widget
+        Returns:
+            int: Row index
+        """
+        for row in range(self.axisTable.rowCount()):
+            if self.axisTable.cellWidget(row, 0) is widget:
+                return row
+        return -1
+
+    def fill_default_range(self, row):
+        """
+        Propose a range around the current value of the parameter of a row.
+        Args:
+            row (int): Table row
+        Returns:
+            None
+        """
+        group, name = self.axisTable.cellWidget(row, 0).currentText().split(": ")
+        nominal = self.sweep.get_nominal_value(group, name)
+        if nominal == 0:
+            start, stop = 0.0, 1.0
+        else:
+            start, stop = sorted((nominal * DEFAULT_RANGE[0], nominal * DEFAULT_RANGE[1]))
+        self.axisTable.setItem(row, 1, QTableWidgetItem(f"{start:.4g}"))
+        self.axisTable.setItem(row, 2, QTableWidgetItem(f"{stop:.4g}"))
+
+    def remove_axis_row(self):
+        """
+        Remove the selected axis row, or the last one if none is selected.
+        Args:
+            None
+        Returns:
+            None
+        """
+        row = self.axisTable.currentRow()
+        if row < 0:
+            row = self.axisTable.rowCount() - 1
+        if row >= 0:
+            self.axisTable.removeRow(row)
+
+    def show_error(self, message):
+        """
+        Display an error message below the settings.
+        Args:
+            message (str): Error message
+        Returns:
+            None
+        """
+        self.errorlabel.setText(message)
+        self.errorlabel.show()
+
+    def apply_axes(self):
+        """
+        Copy the table settings into the sweep.
+        Args:
+            None
+        Returns:
+            str: Error message, empty if every row is valid
+        """
+        self.sweep.clear_axes()
+        errors = []
+        for row in range(self.axisTable.rowCount()):
+            group, name = self.axisTable.cellWidget(row, 0).currentText().split(": ")
+            try:
+                start = float(self.axisTable.item(row, 1).text())
+                stop = float(self.axisTable.item(row, 2).text())
+                points = int(self.axisTable.item(row, 3).text())
+            except ValueError:
+                errors.append(f"Error: Invalid range for {name}.")
+                continue
+            error_log = self.sweep.add_axis(group, name, start, stop, points, self.axisTable.cellWidget(row, 4).currentText())
+            if error_log:
+                errors.append(error_log)
+        return "\n".join(errors)
+
+    def update_axis_selectors(self):
+        """
+        List the swept parameters in the plot axis selectors.
+        Args:
+            None
+        Returns:
+            None
+        """
+        labels = [axis.get_label() for axis in self.sweep.get_axes()]
+        for combo in (self.xAxisComboBox, self.yAxisComboBox):
+            combo.blockSignals(True)
+            combo.clear()
+        self.xAxisComboBox.addItems(labels)
+        self.yAxisComboBox.addItem(NO_AXIS)
+        self.yAxisComboBox.addItems(labels)
+        self.yAxisComboBox.setCurrentIndex(2 if len(labels) > 1 else 0)
+        for combo in (self.xAxisComboBox, self.yAxisComboBox):
+            combo.blockSignals(False)
+
+    def run_sweep(self):
+        """
+        Run the sweep, redrawing the partial results as chunks complete.
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.errorlabel.hide()
+        error_log = self.apply_axes()
+        if error_log:
+            self.show_error(error_log)
+            return
+
+        workers = int(self.workersInput.text()) if self.workersInput.text() else None
+        self.update_axis_selectors()
+        self.stop_requested = False
+        self.last_redraw = 0.0
+        self.runButton.setEnabled(False)
+        self.stopButton.setEnabled(True)
+        self.statusLabel.setText(f"Simulating {self.sweep.get_grid_size()} grid points...")
+        try:
+            result = self.sweep.run(workers=workers, callback=self.on_chunk_done)
+        finally:
+            self.runButton.setEnabled(True)
+            self.stopButton.setEnabled(False)
+
+        if isinstance(result, str):
+            self.show_error(result)
+            return
+        self.result = result
+        self.update_status()
+        self.display_result()
+
+    def on_chunk_done(self, result):
+        """
+        Show the partial results of a running sweep and keep the dialog responsive.
+        Args:
+            result (SweepResult): Partially filled result
+        Returns:
+            bool: False to stop the sweep
+        """
+        self.result = result
+        if time.perf_counter() - self.last_redraw > REDRAW_INTERVAL:
+            self.update_status()
+            self.display_result()
+            self.last_redraw = time.perf_counter()
+        QApplication.processEvents()
+        return not self.stop_requested
+
+    def request_stop(self):
+        """
+        Stop the running sweep after the current chunk.
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.stop_requested = True
+
+    def update_status(self):
+        """
+        Show the progress and the fraction of stable closed loops.
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.statusLabel.setText(f"Done: {100 * self.result.get_progress():.0f}% of {self.result.done.size} grid points\n"
+                                 f"Stable closed loops: {100 * self.result.get_stable_fraction():.1f}%")
+
+    def display_result(self):
+        """
+        Plot the selected metric over the selected axes.
+        Args:
+            None
+        Returns:
+            None
+        """
+        if self.result is None or self.xAxisComboBox.currentIndex() < 0:
+            return
+        x_axis = self.xAxisComboBox.currentIndex()
+        y_axis = self.yAxisComboBox.currentIndex() - 1
+        if y_axis < 0 or y_axis == x_axis:
+            y_axis = None
+        self.display_figure(self.result.plot(self.metricComboBox.currentData(), x_axis, y_axis))
+
+    def display_figure(self, fig):
+        """
+        Replace the canvas content with a new figure.
+        Args:
+            fig (Figure): Matplotlib figure to display
+        Returns:
+            None
+        """
+        plot_container = self.findChild(QtWidgets.QWidget, "widget")
+        layout = plot_container.layout()
+        if layout is None:
+            layout = QVBoxLayout(plot_container)
+            layout.setContentsMargins(0, 0, 0, 0)
+        for i in reversed(range(layout.count())):
+            layout.itemAt(i).widget().setParent(None)
+
+        self.canvas = FigureCanvas(fig)
+        self.canvas.setStyleSheet("background-color: white;")
+        self.canvas.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        layout.addWidget(self.canvas)
+        self.canvas.draw()
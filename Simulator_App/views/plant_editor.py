@@ -11,7 +11,7 @@ from PyQt5.QtCore import QRegExp, QLocale
 
 # Local application imports
 from simulation_components.plant import Plant
-from utils.input_utils import simulator_create_pixmap_equation
+from utils.equation_preview import EquationPreview
 
 
 class PlantEditor(QDialog):
@@ -40,6 +40,7 @@ class PlantEditor(QDialog):
 
         #Plant label configuration
         self.plantLabel.setAlignment(Qt.AlignCenter)
+        self.plant_preview = EquationPreview(self.plantLabel)
 
         #Parameter descriptions 
         descriptions = self.plant_controller.get_parameter_descriptions()
@@ -76,6 +77,11 @@ class PlantEditor(QDialog):
             getattr(self, f"param{j}Input").hide()
 
         
+        # Delay input configuration
+        self.delayInput.setValidator(QRegExpValidator(QRegExp(r"^\d+(\.\d*)?$")))  # Non-negative decimal numbers
+        self.delayInput.setPlaceholderText("e.g., 0.1 for 100 ms")
+        self.delayLabelInfo.setToolTip(self.plant_controller.get_delay_description())
+
         # Initialize Plant Label Preview
         self.update_plant_preview()
 
@@ -89,6 +95,7 @@ class PlantEditor(QDialog):
 
         # Load current values from the model (if any)
         self.load_from_model()
+        self.plant_preview.flush()
 
     def load_from_model(self):
         """
@@ -108,6 +115,8 @@ class PlantEditor(QDialog):
             else:
                 line_edit.setText(str(value))
 
+        self.delayInput.setText(str(self.plant_controller.get_delay()))
+
 
     def update_plant_preview(self):
         """
@@ -134,18 +143,12 @@ class PlantEditor(QDialog):
             # Ask plant controller for LaTeX equation
             latex_eq = self.plant_controller.get_latex_equation(**params)
 
-            pixmap = simulator_create_pixmap_equation(latex_eq, fontsize=10)
-            pixmap = pixmap.scaled(
-                self.plantLabel.width(),
-                self.plantLabel.height(),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-            self.plantLabel.setPixmap(pixmap)
+            self.plant_preview.request(latex_eq)
         
         except Exception as e:
             # If there's an error, show a message or leave the preview empty
             #print(f"Error updating preview: {e}")
+            self.plant_preview.cancel()
             self.plantLabel.setText("Error: Invalid input")
 
     def apply_changes_to_model(self):
@@ -176,14 +179,26 @@ class PlantEditor(QDialog):
 
         # Save old parameters for comparison
         old_params = self.plant_controller.get_parameters().copy()
+        old_delay = self.plant_controller.get_delay()
 
         #Try to update parameters in the model
         self.plant_controller.set_parameters(**params)
         tf = self.plant_controller.get_transfer_function()
 
+        # Validate and apply the transport delay
+        delay_text = self.delayInput.text()
+        if not isinstance(tf, str) and delay_text:
+            try:
+                delay_error = self.plant_controller.set_delay(float(delay_text))
+            except ValueError:
+                delay_error = f"Error: Invalid value for Delay ({delay_text})."
+            if delay_error:
+                tf = delay_error
+
         if isinstance(tf, str):  # An error message was returned
 
             self.plant_controller.set_parameters(**old_params) #Revert to old parameters
+            self.plant_controller.set_delay(old_delay)
             self.errorLabel.show()
             self.errorLabelInfo.show()
             self.errorLabelInfo.setToolTip(tf) # Show error message as tooltip
@@ -208,4 +223,5 @@ class PlantEditor(QDialog):
         """
         for i in range(1, 7):
             getattr(self, f"param{i}Input").clear()
+        self.delayInput.clear()
         self.update_plant_preview()
\ No newline at end of file
@@ -0,0 +1,191 @@
+#Standard library imports
+import os
+
+#Third-party imports
+from PyQt5.QtWidgets import QDialog, QVBoxLayout
+from PyQt5.uic import loadUi
+from PyQt5 import QtWidgets
+
+#Scientific imports
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+
+#Local application imports
+from simulation_components.input import Input
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.plant import Plant
+from simulation_components.sensor import Sensor
+from simulation_components.run_comparison import RunComparison, COMPARISON_VIEWS
+from utils.file_utils import get_project_file, extract_project_from_file
+
+class RunComparisonDialog(QDialog):
+    def __init__(self, comparison: RunComparison, project_name, plant_model: Plant, pid_controller: ControllerPID, input_signal: Input, sensor_model: Sensor, parent=None):
+        """
+        Dialog overlaying the step, Bode and pole-zero results of pinned configurations.
+        Args:
+            comparison (RunComparison): Pinned runs and their cached results, kept by the simulator between dialogs.
+            project_name (str): Name of the current project, used to label its pinned runs.
+            plant_model (Plant): The plant model.
+            pid_controller (ControllerPID): The PID controller.
+            input_signal (Input): The input signal.
+            sensor_model (Sensor): The sensor model.
+            parent: The parent widget.
+        Returns:
+            None
+        """
+        super().__init__(parent)
+        ui_path = os.path.join(os.path.dirname(__file__), "../ui/run_comparison.ui")
+        loadUi(ui_path, self)
+
+        self.comparison = comparison
+        self.project_name = project_name
+        self.plant_model = plant_model
+        self.pid_controller = pid_controller
+        self.input_signal = input_signal
+        self.sensor_model = sensor_model
+        self.canvas = None
+
+        self.setWindowTitle(self.plant_model.name + " - Run Comparison")
+        self.errorlabel.hide()
+        self.viewComboBox.addItems(COMPARISON_VIEWS)
+        self.pinButton.setToolTip("Pin a copy of the current configuration.\nLater edits in the simulator do not change it.")
+
+        self.pinButton.clicked.connect(self.pin_current_project)
+        self.addFileButton.clicked.connect(self.add_project_file)
+        self.removeButton.clicked.connect(self.remove_selected_run)
+        self.viewComboBox.currentIndexChanged.connect(lambda index: self.display_comparison())
+        self.closeButton.clicked.connect(self.accept)
+
+        self.update_run_list()
+        self.display_comparison()
+
+    def get_unique_label(self, label):
+        """
+        Append a counter to a run label already in use.
+        Args:
+            label (str): Proposed label
+        Returns:
+            str: Label not used by any pinned run
+        """
+        labels = {run.label for run in self.comparison.get_runs()}
+        unique_label, counter = label, 2
+        while unique_label in labels:
+            unique_label = f"{label} #{counter}"
+            counter += 1
+        return unique_label
+
+    def show_error(self, message):
+        """
+        Display an error message below the run list.
+        Args:
+            message (str): Error message
+        Returns:
+            None
+        """
+        self.errorlabel.setText(message)
+        self.errorlabel.show()
+
+    def pin_current_project(self):
+        """
+        Pin a copy of the configuration open in the simulator.
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.errorlabel.hide()
+        error_log = self.comparison.add_run(self.get_unique_label(self.project_name), self.pid_controller,
+                                            self.plant_model, self.input_signal, self.sensor_model)
+        if error_log:
+            self.show_error(error_log)
+            return
+        self.update_run_list()
+        self.display_comparison()
+
+    def add_project_file(self):
+        """
+        Pin the configuration saved in a project file.
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.errorlabel.hide()
+        file_path = get_project_file(self)
+        if file_path is None:
+            return
+        if file_path == "INVALID":
+            self.show_error("Error: Project files have the .txt extension.")
+            return
+        project = extract_project_from_file(file_path)
+        if isinstance(project, str):
+            self.show_error(project)
+            return
+        error_log = self.comparison.add_project(self.get_unique_label(project["Project"]), project)
+        if error_log:
+            self.show_error(error_log)
+            return
+        self.update_run_list()
+        self.display_comparison()
+
+    def remove_selected_run(self):
+        """
+        Unpin the selected run, or the last one if none is selected.
+        Args:
+            None
+        Returns:
+            None
+        """
+        runs = self.comparison.get_runs()
+        if not runs:
+            return
+        row = self.runList.currentRow()
+        self.comparison.remove_run(runs[row if row >= 0 else -1].label)
+        self.update_run_list()
+        self.display_comparison()
+
+    def update_run_list(self):
+        """
+        List the pinned runs and the work saved by the shared computation.
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.runList.clear()
+        runs = self.comparison.get_runs()
+        self.runList.addItems([run.get_description() for run in runs])
+        plants = {run.get_key()[0] for run in runs}
+        sensors = {run.get_key()[1] for run in runs}
+        self.statusLabel.setText(f"{len(runs)} runs sharing {len(plants)} plant and {len(sensors)} sensor models")
+
+    def display_comparison(self):
+        """
+        Overlay the selected view of every pinned run.
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.errorlabel.hide()
+        plot_container = self.findChild(QtWidgets.QWidget, "widget")
+        layout = plot_container.layout()
+        if layout is None:
+            layout = QVBoxLayout(plot_container)
+            layout.setContentsMargins(0, 0, 0, 0)
+        for i in reversed(range(layout.count())):
+            layout.itemAt(i).widget().setParent(None)
+
+        view = self.viewComboBox.currentText()
+        fig = self.comparison.plot(view)
+        if fig is None:
+            self.canvas = None
+            return
+        failed = self.comparison.get_failed_runs(view)
+        if failed:
+            self.show_error(f"Error: No {view.lower()} for: {', '.join(failed)}")
+
+        self.canvas = FigureCanvas(fig)
+        self.canvas.setStyleSheet("background-color: white;")
+        self.canvas.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        layout.addWidget(self.canvas)
+        self.canvas.draw()
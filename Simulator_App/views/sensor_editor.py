@@ -11,7 +11,7 @@ from PyQt5.QtCore import QRegExp, QLocale
 
 # Local application imports
 from simulation_components.sensor import Sensor
-from utils.input_utils import simulator_create_pixmap_equation
+from utils.equation_preview import EquationPreview
 
 
 class SensorEditor(QDialog):
@@ -40,6 +40,7 @@ class SensorEditor(QDialog):
 
         # Sensor label configuration
         self.sensorLabel.setAlignment(Qt.AlignCenter)
+        self.sensor_preview = EquationPreview(self.sensorLabel)
 
         # Set tooltips
         self.sensorNumeratorLabelInfo.setToolTip(self.sensor_controller.get_parameter_descriptions()["Numerator"])
@@ -55,6 +56,11 @@ class SensorEditor(QDialog):
         self.sensorNumeratorInput.setPlaceholderText("e.g., 1, 0, 5 for s^2 + 5")
         self.sensorDenominatorInput.setPlaceholderText("e.g., 1, 0, 5 for s^2 + 5")
 
+        # Delay input configuration
+        self.delayInput.setValidator(QRegExpValidator(QRegExp(r"^\d+(\.\d*)?$")))  # Non-negative decimal numbers
+        self.delayInput.setPlaceholderText("e.g., 0.1 for 100 ms")
+        self.delayLabelInfo.setToolTip(self.sensor_controller.get_delay_description())
+
         # Real-time connection of inputs to preview
         self.sensorNumeratorInput.textChanged.connect(self.update_sensor_preview)
         self.sensorDenominatorInput.textChanged.connect(self.update_sensor_preview)
@@ -64,6 +70,7 @@ class SensorEditor(QDialog):
 
         # Load current values from the model
         self.load_from_model()
+        self.sensor_preview.flush()
 
     def load_from_model(self):
         """
@@ -95,6 +102,8 @@ class SensorEditor(QDialog):
             else:
                 den_str = str(den_list)
             self.sensorDenominatorInput.setText(den_str)
+
+        self.delayInput.setText(str(self.sensor_controller.get_delay()))
             
     def update_sensor_preview(self):
         """
@@ -119,19 +128,13 @@ class SensorEditor(QDialog):
             # Ask sensor controller for LaTeX equation
             latex_eq = self.sensor_controller.get_latex_equation(**params)
             
-            pixmap = simulator_create_pixmap_equation(latex_eq, fontsize=10)
-            pixmap = pixmap.scaled(
-                self.sensorLabel.width(),
-                self.sensorLabel.height(),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-            self.sensorLabel.setPixmap(pixmap)
+            self.sensor_preview.request(latex_eq)
         
         except Exception as e:
             # If there's an error, show a message or leave the preview empty
             #print(f"Error updating preview: {e}")
             # Optional: show an error message in the preview
+            self.sensor_preview.cancel()
             self.sensorLabel.setText("Error: Invalid input")
 
     def apply_changes_to_model(self):
@@ -155,6 +158,7 @@ class SensorEditor(QDialog):
 
         # Save old parameters for comparison
         old_params = self.sensor_controller.get_parameters().copy()
+        old_delay = self.sensor_controller.get_delay()
 
         # Use the names expected by Sensor (that extends PersonalizedPlant)
         self.sensor_controller.set_parameters(
@@ -164,12 +168,23 @@ class SensorEditor(QDialog):
         
         tf = self.sensor_controller.get_transfer_function()
 
+        # Validate and apply the transport delay
+        delay_text = self.delayInput.text()
+        if not isinstance(tf, str) and delay_text:
+            try:
+                delay_error = self.sensor_controller.set_delay(float(delay_text))
+            except ValueError:
+                delay_error = f"Error: Invalid value for Delay ({delay_text})."
+            if delay_error:
+                tf = delay_error
+
         if isinstance(tf, str):  # An error message was returned
             # Revert to old parameters
             self.sensor_controller.set_parameters(
                 Numerator=old_params.get('Numerator'),
                 Denominator=old_params.get('Denominator')
             )
+            self.sensor_controller.set_delay(old_delay)
             self.errorLabel.show()
             self.errorLabelInfo.show()
             self.errorLabelInfo.setToolTip(tf)  # Show error message as tooltip
@@ -193,4 +208,5 @@ class SensorEditor(QDialog):
         """
         self.sensorNumeratorInput.clear()
         self.sensorDenominatorInput.clear()
+        self.delayInput.clear()
         self.update_sensor_preview()
\ No newline at end of file
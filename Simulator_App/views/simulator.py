@@ -13,15 +13,23 @@ from simulation_components.controller_pid import ControllerPID
 from simulation_components.plant import get_plant
 from simulation_components.input import Input
 from simulation_components.sensor import Sensor
+from simulation_components.output import Output
+from simulation_components.run_comparison import RunComparison
 from utils.clickable_label import ClickableLabel
 from utils.input_utils import simulator_create_pixmap_equation
-from utils.file_utils import save_simulation_config, extract_params_from_file, save_simulation_config_as
+from utils.file_utils import save_simulation_config, extract_params_from_file, save_simulation_config_as, extract_delays_from_file, extract_signal_from_file
 
 # Local application imports
 from views.control_editor import ControlEditor
 from views.input_editor import InputEditor
 from views.plant_editor import PlantEditor
 from views.output_plotter import OutputPlotter
+from views.monte_carlo_analysis import MonteCarloAnalysisDialog
+from views.live_tuning import LiveTuning
+from views.model_reduction import ModelReduction
+from views.parameter_sweep import ParameterSweepDialog
+from views.run_comparison import RunComparisonDialog
+from views.stability_map import StabilityMapDialog
 from views.sensor_editor import SensorEditor
 
 
@@ -51,6 +59,11 @@ class Simulator(QMainWindow):
         self.input_controller = Input()
         self.sensor_controller = Sensor()
 
+        # Output of the project, its results stay cached between the openings of the output plotter
+        self.create_output()
+
+        # Runs pinned for comparison, kept while the project is open
+        self.run_comparison = RunComparison()
 
         # Make labels clickable
         label_map = {
@@ -111,6 +124,12 @@ class Simulator(QMainWindow):
         #Menu bar actions
         self.actionSave.triggered.connect(self.on_action_save_triggered) 
         self.actionSave_As.triggered.connect(self.on_action_save_as_triggered) 
+        self.actionLive_Tuning.triggered.connect(self.on_action_live_tuning_triggered)
+        self.actionMonte_Carlo.triggered.connect(self.on_action_monte_carlo_triggered)
+        self.actionModel_Reduction.triggered.connect(self.on_action_model_reduction_triggered)
+        self.actionParameter_Sweep.triggered.connect(self.on_action_parameter_sweep_triggered)
+        self.actionCompare_Runs.triggered.connect(self.on_action_compare_runs_triggered)
+        self.actionStability_Map.triggered.connect(self.on_action_stability_map_triggered)
 
         self.update_window_title()
     # Update window Title
@@ -135,7 +154,7 @@ class Simulator(QMainWindow):
             None
         """
         #print("Input label clicked")
-        dialog = InputEditor(self.input_controller, self)
+        dialog = InputEditor(self.input_controller, self, self.controller_pid, self.plant_controller, self.sensor_controller)
         result = dialog.exec_()
         if result == QDialog.Accepted:
             #print("Input configuration accepted")
@@ -308,7 +327,7 @@ class Simulator(QMainWindow):
         self.controlLabel.setDisabled(True)
         self.plantLabel.setDisabled(True)
         self.sensorLabel.setDisabled(True)
-        dialog = OutputPlotter(self.plant_controller, self.controller_pid, self.input_controller, self.sensor_controller, self)
+        dialog = OutputPlotter(self.plant_controller, self.controller_pid, self.input_controller, self.sensor_controller, self, output=self.output)
         result = dialog.exec_()
         self.inputLabel.setDisabled(False)
         self.controlLabel.setDisabled(False)
@@ -316,8 +335,95 @@ class Simulator(QMainWindow):
         self.sensorLabel.setDisabled(False)
 
     
+    def create_output(self):
+        """
+        Create the output of the current components, shared by every opening of the output plotter.
+        Editing one component only recomputes the results that depend on it.
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.output = Output(pid_object=self.controller_pid, plant_object=self.plant_controller, input_params=self.input_controller,
+                             sensor_object=self.sensor_controller, use_reduced_models=True)
+
     #--------------- End Output Label Methods ---------------
 
+    #--------------- Analysis Menu Methods ---------------
+
+    def on_action_live_tuning_triggered(self):
+        """
+        Handle the Live Tuning action to open the LiveTuning dialog.
+        Args:
+            None
+        Returns:
+            None
+        """
+        dialog = LiveTuning(self.plant_controller, self.controller_pid, self.input_controller, self.sensor_controller, self)
+        result = dialog.exec_()
+
+        if result == QDialog.Accepted:
+            self.update_control_label()
+
+    def on_action_monte_carlo_triggered(self):
+        """
+        Handle the Monte Carlo action to open the MonteCarloAnalysisDialog.
+        Args:
+            None
+        Returns:
+            None
+        """
+        dialog = MonteCarloAnalysisDialog(self.plant_controller, self.controller_pid, self.input_controller, self.sensor_controller, self)
+        dialog.exec_()
+
+    def on_action_model_reduction_triggered(self):
+        """
+        Handle the Model Reduction action to open the ModelReduction dialog.
+        Args:
+            None
+        Returns:
+            None
+        """
+        dialog = ModelReduction(self.plant_controller, self.sensor_controller, self)
+        dialog.exec_()
+
+    def on_action_parameter_sweep_triggered(self):
+        """
+        Handle the Parameter Sweep action to open the ParameterSweepDialog.
+        Args:
+            None
+        Returns:
+            None
+        """
+        dialog = ParameterSweepDialog(self.plant_controller, self.controller_pid, self.input_controller, self.sensor_controller, self)
+        dialog.exec_()
+
+    def on_action_compare_runs_triggered(self):
+        """
+        Handle the Compare Runs action to open the RunComparisonDialog.
+        Args:
+            None
+        Returns:
+            None
+        """
+        project_name = os.path.splitext(os.path.basename(self.file_path))[0]
+        dialog = RunComparisonDialog(self.run_comparison, project_name, self.plant_controller, self.controller_pid,
+                                     self.input_controller, self.sensor_controller, self)
+        dialog.exec_()
+
+    def on_action_stability_map_triggered(self):
+        """
+        Handle the Stability Map action to open the StabilityMapDialog.
+        Args:
+            None
+        Returns:
+            None
+        """
+        dialog = StabilityMapDialog(self.plant_controller, self.controller_pid, self.sensor_controller, self)
+        dialog.exec_()
+
+    #--------------- End Analysis Menu Methods ---------------
+
     #--------------- Reset Button Methods ---------------
 
     def on_reset_button_clicked(self):
@@ -350,6 +456,7 @@ class Simulator(QMainWindow):
             self.plant_controller = get_plant(self.plant_type)
             self.input_controller = Input()
             self.sensor_controller = Sensor()
+            self.create_output()
 
             self.update_control_label()
             self.update_plant_label()
@@ -381,6 +488,7 @@ class Simulator(QMainWindow):
         plant_params = self.plant_controller.get_parameters()
         input_params = self.input_controller.get_parameters()
         sensor_params = self.sensor_controller.get_parameters()
+        delay_params = self.get_delay_params()
         file_path = self.file_path
 
         save_simulation_config(
@@ -389,10 +497,25 @@ class Simulator(QMainWindow):
             plant_params=plant_params,
             input_params=input_params,
             sensor_params=sensor_params,
-            plant_type_fallback=self.plant_controller.name
+            plant_type_fallback=self.plant_controller.name,
+            delay_params=delay_params,
+            signal_params=self.input_controller.get_signal_parameters()
         )
 
 
+    def get_delay_params(self):
+        """
+        Collect the transport delays of the plant and the sensor for saving.
+        Args:
+            None
+        Returns:
+            dict: {'plant': float, 'sensor': float} delays in seconds
+        """
+        return {
+            "plant": self.plant_controller.get_delay(),
+            "sensor": self.sensor_controller.get_delay()
+        }
+
     #--------------- End Action Save Methods ---------------
 
 
@@ -413,6 +536,7 @@ class Simulator(QMainWindow):
         plant_params = self.plant_controller.get_parameters()
         input_params = self.input_controller.get_parameters()
         sensor_params = self.sensor_controller.get_parameters()
+        delay_params = self.get_delay_params()
         
         # Call function Save As
         new_file_path = save_simulation_config_as(
@@ -422,7 +546,9 @@ class Simulator(QMainWindow):
             plant_params=plant_params,
             input_params=input_params,
             sensor_params=sensor_params,
-            plant_type_fallback=self.plant_controller.name
+            plant_type_fallback=self.plant_controller.name,
+            delay_params=delay_params,
+            signal_params=self.input_controller.get_signal_parameters()
         )
         
         # If saved successfully, update the path and title
@@ -450,6 +576,9 @@ class Simulator(QMainWindow):
         """
         # Extract parameters from file using the separate function
         pid_params, plant_params, input_params, sensor_params = extract_params_from_file(self.file_path)
+        delay_params = extract_delays_from_file(self.file_path)
+        signal_warnings = []
+        signal_params = extract_signal_from_file(self.file_path, signal_warnings)
 
         # Apply parameters to model controllers
         try:
@@ -461,6 +590,9 @@ class Simulator(QMainWindow):
                 self.input_controller.set_parameters(**input_params)
             if sensor_params:
                 self.sensor_controller.set_parameters(Numerator=sensor_params["Numerator"], Denominator=sensor_params["Denominator"])
+            self.plant_controller.set_delay(delay_params["plant"])
+            self.sensor_controller.set_delay(delay_params["sensor"])
+            self.input_controller.set_signal(signal_params.pop("type", "Step"), **signal_params)
         except Exception as e:
             #print(f"Error setting parameters to models: {e}")
             return
@@ -475,6 +607,13 @@ class Simulator(QMainWindow):
         self.update_plant_label()
         self.update_sensor_label()
 
+        if signal_warnings:
+            QMessageBox.warning(
+                self,
+                "Reference Signal",
+                f"{signal_warnings[0]}\nThe Step input is used instead."
+            )
+
     #--------------- End Load Params Methods --------------
 
     def handle_close_request(self):
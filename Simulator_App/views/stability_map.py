@@ -0,0 +1,171 @@
+#Standard library imports
+import os
+
+#Third-party imports
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QTableWidgetItem, QHeaderView
+from PyQt5.uic import loadUi
+from PyQt5.QtCore import Qt
+from PyQt5 import QtWidgets
+
+#Scientific imports
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+
+#Local application imports
+from simulation_components.controller_pid import ControllerPID
+from simulation_components.plant import Plant
+from simulation_components.sensor import Sensor
+from simulation_components.stability_map import StabilityMap, GAINS, DEFAULT_POINTS
+
+# Gains on the grid when the dialog opens
+DEFAULT_AXES = ("kp", "ki")
+
+# Upper end of the proposed range, relative to the current gain
+DEFAULT_RANGE_FACTOR = 3.0
+
+class StabilityMapDialog(QDialog):
+    def __init__(self, plant_model: Plant, pid_controller: ControllerPID, sensor_model: Sensor, parent=None):
+        """
+        Dialog mapping the closed-loop stable region over a grid of PID gains.
+        Args:
+            plant_model (Plant): The plant model.
+            pid_controller (ControllerPID): The PID controller, marked on the map.
+            sensor_model (Sensor): The sensor model.
+            parent: The parent widget.
+        Returns:
+            None
+        """
+        super().__init__(parent)
+        ui_path = os.path.join(os.path.dirname(__file__), "../ui/stability_map.ui")
+        loadUi(ui_path, self)
+
+        self.plant_model = plant_model
+        self.stability_map = StabilityMap(pid_controller, plant_model, sensor_model)
+        self.result = None
+        self.canvas = None
+
+        self.setWindowTitle(self.plant_model.name + " - Stability Map")
+        self.errorlabel.hide()
+        self.axisTable.verticalHeader().setVisible(False)
+        self.axisTable.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.axisTable.setToolTip("Check two or three gains to put them on the grid.\nThe other gain keeps its current value.")
+        self.fill_axis_table()
+        self.sliceSlider.setEnabled(False)
+
+        self.computeButton.clicked.connect(self.compute_map)
+        self.sliceSlider.valueChanged.connect(lambda value: self.display_result())
+
+        self.compute_map()
+
+    def fill_axis_table(self):
+        """
+        List the gains with a range from zero to a multiple of their current value.
+        Args:
+            None
+        Returns:
+            None
+        """
+        current = self.stability_map.get_current_point()
+        self.axisTable.setRowCount(len(GAINS))
+        for row, name in enumerate(GAINS):
+            item = QTableWidgetItem(name)
+            item.setFlags(Qt.ItemIsUserCheckable | Qt.ItemIsEnabled)
+            item.setCheckState(Qt.Checked if name in DEFAULT_AXES else Qt.Unchecked)
+            self.axisTable.setItem(row, 0, item)
+            stop = DEFAULT_RANGE_FACTOR * abs(current[name]) or 1.0
+            self.axisTable.setItem(row, 1, QTableWidgetItem(f"{min(0.0, current[name]):.4g}"))
+            self.axisTable.setItem(row, 2, QTableWidgetItem(f"{stop:.4g}"))
+            self.axisTable.setItem(row, 3, QTableWidgetItem(str(DEFAULT_POINTS)))
+
+    def show_error(self, message):
+        """
+        Display an error message below the settings.
+        Args:
+            message (str): Error message
+        Returns:
+            None
+        """
+        self.errorlabel.setText(message)
+        self.errorlabel.show()
+
+    def apply_axes(self):
+        """
+        Copy the checked table rows into the stability map.
+        Args:
+            None
+        Returns:
+            str: Error message, empty if every checked row is valid
+        """
+        self.stability_map.clear_axes()
+        errors = []
+        for row, name in enumerate(GAINS):
+            if self.axisTable.item(row, 0).checkState() != Qt.Checked:
+                continue
+            try:
+                start = float(self.axisTable.item(row, 1).text())
+                stop = float(self.axisTable.item(row, 2).text())
+                points = int(self.axisTable.item(row, 3).text())
+            except ValueError:
+                errors.append(f"Error: Invalid range for {name}.")
+                continue
+            error_log = self.stability_map.add_axis(name, start, stop, points)
+            if error_log:
+                errors.append(error_log)
+        return "\n".join(errors)
+
+    def compute_map(self):
+        """
+        Evaluate the stability over the grid and show the slice through the current gains.
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.errorlabel.hide()
+        error_log = self.apply_axes()
+        if error_log:
+            self.show_error(error_log)
+            return
+        result = self.stability_map.compute()
+        if isinstance(result, str):
+            self.show_error(result)
+            return
+        self.result = result
+
+        third_axis = len(result.axes) > 2
+        self.sliceSlider.blockSignals(True)
+        self.sliceSlider.setEnabled(third_axis)
+        self.sliceSlider.setRange(0, len(result.axes[2].values) - 1 if third_axis else 0)
+        self.sliceSlider.setValue(result.get_default_slice())
+        self.sliceSlider.blockSignals(False)
+        self.sliceLabel.setText(f"Slice ({result.axes[2].name})" if third_axis else "Slice")
+
+        self.statusLabel.setText(f"{result.stable.size} grid points in {1000 * result.elapsed:.0f} ms\n"
+                                 f"Stable closed loops: {100 * result.get_stable_fraction():.1f}%\n"
+                                 f"Current PID: {'stable' if result.current_stable else 'unstable'}")
+        self.display_result()
+
+    def display_result(self):
+        """
+        Plot the stable region of the selected slice.
+        Args:
+            None
+        Returns:
+            None
+        """
+        if self.result is None:
+            return
+        fig = self.result.plot(self.sliceSlider.value() if len(self.result.axes) > 2 else None)
+
+        plot_container = self.findChild(QtWidgets.QWidget, "widget")
+        layout = plot_container.layout()
+        if layout is None:
+            layout = QVBoxLayout(plot_container)
+            layout.setContentsMargins(0, 0, 0, 0)
+        for i in reversed(range(layout.count())):
+            layout.itemAt(i).widget().setParent(None)
+
+        self.canvas = FigureCanvas(fig)
+        self.canvas.setStyleSheet("background-color: white;")
+        self.canvas.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        layout.addWidget(self.canvas)
+        self.canvas.draw()